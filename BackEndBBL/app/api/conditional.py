@@ -0,0 +1,77 @@
+"""
+Requêtes HTTP conditionnelles (ETag, Last-Modified, 304)
+
+Les validateurs sont calculés à partir de la version des ressources (horodatages,
+compteurs, agrégats) et non du contenu sérialisé : une réponse 304 est
+renvoyée sans charger ni sérialiser le corps.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+# Les clients doivent revalider à chaque fois : sans cette directive, la
+# présence de Last-Modified autorise une mise en cache heuristique
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts) -> str:
+    """ETag fort à partir des éléments de version d'une ressource"""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Les dates SQLite sont lues sans fuseau : elles sont stockées en UTC"""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Comparaison faible (RFC 9110, 13.1.2) : suffisante pour GET"""
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime] = None
+) -> bool:
+    """
+    Indique si le client possède déjà la version courante
+
+    ``If-None-Match`` est prioritaire ; ``If-Modified-Since`` n'est évalué
+    qu'en son absence, à la seconde près comme les dates HTTP.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = as_utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+        return False
+    return as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def validator_headers(
+    etag: str, last_modified: Optional[datetime] = None
+) -> Dict[str, str]:
+    """En-têtes de validation à joindre aux réponses 200 et 304"""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """Réponse 304 sans corps"""
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
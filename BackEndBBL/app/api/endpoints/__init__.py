@@ -1,9 +1,10 @@
 # app/api/endpoints/__init__.py
 """
 API package initializer
-Expose les routeurs d'API (articles, comments)
+Expose les routeurs d'API (articles, authors, comments)
 """
 from . import articles  # existant dans ton projet
+from . import authors
 from . import (
     comments,
 )  # nouveau - import nécessaire pour que les modèles soient enregistrés
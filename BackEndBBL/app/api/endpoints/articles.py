@@ -2,18 +2,106 @@
 Endpoints API pour la gestion des articles
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from ...database import get_db
-from app.schemas.article import ArticleCreate, ArticleUpdate, ArticleResponse
-from app.services.article_service import ArticleService
+from datetime import datetime
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import TypeAdapter
+from typing import List, Literal, Optional, Union
+from ...database import AnySession, close_session, get_session
+from app.api.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified,
+    validator_headers,
+)
+from app.schemas.article import (
+    ArticleBulkDeleteResult,
+    ArticleCreate,
+    ArticleUpdate,
+    ArticleResponse,
+    ArticlePage,
+    ArticleSearchResult,
+    ArticleSummary,
+    ArticleWithComments,
+    TrendingArticle,
+)
+from app.api.rate_limit import write_rate_limit
+from app.api.responses import FastJSONResponse, dumps
+from app.core.config import settings
+from app.schemas.bulk import NDJSON_BODY, BulkImportResult
+from app.services.article_cache import article_cache
+from app.services.article_service import ArticleService, AsyncArticleService
+from app.services.bulk_service import export_articles, import_ndjson, insert_articles
+from app.services.comment_service import AsyncCommentService, CommentService
+from app.services.events import event_bus, event_stream
+from app.services.jobs import schedule_jobs
+from app.services.pagination import InvalidCursorError
+from app.services.post_write import deferred
+from app.services.projection import (
+    ARTICLE_RESPONSE_COLUMNS,
+    ARTICLE_SUMMARY_COLUMNS,
+    COMMENT_RESPONSE_COLUMNS,
+    article_columns,
+)
 
 router = APIRouter()
 
+# Sérialiseur JSON des articles mis en cache (octets prêts à l'envoi) ; les
+# listes sont projetées en dictionnaires et encodées par ``dumps``
+_article_json = TypeAdapter(ArticleResponse)
 
-@router.get("/", response_model=List[ArticleResponse])
-def get_articles(
+
+def _json_response(
+    body: bytes, etag: str, last_modified: Optional[datetime] = None
+) -> Response:
+    """Réponse JSON à partir d'un corps déjà sérialisé, avec ses validateurs"""
+    return FastJSONResponse(
+        content=body, headers=validator_headers(etag, last_modified)
+    )
+
+
+async def _article_items(db: AnySession, articles: List[dict], include_comments: int):
+    """
+    Articles projetés d'une liste, avec leurs derniers commentaires si demandé
+
+    Les commentaires de toute la page sont chargés en une seule requête ; le
+    nombre de commentaires provient de la colonne ``comments_count``.
+    """
+    for article in articles:
+        ArticleService.add_pending_likes(article)
+    if include_comments:
+        recent = await AsyncCommentService.get_recent_comments(
+            db,
+            [a["id"] for a in articles],
+            include_comments,
+            columns=COMMENT_RESPONSE_COLUMNS,
+        )
+        for article in articles:
+            article["recent_comments"] = [
+                CommentService.add_pending_likes(c) for c in recent[article["id"]]
+            ]
+    return articles
+
+
+@router.get(
+    "/",
+    response_model=Union[
+        List[Union[ArticleWithComments, ArticleResponse, ArticleSummary]],
+        ArticlePage,
+    ],
+)
+async def get_articles(
+    request: Request,
     search: Optional[str] = Query(
         None, description="Rechercher dans titre, contenu ou auteur"
     ),
@@ -21,49 +109,300 @@ def get_articles(
     limit: int = Query(
         100, ge=1, le=100, description="Nombre maximum d'articles à retourner"
     ),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None,
+        description=(
+            "Curseur opaque (`next_cursor` de la page précédente) ; une valeur "
+            "vide demande la première page. Active la réponse paginée "
+            "`{items, next_cursor}` et ignore `skip`"
+        ),
+    ),
+    include_comments: int = Query(
+        0,
+        ge=0,
+        le=20,
+        description="Nombre de commentaires récents à inclure pour chaque article",
+    ),
+    view: Literal["full", "summary"] = Query(
+        "full",
+        description=(
+            "`summary` : extrait, nombre de mots et temps de lecture à la place "
+            "du contenu complet"
+        ),
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description=(
+            "Champs à retourner, séparés par des virgules (ex. `id,title,excerpt`) ; "
+            "`id` est toujours inclus. Prioritaire sur `view`"
+        ),
+    ),
+    db: AnySession = Depends(get_session),
 ):
     """Récupère tous les articles avec recherche optionnelle"""
-    return ArticleService.get_all_articles(db, search=search, skip=skip, limit=limit)
+    if fields is not None:
+        try:
+            columns = article_columns(f.strip() for f in fields.split(",") if f.strip())
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    elif view == "summary":
+        columns = ARTICLE_SUMMARY_COLUMNS
+    else:
+        columns = ARTICLE_RESPONSE_COLUMNS
+
+    params = {
+        "search": search,
+        "skip": skip,
+        "limit": limit,
+        "cursor": cursor,
+        "include_comments": include_comments,
+        "columns": [column.key for column in columns],
+    }
+    version = await AsyncArticleService.get_articles_version(db)
+    etag = make_etag("articles", version, sorted(params.items()))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    key = article_cache.list_key("articles", params)
+    body = article_cache.get(key, etag)
+    if body is not None:
+        return _json_response(body, etag)
+
+    if cursor is not None:
+        try:
+            articles, next_cursor = await AsyncArticleService.get_articles_page(
+                db,
+                search=search,
+                cursor=cursor,
+                limit=limit,
+                columns=columns,
+            )
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        items = await _article_items(db, articles, include_comments)
+        body = dumps({"items": items, "next_cursor": next_cursor})
+    else:
+        articles = await AsyncArticleService.get_all_articles(
+            db, search=search, skip=skip, limit=limit, columns=columns
+        )
+        body = dumps(await _article_items(db, articles, include_comments))
+
+    ids = [a["id"] for a in articles]
+    article_cache.set_list(key, body, ids, etag, search=bool(search))
+    return _json_response(body, etag)
+
+
+@router.get("/search", response_model=List[ArticleSearchResult])
+async def search_articles(
+    request: Request,
+    q: str = Query(
+        ..., min_length=1, description="Termes recherchés (préfixes acceptés)"
+    ),
+    skip: int = Query(0, ge=0, description="Nombre de résultats à sauter"),
+    limit: int = Query(
+        20, ge=1, le=100, description="Nombre maximum de résultats à retourner"
+    ),
+    db: AnySession = Depends(get_session),
+):
+    """Recherche plein texte classée par pertinence, avec extraits surlignés"""
+    params = {"q": q, "skip": skip, "limit": limit}
+    version = await AsyncArticleService.get_articles_version(db)
+    etag = make_etag("search", version, sorted(params.items()))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    key = article_cache.list_key("search", params)
+    body = article_cache.get(key, etag)
+    if body is not None:
+        return _json_response(body, etag)
+
+    results = await AsyncArticleService.search_articles(
+        db, q, skip=skip, limit=limit, columns=ARTICLE_RESPONSE_COLUMNS
+    )
+    body = dumps(
+        [
+            {
+                **ArticleService.add_pending_likes(article),
+                "rank": hit.rank,
+                "snippet": hit.snippet,
+            }
+            for article, hit in results
+        ]
+    )
+    ids = [a["id"] for a, _ in results]
+    article_cache.set_list(key, body, ids, etag, search=True)
+    return _json_response(body, etag)
+
+
+@router.get("/trending", response_model=List[TrendingArticle])
+async def get_trending_articles(
+    window: Literal["1h", "24h", "7d"] = Query(
+        "24h",
+        description=(
+            "Constante de temps de la décroissance : un like ou un commentaire "
+            "pèse 1/e de son poids après cette durée"
+        ),
+    ),
+    limit: int = Query(10, ge=1, le=100, description="Nombre d'articles à retourner"),
+    db: AnySession = Depends(get_session),
+):
+    """Articles tendance : likes et commentaires récents pondérés par leur âge"""
+    articles = await AsyncArticleService.get_trending(db, window=window, limit=limit)
+    return FastJSONResponse(
+        content=[ArticleService.add_pending_likes(a) for a in articles]
+    )
+
+
+@router.get("/export")
+async def export_all_articles(db: AnySession = Depends(get_session)):
+    """Exporte tous les articles en NDJSON (un article par ligne, par id croissant)"""
+    return StreamingResponse(export_articles(db), media_type="application/x-ndjson")
 
 
 @router.get("/{article_id}", response_model=ArticleResponse)
-def get_article(article_id: int, db: Session = Depends(get_db)):
+async def get_article(
+    article_id: int, request: Request, db: AnySession = Depends(get_session)
+):
     """Récupère un article spécifique par son ID"""
-    article = ArticleService.get_article_by_id(db, article_id)
-    if not article:
+    version = await AsyncArticleService.get_article_version(db, article_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Article non trouvé")
-    return article
+    parts, last_modified = version
+    etag = make_etag("article", parts)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    body = article_cache.get(article_cache.article_key(article_id), etag)
+    if body is None:
+        article = await AsyncArticleService.get_article_by_id(db, article_id)
+        if not article:
+            raise HTTPException(status_code=404, detail="Article non trouvé")
+        body = _article_json.dump_json(ArticleService.to_response(article))
+        article_cache.set_article(article_id, body, etag)
+    return _json_response(body, etag, last_modified)
+
 
+@router.get(
+    "/{article_id}/events",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_article_events(
+    article_id: int,
+    last_event_id: Optional[str] = Header(
+        None, description="Dernier événement reçu (reconnexion de EventSource)"
+    ),
+    db: AnySession = Depends(get_session),
+):
+    """
+    Flux Server-Sent Events d'un article, à la place du rechargement périodique
 
-@router.post("/", response_model=ArticleResponse, status_code=201)
-def create_article(article: ArticleCreate, db: Session = Depends(get_db)):
-    """Crée un nouvel article"""
-    return ArticleService.create_article(db, article)
+    Événements : ``comment_created`` (le commentaire), ``comment_deleted``
+    (``id``), ``likes`` (``likes_count``), ``comment_likes`` (``id`` et
+    ``likes_count`` du commentaire) et ``reset`` lorsque des événements
+    manqués ne peuvent être rejoués (recharger l'article et ses commentaires).
+    """
+    if await AsyncArticleService.get_article_version(db, article_id) is None:
+        raise HTTPException(status_code=404, detail="Article non trouvé")
+    await close_session(db)
+
+    subscriber = event_bus.subscribe(article_id, last_event_id)
+    return StreamingResponse(
+        event_stream(subscriber, settings.events_heartbeat_interval),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(subscriber.close),
+    )
+
+
+@router.post(
+    "/",
+    response_model=ArticleResponse,
+    status_code=201,
+    dependencies=[Depends(write_rate_limit)],
+)
+async def create_article(
+    article: ArticleCreate,
+    background_tasks: BackgroundTasks,
+    db: AnySession = Depends(get_session),
+):
+    """Crée un nouvel article (résumé calculé après la réponse si différé)"""
+    new_article = await AsyncArticleService.create_article(db, article)
+    if deferred():
+        schedule_jobs(background_tasks, db)
+    return ArticleService.to_response(new_article)
+
+
+@router.post("/bulk", response_model=BulkImportResult, openapi_extra=NDJSON_BODY)
+async def bulk_import_articles(request: Request, db: AnySession = Depends(get_session)):
+    """
+    Importe des articles depuis un flux NDJSON
+
+    Chaque ligne est un objet ``ArticleCreate``. Les lignes valides sont
+    insérées par lots ; les lignes rejetées sont listées avec leur numéro.
+    """
+    return await import_ndjson(db, request.stream(), ArticleCreate, insert_articles)
 
 
 @router.put("/{article_id}", response_model=ArticleResponse)
-def update_article(
-    article_id: int, article: ArticleUpdate, db: Session = Depends(get_db)
+async def update_article(
+    article_id: int,
+    article: ArticleUpdate,
+    background_tasks: BackgroundTasks,
+    db: AnySession = Depends(get_session),
 ):
     """Met à jour un article existant"""
-    updated_article = ArticleService.update_article(db, article_id, article)
+    updated_article = await AsyncArticleService.update_article(db, article_id, article)
     if not updated_article:
         raise HTTPException(status_code=404, detail="Article non trouvé")
-    return updated_article
+    if deferred():
+        schedule_jobs(background_tasks, db)
+    return ArticleService.to_response(updated_article)
+
+
+@router.delete("/", response_model=ArticleBulkDeleteResult)
+async def delete_articles(
+    ids: str = Query(
+        ...,
+        description="Identifiants séparés par des virgules",
+        examples=["1,2,3"],
+    ),
+    db: AnySession = Depends(get_session),
+):
+    """Supprime plusieurs articles (avec leurs commentaires et likes)"""
+    try:
+        article_ids = sorted({int(i) for i in ids.split(",") if i.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Identifiants invalides")
+    if not article_ids:
+        raise HTTPException(status_code=400, detail="Aucun identifiant")
+    if len(article_ids) > settings.article_bulk_delete_max:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Au plus {settings.article_bulk_delete_max} articles par requête",
+        )
+    deleted = await AsyncArticleService.delete_articles(db, article_ids)
+    return {
+        "deleted": deleted,
+        "not_found": sorted(set(article_ids) - set(deleted)),
+    }
 
 
 @router.delete("/{article_id}", status_code=204)
-def delete_article(article_id: int, db: Session = Depends(get_db)):
-    """Supprime un article"""
-    if not ArticleService.delete_article(db, article_id):
+async def delete_article(article_id: int, db: AnySession = Depends(get_session)):
+    """Supprime un article avec ses commentaires et likes"""
+    if not await AsyncArticleService.delete_article(db, article_id):
         raise HTTPException(status_code=404, detail="Article non trouvé")
 
 
-@router.post("/{article_id}/like", response_model=ArticleResponse)
-def like_article(article_id: int, db: Session = Depends(get_db)):
+@router.post(
+    "/{article_id}/like",
+    response_model=ArticleResponse,
+    dependencies=[Depends(write_rate_limit)],
+)
+async def like_article(article_id: int, db: AnySession = Depends(get_session)):
     """Ajoute un like à un article"""
-    article = ArticleService.increment_likes(db, article_id)
+    article = await AsyncArticleService.increment_likes(db, article_id)
     if not article:
         raise HTTPException(status_code=404, detail="Article non trouvé")
-    return article
+    return ArticleService.to_response(article)
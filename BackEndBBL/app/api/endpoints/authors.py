@@ -0,0 +1,72 @@
+"""
+Endpoints API des auteurs
+"""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.responses import FastJSONResponse
+from app.database import AnySession, get_session
+from app.models.author import AuthorStats
+from app.schemas.author import AuthorArticlesPage, AuthorStatsResponse
+from app.services.article_service import ArticleService
+from app.services.author_service import AsyncAuthorService
+from app.services.pagination import InvalidCursorError
+from app.services.projection import ARTICLE_SUMMARY_COLUMNS
+
+router = APIRouter()
+
+
+def _stats(stats: AuthorStats) -> dict:
+    """Champs de AuthorStatsResponse d'une ligne de ``author_stats``"""
+    return {
+        "author": stats.author,
+        "articles_count": stats.articles_count,
+        "likes_count": stats.likes_count,
+        "comments_count": stats.comments_count,
+        "last_post_at": stats.last_post_at,
+    }
+
+
+@router.get("/", response_model=List[AuthorStatsResponse])
+async def get_authors(
+    skip: int = Query(0, ge=0, description="Nombre d'auteurs à sauter"),
+    limit: int = Query(100, ge=1, le=100, description="Nombre maximum d'auteurs"),
+    db: AnySession = Depends(get_session),
+):
+    """Auteurs par ordre alphabétique, avec leurs statistiques"""
+    authors = await AsyncAuthorService.get_authors(db, skip=skip, limit=limit)
+    return FastJSONResponse([_stats(stats) for stats in authors])
+
+
+@router.get("/{name}/articles", response_model=AuthorArticlesPage)
+async def get_author_articles(
+    name: str,
+    cursor: Optional[str] = Query(
+        None, description="Curseur opaque (`next_cursor` de la page précédente)"
+    ),
+    limit: int = Query(20, ge=1, le=100, description="Nombre d'articles par page"),
+    db: AnySession = Depends(get_session),
+):
+    """
+    Statistiques d'un auteur (nom exact) et ses articles, du plus récent
+
+    Lecture par clé primaire et par plage d'index : le coût ne dépend ni du
+    nombre d'articles de la base ni de celui de l'auteur.
+    """
+    try:
+        stats, articles, next_cursor = await AsyncAuthorService.get_author_articles(
+            db, name, cursor=cursor, limit=limit, columns=ARTICLE_SUMMARY_COLUMNS
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Auteur non trouvé")
+    return FastJSONResponse(
+        {
+            "author": _stats(stats),
+            "items": [ArticleService.add_pending_likes(a) for a in articles],
+            "next_cursor": next_cursor,
+        }
+    )
@@ -1,61 +1,171 @@
 # app/api/endpoints/comments.py
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.services.comment_service import CommentService
-from app.schemas.comment import CommentCreate, CommentResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from typing import List, Optional, Union
+from app.api.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified,
+    validator_headers,
+)
+from app.api.rate_limit import write_rate_limit
+from app.api.responses import FastJSONResponse
+from app.database import AnySession, get_session
+from app.services.bulk_service import import_ndjson, insert_comments
+from app.services.comment_service import (
+    AsyncCommentService,
+    CommentService,
+    CommentSort,
+)
+from app.schemas.bulk import NDJSON_BODY, BulkImportResult
+from app.schemas.comment import CommentCreate, CommentPage, CommentResponse
+from app.services.jobs import schedule_jobs
+from app.services.pagination import InvalidCursorError
+from app.services.post_write import deferred
+from app.services.projection import COMMENT_RESPONSE_COLUMNS
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[CommentResponse])
-def list_comments(
+@router.get("/", response_model=Union[List[CommentResponse], CommentPage])
+async def list_comments(
+    request: Request,
     article_id: int = Query(..., description="ID de l'article"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None,
+        description=(
+            "Opaque cursor (`next_cursor` of the previous page); an empty value "
+            "requests the first page. Switches to the `{items, next_cursor}` "
+            "paginated response"
+        ),
+    ),
+    limit: int = Query(
+        50,
+        ge=1,
+        le=100,
+        description="Page size in cursor mode, number of comments with `sort`",
+    ),
+    sort: Optional[CommentSort] = Query(
+        None,
+        description=(
+            "`top`: most liked first, `new`: newest first; returns the first "
+            "`limit` comments. Oldest first (the whole thread) when absent"
+        ),
+    ),
+    db: AnySession = Depends(get_session),
 ):
     """
     Récupère les commentaires pour un article donné.
     GET /api/comments?article_id=1
+    GET /api/comments?article_id=1&cursor=&limit=20  (paginated)
+    GET /api/comments?article_id=1&sort=top&limit=10  (top comments)
+
+    Responses carry an ETag derived from the thread's aggregates; a matching
+    If-None-Match gets a 304 before any comment is loaded.
     """
-    # Fetch SQLAlchemy model instances and return Pydantic responses.
-    comments = CommentService.get_comments_by_article(db, article_id)
-    # The CommentResponse schema handles model -> JSON conversion (from_orm)
-    return [
-        {
-            "id": c.id,
-            "article_id": c.article_id,
-            "author": c.author,
-            "content": c.content,
-            "created_at": c.created_at,
-        }
-        for c in comments
-    ]
+    # Comments are read as column tuples and encoded straight to JSON: no ORM
+    # or Pydantic object is built per comment (response_model stays for OpenAPI)
+    version = await AsyncCommentService.get_comments_version(db, article_id)
+    etag = make_etag("comments", article_id, version, cursor, limit, sort)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    headers = validator_headers(etag)
+
+    if cursor is not None:
+        if sort is not None:
+            raise HTTPException(
+                status_code=400, detail="sort cannot be combined with cursor"
+            )
+        try:
+            comments, next_cursor = await AsyncCommentService.get_comments_page(
+                db,
+                article_id,
+                cursor=cursor,
+                limit=limit,
+                columns=COMMENT_RESPONSE_COLUMNS,
+            )
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        for comment in comments:
+            CommentService.add_pending_likes(comment)
+        return FastJSONResponse(
+            {"items": comments, "next_cursor": next_cursor}, headers=headers
+        )
 
+    comments = await AsyncCommentService.get_comments_by_article(
+        db,
+        article_id,
+        columns=COMMENT_RESPONSE_COLUMNS,
+        sort=sort,
+        limit=limit if sort is not None else None,
+    )
+    for comment in comments:
+        CommentService.add_pending_likes(comment)
+    return FastJSONResponse(comments, headers=headers)
 
-@router.post("/", status_code=201, response_model=CommentResponse)
-def create_comment(payload: CommentCreate, db: Session = Depends(get_db)):
+
+@router.post(
+    "/",
+    status_code=201,
+    response_model=CommentResponse,
+    dependencies=[Depends(write_rate_limit)],
+)
+async def create_comment(
+    payload: CommentCreate,
+    background_tasks: BackgroundTasks,
+    db: AnySession = Depends(get_session),
+):
     """
     Crée un commentaire.
     POST /api/comments
     body: { "article_id": 1, "author": "Paul", "content": "Super article !" }
     """
     # Create and return the saved comment using the Pydantic schema for response
-    comment = CommentService.create_comment(db, payload)
-    return {
-        "id": comment.id,
-        "article_id": comment.article_id,
-        "author": comment.author,
-        "content": comment.content,
-        "created_at": comment.created_at,
-    }
+    comment = await AsyncCommentService.create_comment(db, payload)
+    if comment is None:
+        raise HTTPException(status_code=404, detail="Article non trouvé")
+    if deferred():
+        # Article counters are recounted after the response
+        schedule_jobs(background_tasks, db)
+    return CommentService.to_dict(comment)
+
+
+@router.post("/bulk", response_model=BulkImportResult, openapi_extra=NDJSON_BODY)
+async def bulk_import_comments(request: Request, db: AnySession = Depends(get_session)):
+    """
+    Importe des commentaires depuis un flux NDJSON.
+    POST /api/comments/bulk
+    body: one CommentCreate object per line
+
+    Rows are inserted in batches together with the articles' comments_count;
+    rows that fail validation or reference a missing article are reported.
+    """
+    return await import_ndjson(db, request.stream(), CommentCreate, insert_comments)
+
+
+@router.post(
+    "/{comment_id}/like",
+    response_model=CommentResponse,
+    dependencies=[Depends(write_rate_limit)],
+)
+async def like_comment(comment_id: int, db: AnySession = Depends(get_session)):
+    """
+    Ajoute un like à un commentaire.
+    POST /api/comments/1/like
+
+    Likes are buffered and written as batched atomic increments; the returned
+    ``likes_count`` already includes the pending ones.
+    """
+    comment = await AsyncCommentService.like_comment(db, comment_id)
+    if comment is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    return CommentService.to_dict(comment)
 
 
 @router.delete("/{comment_id}", status_code=204)
-def delete_comment(comment_id: int, db: Session = Depends(get_db)):
+async def delete_comment(comment_id: int, db: AnySession = Depends(get_session)):
     """
     Supprime un commentaire par son id.
     """
-    ok = CommentService.delete_comment(db, comment_id)
+    ok = await AsyncCommentService.delete_comment(db, comment_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Comment not found")
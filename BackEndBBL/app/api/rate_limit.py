@@ -0,0 +1,52 @@
+"""
+Limitation de débit des routes d'écriture (dépendance FastAPI)
+
+Les routes qui écrivent dans la base (création d'article, de commentaire,
+like) déclarent ``dependencies=[Depends(write_rate_limit)]`` : au-delà de
+son seau de jetons, un client reçoit 429 et ``Retry-After``. La clé associe
+l'adresse du client (celle des en-têtes du proxy si uvicorn est lancé avec
+``--proxy-headers``) au gabarit de la route.
+"""
+
+import math
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+from app.core.config import settings
+from app.core.rate_limit import RateLimitStore, create_rate_limit_store
+
+
+class RateLimiter:
+    """Dépendance appliquant un seau par client et par route"""
+
+    def __init__(self, store: Optional[RateLimitStore], rate: float, burst: int):
+        self.store = store
+        self.rate = rate
+        self.burst = burst
+
+    @staticmethod
+    def key(request: Request) -> str:
+        client = request.client.host if request.client else "unknown"
+        route = request.scope.get("route")
+        path = getattr(route, "path", request.url.path)
+        return f"{client}:{request.method}:{path}"
+
+    async def __call__(self, request: Request) -> None:
+        if self.store is None:
+            return
+        wait = self.store.acquire(self.key(request), self.rate, self.burst)
+        if wait > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Trop de requêtes, réessayez plus tard",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+
+# Limiteur partagé des routes d'écriture (RATE_LIMIT_ENABLED)
+write_rate_limit = RateLimiter(
+    create_rate_limit_store(settings),
+    rate=settings.rate_limit_rate,
+    burst=settings.rate_limit_burst,
+)
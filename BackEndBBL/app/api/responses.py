@@ -0,0 +1,88 @@
+"""
+Encodage JSON rapide des réponses en liste
+
+Les listes sont construites comme des dictionnaires de valeurs simples
+(voir ``app.services.projection``) et encodées directement avec orjson,
+sans validation Pydantic par élément. Le ``response_model`` des routes reste
+déclaré : le schéma OpenAPI est inchangé.
+
+Le JSON produit est identique à celui de Pydantic : dates ISO 8601 (``Z``
+pour UTC), UTF-8 non échappé. Les corps volumineux (articles complets, pages
+de 100 articles) sont envoyés par morceaux de ``RESPONSE_CHUNK_SIZE`` octets :
+le serveur les écrit au rythme du client et le middleware de compression les
+compresse au fil de l'eau.
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from fastapi.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import orjson  # dépendance optionnelle
+except ImportError:  # pragma: no cover - repli sur la bibliothèque standard
+    orjson = None
+
+
+def _default(value: Any):
+    """Types non natifs pour le repli ``json`` (comme Pydantic)"""
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if value.utcoffset() == timedelta(0) else text
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Type non sérialisable : {type(value).__name__}")
+
+
+if orjson is not None:
+
+    def dumps(content: Any) -> bytes:
+        """Encode en JSON (octets UTF-8)"""
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+else:
+
+    def dumps(content: Any) -> bytes:
+        """Encode en JSON (octets UTF-8)"""
+        return json.dumps(
+            content, default=_default, ensure_ascii=False, separators=(",", ":")
+        ).encode()
+
+
+class FastJSONResponse(Response):
+    """Réponse JSON encodée par ``dumps``, sans passage par ``jsonable_encoder``"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        chunk_size = settings.response_chunk_size
+        if len(self.body) <= chunk_size:
+            await super().__call__(scope, receive, send)
+            return
+        # Content-Length reste celui du corps entier
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        for offset in range(0, len(self.body), chunk_size):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": self.body[offset : offset + chunk_size],
+                    "more_body": offset + chunk_size < len(self.body),
+                }
+            )
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,4 @@
+"""
+Core package initializer
+Configuration et briques transverses de l'application
+"""
@@ -0,0 +1,235 @@
+"""
+Cache de réponses sérialisées
+
+Deux implémentations de ``CacheBackend`` :
+- ``LRUCache`` : en mémoire du processus, bornée en nombre d'entrées, avec TTL
+- ``RedisCache`` : partagée entre processus, via tout client compatible
+  redis-py (ou ``FakeRedis`` en local)
+
+Les valeurs sont des octets (JSON déjà sérialisé). Les clés peuvent être
+rattachées à des étiquettes pour être invalidées ensemble.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+class CacheStats:
+    """Compteurs de succès, d'échecs et d'évictions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+class CacheBackend(ABC):
+    """Interface commune des caches de réponses"""
+
+    # Partagé par tous les workers (sinon, les invalidations leur sont diffusées)
+    shared = False
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Valeur de la clé, ou None si elle est absente ou expirée"""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, tags: Iterable[str] = ()) -> None:
+        """Stocke une valeur et la rattache aux étiquettes données"""
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        """Supprime les clés données"""
+
+    @abstractmethod
+    def invalidate_tags(self, *tags: str) -> None:
+        """Supprime toutes les clés rattachées à l'une des étiquettes"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Vide le cache"""
+
+    @abstractmethod
+    def size(self) -> int:
+        """Nombre d'entrées en cache"""
+
+
+class LRUCache(CacheBackend):
+    """Cache LRU en mémoire avec durée de vie par entrée"""
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 60.0):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # clé -> (valeur, échéance monotone)
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        # étiquette -> clés, et clé -> étiquettes (pour nettoyer à l'éviction)
+        self._tags: Dict[str, Set[str]] = {}
+        self._key_tags: Dict[str, Set[str]] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                self._remove(key)
+                self.stats.incr("expirations")
+                entry = None
+            if entry is None:
+                self.stats.incr("misses")
+                return None
+            self._entries.move_to_end(key)
+            self.stats.incr("hits")
+            return entry[0]
+
+    def set(self, key: str, value: bytes, tags: Iterable[str] = ()) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+                self._key_tags.setdefault(key, set()).add(tag)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats.incr("evictions")
+
+    def _remove(self, key: str) -> bool:
+        """Retire une clé et ses rattachements ; verrou déjà acquis"""
+        if self._entries.pop(key, None) is None:
+            return False
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return True
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            removed = sum(1 for key in keys if self._remove(key))
+            if removed:
+                self.stats.incr("invalidations", removed)
+
+    def invalidate_tags(self, *tags: str) -> None:
+        with self._lock:
+            removed = 0
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    removed += self._remove(key)
+            if removed:
+                self.stats.incr("invalidations", removed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._key_tags.clear()
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache partagé stocké dans Redis
+
+    Les étiquettes sont des ensembles Redis (``<prefix>tag:<nom>``) listant les
+    clés rattachées ; l'expiration et l'éviction sont déléguées à Redis
+    (TTL par clé, politique ``maxmemory``).
+    """
+
+    shared = True
+
+    def __init__(self, client, ttl: float = 60.0, prefix: str = "bbl:cache:"):
+        super().__init__()
+        self.client = client
+        # Redis attend une durée entière en secondes
+        self.ttl = max(1, int(ttl))
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.client.get(self._key(key))
+        self.stats.incr("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: bytes, tags: Iterable[str] = ()) -> None:
+        self.client.set(self._key(key), value, ex=self.ttl)
+        for tag in tags:
+            self.client.sadd(self._tag(tag), self._key(key))
+            # L'ensemble ne survit pas aux clés qu'il référence
+            self.client.expire(self._tag(tag), self.ttl)
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            removed = self.client.delete(*(self._key(k) for k in keys))
+            if removed:
+                self.stats.incr("invalidations", removed)
+
+    def invalidate_tags(self, *tags: str) -> None:
+        for tag in tags:
+            members = self.client.smembers(self._tag(tag))
+            if members:
+                removed = self.client.delete(*members)
+                if removed:
+                    self.stats.incr("invalidations", removed)
+            self.client.delete(self._tag(tag))
+
+    def clear(self) -> None:
+        keys = list(self.client.keys(f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def size(self) -> int:
+        tag_prefix = self._tag("").encode()
+        return sum(
+            1
+            for key in self.client.keys(f"{self.prefix}*")
+            if not key.startswith(tag_prefix)
+        )
+
+
+def create_cache_backend(settings) -> CacheBackend:
+    """Construit le cache décrit par la configuration"""
+    if settings.cache_backend == "redis":
+        if settings.redis_url:
+            import redis  # dépendance optionnelle
+
+            client = redis.Redis.from_url(settings.redis_url)
+        else:
+            from app.core.fake_redis import FakeRedis
+
+            client = FakeRedis()
+        return RedisCache(client, ttl=settings.cache_ttl)
+    return LRUCache(max_entries=settings.cache_max_entries, ttl=settings.cache_ttl)
@@ -0,0 +1,213 @@
+"""
+Configuration de l'application
+Paramètres lus depuis l'environnement (ou un fichier .env) via pydantic-settings
+"""
+
+from typing import Dict, Literal, Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+# Pilotes asynchrones utilisés lorsque ASYNC_DATABASE_URL n'est pas fourni
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+class Settings(BaseSettings):
+    """Paramètres de l'application"""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # URL de connexion (SQLite par défaut pour la simplicité)
+    database_url: str = "sqlite:///./blog.db"
+    # URL du moteur asynchrone ; déduite de database_url si absente
+    async_database_url: Optional[str] = None
+    # "sync" : sessions bloquantes exécutées dans le pool de threads
+    # "async" : AsyncEngine et sessions asynchrones (aiosqlite / asyncpg)
+    db_mode: Literal["sync", "async"] = "sync"
+    # Pool de connexions en lecture seule (réplica, ou même fichier SQLite
+    # ouvert en lecture seule si absent)
+    read_database_url: Optional[str] = None
+    # Routes GET servies par ce pool ; les autres méthodes utilisent le primaire
+    read_routing: bool = True
+    # Après une écriture, les lectures du même client restent sur le primaire
+    # pendant ce délai (secondes, au moins le retard du réplica)
+    read_your_writes_window: float = 5.0
+    # Réplica injoignable : lectures sur le primaire pendant ce délai (secondes)
+    replica_retry_interval: float = 30.0
+    # Appliquer les migrations au démarrage (développement, processus unique) ;
+    # sinon le démarrage vérifie seulement la version du schéma
+    migrate_on_startup: bool = False
+
+    # Pool de connexions (ignoré pour les bases SQLite en mémoire)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    # Recyclage des connexions (secondes, -1 pour désactiver)
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = False
+
+    # Profil PRAGMA appliqué à chaque connexion SQLite
+    sqlite_tuning: bool = True
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size: int = 268_435_456
+    sqlite_temp_store: str = "memory"
+
+    # Likes : écriture groupée dès que ce nombre de likes est en attente...
+    like_flush_max_pending: int = 500
+    # ... ou au plus tard après ce délai (secondes)
+    like_flush_interval: float = 1.0
+
+    # Cache des lectures d'articles : "memory" (LRU du processus) ou "redis"
+    cache_backend: Literal["memory", "redis"] = "memory"
+    cache_max_entries: int = 10_000
+    cache_ttl: float = 60.0
+    # Serveur Redis (paquet `redis` requis) ; sans URL, un Redis factice local
+    redis_url: Optional[str] = None
+
+    # Coordination des workers (invalidations du cache, événements, compteurs) :
+    # "memory" pour un seul processus, "redis" (REDIS_URL) pour plusieurs
+    coordination_backend: Literal["memory", "redis"] = "memory"
+
+    # Limitation de débit des écritures (articles, commentaires, likes) par
+    # client et par route : seau de `burst` jetons rempli à `rate` par seconde
+    rate_limit_enabled: bool = False
+    rate_limit_backend: Literal["memory", "redis"] = "memory"
+    rate_limit_rate: float = 2.0
+    rate_limit_burst: int = 20
+    rate_limit_max_keys: int = 100_000
+
+    # Contrôle d'admission des écritures (503 et Retry-After) : au-delà de ce
+    # nombre d'écritures en cours (0 : sans limite)...
+    admission_max_writes: int = 0
+    # ... ou tant que le p99 du temps de réponse des lectures, sur les
+    # `admission_window` dernières secondes, dépasse ce seuil (ms, 0 : ignoré)
+    admission_read_p99_ms: float = 0.0
+    admission_window: float = 10.0
+    admission_retry_after: int = 1
+
+    # Idempotence des écritures portant un en-tête Idempotency-Key : réponse
+    # conservée `idempotency_ttl` secondes et rejouée aux requêtes répétées ;
+    # "memory" pour un seul processus, "database" (table idempotency_keys)
+    # pour plusieurs workers
+    idempotency_enabled: bool = True
+    idempotency_backend: Literal["memory", "database"] = "memory"
+    idempotency_ttl: float = 86_400.0
+    idempotency_max_keys: int = 10_000
+    # Durée maximale d'une requête en cours : au-delà, sa clé est libérée et
+    # les doublons qui l'attendaient reçoivent 409
+    idempotency_lock_timeout: float = 30.0
+    # Corps plus gros (octets) : réponses non conservées, requêtes refusées (413)
+    idempotency_max_body: int = 1_048_576
+
+    # Travaux dérivés des écritures (résumé des articles, compteurs de
+    # commentaires, statistiques des auteurs) : "inline" dans la transaction
+    # de la requête, "deferred" dans la file durable (table jobs), exécutés
+    # après la réponse puis par la tâche de fond, par `jobs_workers` au plus
+    post_write_mode: Literal["inline", "deferred"] = "inline"
+    jobs_workers: int = 2
+    jobs_batch_size: int = 50
+    jobs_poll_interval: float = 1.0
+    # Travail en échec : nouvel essai après un délai doublé à chaque fois (de
+    # `jobs_retry_delay` à `jobs_retry_max_delay` secondes) ; après
+    # `jobs_max_attempts` essais, il reste dans la table (statut failed)
+    jobs_max_attempts: int = 5
+    jobs_retry_delay: float = 1.0
+    jobs_retry_max_delay: float = 300.0
+    # Réservation d'un travail en cours : passé ce délai (worker arrêté), un
+    # autre worker le reprend
+    jobs_lease: float = 60.0
+
+    # Serveur de production (python -m app.serve) : adresse, nombre de workers
+    serve_host: str = "127.0.0.1"
+    serve_port: int = 8000
+    serve_workers: int = 1
+    # Délai laissé aux requêtes en cours à l'arrêt (s)
+    serve_graceful_timeout: float = 30.0
+
+    # Compression des réponses : gzip, et br / zstd si les paquets brotli /
+    # zstandard sont installés ; les corps plus petits partent tels quels
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    # Niveaux choisis pour le débit (voir benchmarks/bench_compression.py)
+    compression_gzip_level: int = 4
+    compression_brotli_level: int = 4
+    compression_zstd_level: int = 3
+    # Réponses compressées conservées (par ETag), jusqu'à cette taille de corps
+    compression_cache_entries: int = 256
+    compression_cache_ttl: float = 600.0
+    compression_cache_max_size: int = 2_097_152
+    # Corps JSON envoyés par morceaux de cette taille (octets)
+    response_chunk_size: int = 65_536
+
+    # Articles tendance : poids d'un like et d'un commentaire...
+    trending_like_weight: float = 1.0
+    trending_comment_weight: float = 3.0
+    # ... lecture des nouveaux événements et écriture de l'instantané (s)
+    trending_refresh_interval: float = 1.0
+    trending_persist_interval: float = 60.0
+    # Articles retirés du classement sous ce score (mémoire bornée)
+    trending_min_score: float = 0.01
+
+    # Flux d'événements (SSE) : commentaire ``: ping`` après ce délai sans
+    # événement (s) et délai de reconnexion suggéré au client (ms)
+    events_heartbeat_interval: float = 15.0
+    events_retry_ms: int = 3000
+    # Derniers événements gardés par article pour la reprise (Last-Event-ID),
+    # pour au plus ce nombre d'articles
+    events_history_size: int = 100
+    events_history_articles: int = 1000
+    # Événements en attente par connexion avant décrochage d'un client lent
+    events_max_pending: int = 64
+
+    # Requêtes SQL journalisées comme lentes au-delà de ce seuil (ms)
+    slow_query_ms: float = 200.0
+
+    # Import NDJSON : lignes insérées par transaction
+    bulk_chunk_size: int = 1000
+    # Export NDJSON : lignes lues par lot sur le curseur serveur
+    export_batch_size: int = 500
+
+    # Suppression des articles : "immediate" (commentaires et likes effacés
+    # dans la requête) ou "deferred" (effacés ensuite, en tâche de fond)
+    article_delete_mode: Literal["immediate", "deferred"] = "immediate"
+    # Purge différée : lignes effacées par transaction, délai entre deux passes
+    article_purge_batch_size: int = 5000
+    article_purge_interval: float = 1.0
+    # Suppression groupée (DELETE /api/articles?ids=) : identifiants par appel
+    article_bulk_delete_max: int = 1000
+
+    def sqlite_pragmas(self, read_only: bool = False) -> Dict[str, str]:
+        """PRAGMA appliqués à l'ouverture d'une connexion SQLite"""
+        if not self.sqlite_tuning:
+            return {}
+        pragmas = {
+            "busy_timeout": str(self.sqlite_busy_timeout_ms),
+            # Valeur négative : taille en Kio plutôt qu'en pages
+            "cache_size": str(-self.sqlite_cache_size_kib),
+            "mmap_size": str(self.sqlite_mmap_size),
+            "temp_store": self.sqlite_temp_store,
+        }
+        if read_only:
+            # Le mode de journal ne peut être changé qu'en écriture
+            pragmas["query_only"] = "on"
+        else:
+            pragmas["journal_mode"] = self.sqlite_journal_mode
+            pragmas["synchronous"] = self.sqlite_synchronous
+        return pragmas
+
+    def get_async_database_url(self) -> str:
+        """URL du moteur asynchrone, avec le pilote async adapté au SGBD"""
+        if self.async_database_url:
+            return self.async_database_url
+        scheme, _, rest = self.database_url.partition("://")
+        driver = ASYNC_DRIVERS.get(scheme.split("+")[0], scheme)
+        return f"{driver}://{rest}"
+
+
+settings = Settings()
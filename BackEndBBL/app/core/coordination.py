@@ -0,0 +1,206 @@
+"""
+Coordination des workers : messages diffusés et compteurs partagés
+
+Avec plusieurs workers (``python -m app.serve``), chaque processus garde ses
+propres états : cache LRU des lectures, abonnés des flux d'événements,
+génération des likes utilisée dans les ETag. Le coordinateur les tient
+cohérents :
+
+- ``broadcast`` : un message (invalidation du cache, événement d'un article)
+  est traité par les gestionnaires de chaque worker, l'émetteur compris
+  (immédiatement, avant le retour de l'appel) ;
+- ``incr`` / ``counter`` : compteurs communs à tous les workers.
+
+Deux implémentations de ``Coordinator`` :
+- ``LocalCoordinator`` : un seul processus, en mémoire
+- ``RedisCoordinator`` : Pub/Sub et ``INCRBY`` Redis, via tout client
+  compatible redis-py (ou ``FakeRedis`` en local)
+
+Les messages sont des dictionnaires sérialisables en JSON.
+"""
+
+import json
+import logging
+import os
+import secrets
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], None]
+
+
+class Coordinator(ABC):
+    """Interface commune des coordinateurs"""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._node_id: Optional[str] = None
+        self._node_pid: Optional[int] = None
+
+    @property
+    def node_id(self) -> str:
+        """Identifiant du worker (renouvelé après un fork)"""
+        if self._node_pid != os.getpid():
+            self._node_pid = os.getpid()
+            self._node_id = f"{self._node_pid}-{secrets.token_hex(4)}"
+        return self._node_id
+
+    def subscribe(self, channel: str, handler: Handler) -> None:
+        """Enregistre le gestionnaire des messages d'un canal (avant ``start``)"""
+        self._handlers.setdefault(channel, []).append(handler)
+
+    @abstractmethod
+    def broadcast(self, channel: str, message: dict) -> None:
+        """Fait traiter un message par tous les workers, celui-ci compris"""
+
+    @abstractmethod
+    def incr(self, key: str, amount: int = 1) -> int:
+        """Incrémente un compteur partagé ; retourne sa nouvelle valeur"""
+
+    @abstractmethod
+    def counter(self, key: str) -> int:
+        """Valeur d'un compteur partagé (0 s'il n'existe pas)"""
+
+    def start(self) -> None:
+        """Commence à recevoir les messages des autres workers (après le fork)"""
+
+    def close(self) -> None:
+        """Cesse de recevoir les messages"""
+
+    def _dispatch(self, channel: str, message: dict) -> None:
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(message)
+            except Exception:
+                logger.exception("Échec du traitement d'un message %s", channel)
+
+
+class LocalCoordinator(Coordinator):
+    """Coordination d'un seul processus : appels directs et compteurs en mémoire"""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+
+    def broadcast(self, channel: str, message: dict) -> None:
+        self._dispatch(channel, message)
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + amount
+            self._counters[key] = value
+            return value
+
+    def counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+
+class RedisCoordinator(Coordinator):
+    """
+    Coordination par Redis
+
+    Chaque canal est un canal Pub/Sub (``<prefix><canal>``) ; un thread par
+    worker reçoit les messages des autres et ignore les siens, déjà traités
+    à l'émission. Les compteurs sont des clés ``<prefix>counter:<nom>``.
+    Un message publié pendant une coupure de Redis est perdu : les entrées
+    de cache restent bornées par leur durée de vie.
+    """
+
+    def __init__(self, client, prefix: str = "bbl:", poll_interval: float = 1.0):
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+        self.poll_interval = poll_interval
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._pubsub = None
+
+    def _channel(self, channel: str) -> str:
+        return f"{self.prefix}{channel}"
+
+    def broadcast(self, channel: str, message: dict) -> None:
+        self._dispatch(channel, message)
+        envelope = json.dumps({"node": self.node_id, "message": message})
+        try:
+            self.client.publish(self._channel(channel), envelope)
+        except Exception:
+            logger.exception("Message %s non diffusé aux autres workers", channel)
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        return int(self.client.incrby(f"{self.prefix}counter:{key}", amount))
+
+    def counter(self, key: str) -> int:
+        value = self.client.get(f"{self.prefix}counter:{key}")
+        return int(value) if value is not None else 0
+
+    def start(self) -> None:
+        if not self._handlers or (self._thread and self._thread.is_alive()):
+            return
+        self._stopping.clear()
+        self._pubsub = self._listen()
+        self._thread = threading.Thread(
+            target=self._run, name="coordination", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval * 2)
+            self._thread = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+    def _listen(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(*(self._channel(channel) for channel in self._handlers))
+        return pubsub
+
+    def _run(self) -> None:
+        channels = {self._channel(channel): channel for channel in self._handlers}
+        while not self._stopping.is_set():
+            try:
+                message = self._pubsub.get_message(timeout=self.poll_interval)
+            except Exception:
+                logger.exception("Abonnement Redis interrompu, reconnexion")
+                self._stopping.wait(self.poll_interval)
+                try:
+                    self._pubsub = self._listen()
+                except Exception:
+                    pass
+                continue
+            if message is None or message.get("type") != "message":
+                continue
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            envelope = json.loads(message["data"])
+            if envelope["node"] != self.node_id and channel in channels:
+                self._dispatch(channels[channel], envelope["message"])
+
+
+def create_coordinator(settings) -> Coordinator:
+    """Construit le coordinateur décrit par la configuration"""
+    if settings.coordination_backend == "redis":
+        if settings.redis_url:
+            import redis  # dépendance optionnelle
+
+            client = redis.Redis.from_url(settings.redis_url)
+        else:
+            from app.core.fake_redis import FakeRedis
+
+            client = FakeRedis()
+        return RedisCoordinator(client)
+    return LocalCoordinator()
+
+
+# Coordinateur du processus, partagé par les caches et services
+coordination = create_coordinator(settings)
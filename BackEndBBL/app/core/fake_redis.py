@@ -0,0 +1,204 @@
+"""
+Client Redis factice en mémoire
+
+Implémente le sous-ensemble des commandes Redis utilisé par l'application
+(mêmes noms et mêmes valeurs de retour que redis-py avec ``decode_responses``
+désactivé). Sert de remplaçant local pour les tests et le développement, là où
+un serveur Redis n'est pas disponible.
+"""
+
+import queue
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+Value = Union[bytes, Set[bytes]]
+
+
+def _to_bytes(value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+class FakePubSub:
+    """Abonnement Pub/Sub (``FakeRedis.pubsub()``), interface de redis-py"""
+
+    def __init__(self, server: "FakeRedis", ignore_subscribe_messages: bool = False):
+        self._server = server
+        self._ignore_subscribe_messages = ignore_subscribe_messages
+        self._messages: "queue.Queue[dict]" = queue.Queue()
+        self.channels: Set[bytes] = set()
+
+    def subscribe(self, *channels) -> None:
+        for channel in channels:
+            channel = _to_bytes(channel)
+            self._server._attach(channel, self)
+            self.channels.add(channel)
+            if not self._ignore_subscribe_messages:
+                self._messages.put(
+                    {
+                        "type": "subscribe",
+                        "pattern": None,
+                        "channel": channel,
+                        "data": len(self.channels),
+                    }
+                )
+
+    def get_message(self, timeout: float = 0.0) -> Optional[dict]:
+        try:
+            if timeout:
+                return self._messages.get(timeout=timeout)
+            return self._messages.get_nowait()
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        for channel in self.channels:
+            self._server._detach(channel, self)
+        self.channels.clear()
+
+
+class FakeRedis:
+    """Sous-ensemble thread-safe de l'API redis-py, stocké en mémoire"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # clé -> (valeur, échéance monotone ou None)
+        self._data: Dict[bytes, Tuple[Value, Optional[float]]] = {}
+        # canal -> abonnements Pub/Sub
+        self._channels: Dict[bytes, List[FakePubSub]] = {}
+
+    def _get_entry(self, key) -> Optional[Value]:
+        key = _to_bytes(key)
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def get(self, key) -> Optional[bytes]:
+        with self._lock:
+            value = self._get_entry(key)
+            return value if isinstance(value, bytes) else None
+
+    def set(
+        self,
+        key,
+        value,
+        ex: Optional[float] = None,
+        px: Optional[int] = None,
+        nx: bool = False,
+    ):
+        with self._lock:
+            if nx and self._get_entry(key) is not None:
+                return None
+            ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+            expires_at = time.monotonic() + ttl if ttl is not None else None
+            self._data[_to_bytes(key)] = (_to_bytes(value), expires_at)
+            return True
+
+    def delete(self, *keys) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if self._get_entry(key) is not None:
+                    del self._data[_to_bytes(key)]
+                    removed += 1
+            return removed
+
+    def incrby(self, key, amount: int = 1) -> int:
+        with self._lock:
+            value = self._get_entry(key)
+            if value is not None and not isinstance(value, bytes):
+                raise TypeError("WRONGTYPE Operation against a key holding a set")
+            total = int(value or 0) + amount
+            expires_at = self._data.get(_to_bytes(key), (None, None))[1]
+            self._data[_to_bytes(key)] = (_to_bytes(total), expires_at)
+            return total
+
+    def incr(self, key, amount: int = 1) -> int:
+        return self.incrby(key, amount)
+
+    def publish(self, channel, message) -> int:
+        """Remet le message aux abonnements du canal ; nombre de destinataires"""
+        channel = _to_bytes(channel)
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscriber in subscribers:
+            subscriber._messages.put(
+                {
+                    "type": "message",
+                    "pattern": None,
+                    "channel": channel,
+                    "data": _to_bytes(message),
+                }
+            )
+        return len(subscribers)
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> FakePubSub:
+        return FakePubSub(self, ignore_subscribe_messages=ignore_subscribe_messages)
+
+    def _attach(self, channel: bytes, subscriber: FakePubSub) -> None:
+        with self._lock:
+            self._channels.setdefault(channel, []).append(subscriber)
+
+    def _detach(self, channel: bytes, subscriber: FakePubSub) -> None:
+        with self._lock:
+            subscribers = self._channels.get(channel, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+
+    def exists(self, *keys) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._get_entry(key) is not None)
+
+    def expire(self, key, seconds: float) -> bool:
+        with self._lock:
+            value = self._get_entry(key)
+            if value is None:
+                return False
+            self._data[_to_bytes(key)] = (value, time.monotonic() + seconds)
+            return True
+
+    def sadd(self, key, *members) -> int:
+        with self._lock:
+            current = self._get_entry(key)
+            members_set = set(current) if isinstance(current, set) else set()
+            before = len(members_set)
+            members_set.update(_to_bytes(m) for m in members)
+            expires_at = self._data.get(_to_bytes(key), (None, None))[1]
+            self._data[_to_bytes(key)] = (members_set, expires_at)
+            return len(members_set) - before
+
+    def srem(self, key, *members) -> int:
+        with self._lock:
+            current = self._get_entry(key)
+            if not isinstance(current, set):
+                return 0
+            before = len(current)
+            current.difference_update(_to_bytes(m) for m in members)
+            return before - len(current)
+
+    def smembers(self, key) -> Set[bytes]:
+        with self._lock:
+            current = self._get_entry(key)
+            return set(current) if isinstance(current, set) else set()
+
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._data.clear()
+            return True
+
+    def keys(self, pattern: str = "*") -> Iterable[bytes]:
+        """Seul le motif ``préfixe*`` est pris en charge"""
+        with self._lock:
+            prefix = _to_bytes(pattern.rstrip("*"))
+            return [
+                key
+                for key in list(self._data)
+                if key.startswith(prefix) and self._get_entry(key) is not None
+            ]
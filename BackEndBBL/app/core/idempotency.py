@@ -0,0 +1,227 @@
+"""
+Stockage des clés d'idempotence
+
+Une requête d'écriture portant un en-tête ``Idempotency-Key`` réserve sa clé
+(``claim``) avant d'être traitée, puis y enregistre sa réponse
+(``complete``) ou la libère (``release``) si elle a échoué. Une requête qui
+présente ensuite la même clé reçoit la réponse enregistrée au lieu d'être
+rejouée ; tant que la première est en cours, la clé est occupée.
+
+La clé vaut pour une requête (méthode, chemin et paramètres) : présentée
+avec une autre, elle est refusée. Une réservation expire après
+``lock_timeout`` secondes (requête perdue avec son worker), une réponse
+après ``ttl`` secondes.
+
+Deux implémentations de ``IdempotencyStore`` :
+- ``MemoryIdempotencyStore`` : propre au processus, nombre de clés borné
+- ``DatabaseIdempotencyStore`` : table ``idempotency_keys``, partagée entre
+  workers ; la réservation est un ``INSERT ... ON CONFLICT DO NOTHING``
+"""
+
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+
+from app.models.idempotency import IdempotencyKey
+
+# Résultats de ``claim``
+CLAIMED = "claimed"  # clé réservée : la requête doit être traitée
+REPLAY = "replay"  # réponse enregistrée à renvoyer
+IN_PROGRESS = "in_progress"  # requête en cours avec la même clé
+MISMATCH = "mismatch"  # clé déjà utilisée pour une autre requête
+
+
+class StoredResponse(NamedTuple):
+    """Réponse enregistrée : code, en-têtes (noms et valeurs latin-1), corps"""
+
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+
+class IdempotencyStore(ABC):
+    """Interface commune des stockages de clés"""
+
+    # Les appels font des entrées-sorties (à exécuter hors de la boucle)
+    blocking = False
+
+    def __init__(self, ttl: float = 86_400.0, lock_timeout: float = 30.0):
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+
+    @abstractmethod
+    def claim(self, key: str, fingerprint: str) -> Tuple[str, Optional[StoredResponse]]:
+        """Réserve la clé ; renvoie le résultat et, pour REPLAY, la réponse"""
+
+    @abstractmethod
+    def complete(self, key: str, response: StoredResponse) -> None:
+        """Enregistre la réponse de la requête qui a réservé la clé"""
+
+    @abstractmethod
+    def release(self, key: str) -> None:
+        """Libère une clé réservée : la requête pourra être traitée à nouveau"""
+
+    def clear(self) -> None:
+        """Oublie toutes les clés"""
+
+
+class _Entry(NamedTuple):
+    fingerprint: str
+    response: Optional[StoredResponse]
+    expires_at: float
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """Clés en mémoire ; au-delà de ``max_keys``, les plus anciennes oubliées"""
+
+    def __init__(
+        self, max_keys: int = 10_000, ttl: float = 86_400.0, lock_timeout: float = 30.0
+    ):
+        super().__init__(ttl=ttl, lock_timeout=lock_timeout)
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+
+    def claim(self, key: str, fingerprint: str) -> Tuple[str, Optional[StoredResponse]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                if entry.fingerprint != fingerprint:
+                    return MISMATCH, None
+                if entry.response is None:
+                    return IN_PROGRESS, None
+                return REPLAY, entry.response
+            self._entries[key] = _Entry(fingerprint, None, now + self.lock_timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+            return CLAIMED, None
+
+    def complete(self, key: str, response: StoredResponse) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = entry._replace(
+                    response=response, expires_at=time.monotonic() + self.ttl
+                )
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    """
+    Clés stockées dans la table ``idempotency_keys``, communes aux workers
+
+    Les échéances sont en horloge murale (workers supposés synchronisés). Les
+    lignes expirées sont supprimées lors des réservations, par l'index de
+    ``expires_at`` : la table reste bornée par le débit des écritures sur
+    ``ttl``, sans limite de nombre de clés.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        bind: Optional[Engine] = None,
+        ttl: float = 86_400.0,
+        lock_timeout: float = 30.0,
+    ):
+        super().__init__(ttl=ttl, lock_timeout=lock_timeout)
+        self._bind = bind
+
+    @property
+    def bind(self) -> Engine:
+        if self._bind is None:
+            from app.database import engine
+
+            self._bind = engine
+        return self._bind
+
+    def claim(self, key: str, fingerprint: str) -> Tuple[str, Optional[StoredResponse]]:
+        now = time.time()
+        with self.bind.begin() as connection:
+            connection.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now)
+            )
+            dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+            inserted = connection.execute(
+                dialect.insert(IdempotencyKey)
+                .values(
+                    key=key,
+                    fingerprint=fingerprint,
+                    expires_at=now + self.lock_timeout,
+                )
+                .on_conflict_do_nothing(index_elements=[IdempotencyKey.key])
+            )
+            if inserted.rowcount:
+                return CLAIMED, None
+            row = connection.execute(
+                select(
+                    IdempotencyKey.fingerprint,
+                    IdempotencyKey.status_code,
+                    IdempotencyKey.headers,
+                    IdempotencyKey.body,
+                ).where(IdempotencyKey.key == key)
+            ).one_or_none()
+        if row is None:
+            # Libérée entre-temps : nouvel essai
+            return self.claim(key, fingerprint)
+        if row.fingerprint != fingerprint:
+            return MISMATCH, None
+        if row.status_code is None:
+            return IN_PROGRESS, None
+        headers = [tuple(pair) for pair in json.loads(row.headers)]
+        return REPLAY, StoredResponse(row.status_code, headers, row.body)
+
+    def complete(self, key: str, response: StoredResponse) -> None:
+        with self.bind.begin() as connection:
+            connection.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(
+                    status_code=response.status_code,
+                    headers=json.dumps(response.headers),
+                    body=response.body,
+                    expires_at=time.time() + self.ttl,
+                )
+            )
+
+    def release(self, key: str) -> None:
+        with self.bind.begin() as connection:
+            connection.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None)
+                )
+            )
+
+    def clear(self) -> None:
+        with self.bind.begin() as connection:
+            connection.execute(delete(IdempotencyKey))
+
+
+def create_idempotency_store(settings) -> IdempotencyStore:
+    """Construit le stockage décrit par la configuration"""
+    if settings.idempotency_backend == "database":
+        return DatabaseIdempotencyStore(
+            ttl=settings.idempotency_ttl,
+            lock_timeout=settings.idempotency_lock_timeout,
+        )
+    return MemoryIdempotencyStore(
+        max_keys=settings.idempotency_max_keys,
+        ttl=settings.idempotency_ttl,
+        lock_timeout=settings.idempotency_lock_timeout,
+    )
@@ -0,0 +1,334 @@
+"""
+Métriques de performance au format Prometheus
+
+Compteurs, jauges et histogrammes thread-safe regroupés dans un registre
+rendu en texte par ``/metrics``. Les requêtes SQL sont chronométrées via les
+événements ``before_cursor_execute`` / ``after_cursor_execute`` de SQLAlchemy
+et attribuées à la requête HTTP en cours (``RequestStats`` dans une
+``ContextVar``).
+"""
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seuils par défaut des histogrammes de durée (secondes)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Seuils des histogrammes de nombre de requêtes SQL par requête HTTP
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    """Métrique nommée, déclinée par valeurs d'étiquettes"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """Lignes d'exposition : en-tête puis une ligne par étiquettes"""
+
+
+class Counter(Metric):
+    """Valeur croissante (total d'événements)"""
+
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(v)}"
+            for labels, v in items
+        ]
+
+
+class Gauge(Counter):
+    """Valeur instantanée, pouvant décroître"""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    """Distribution cumulée par seuils, avec somme et nombre d'observations"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # étiquettes -> (effectifs par seuil, somme, nombre)
+        self._series: Dict[Labels, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            counts, total, count = self._series.get(
+                labels, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._series[labels] = (counts, total + value, count + 1)
+
+    def snapshot(self, *labels: str) -> Tuple[float, int]:
+        """Somme et nombre d'observations d'une série"""
+        with self._lock:
+            _, total, count = self._series.get(labels, ([], 0.0, 0))
+            return total, count
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(
+                (labels, (list(counts), total, count))
+                for labels, (counts, total, count) in self._series.items()
+            )
+        lines = self.header()
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(self.label_names, labels, f'le="{bound:g}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(self.label_names, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {count}")
+            suffix = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ensemble des métriques exposées par ``/metrics``"""
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        # Fonctions appelées au rendu pour mettre à jour des jauges
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception:
+                logger.exception("Échec de la collecte de métriques")
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.register(
+    Counter(
+        "http_requests_total",
+        "Requêtes HTTP traitées",
+        ("method", "route", "status"),
+    )
+)
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Durée des requêtes HTTP",
+        ("method", "route"),
+    )
+)
+http_requests_in_flight = registry.register(
+    Gauge(
+        "http_requests_in_flight",
+        "Requêtes HTTP en cours de traitement",
+        ("method", "route"),
+    )
+)
+http_request_db_queries = registry.register(
+    Histogram(
+        "http_request_db_queries",
+        "Nombre de requêtes SQL par requête HTTP",
+        ("method", "route"),
+        buckets=COUNT_BUCKETS,
+    )
+)
+http_request_db_duration = registry.register(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Temps passé en SQL par requête HTTP",
+        ("method", "route"),
+    )
+)
+db_query_duration = registry.register(
+    Histogram("db_query_duration_seconds", "Durée des requêtes SQL")
+)
+db_slow_queries_total = registry.register(
+    Counter("db_slow_queries_total", "Requêtes SQL au-delà de SLOW_QUERY_MS")
+)
+http_requests_shed_total = registry.register(
+    Counter(
+        "http_requests_shed_total",
+        "Écritures refusées par le contrôle d'admission (503)",
+        ("reason",),
+    )
+)
+http_requests_replayed_total = registry.register(
+    Counter(
+        "http_requests_replayed_total",
+        "Écritures répétées (Idempotency-Key) servies par la réponse enregistrée",
+    )
+)
+
+
+class RequestStats:
+    """Requêtes SQL attribuées à une requête HTTP"""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Statistiques de la requête HTTP en cours (None hors requête)
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    elapsed = time.perf_counter() - started
+    db_query_duration.observe(elapsed)
+
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+    if elapsed * 1000 >= settings.slow_query_ms:
+        db_slow_queries_total.inc()
+        logger.warning("Requête SQL lente (%.1f ms) : %s", elapsed * 1000, statement)
+
+
+def _handle_error(exception_context):
+    # Requête en échec : after_cursor_execute ne sera pas appelé
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
+
+
+def install_sql_instrumentation() -> None:
+    """Chronomètre les requêtes de tous les moteurs (idempotent)"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+def pool_status(engine: Engine) -> Dict[str, float]:
+    """
+    Occupation du pool de connexions
+
+    ``saturation`` est la part des connexions possibles (taille + débordement)
+    actuellement empruntées ; absente pour les pools non bornés.
+    """
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    checked_out = getattr(pool, "checkedout", None)
+    if checked_out is None:
+        return status
+    status["checked_out"] = checked_out()
+    status["checked_in"] = pool.checkedin()
+    size = pool.size()
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    status["size"] = size
+    if max_overflow >= 0:
+        capacity = size + max_overflow
+        status["capacity"] = capacity
+        status["saturation"] = (
+            round(status["checked_out"] / capacity, 3) if capacity else 0
+        )
+    return status
+
+
+db_pool_connections = registry.register(
+    Gauge(
+        "db_pool_connections",
+        "Connexions du pool par état (checked_out, checked_in, capacity)",
+        ("state",),
+    )
+)
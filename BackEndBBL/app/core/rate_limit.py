@@ -0,0 +1,121 @@
+"""
+Limitation de débit par seau à jetons
+
+Chaque clé (client et route) dispose d'un seau de ``burst`` jetons, rempli à
+``rate`` jetons par seconde ; une requête consomme un jeton ou est refusée
+avec le délai d'attente avant le prochain.
+
+Le seau est tenu sous la forme GCRA (« generic cell rate algorithm ») : une
+seule valeur par clé, l'instant théorique ``tat`` où le seau serait plein.
+Une requête à l'instant ``now`` est admise si ``max(tat, now) + 1/rate - now``
+ne dépasse pas ``burst / rate`` ; ``tat`` avance alors de ``1/rate``.
+
+Deux implémentations de ``RateLimitStore`` :
+- ``MemoryRateLimitStore`` : propre au processus, nombre de clés borné
+- ``RedisRateLimitStore`` : partagée entre workers, via tout client compatible
+  redis-py (ou ``FakeRedis`` en local)
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+
+class RateLimitStore(ABC):
+    """Interface commune des stockages de seaux"""
+
+    @abstractmethod
+    def acquire(self, key: str, rate: float, burst: int) -> float:
+        """Consomme un jeton ; 0 si admis, sinon secondes avant le prochain jeton"""
+
+    def clear(self) -> None:
+        """Remplit tous les seaux"""
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Seaux en mémoire ; les clés inactives les plus anciennes sont oubliées"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # clé -> tat (horloge monotone)
+        self._buckets: "OrderedDict[str, float]" = OrderedDict()
+
+    def acquire(self, key: str, rate: float, burst: int) -> float:
+        interval = 1.0 / rate
+        now = time.monotonic()
+        with self._lock:
+            tat = max(self._buckets.get(key, now), now) + interval
+            wait = tat - now - burst * interval
+            if wait > 0:
+                return wait
+            self._buckets[key] = tat
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                # Une clé oubliée repart d'un seau plein
+                self._buckets.popitem(last=False)
+            return 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Seaux stockés dans Redis, communs à tous les workers
+
+    ``tat`` est une clé entière en microsecondes (horloge murale des workers,
+    supposées synchronisées). Chaque requête réserve son jeton par ``INCRBY``
+    atomique et le rend si elle est refusée : des requêtes concurrentes ne
+    peuvent pas consommer le même jeton. Seul le passage d'un seau plein à
+    ``now`` n'est pas atomique, ce qui peut admettre quelques requêtes de
+    plus qu'un seau plein lorsque le client revient après une pause.
+    """
+
+    def __init__(self, client, prefix: str = "bbl:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    def acquire(self, key: str, rate: float, burst: int) -> float:
+        key = f"{self.prefix}{key}"
+        interval = max(1, round(1_000_000 / rate))
+        now = int(time.time() * 1_000_000)
+        ttl = math.ceil(burst * interval / 1_000_000) + 1
+
+        tat = int(self.client.incrby(key, interval))
+        if tat - interval < now:
+            # Seau plein (ou clé nouvelle) : le décompte repart de maintenant
+            tat = now + interval
+            self.client.set(key, tat, ex=ttl)
+        wait = tat - now - burst * interval
+        if wait > 0:
+            self.client.incrby(key, -interval)
+            return wait / 1_000_000
+        self.client.expire(key, ttl)
+        return 0.0
+
+    def clear(self) -> None:
+        keys = list(self.client.keys(f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+def create_rate_limit_store(settings) -> Optional[RateLimitStore]:
+    """Construit le stockage décrit par la configuration (None : désactivé)"""
+    if not settings.rate_limit_enabled:
+        return None
+    if settings.rate_limit_backend == "redis":
+        if settings.redis_url:
+            import redis  # dépendance optionnelle
+
+            client = redis.Redis.from_url(settings.redis_url)
+        else:
+            from app.core.fake_redis import FakeRedis
+
+            client = FakeRedis()
+        return RedisRateLimitStore(client)
+    return MemoryRateLimitStore(max_keys=settings.rate_limit_max_keys)
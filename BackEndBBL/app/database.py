@@ -1,19 +1,99 @@
 """
 Configuration de la base de données
-Gestion de la connexion et des sessions SQLAlchemy
+Gestion de la connexion et des sessions SQLAlchemy (synchrones et asynchrones)
 """
-from sqlalchemy import create_engine
+import logging
+import time
+from typing import Callable, Optional, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# URL de connexion (SQLite par défaut, configurable via DATABASE_URL)
+DATABASE_URL = settings.database_url
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    parsed = make_url(url)
+    database = parsed.database or ""
+    return database in ("", ":memory:") or parsed.query.get("mode") == "memory"
+
+
+def engine_options(url: str, asynchronous: bool = False) -> dict:
+    """Options de create_engine : pool configuré et arguments du pilote"""
+    options = {}
+    if _is_sqlite(url) and not asynchronous:
+        options["connect_args"] = {"check_same_thread": False}  # Nécessaire pour SQLite
+    if not (_is_sqlite(url) and _is_sqlite_memory(url)):
+        # Une base en mémoire n'existe que dans sa connexion : pas de pool
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+    return options
+
+
+def apply_sqlite_pragmas(engine: Engine, read_only: bool = False) -> None:
+    """
+    Applique le profil PRAGMA à chaque nouvelle connexion SQLite
+
+    WAL permet aux lectures de se poursuivre pendant une écriture,
+    synchronous=NORMAL (sûr en WAL) évite un fsync par transaction, et
+    busy_timeout fait attendre les écritures concurrentes au lieu d'échouer.
+    """
+    pragmas = settings.sqlite_pragmas(read_only=read_only)
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+def create_db_engine(url: str, read_only: bool = False) -> Engine:
+    """Crée un moteur synchrone configuré par les paramètres de l'application"""
+    db_engine = create_engine(url, **engine_options(url))
+    if _is_sqlite(url):
+        apply_sqlite_pragmas(db_engine, read_only=read_only)
+    return db_engine
+
+
+def get_read_database_url() -> Optional[str]:
+    """
+    URL du pool en lecture seule
+
+    READ_DATABASE_URL si fournie ; sinon, pour un fichier SQLite, le même
+    fichier ouvert en lecture seule. None : les lectures utilisent ``engine``.
+    """
+    if settings.read_database_url:
+        return settings.read_database_url
+    if _is_sqlite(DATABASE_URL) and not _is_sqlite_memory(DATABASE_URL):
+        return f"sqlite:///file:{make_url(DATABASE_URL).database}?mode=ro&uri=true"
+    return None
 
-# URL de connexion SQLite (pour la simplicité)
-DATABASE_URL = "sqlite:///./blog.db"
 
 # Création du moteur de base de données
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # Nécessaire pour SQLite
-)
+engine = create_db_engine(DATABASE_URL)
 
 # Session locale pour les opérations de base de données
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -21,13 +101,196 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Classe de base pour les modèles
 Base = declarative_base()
 
-def get_db():
+# Session synchrone ou asynchrone selon le mode configuré
+AnySession = Union[Session, AsyncSession]
+
+# Moteur en lecture seule créé à la demande (le fichier SQLite doit exister)
+_read_engine = None
+_read_session_factory = None
+
+
+def get_read_engine() -> Engine:
+    """Retourne le moteur en lecture seule, créé au premier appel"""
+    global _read_engine, _read_session_factory
+    if _read_engine is None:
+        url = get_read_database_url()
+        _read_engine = create_db_engine(url, read_only=True) if url else engine
+        _read_session_factory = sessionmaker(
+            autocommit=False, autoflush=False, bind=_read_engine
+        )
+    return _read_engine
+
+
+def ReadSessionLocal() -> Session:
+    """Crée une session sur le pool en lecture seule"""
+    get_read_engine()
+    return _read_session_factory()
+
+
+# Méthodes HTTP servies par le pool en lecture seule
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+# Méthodes sans effet sur les données (dont les requêtes CORS préalables)
+SAFE_METHODS = READ_METHODS | {"OPTIONS", "TRACE"}
+
+
+class SessionRouter:
+    """
+    Choix de la session d'une requête : réplica pour les lectures, primaire sinon
+
+    Une requête lit sur le réplica si sa méthode ne modifie rien et si le
+    client n'a pas écrit récemment (``request.state.read_primary``, posé par
+    ReadYourWritesMiddleware) : il relit alors ses propres écritures même si
+    le réplica est en retard.
+
+    La connexion au réplica est ouverte dès la création de la session ; en
+    cas d'échec, les lectures passent par le primaire pendant
+    ``retry_interval`` secondes avant une nouvelle tentative.
+    """
+
+    def __init__(
+        self,
+        primary: Callable[[], Session],
+        replica: Optional[Callable[[], Session]] = None,
+        retry_interval: float = 30.0,
+    ):
+        self.primary = primary
+        self.replica = replica
+        self.retry_interval = retry_interval
+        self._replica_down_until = 0.0
+
+    @property
+    def replica_available(self) -> bool:
+        """Faux pendant le délai qui suit un échec de connexion au réplica"""
+        return self.replica is not None and time.monotonic() >= self._replica_down_until
+
+    def session(self, read_only: bool = False) -> Session:
+        """Session sur le réplica (lecture, s'il répond) ou sur le primaire"""
+        if read_only and self.replica_available:
+            db = self.replica()
+            try:
+                db.connection()
+                return db
+            except DBAPIError:
+                db.close()
+                self._replica_down_until = time.monotonic() + self.retry_interval
+                logger.warning(
+                    "Réplica injoignable : lectures sur le primaire pendant %.0f s",
+                    self.retry_interval,
+                    exc_info=True,
+                )
+        return self.primary()
+
+    def for_request(self, request: Request) -> Session:
+        """Session adaptée à la méthode de la requête et aux écritures du client"""
+        read_only = request.method in READ_METHODS and not getattr(
+            request.state, "read_primary", False
+        )
+        return self.session(read_only=read_only)
+
+
+# Moteur asynchrone créé à la demande : le pilote (aiosqlite, asyncpg) n'est
+# importé que si le mode asynchrone est utilisé
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_engine():
+    """Retourne le moteur asynchrone, créé au premier appel"""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = settings.get_async_database_url()
+        _async_engine = create_async_engine(url, **engine_options(url, asynchronous=True))
+        if _is_sqlite(url):
+            apply_sqlite_pragmas(_async_engine.sync_engine)
+        _async_session_factory = async_sessionmaker(
+            bind=_async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Crée une session asynchrone sur le moteur asynchrone"""
+    get_async_engine()
+    return _async_session_factory()
+
+
+async def dispose_async_engine():
+    """Ferme les connexions du moteur asynchrone s'il a été créé"""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
+# Routage des sessions synchrones (READ_ROUTING) : sans lui, tout va au primaire
+session_router = SessionRouter(
+    SessionLocal,
+    ReadSessionLocal if settings.read_routing else None,
+    retry_interval=settings.replica_retry_interval,
+)
+
+
+def get_db(request: Request):
     """
     Générateur de session de base de données
-    Utilisé comme dépendance FastAPI pour injecter la session
+    Utilisé comme dépendance FastAPI pour injecter la session : sur le pool en
+    lecture seule pour les lectures, sur le primaire pour les écritures
     """
-    db = SessionLocal()
+    db = session_router.for_request(request)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_read_db():
+    """
+    Générateur de session en lecture seule
+    Dépendance FastAPI pour les routes qui ne font que lire
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """
+    Générateur de session asynchrone
+    Dépendance FastAPI utilisée en mode DB_MODE=async
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Dépendance injectée dans les routes, choisie par la configuration
+get_session = get_async_db if settings.db_mode == "async" else get_db
+
+
+async def run_in_session(db: AnySession, fn, *args, **kwargs):
+    """
+    Exécute une fonction de service synchrone sans bloquer la boucle d'événements
+
+    - AsyncSession : ``run_sync`` exécute ``fn`` sur la session synchrone sous-jacente,
+      les entrées/sorties passant par le pilote asynchrone
+    - Session : ``fn`` est exécutée dans le pool de threads de Starlette
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def close_session(db: AnySession) -> None:
+    """
+    Termine la transaction d'une session et rend sa connexion au pool
+
+    Pour les réponses longues (flux d'événements) : la session injectée reste
+    ouverte jusqu'à la fin de la réponse, sa connexion n'y est plus retenue.
+    """
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        await run_in_threadpool(db.close)
@@ -0,0 +1,73 @@
+"""
+Commande d'inspection de la file de travaux différés
+
+Usage (depuis BackEndBBL/) :
+    python -m app.jobs status
+    python -m app.jobs failed [--limit N]
+    python -m app.jobs drain [--limit N]
+    python -m app.jobs retry
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import select
+
+from app.database import engine
+from app.models.job import Job
+from app.services.jobs import FAILED, job_runner, queue_stats, retry_failed
+
+# Déclare aussi les types de travaux de l'application
+from app.services.post_write import deferred
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.jobs", description="File de travaux différés"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="travaux par type et statut")
+    failed_parser = commands.add_parser("failed", help="lister les travaux abandonnés")
+    failed_parser.add_argument("--limit", type=int, default=20)
+    drain_parser = commands.add_parser("drain", help="exécuter les travaux dus")
+    drain_parser.add_argument("--limit", type=int, help="nombre maximal de travaux")
+    commands.add_parser("retry", help="relancer les travaux abandonnés")
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        with engine.connect() as connection:
+            stats = queue_stats(connection)
+        now = time.time()
+        print(f"POST_WRITE_MODE={'deferred' if deferred() else 'inline'}")
+        for row in stats:
+            late = max(0.0, now - row["oldest_run_at"])
+            print(
+                f"{row['kind']:<20} {row['status']:<8} {row['count']:>8} "
+                f"(plus ancien dû depuis {late:.1f} s)"
+            )
+        print(f"{sum(row['count'] for row in stats)} travail(aux) en file")
+    elif args.command == "failed":
+        with engine.connect() as connection:
+            rows = connection.execute(
+                select(Job.kind, Job.key, Job.attempts, Job.last_error)
+                .where(Job.status == FAILED)
+                .order_by(Job.run_at)
+                .limit(args.limit)
+            ).all()
+        for row in rows:
+            print(f"{row.kind}[{row.key}] après {row.attempts} essai(s) :")
+            print(f"    {row.last_error}")
+    elif args.command == "drain":
+        started = time.perf_counter()
+        done = job_runner.drain(engine, limit=args.limit)
+        elapsed = time.perf_counter() - started
+        print(f"{done} travail(aux) exécuté(s) en {elapsed:.2f} s")
+    else:
+        with engine.begin() as connection:
+            print(f"{retry_failed(connection)} travail(aux) relancé(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,17 +3,90 @@ Application principale FastAPI
 Point d'entrée de l'API du blog
 """
 
+import asyncio
+import contextlib
+import logging
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import articles, comments
+from app.api.endpoints import articles, authors, comments
 from app.api.endpoints.articles import router as articles_router
 from app.api.endpoints.comments import router as comments_router
-from app.database import engine, Base
+from app.core.config import settings
+from app.core.coordination import coordination
+from app.core.metrics import (
+    db_pool_connections,
+    install_sql_instrumentation,
+    pool_status,
+    registry,
+)
+from app.database import engine, dispose_async_engine
+from app.migrations import check_schema, upgrade
+from app.services.article_cache import article_cache
+from app.services.article_purge import article_purger
+from app.middleware import (
+    AdmissionMiddleware,
+    CompressionMiddleware,
+    IdempotencyMiddleware,
+    MetricsMiddleware,
+    ReadYourWritesMiddleware,
+)
+from app.services.comment_like_service import comment_like_buffer
+from app.services.jobs import job_runner
+from app.services.like_service import like_buffer
+from app.services.trending import trending
+
+logger = logging.getLogger(__name__)
+
+install_sql_instrumentation()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Cycle de vie de l'application
+
+    Vérifie que le schéma est à jour (sans le modifier, sauf si
+    MIGRATE_ON_STARTUP est activé), commence à recevoir les messages des
+    autres workers et démarre l'écriture périodique des likes (articles et
+    commentaires), la mise à jour du classement tendance, la purge des
+    articles supprimés et l'exécution des travaux différés ; à l'arrêt,
+    écrit les likes restants et l'instantané du classement, puis libère les
+    connexions du moteur asynchrone. Les travaux différés restent dans leur
+    table jusqu'au prochain démarrage. Les autres ressources (moteurs
+    asynchrone et en lecture seule, détection de FTS5) sont créées à la
+    première utilisation.
+    """
+    if settings.migrate_on_startup:
+        await run_in_threadpool(upgrade, engine)
+    else:
+        await run_in_threadpool(check_schema, engine)
+    coordination.start()
+    like_flusher = asyncio.create_task(like_buffer.run_periodic())
+    comment_like_flusher = asyncio.create_task(comment_like_buffer.run_periodic())
+    trending_refresher = asyncio.create_task(trending.run_periodic())
+    purger = asyncio.create_task(article_purger.run_periodic())
+    jobs = asyncio.create_task(job_runner.run_periodic())
+    yield
+    tasks = (like_flusher, comment_like_flusher, trending_refresher, purger, jobs)
+    for task in tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await run_in_threadpool(like_buffer.flush)
+    await run_in_threadpool(comment_like_buffer.flush)
+    await run_in_threadpool(trending.close)
+    await run_in_threadpool(coordination.close)
+    await dispose_async_engine()
 
-# Création des tables dans la base de données
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
+    lifespan=lifespan,
     title="Blog API",
     description="API REST pour application de blog avec protection par mot de passe et commentaires",
     version="2.0.0",
@@ -28,9 +101,17 @@ app = FastAPI(
             "name": "comments",
             "description": "Système de commentaires pour les articles",
         },
+        {
+            "name": "authors",
+            "description": "Auteurs, leurs statistiques et leurs articles",
+        },
     ],
 )
 
+# Écritures répétées avec la même Idempotency-Key : une seule est traitée
+if settings.idempotency_enabled:
+    app.add_middleware(IdempotencyMiddleware, max_body=settings.idempotency_max_body)
+
 # Configuration CORS - IMPORTANT pour permettre les requêtes depuis le frontend
 app.add_middleware(
     CORSMiddleware,
@@ -46,9 +127,33 @@ app.add_middleware(
     allow_headers=["*"],  # Permet tous les headers
 )
 
+# Lectures sur le primaire juste après une écriture du même client
+if settings.read_routing:
+    app.add_middleware(
+        ReadYourWritesMiddleware, window=settings.read_your_writes_window
+    )
+
+# Compression négociée (Accept-Encoding) des réponses textuelles
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+
+# Écritures refusées (503) quand le worker sature, avant tout traitement
+if settings.admission_max_writes or settings.admission_read_p99_ms:
+    app.add_middleware(
+        AdmissionMiddleware,
+        max_writes=settings.admission_max_writes,
+        read_p99_ms=settings.admission_read_p99_ms,
+        window=settings.admission_window,
+        retry_after=settings.admission_retry_after,
+    )
+
+# Mesures par route (durée, requêtes en cours, requêtes SQL)
+app.add_middleware(MetricsMiddleware)
+
 # Inclusion des routeurs
 app.include_router(articles.router, prefix="/api/articles", tags=["articles"])
 app.include_router(comments.router, prefix="/api/comments", tags=["comments"])
+app.include_router(authors.router, prefix="/api/authors", tags=["authors"])
 
 
 @app.get("/", tags=["root"])
@@ -68,7 +173,59 @@ async def root():
     }
 
 
+def _ping_database() -> float:
+    """Emprunte une connexion au pool et exécute ``SELECT 1`` ; durée en ms"""
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return (time.perf_counter() - started) * 1000
+
+
 @app.get("/health", tags=["root"])
 async def health_check():
-    """Endpoint de vérification de santé"""
-    return {"status": "healthy", "version": "2.0.0", "database": "connected"}
+    """Endpoint de vérification de santé : ping de la base et état du pool"""
+    try:
+        latency_ms = await run_in_threadpool(_ping_database)
+    except Exception:
+        # Le détail (URL, chemins) reste dans les journaux
+        logger.exception("Base de données injoignable")
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "unhealthy",
+                "version": "2.0.0",
+                "database": "unreachable",
+                "pool": pool_status(engine),
+            },
+        )
+    return {
+        "status": "healthy",
+        "version": "2.0.0",
+        "database": "connected",
+        "database_latency_ms": round(latency_ms, 2),
+        "pool": pool_status(engine),
+    }
+
+
+def _collect_pool_metrics() -> None:
+    status = pool_status(engine)
+    for state in ("checked_out", "checked_in", "capacity"):
+        if state in status:
+            db_pool_connections.set(state, value=status[state])
+
+
+registry.add_collector(_collect_pool_metrics)
+
+
+@app.get("/metrics", tags=["root"], response_class=PlainTextResponse)
+async def metrics():
+    """Métriques au format d'exposition texte de Prometheus"""
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/cache/stats", tags=["root"])
+async def cache_stats():
+    """Compteurs du cache des lectures d'articles"""
+    return article_cache.stats()
@@ -0,0 +1,17 @@
+"""
+Middlewares ASGI de l'application
+"""
+
+from .admission import AdmissionMiddleware
+from .compression import CompressionMiddleware
+from .idempotency import IdempotencyMiddleware
+from .metrics import MetricsMiddleware
+from .read_your_writes import ReadYourWritesMiddleware
+
+__all__ = [
+    "AdmissionMiddleware",
+    "CompressionMiddleware",
+    "IdempotencyMiddleware",
+    "MetricsMiddleware",
+    "ReadYourWritesMiddleware",
+]
@@ -0,0 +1,111 @@
+"""
+Contrôle d'admission des écritures
+
+SQLite n'a qu'un écrivain : une rafale d'écritures s'accumule derrière son
+verrou et dans le pool de threads, et les lectures attendent avec elles. Le
+middleware refuse une écriture (méthode autre que GET, HEAD, OPTIONS et
+TRACE) par un 503 avec ``Retry-After`` avant qu'elle n'atteigne l'application
+lorsque :
+
+- ``max_writes`` écritures sont déjà en cours dans le worker ;
+- le p99 du temps de réponse des lectures (jusqu'au premier octet, pour ne
+  pas compter la durée des flux) sur les ``window`` dernières secondes
+  dépasse ``read_p99_ms``.
+
+Les lectures ne sont jamais refusées : ce sont elles qu'il protège. La
+limitation par client (429) est assurée par ``app.api.rate_limit``.
+"""
+
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import http_requests_shed_total
+from app.database import SAFE_METHODS
+
+
+class AdmissionMiddleware:
+    """Middleware ASGI pur : compatible avec les réponses en flux"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_writes: int = 0,
+        read_p99_ms: float = 0.0,
+        window: float = 10.0,
+        retry_after: int = 1,
+        refresh_interval: float = 0.25,
+    ):
+        self.app = app
+        self.max_writes = max_writes
+        self.read_p99_ms = read_p99_ms
+        self.window = window
+        self.retry_after = retry_after
+        self.refresh_interval = refresh_interval
+        # Écritures en cours dans ce worker
+        self.writes = 0
+        # (début, durée en ms) des lectures récentes
+        self._reads: Deque[Tuple[float, float]] = deque(maxlen=4096)
+        self._p99 = 0.0
+        self._p99_at = float("-inf")
+
+    def read_p99(self, now: float) -> float:
+        """p99 des lectures de la fenêtre (recalculé tous les refresh_interval)"""
+        if now - self._p99_at >= self.refresh_interval:
+            horizon = now - self.window
+            while self._reads and self._reads[0][0] < horizon:
+                self._reads.popleft()
+            durations = sorted(duration for _, duration in self._reads)
+            self._p99 = (
+                durations[int(0.99 * (len(durations) - 1))] if durations else 0.0
+            )
+            self._p99_at = now
+        return self._p99
+
+    def shed_reason(self, now: float) -> Optional[str]:
+        """Motif du refus d'une écriture, None si elle est admise"""
+        if self.max_writes and self.writes >= self.max_writes:
+            return "writes"
+        if self.read_p99_ms and self.read_p99(now) > self.read_p99_ms:
+            return "read_latency"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in SAFE_METHODS:
+            if not self.read_p99_ms:
+                await self.app(scope, receive, send)
+                return
+            started = time.perf_counter()
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    elapsed = (time.perf_counter() - started) * 1000
+                    self._reads.append((started, elapsed))
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+            return
+
+        reason = self.shed_reason(time.perf_counter())
+        if reason is not None:
+            http_requests_shed_total.inc(reason)
+            response = JSONResponse(
+                {"detail": "Serveur surchargé, réessayez plus tard"},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.writes += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.writes -= 1
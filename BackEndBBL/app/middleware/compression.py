@@ -0,0 +1,292 @@
+"""
+Middleware de compression des réponses
+
+Négocie l'encodage avec ``Accept-Encoding`` (valeurs ``q`` comprises) parmi
+les encodages disponibles, dans l'ordre de préférence du serveur : ``zstd``
+et ``br`` si les paquets ``zstandard`` et ``brotli`` sont installés, ``gzip``
+toujours. Ne sont pas compressés : les réponses sans corps (204, 304), les
+corps déjà encodés, les types non textuels ou en flux d'événements et les
+corps plus petits que ``COMPRESSION_MIN_SIZE``.
+
+Les corps envoyés en plusieurs morceaux sont compressés au fil de l'eau. Les
+réponses versionnées (avec un ETag) sont conservées compressées : un article
+ou une page inchangés ne sont compressés qu'une fois par encodage. L'ETag
+d'une réponse compressée devient faible (``W/``) : la représentation diffère
+de l'originale, mais la comparaison faible des requêtes conditionnelles
+reste valable.
+"""
+
+import zlib
+from typing import Dict, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+try:
+    import brotli  # dépendance optionnelle
+except ImportError:  # pragma: no cover - encodage br indisponible
+    brotli = None
+
+try:
+    import zstandard  # dépendance optionnelle
+except ImportError:  # pragma: no cover - encodage zstd indisponible
+    zstandard = None
+
+# Ordre de préférence du serveur à poids ``q`` égal
+PREFERENCE = ("zstd", "br", "gzip")
+
+# Types de contenu compressés (en plus de ``text/*`` et des suffixes
+# ``+json`` / ``+xml``) ; les flux d'événements doivent partir sans tampon
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+}
+UNCOMPRESSIBLE_TYPES = {"text/event-stream"}
+
+
+class _BrotliCompressor:
+    """Compresseur brotli avec l'interface de ``zlib.compressobj``"""
+
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def _gzip(level: int):
+    # wbits=31 : en-tête et somme de contrôle gzip, date de modification nulle
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def _zstd(level: int):
+    return zstandard.ZstdCompressor(level=level).compressobj()
+
+
+# Encodage -> fabrique de compresseurs (``compress`` puis ``flush`` final)
+CODECS = {"gzip": _gzip}
+if brotli is not None:
+    CODECS["br"] = _BrotliCompressor
+if zstandard is not None:
+    CODECS["zstd"] = _zstd
+
+
+def default_levels() -> Dict[str, int]:
+    """Niveaux de compression configurés, par encodage"""
+    return {
+        "gzip": settings.compression_gzip_level,
+        "br": settings.compression_brotli_level,
+        "zstd": settings.compression_zstd_level,
+    }
+
+
+def compress(body: bytes, coding: str, level: int) -> bytes:
+    """Compresse un corps complet"""
+    compressor = CODECS[coding](level)
+    return compressor.compress(body) + compressor.flush()
+
+
+def negotiate(accept_encoding: str, codings: Sequence[str]) -> Optional[str]:
+    """
+    Encodage retenu pour une requête
+
+    Args:
+        accept_encoding: valeur de l'en-tête ``Accept-Encoding``
+        codings: encodages disponibles, par ordre de préférence du serveur
+
+    Returns:
+        L'encodage de plus fort poids accepté par le client, ou None
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+
+    default = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for coding in codings:
+        weight = weights.get(coding, default)
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """Indique si un type de contenu gagne à être compressé"""
+    if not content_type:
+        return False
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in UNCOMPRESSIBLE_TYPES:
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+# Réponses compressées, par encodage, niveau, ETag et taille du corps
+compressed_responses = LRUCache(
+    max_entries=settings.compression_cache_entries, ttl=settings.compression_cache_ttl
+)
+
+
+class CompressionMiddleware:
+    """Middleware ASGI pur : compatible avec les réponses en flux"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        levels: Optional[Dict[str, int]] = None,
+        codings: Optional[Sequence[str]] = None,
+        cache: Optional[LRUCache] = None,
+    ):
+        self.app = app
+        self.minimum_size = (
+            settings.compression_min_size if minimum_size is None else minimum_size
+        )
+        self.levels = {**default_levels(), **(levels or {})}
+        self.codings = tuple(
+            coding for coding in (codings or PREFERENCE) if coding in CODECS
+        )
+        self.cache = compressed_responses if cache is None else cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate(
+            Headers(scope=scope).get("accept-encoding", ""), self.codings
+        )
+        responder = _CompressedResponder(self, coding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressedResponder:
+    """Réécrit les messages d'une réponse selon l'encodage négocié"""
+
+    def __init__(self, middleware: CompressionMiddleware, coding, send: Send):
+        self.middleware = middleware
+        self.coding = coding
+        self.level = middleware.levels.get(coding)
+        self._send = send
+        self.start: Optional[Message] = None
+        # None (en attente du premier morceau), "identity", "stream" ou "sent"
+        # (corps compressé déjà envoyé en entier)
+        self.mode: Optional[str] = None
+        self.compressor = None
+        self.cache_key: Optional[str] = None
+        self.parts = []
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Envoyé avec le premier morceau du corps, une fois l'encodage choisi
+            self.start = message
+        elif message["type"] != "http.response.body":
+            await self._send(message)
+        elif self.mode is None:
+            await self._first_body(message)
+        elif self.mode == "identity":
+            await self._send(message)
+        elif self.mode == "stream":
+            await self._stream_body(message)
+
+    async def _first_body(self, message: Message) -> None:
+        headers = MutableHeaders(raw=self.start["headers"])
+        status = self.start["status"]
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        eligible = (
+            200 <= status < 300
+            and status != 204
+            and "content-encoding" not in headers
+            and is_compressible(headers.get("content-type"))
+        )
+        if eligible:
+            headers.add_vary_header("Accept-Encoding")
+        length = headers.get("content-length")
+        total = int(length) if length else None
+        if total is None and not more_body:
+            total = len(body)
+        if (
+            not eligible
+            or self.coding is None
+            or (total is not None and total < self.middleware.minimum_size)
+        ):
+            self.mode = "identity"
+            await self._send(self.start)
+            await self._send(message)
+            return
+
+        etag = headers.get("etag")
+        if (
+            etag is not None
+            and total is not None
+            and total <= settings.compression_cache_max_size
+        ):
+            self.cache_key = f"{self.coding}:{self.level}:{etag}:{total}"
+        headers["Content-Encoding"] = self.coding
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+        cached = None
+        if self.cache_key is not None:
+            cached = self.middleware.cache.get(self.cache_key)
+        if cached is not None:
+            self.mode = "sent"
+            headers["Content-Length"] = str(len(cached))
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": cached})
+        elif not more_body:
+            self.mode = "sent"
+            compressed = compress(body, self.coding, self.level)
+            self._store(compressed)
+            headers["Content-Length"] = str(len(compressed))
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": compressed})
+        else:
+            self.mode = "stream"
+            self.compressor = CODECS[self.coding](self.level)
+            del headers["Content-Length"]
+            await self._send(self.start)
+            await self._stream_body(message)
+
+    async def _stream_body(self, message: Message) -> None:
+        """Compresse un morceau ; le dernier vide le compresseur"""
+        more_body = message.get("more_body", False)
+        chunk = self.compressor.compress(message.get("body", b""))
+        if not more_body:
+            chunk += self.compressor.flush()
+        if self.cache_key is not None:
+            self.parts.append(chunk)
+            if not more_body:
+                self._store(b"".join(self.parts))
+        if chunk or not more_body:
+            await self._send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
+            )
+
+    def _store(self, compressed: bytes) -> None:
+        if self.cache_key is not None:
+            self.middleware.cache.set(self.cache_key, compressed)
@@ -0,0 +1,274 @@
+"""
+Middleware d'idempotence des écritures (en-tête ``Idempotency-Key``)
+
+Un client qui répète une écriture (méthode autre que GET, HEAD, OPTIONS et
+TRACE) après une coupure ou un délai dépassé y joint la même
+``Idempotency-Key`` : seule la première atteint l'application, les suivantes
+reçoivent sa réponse avec l'en-tête ``Idempotent-Replayed: true`` (voir
+``app.core.idempotency``).
+
+Une clé appartient au client qui l'envoie (son adresse) : deux clients qui
+choisissent la même ne partagent pas leurs réponses. Elle est liée à sa
+requête (méthode, chemin, paramètres et empreinte SHA-256 du corps) : réutilisée
+pour une autre, elle est refusée (422). Le corps est lu avant la requête
+pour en calculer l'empreinte, puis transmis à l'application ; au-delà de
+``max_body`` octets, la requête est refusée (413).
+
+Les doublons concurrents sont dédupliqués avant le stockage : dans un worker,
+une seule requête par clé interroge le stockage à la fois, les autres
+attendent qu'elle se termine puis lisent la réponse enregistrée. Une clé
+réservée par un autre worker est interrogée à intervalles réguliers ; au-delà
+de ``wait_timeout`` (par défaut ``lock_timeout`` du stockage), la requête
+reçoit 409 avec ``Retry-After``.
+
+Une réponse n'est enregistrée que si elle décrit le résultat de la requête :
+les erreurs du serveur et les refus temporaires (408, 409, 429), ainsi que
+les corps de plus de ``max_body`` octets, libèrent la clé et la requête
+pourra être traitée à nouveau. Les requêtes sans clé ne sont pas concernées.
+"""
+
+import asyncio
+import hashlib
+import time
+from typing import Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.idempotency import (
+    CLAIMED,
+    IN_PROGRESS,
+    MISMATCH,
+    IdempotencyStore,
+    StoredResponse,
+    create_idempotency_store,
+)
+from app.core.metrics import http_requests_replayed_total
+from app.database import SAFE_METHODS
+
+HEADER = "idempotency-key"
+MAX_KEY_LENGTH = 255
+# Réponses qui ne disent rien du résultat de la requête : non enregistrées
+TRANSIENT_STATUSES = frozenset({408, 409, 429})
+
+# Clés et réponses enregistrées (IDEMPOTENCY_BACKEND)
+idempotency_store = create_idempotency_store(settings)
+
+
+class IdempotencyMiddleware:
+    """Middleware ASGI pur : compatible avec les réponses en flux"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: Optional[IdempotencyStore] = None,
+        max_body: int = 1_048_576,
+        poll_interval: float = 0.05,
+        retry_after: int = 1,
+        wait_timeout: Optional[float] = None,
+    ):
+        self.app = app
+        self.store = store if store is not None else idempotency_store
+        self.max_body = max_body
+        self.poll_interval = poll_interval
+        # Attente maximale d'une clé réservée ailleurs (lock_timeout si None)
+        self.wait_timeout = wait_timeout
+        self.retry_after = retry_after
+        # Clé -> fin de la requête de ce worker qui la traite
+        self._inflight: Dict[str, asyncio.Event] = {}
+
+    async def _call(self, method, *args):
+        if self.store.blocking:
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        key = Headers(scope=scope).get(HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await self._error(
+                scope, receive, send, 400, "En-tête Idempotency-Key invalide"
+            )
+            return
+
+        body = await self._read_body(receive)
+        if body is None:
+            await self._error(
+                scope, receive, send, 413, "Corps trop volumineux pour Idempotency-Key"
+            )
+            return
+        receive = _replay_body(body, receive)
+        key = _client_key(scope, key)
+        fingerprint = f"{scope['method']} {scope['path']}"
+        if scope.get("query_string"):
+            fingerprint += "?" + scope["query_string"].decode("latin-1")
+        fingerprint += " " + hashlib.sha256(body).hexdigest()
+        wait_timeout = self.wait_timeout
+        if wait_timeout is None:
+            wait_timeout = self.store.lock_timeout
+        deadline = time.monotonic() + wait_timeout
+
+        # Une seule requête par clé et par worker interroge le stockage
+        while key in self._inflight:
+            remaining = deadline - time.monotonic()
+            try:
+                await asyncio.wait_for(self._inflight[key].wait(), remaining)
+            except asyncio.TimeoutError:
+                await self._busy(scope, receive, send)
+                return
+        done = self._inflight[key] = asyncio.Event()
+        try:
+            await self._handle(scope, receive, send, key, fingerprint, deadline)
+        finally:
+            del self._inflight[key]
+            done.set()
+
+    async def _read_body(self, receive: Receive) -> Optional[bytes]:
+        """Corps complet de la requête, ou None au-delà de ``max_body`` octets"""
+        chunks: List[bytes] = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                # Client déconnecté : l'application le constatera à son tour
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    async def _handle(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        key: str,
+        fingerprint: str,
+        deadline: float,
+    ) -> None:
+        while True:
+            outcome, stored = await self._call(self.store.claim, key, fingerprint)
+            if outcome != IN_PROGRESS:
+                break
+            # Requête en cours dans un autre worker
+            if time.monotonic() + self.poll_interval > deadline:
+                await self._busy(scope, receive, send)
+                return
+            await asyncio.sleep(self.poll_interval)
+
+        if outcome == MISMATCH:
+            await self._error(
+                scope,
+                receive,
+                send,
+                422,
+                "Idempotency-Key déjà utilisée pour une autre requête",
+            )
+        elif outcome == CLAIMED:
+            await self._forward(scope, receive, send, key)
+        else:
+            http_requests_replayed_total.inc()
+            await self._replay(stored, send)
+
+    async def _forward(self, scope: Scope, receive: Receive, send: Send, key: str):
+        """Traite la requête en conservant sa réponse pour les suivantes"""
+        status_code = 0
+        headers: List[Tuple[str, str]] = []
+        chunks: List[bytes] = []
+        size = 0
+        complete = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, size, complete
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers.extend(
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                )
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                size += len(body)
+                if size <= self.max_body:
+                    chunks.append(body)
+                complete = not message.get("more_body", False)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            await self._call(self.store.release, key)
+            raise
+        if (
+            complete
+            and status_code < 500
+            and status_code not in TRANSIENT_STATUSES
+            and size <= self.max_body
+        ):
+            response = StoredResponse(status_code, headers, b"".join(chunks))
+            await self._call(self.store.complete, key, response)
+        else:
+            await self._call(self.store.release, key)
+
+    @staticmethod
+    async def _replay(stored: StoredResponse, send: Send) -> None:
+        headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in stored.headers
+        ]
+        headers.append((b"idempotent-replayed", b"true"))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": stored.status_code,
+                "headers": headers,
+            }
+        )
+        await send({"type": "http.response.body", "body": stored.body})
+
+    async def _busy(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            {"detail": "Requête avec la même Idempotency-Key en cours"},
+            status_code=409,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+        await response(scope, receive, send)
+
+    @staticmethod
+    async def _error(
+        scope: Scope, receive: Receive, send: Send, status_code: int, detail: str
+    ) -> None:
+        response = JSONResponse({"detail": detail}, status_code=status_code)
+        await response(scope, receive, send)
+
+
+def _client_key(scope: Scope, key: str) -> str:
+    """Clé de stockage propre au client (longueur fixe, quelle que soit l'adresse)"""
+    client = scope["client"][0] if scope.get("client") else "unknown"
+    return hashlib.sha256(f"{client}\n{key}".encode()).hexdigest()
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    """``receive`` qui rend d'abord le corps déjà lu, en un seul message"""
+    pending = True
+
+    async def replay() -> Message:
+        nonlocal pending
+        if pending:
+            pending = False
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
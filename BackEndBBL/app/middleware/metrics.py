@@ -0,0 +1,73 @@
+"""
+Middleware de mesure des requêtes HTTP
+
+Enregistre pour chaque route (gabarit de chemin, ex. ``/api/articles/{article_id}``)
+la durée, le nombre de requêtes en cours, le code de réponse ainsi que le
+nombre de requêtes SQL et le temps SQL attribués à la requête.
+"""
+
+import time
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    RequestStats,
+    current_request_stats,
+    http_request_db_duration,
+    http_request_db_queries,
+    http_request_duration,
+    http_requests_in_flight,
+    http_requests_total,
+)
+
+# Étiquette des requêtes sans route : le chemin brut ferait exploser le
+# nombre de séries
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI pur : compatible avec les réponses en flux"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def route_template(self, scope: Scope) -> str:
+        """Gabarit de la route qui traitera la requête"""
+        application = scope.get("app")
+        router = getattr(application, "router", None)
+        for route in getattr(router, "routes", ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", UNMATCHED_ROUTE)
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self.route_template(scope)
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        http_requests_in_flight.inc(method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request_stats.reset(token)
+            http_requests_in_flight.dec(method, route)
+            http_requests_total.inc(method, route, status)
+            http_request_duration.observe(elapsed, method, route)
+            http_request_db_queries.observe(stats.queries, method, route)
+            http_request_db_duration.observe(stats.db_seconds, method, route)
@@ -0,0 +1,66 @@
+"""
+Middleware de lecture de ses propres écritures (routage vers le réplica)
+
+Une requête d'écriture réussie (méthode autre que GET, HEAD, OPTIONS et
+TRACE, code < 400) pose un cookie contenant l'échéance de la fenêtre
+``READ_YOUR_WRITES_WINDOW``.
+Tant qu'elle n'est pas dépassée, les lectures de ce client sont marquées
+``request.state.read_primary`` et servies par le primaire (voir
+``SessionRouter``), le temps que le réplica rattrape son retard. L'état
+voyage avec le client : tous les workers le voient.
+"""
+
+import math
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import SAFE_METHODS
+
+COOKIE_NAME = "bbl_primary_until"
+
+
+class ReadYourWritesMiddleware:
+    """Middleware ASGI pur : compatible avec les réponses en flux"""
+
+    def __init__(self, app: ASGIApp, window: float, cookie_name: str = COOKIE_NAME):
+        self.app = app
+        self.window = window
+        self.cookie_name = cookie_name
+
+    def wrote_recently(self, scope: Scope) -> bool:
+        """Le cookie de la requête désigne une échéance encore à venir"""
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                until = cookie_parser(value.decode("latin-1")).get(self.cookie_name)
+                try:
+                    return until is not None and float(until) > time.time()
+                except ValueError:
+                    return False
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.window <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in SAFE_METHODS:
+            if self.wrote_recently(scope):
+                scope.setdefault("state", {})["read_primary"] = True
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window
+                max_age = math.ceil(self.window)
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{self.cookie_name}={until:.3f}; Max-Age={max_age}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,127 @@
+"""
+Migrations du schéma de la base de données
+
+Chaque migration est un module de ``app.migrations.versions`` qui définit
+``VERSION`` (entier croissant), ``NAME`` et ``upgrade(connection)``. Les
+versions appliquées sont enregistrées dans la table ``schema_version``.
+
+Le schéma n'est jamais modifié au démarrage de l'application : les
+migrations sont appliquées explicitement (``python -m app.migrations
+upgrade``) et le démarrage vérifie seulement que la base est à jour.
+"""
+
+import importlib
+import pkgutil
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.migrations import versions
+
+VERSION_TABLE = "schema_version"
+
+_version_metadata = MetaData()
+schema_version = Table(
+    VERSION_TABLE,
+    _version_metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+class SchemaVersionError(RuntimeError):
+    """La base n'est pas à la version attendue par l'application"""
+
+
+@dataclass
+class Migration:
+    """Migration chargée depuis ``app.migrations.versions``"""
+
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def load_migrations() -> List[Migration]:
+    """Migrations disponibles, par version croissante"""
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(Migration(module.VERSION, module.NAME, module.upgrade))
+    migrations.sort(key=lambda migration: migration.version)
+    numbers = [migration.version for migration in migrations]
+    if len(set(numbers)) != len(numbers):
+        raise SchemaVersionError(f"Numéros de migration en double : {numbers}")
+    return migrations
+
+
+def head_version() -> int:
+    """Version la plus récente disponible (0 sans migration)"""
+    migrations = load_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def current_version(connection: Connection) -> int:
+    """Version appliquée à la base (0 si elle n'a jamais été migrée)"""
+    if not connection.dialect.has_table(connection, VERSION_TABLE):
+        return 0
+    version = connection.execute(select(func.max(schema_version.c.version))).scalar()
+    return version or 0
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[Migration]:
+    """
+    Applique les migrations manquantes jusqu'à ``target`` (la dernière par défaut)
+
+    Chaque migration s'exécute dans sa propre transaction avec l'enregistrement
+    de sa version : une migration en échec n'est pas marquée comme appliquée.
+
+    Returns:
+        Les migrations appliquées
+    """
+    with engine.begin() as connection:
+        _version_metadata.create_all(connection)
+        current = current_version(connection)
+
+    applied = []
+    for migration in load_migrations():
+        if migration.version <= current:
+            continue
+        if target is not None and migration.version > target:
+            break
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(
+                schema_version.insert().values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.now(timezone.utc),
+                )
+            )
+        applied.append(migration)
+    return applied
+
+
+def check_schema(engine: Engine) -> int:
+    """
+    Vérifie que la base est à la dernière version, sans la modifier
+
+    Returns:
+        La version de la base
+
+    Raises:
+        SchemaVersionError: si des migrations restent à appliquer
+    """
+    with engine.connect() as connection:
+        current = current_version(connection)
+    head = head_version()
+    if current < head:
+        raise SchemaVersionError(
+            f"Schéma en version {current}, version {head} attendue : "
+            "exécuter `python -m app.migrations upgrade`"
+        )
+    return current
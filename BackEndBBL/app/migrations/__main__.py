@@ -0,0 +1,58 @@
+"""
+Commande de migration du schéma
+
+Usage (depuis BackEndBBL/) :
+    python -m app.migrations upgrade [--to VERSION]
+    python -m app.migrations current
+    python -m app.migrations check
+    python -m app.migrations history
+"""
+
+import argparse
+import sys
+
+from app.database import engine
+from app.migrations import (
+    SchemaVersionError,
+    check_schema,
+    current_version,
+    head_version,
+    load_migrations,
+    upgrade,
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.migrations", description="Migrations du schéma"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = commands.add_parser("upgrade", help="appliquer les migrations")
+    upgrade_parser.add_argument("--to", type=int, help="version cible")
+    commands.add_parser("current", help="afficher la version de la base")
+    commands.add_parser("check", help="échouer si des migrations sont en attente")
+    commands.add_parser("history", help="lister les migrations disponibles")
+    args = parser.parse_args(argv)
+
+    if args.command == "upgrade":
+        applied = upgrade(engine, target=args.to)
+        for migration in applied:
+            print(f"{migration.version:04d} {migration.name}")
+        print(f"{len(applied)} migration(s) appliquée(s)")
+    elif args.command == "current":
+        with engine.connect() as connection:
+            print(f"{current_version(connection)} (dernière : {head_version()})")
+    elif args.command == "check":
+        try:
+            print(f"Schéma à jour (version {check_schema(engine)})")
+        except SchemaVersionError as exc:
+            print(exc, file=sys.stderr)
+            return 1
+    else:
+        for migration in load_migrations():
+            print(f"{migration.version:04d} {migration.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""
+Migrations du schéma, une par module (``vNNNN_description.py``)
+"""
@@ -0,0 +1,145 @@
+"""
+0001 : schéma initial
+
+Crée les tables ``articles``, ``comments`` et ``likes``, leurs index et
+l'index plein texte FTS5 (SQLite).
+
+Les bases créées avant les migrations (par ``create_all`` au démarrage) sont
+reprises telles quelles : seules les colonnes et les index manquants sont
+ajoutés, et ``comments_count`` est recalculé s'il vient d'être ajouté.
+"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    func,
+    inspect,
+    text,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+VERSION = 1
+NAME = "Schéma initial"
+
+# Copie figée du schéma (index plein texte compris) : les modèles et le
+# moteur de recherche pourront évoluer, cette migration non
+metadata = MetaData()
+
+articles = Table(
+    "articles",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String(200), nullable=False, index=True),
+    Column("content", Text, nullable=False),
+    Column("author", String(100), nullable=False, index=True),
+    Column("likes_count", Integer),
+    Column("comments_count", Integer, server_default="0"),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True), index=True),
+    Index("ix_articles_created_at_id", "created_at", "id"),
+)
+
+comments = Table(
+    "comments",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("article_id", Integer, ForeignKey("articles.id"), nullable=False),
+    Column("author", String(100), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("likes_count", Integer),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Index("ix_comments_article_id_created_at_id", "article_id", "created_at", "id"),
+)
+
+likes = Table(
+    "likes",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("article_id", Integer, nullable=False, index=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+FTS_TABLE = "articles_fts"
+
+FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, content, author,
+        content='articles', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content, author)
+        VALUES (new.id, new.title, new.content, new.author);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content, author)
+        VALUES ('delete', old.id, old.title, old.content, old.author);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_au
+    AFTER UPDATE OF title, content, author ON articles BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content, author)
+        VALUES ('delete', old.id, old.title, old.content, old.author);
+        INSERT INTO {FTS_TABLE}(rowid, title, content, author)
+        VALUES (new.id, new.title, new.content, new.author);
+    END
+    """,
+]
+
+
+def _create_fts_index(connection: Connection) -> None:
+    """Table FTS5 et triggers de synchronisation, puis indexation des articles"""
+    if connection.dialect.has_table(connection, FTS_TABLE):
+        return
+    for statement in FTS_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql(
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+    )
+
+
+def _add_missing_columns(connection: Connection) -> set:
+    """Colonnes ajoutées aux tables d'une base antérieure aux migrations"""
+    added = set()
+    for table in metadata.sorted_tables:
+        present = {c["name"] for c in inspect(connection).get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in present:
+                ddl = CreateColumn(column).compile(dialect=connection.dialect)
+                connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+                added.add(f"{table.name}.{column.name}")
+    return added
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection, checkfirst=True)
+
+    added = _add_missing_columns(connection)
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+    if "articles.comments_count" in added:
+        connection.execute(
+            text(
+                "UPDATE articles SET comments_count = "
+                "(SELECT count(*) FROM comments WHERE comments.article_id = articles.id)"
+            )
+        )
+
+    if connection.dialect.name == "sqlite":
+        _create_fts_index(connection)
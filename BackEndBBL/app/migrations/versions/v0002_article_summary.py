@@ -0,0 +1,111 @@
+"""
+0002 : résumé des articles pour les listes
+
+Ajoute les colonnes ``excerpt``, ``word_count`` et ``reading_time`` et les
+calcule pour les articles existants, par lots. L'index de pagination sur
+``(created_at, id)`` est remplacé par un index couvrant les colonnes du
+résumé : les listes en mode résumé ne lisent plus la table.
+"""
+
+import math
+import re
+from typing import Dict, Union
+
+from sqlalchemy import Column, Integer, String, bindparam, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+VERSION = 2
+NAME = "Résumé des articles"
+
+BATCH_SIZE = 1000
+
+# Copie figée de SUMMARY_INDEX_COLUMNS
+SUMMARY_INDEX_COLUMNS = (
+    "created_at",
+    "id",
+    "title",
+    "author",
+    "excerpt",
+    "likes_count",
+    "comments_count",
+    "word_count",
+    "reading_time",
+    "updated_at",
+)
+
+# Copie figée du calcul du résumé (app.services.summary) : ce que cette
+# migration écrit ne change pas si les réglages du service évoluent
+EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _excerpt(content: str) -> str:
+    """Début du texte, espaces normalisés, coupé entre deux mots"""
+    normalized = _WHITESPACE_RE.sub(" ", content).strip()
+    if len(normalized) <= EXCERPT_LENGTH:
+        return normalized
+    cut = normalized[: EXCERPT_LENGTH - 1]
+    if " " in cut:
+        cut = cut[: cut.rindex(" ")]
+    return cut.rstrip(" ,;:.") + "…"
+
+
+def _summary(content: str) -> Dict[str, Union[str, int]]:
+    """Valeurs des colonnes de résumé pour un contenu donné"""
+    word_count = len(_WORD_RE.findall(content))
+    return {
+        "excerpt": _excerpt(content),
+        "word_count": word_count,
+        "reading_time": math.ceil(word_count / WORDS_PER_MINUTE),
+    }
+
+
+COLUMNS = [
+    Column("excerpt", String(300)),
+    Column("word_count", Integer, server_default="0"),
+    Column("reading_time", Integer, server_default="0"),
+]
+
+
+def _backfill(connection: Connection) -> None:
+    """Calcule le résumé des articles existants, sans modifier updated_at"""
+    update = text(
+        "UPDATE articles SET excerpt = :excerpt, word_count = :word_count, "
+        "reading_time = :reading_time WHERE id = :b_id"
+    ).bindparams(bindparam("b_id"))
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            text(
+                "SELECT id, content FROM articles WHERE id > :last_id "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            return
+        connection.execute(
+            update,
+            [{"b_id": row.id, **_summary(row.content or "")} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade(connection: Connection) -> None:
+    present = {c["name"] for c in inspect(connection).get_columns("articles")}
+    for column in COLUMNS:
+        if column.name not in present:
+            ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE articles ADD COLUMN {ddl}"))
+    _backfill(connection)
+    connection.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_articles_summary "
+            f"ON articles ({', '.join(SUMMARY_INDEX_COLUMNS)})"
+        )
+    )
+    connection.execute(text("DROP INDEX IF EXISTS ix_articles_created_at_id"))
@@ -0,0 +1,35 @@
+"""
+0003 : classement des articles tendance
+
+Crée les tables de l'instantané du classement (``trending_scores``) et des
+positions dans les journaux d'événements (``trending_cursors``). Le
+classement est reconstruit à partir des journaux au premier démarrage.
+"""
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+VERSION = 3
+NAME = "Articles tendance"
+
+# Copie figée du schéma
+metadata = MetaData()
+
+Table(
+    "trending_scores",
+    metadata,
+    Column("window", String(8), primary_key=True),
+    Column("article_id", Integer, primary_key=True, autoincrement=False),
+    Column("log_score", Float, nullable=False),
+)
+
+Table(
+    "trending_cursors",
+    metadata,
+    Column("source", String(20), primary_key=True),
+    Column("last_id", Integer, nullable=False),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection, checkfirst=True)
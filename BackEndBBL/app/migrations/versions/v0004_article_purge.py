@@ -0,0 +1,61 @@
+"""
+0004 : suppression ensembliste des articles
+
+- Crée la table ``article_purges`` des suppressions différées
+- Efface les commentaires et likes orphelins laissés par les suppressions
+  précédentes (le journal des likes n'était pas nettoyé)
+- Hors SQLite : la clé étrangère ``comments.article_id`` devient
+  ``ON DELETE CASCADE``. SQLite n'applique pas les clés étrangères (pas de
+  ``PRAGMA foreign_keys``) : la reconstruire pour changer une clause inerte
+  n'apporterait rien, l'application efface elle-même les commentaires.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, func, inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 4
+NAME = "Suppression ensembliste des articles"
+
+# Copie figée du schéma
+metadata = MetaData()
+
+Table(
+    "article_purges",
+    metadata,
+    Column("article_id", Integer, primary_key=True, autoincrement=False),
+    Column("max_comment_id", Integer, nullable=False),
+    Column("max_like_id", Integer, nullable=False),
+    Column("deleted_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+def _cascade_comments(connection: Connection) -> None:
+    """Remplace la clé étrangère des commentaires par une clé en cascade"""
+    for foreign_key in inspect(connection).get_foreign_keys("comments"):
+        if foreign_key["referred_table"] != "articles":
+            continue
+        if (foreign_key.get("options") or {}).get("ondelete", "").upper() == "CASCADE":
+            return
+        name = foreign_key["name"]
+        connection.execute(text(f"ALTER TABLE comments DROP CONSTRAINT {name}"))
+    connection.execute(
+        text(
+            "ALTER TABLE comments ADD CONSTRAINT comments_article_id_fkey "
+            "FOREIGN KEY (article_id) REFERENCES articles (id) ON DELETE CASCADE"
+        )
+    )
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection, checkfirst=True)
+
+    for table in ("likes", "comments"):
+        connection.execute(
+            text(
+                f"DELETE FROM {table} "
+                "WHERE article_id NOT IN (SELECT id FROM articles)"
+            )
+        )
+
+    if connection.dialect.name != "sqlite":
+        _cascade_comments(connection)
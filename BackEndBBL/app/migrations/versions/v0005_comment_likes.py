@@ -0,0 +1,34 @@
+"""
+0005 : likes des commentaires
+
+Crée l'index ``(article_id, likes_count, id)`` des commentaires les plus
+likés d'un article (lecture des N premiers sans trier le fil) et remplace
+les ``likes_count`` NULL par 0 : l'index les classerait sinon après les
+commentaires sans like.
+"""
+
+from sqlalchemy import Column, Index, Integer, MetaData, Table, text
+from sqlalchemy.engine import Connection
+
+VERSION = 5
+NAME = "Likes des commentaires"
+
+# Copie figée du schéma
+metadata = MetaData()
+
+comments = Table(
+    "comments",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("article_id", Integer),
+    Column("likes_count", Integer),
+    Index("ix_comments_article_id_likes_count_id", "article_id", "likes_count", "id"),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    connection.execute(
+        text("UPDATE comments SET likes_count = 0 WHERE likes_count IS NULL")
+    )
+    for index in comments.indexes:
+        index.create(connection, checkfirst=True)
@@ -0,0 +1,67 @@
+"""
+0006 : index et statistiques par auteur
+
+- L'index ``ix_articles_author`` est remplacé par
+  ``(author, created_at, id)`` : les articles d'un auteur sont lus par plage,
+  déjà triés, et sa date de dernière publication en une lecture d'index
+- Crée la table ``author_stats`` et la remplit à partir des articles (seul
+  GROUP BY sur la table : les écritures la tiennent ensuite à jour)
+"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    inspect,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+VERSION = 6
+NAME = "Statistiques par auteur"
+
+# Copie figée du schéma
+metadata = MetaData()
+
+articles = Table(
+    "articles",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("author", String(100)),
+    Column("created_at", DateTime(timezone=True)),
+    Index("ix_articles_author_created_at_id", "author", "created_at", "id"),
+)
+
+author_stats = Table(
+    "author_stats",
+    metadata,
+    Column("author", String(100), primary_key=True),
+    Column("articles_count", Integer, nullable=False, server_default="0"),
+    Column("likes_count", Integer, nullable=False, server_default="0"),
+    Column("comments_count", Integer, nullable=False, server_default="0"),
+    Column("last_post_at", DateTime(timezone=True)),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    indexes = {index["name"] for index in inspect(connection).get_indexes("articles")}
+    if "ix_articles_author" in indexes:
+        connection.execute(text("DROP INDEX ix_articles_author"))
+    for index in articles.indexes:
+        index.create(connection, checkfirst=True)
+
+    author_stats.create(connection, checkfirst=True)
+    connection.execute(text("DELETE FROM author_stats"))
+    connection.execute(
+        text(
+            "INSERT INTO author_stats "
+            "(author, articles_count, likes_count, comments_count, last_post_at) "
+            "SELECT author, count(*), sum(coalesce(likes_count, 0)), "
+            "sum(coalesce(comments_count, 0)), max(created_at) "
+            "FROM articles GROUP BY author"
+        )
+    )
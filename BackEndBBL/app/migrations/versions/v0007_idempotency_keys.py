@@ -0,0 +1,40 @@
+"""
+0007 : clés d'idempotence
+
+Crée la table ``idempotency_keys`` du stockage partagé des réponses rejouées
+aux requêtes portant un en-tête ``Idempotency-Key``
+(IDEMPOTENCY_BACKEND=database).
+"""
+
+from sqlalchemy import (
+    Column,
+    Float,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    Text,
+)
+from sqlalchemy.engine import Connection
+
+VERSION = 7
+NAME = "Clés d'idempotence"
+
+# Copie figée du schéma
+metadata = MetaData()
+
+Table(
+    "idempotency_keys",
+    metadata,
+    Column("key", String(255), primary_key=True),
+    Column("fingerprint", String(2048), nullable=False),
+    Column("status_code", Integer),
+    Column("headers", Text),
+    Column("body", LargeBinary),
+    Column("expires_at", Float, nullable=False, index=True),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,48 @@
+"""
+0008 : file de travaux différés
+
+Crée la table ``jobs`` des travaux exécutés après la réponse des écritures
+(POST_WRITE_MODE=deferred).
+"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.engine import Connection
+
+VERSION = 8
+NAME = "File de travaux différés"
+
+# Copie figée du schéma
+metadata = MetaData()
+
+Table(
+    "jobs",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("kind", String(50), nullable=False),
+    Column("key", String(255), nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("generation", Integer, nullable=False),
+    Column("attempts", Integer, nullable=False),
+    Column("run_at", Float, nullable=False),
+    Column("locked_until", Float),
+    Column("last_error", Text),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    UniqueConstraint("kind", "key", name="uq_jobs_kind_key"),
+    Index("ix_jobs_status_run_at", "status", "run_at"),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,27 @@
+"""
+0009 : générations d'écriture
+
+Crée la table ``write_generations`` : la version des listes d'articles (ETag)
+ne compte plus les articles à chaque lecture, les suppressions y sont
+comptées à l'écriture.
+"""
+
+from sqlalchemy import Column, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+VERSION = 9
+NAME = "Générations d'écriture"
+
+# Copie figée du schéma
+metadata = MetaData()
+
+Table(
+    "write_generations",
+    metadata,
+    Column("name", String(50), primary_key=True),
+    Column("value", Integer, nullable=False, server_default="0"),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection, checkfirst=True)
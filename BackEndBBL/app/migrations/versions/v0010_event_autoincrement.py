@@ -0,0 +1,126 @@
+"""
+0010 : identifiants jamais réattribués pour les commentaires et les likes
+
+Sous SQLite, une clé ``INTEGER PRIMARY KEY`` sans ``AUTOINCREMENT`` réattribue
+l'identifiant du dernier enregistrement supprimé. Le classement tendance lit
+les nouveaux commentaires et likes par ``id > curseur`` : un commentaire
+reprenant l'identifiant du plus récent, supprimé, n'y était jamais compté.
+
+Les tables ``comments`` et ``likes`` sont reconstruites avec ``AUTOINCREMENT``
+(lignes et index conservés). La séquence part au-delà du curseur du
+classement, qui a pu dépasser le plus grand identifiant restant. Les autres
+SGBD utilisent des séquences, qui ne réattribuent pas : rien à faire.
+"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    func,
+    inspect,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateTable
+
+VERSION = 10
+NAME = "Identifiants des commentaires et likes en AUTOINCREMENT"
+
+# Copie figée du schéma
+metadata = MetaData()
+
+# Cible de la clé étrangère des commentaires (non recréée)
+Table("articles", metadata, Column("id", Integer, primary_key=True))
+
+comments = Table(
+    "comments",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column(
+        "article_id",
+        Integer,
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column("author", String(100), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("likes_count", Integer),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Index("ix_comments_article_id_created_at_id", "article_id", "created_at", "id"),
+    Index("ix_comments_article_id_likes_count_id", "article_id", "likes_count", "id"),
+    sqlite_autoincrement=True,
+)
+
+likes = Table(
+    "likes",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("article_id", Integer, nullable=False, index=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    sqlite_autoincrement=True,
+)
+
+
+def _rebuild_with_autoincrement(
+    connection: Connection, table: Table, floor: int
+) -> None:
+    """
+    Recrée une table SQLite avec AUTOINCREMENT, lignes et index compris
+
+    La séquence repart du plus grand identifiant copié, ou de ``floor`` s'il
+    est plus grand.
+    """
+    sql = connection.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (table.name,),
+    ).scalar()
+    if sql is None or "AUTOINCREMENT" in sql.upper():
+        return
+    staging = f"{table.name}_rebuild"
+    ddl = str(CreateTable(table).compile(dialect=connection.dialect))
+    connection.exec_driver_sql(
+        ddl.replace(f"CREATE TABLE {table.name} ", f"CREATE TABLE {staging} ", 1)
+    )
+    present = {c["name"] for c in inspect(connection).get_columns(table.name)}
+    names = ", ".join(c.name for c in table.columns if c.name in present)
+    connection.exec_driver_sql(
+        f"INSERT INTO {staging} ({names}) SELECT {names} FROM {table.name}"
+    )
+    connection.exec_driver_sql(f"DROP TABLE {table.name}")
+    connection.exec_driver_sql(f"ALTER TABLE {staging} RENAME TO {table.name}")
+    for index in table.indexes:
+        index.create(connection)
+
+    connection.exec_driver_sql(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT ?, 0 "
+        "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = ?)",
+        (table.name, table.name),
+    )
+    connection.exec_driver_sql(
+        "UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name = ?",
+        (floor, table.name),
+    )
+
+
+def _trending_cursor(connection: Connection, source: str) -> int:
+    """Dernier événement lu par le classement tendance (0 sans classement)"""
+    if not connection.dialect.has_table(connection, "trending_cursors"):
+        return 0
+    value = connection.exec_driver_sql(
+        "SELECT last_id FROM trending_cursors WHERE source = ?", (source,)
+    ).scalar()
+    return value or 0
+
+
+def upgrade(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for table, source in ((comments, "comments"), (likes, "likes")):
+        _rebuild_with_autoincrement(
+            connection, table, _trending_cursor(connection, source)
+        )
@@ -0,0 +1,145 @@
+"""
+0011 : identifiants d'articles jamais réattribués
+
+Sous SQLite, une clé ``INTEGER PRIMARY KEY`` sans ``AUTOINCREMENT`` réattribue
+l'identifiant du dernier article supprimé. En suppression différée
+(ARTICLE_DELETE_MODE=deferred), les commentaires et likes de l'article
+supprimé attendent leur purge : un nouvel article reprenant son identifiant
+en héritait, et ses ETag pouvaient coïncider avec ceux de l'ancien.
+
+La table ``articles`` est reconstruite avec ``AUTOINCREMENT`` (lignes et index
+conservés). Supprimer la table supprime aussi les triggers qui synchronisent
+l'index plein texte : ils sont recréés. La séquence part au-delà de tout
+identifiant encore référencé par une purge, un commentaire ou un like. Les
+autres SGBD utilisent des séquences, qui ne réattribuent pas : rien à faire.
+"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    func,
+    inspect,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateTable
+
+VERSION = 11
+NAME = "Identifiants des articles en AUTOINCREMENT"
+
+# Copie figée du schéma
+metadata = MetaData()
+
+articles = Table(
+    "articles",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String(200), nullable=False, index=True),
+    Column("content", Text, nullable=False),
+    Column("author", String(100), nullable=False),
+    Column("likes_count", Integer),
+    Column("comments_count", Integer, server_default="0"),
+    Column("excerpt", String(300)),
+    Column("word_count", Integer, server_default="0"),
+    Column("reading_time", Integer, server_default="0"),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True), index=True),
+    Index(
+        "ix_articles_summary",
+        "created_at",
+        "id",
+        "title",
+        "author",
+        "excerpt",
+        "likes_count",
+        "comments_count",
+        "word_count",
+        "reading_time",
+        "updated_at",
+    ),
+    Index("ix_articles_author_created_at_id", "author", "created_at", "id"),
+    sqlite_autoincrement=True,
+)
+
+FTS_TABLE = "articles_fts"
+
+# Triggers de synchronisation de l'index plein texte (voir 0001)
+FTS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content, author)
+        VALUES (new.id, new.title, new.content, new.author);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content, author)
+        VALUES ('delete', old.id, old.title, old.content, old.author);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_au
+    AFTER UPDATE OF title, content, author ON articles BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content, author)
+        VALUES ('delete', old.id, old.title, old.content, old.author);
+        INSERT INTO {FTS_TABLE}(rowid, title, content, author)
+        VALUES (new.id, new.title, new.content, new.author);
+    END
+    """,
+]
+
+
+def _referenced_floor(connection: Connection) -> int:
+    """Plus grand identifiant d'article encore référencé (0 sinon)"""
+    floor = 0
+    for table in ("article_purges", "comments", "likes"):
+        if connection.dialect.has_table(connection, table):
+            value = connection.exec_driver_sql(
+                f"SELECT max(article_id) FROM {table}"
+            ).scalar()
+            floor = max(floor, value or 0)
+    return floor
+
+
+def upgrade(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    sql = connection.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'articles'"
+    ).scalar()
+    if sql is None or "AUTOINCREMENT" in sql.upper():
+        return
+    floor = _referenced_floor(connection)
+
+    # Les lignes gardent leur identifiant : l'index plein texte (rowid = id)
+    # reste valable
+    ddl = str(CreateTable(articles).compile(dialect=connection.dialect))
+    connection.exec_driver_sql(
+        ddl.replace("CREATE TABLE articles ", "CREATE TABLE articles_rebuild ", 1)
+    )
+    present = {c["name"] for c in inspect(connection).get_columns("articles")}
+    names = ", ".join(c.name for c in articles.columns if c.name in present)
+    connection.exec_driver_sql(
+        f"INSERT INTO articles_rebuild ({names}) SELECT {names} FROM articles"
+    )
+    connection.exec_driver_sql("DROP TABLE articles")
+    connection.exec_driver_sql("ALTER TABLE articles_rebuild RENAME TO articles")
+    for index in articles.indexes:
+        index.create(connection)
+    if connection.dialect.has_table(connection, FTS_TABLE):
+        for statement in FTS_TRIGGERS:
+            connection.exec_driver_sql(statement)
+
+    connection.exec_driver_sql(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'articles', 0 "
+        "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'articles')"
+    )
+    connection.exec_driver_sql(
+        "UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name = 'articles'",
+        (floor,),
+    )
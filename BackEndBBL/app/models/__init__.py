@@ -3,6 +3,24 @@ Models package initializer
 """
 
 from .article import Article
+from .author import AuthorStats
 from .comment import Comment
+from .generation import WriteGeneration
+from .idempotency import IdempotencyKey
+from .job import Job
+from .like import Like
+from .purge import ArticlePurge
+from .trending import TrendingCursor, TrendingScore
 
-__all__ = ["Article", "Comment"]
+__all__ = [
+    "Article",
+    "ArticlePurge",
+    "AuthorStats",
+    "Comment",
+    "IdempotencyKey",
+    "Job",
+    "Like",
+    "TrendingCursor",
+    "TrendingScore",
+    "WriteGeneration",
+]
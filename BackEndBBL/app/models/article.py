@@ -2,26 +2,71 @@
 Modèle de données pour les articles
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
 
 
+def _utcnow() -> datetime:
+    """Horodatage UTC à la microseconde (version de l'article pour les ETag)"""
+    return datetime.now(timezone.utc)
+
+
+# Colonnes de l'index des listes (voir ARTICLE_SUMMARY_COLUMNS)
+SUMMARY_INDEX_COLUMNS = (
+    "created_at",
+    "id",
+    "title",
+    "author",
+    "excerpt",
+    "likes_count",
+    "comments_count",
+    "word_count",
+    "reading_time",
+    "updated_at",
+)
+
+
 class Article(Base):
     """Modèle représentant un article de blog"""
 
     __tablename__ = "articles"
+    __table_args__ = (
+        # Pagination par curseur sur (created_at, id). Les colonnes suivantes
+        # rendent l'index couvrant pour les listes en mode résumé : elles sont
+        # servies sans lire la table, donc sans lire le contenu des articles
+        Index("ix_articles_summary", *SUMMARY_INDEX_COLUMNS),
+        # Articles d'un auteur (égalité exacte), du plus récent au plus ancien
+        Index("ix_articles_author_created_at_id", "author", "created_at", "id"),
+        # Identifiants jamais réattribués : une purge en attente, un ETag ou un
+        # commentaire tardif ne visent jamais l'article suivant
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False, index=True)
     content = Column(Text, nullable=False)
-    author = Column(String(100), nullable=False, index=True)
+    author = Column(String(100), nullable=False)
     likes_count = Column(Integer, default=0)
+    # Dénormalisé, maintenu par CommentService (évite un COUNT par article)
+    comments_count = Column(Integer, default=0, server_default="0")
+    # Résumé pour les listes, calculé à l'écriture (voir services/summary.py)
+    excerpt = Column(String(300))
+    word_count = Column(Integer, default=0, server_default="0")
+    reading_time = Column(Integer, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Calculé côté Python : CURRENT_TIMESTAMP de SQLite s'arrête à la seconde
+    updated_at = Column(DateTime(timezone=True), onupdate=_utcnow, index=True)
 
-    # Relation avec les commentaires
+    # Relation avec les commentaires ; leur suppression est confiée à la base
+    # (ON DELETE CASCADE, requêtes ensemblistes) : jamais chargés pour être
+    # effacés un par un
     comments = relationship(
-        "Comment", back_populates="article", cascade="all, delete-orphan"
+        "Comment",
+        back_populates="article",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
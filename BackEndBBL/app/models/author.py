@@ -0,0 +1,23 @@
+"""
+Modèle des statistiques par auteur
+
+Agrégats matérialisés des articles de chaque auteur, tenus à jour dans la
+transaction de chaque écriture (``app.services.author_service``) : la page
+d'un auteur est lue par clé primaire, sans GROUP BY sur les articles.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, String
+from ..database import Base
+
+
+class AuthorStats(Base):
+    """Nombre d'articles, likes et commentaires cumulés d'un auteur"""
+
+    __tablename__ = "author_stats"
+
+    author = Column(String(100), primary_key=True)
+    articles_count = Column(Integer, nullable=False, default=0, server_default="0")
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Date de création du dernier article de l'auteur
+    last_post_at = Column(DateTime(timezone=True))
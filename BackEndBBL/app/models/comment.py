@@ -2,7 +2,7 @@
 Modèle de données pour les commentaires
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -12,9 +12,22 @@ class Comment(Base):
     """Modèle représentant un commentaire sur un article"""
 
     __tablename__ = "comments"
+    __table_args__ = (
+        # Fil de commentaires d'un article paginé par curseur sur (created_at, id)
+        Index("ix_comments_article_id_created_at_id", "article_id", "created_at", "id"),
+        # Commentaires les plus likés d'un article, lus dans l'ordre de l'index
+        Index(
+            "ix_comments_article_id_likes_count_id", "article_id", "likes_count", "id"
+        ),
+        # Identifiants jamais réattribués : le classement tendance lit les
+        # nouveaux commentaires par ``id > curseur``
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    article_id = Column(Integer, ForeignKey("articles.id"), nullable=False)
+    article_id = Column(
+        Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False
+    )
     author = Column(String(100), nullable=False)
     content = Column(Text, nullable=False)
     likes_count = Column(Integer, default=0)
@@ -0,0 +1,20 @@
+"""
+Modèle des générations d'écriture
+
+Compteurs incrémentés dans la transaction de certaines écritures, partagés
+par tous les workers. ``articles.deleted`` compte les suppressions
+d'articles : avec le plus grand identifiant et la plus récente modification,
+il date l'ensemble des articles sans compter ses lignes.
+"""
+
+from sqlalchemy import Column, Integer, String
+from ..database import Base
+
+
+class WriteGeneration(Base):
+    """Compteur nommé, incrémenté à chaque écriture qu'il date"""
+
+    __tablename__ = "write_generations"
+
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0, server_default="0")
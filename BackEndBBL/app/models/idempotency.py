@@ -0,0 +1,25 @@
+"""
+Modèle des clés d'idempotence (stockage partagé par les workers)
+
+Une ligne par clé ``Idempotency-Key`` : tant que ``status_code`` est NULL,
+la requête est en cours dans un worker ; ensuite la ligne conserve la
+réponse à rejouer. ``expires_at`` (horodatage Unix) borne l'une et l'autre.
+"""
+
+from sqlalchemy import Column, Float, Integer, LargeBinary, String, Text
+from ..database import Base
+
+
+class IdempotencyKey(Base):
+    """Requête d'écriture identifiée par sa clé, et sa réponse une fois connue"""
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    # Méthode et chemin de la requête : une clé ne vaut que pour une requête
+    fingerprint = Column(String(2048), nullable=False)
+    status_code = Column(Integer)
+    # En-têtes de la réponse (JSON) et corps
+    headers = Column(Text)
+    body = Column(LargeBinary)
+    expires_at = Column(Float, nullable=False, index=True)
@@ -0,0 +1,48 @@
+"""
+Modèle de la file de travaux différés
+
+Une ligne par travail à exécuter après la réponse d'une écriture
+(``app.services.jobs``), enregistrée dans la transaction de l'écriture : un
+travail n'est jamais perdu, même si le worker s'arrête avant de l'exécuter.
+Un travail est identifié par son type et sa clé (un identifiant d'article,
+un auteur) : un travail déjà en attente absorbe les suivants.
+"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
+from ..database import Base
+
+
+class Job(Base):
+    """Travail en attente (ou abandonné après trop d'échecs)"""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        UniqueConstraint("kind", "key", name="uq_jobs_kind_key"),
+        # Travaux à exécuter, par échéance
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)
+    key = Column(String(255), nullable=False)
+    # "pending" ou "failed" (plus de nouvelle tentative)
+    status = Column(String(20), nullable=False, default="pending")
+    # Incrémenté à chaque demande absorbée : un travail redemandé pendant son
+    # exécution est exécuté à nouveau
+    generation = Column(Integer, nullable=False, default=1)
+    attempts = Column(Integer, nullable=False, default=0)
+    # Horodatages Unix : prochaine exécution, fin de la réservation en cours
+    run_at = Column(Float, nullable=False)
+    locked_until = Column(Float)
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
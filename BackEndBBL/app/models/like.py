@@ -1,8 +1,11 @@
 """
 Like model
 
-Simplified like tracking: each like is a separate record linked to an article_id.
-This can be extended later to add a user_id or to enforce unique likes per user.
+Append-only log of likes: each like is a separate record linked to an
+article_id and timestamped with the moment it was given. The denormalized
+``articles.likes_count`` counters can be rebuilt from this table (see
+``app.services.like_service.rebuild_like_counts``). This can be extended later
+to add a user_id or to enforce unique likes per user.
 """
 
 from sqlalchemy import Column, Integer, DateTime, func
@@ -13,7 +16,9 @@ class Like(Base):
     """SQLAlchemy model representing the 'likes' table."""
 
     __tablename__ = "likes"
+    # Never reused ids: the trending rankings read new likes by ``id > cursor``
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
-    article_id = Column(Integer, index=True)
+    article_id = Column(Integer, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,24 @@
+"""
+Modèle des purges d'articles en attente
+
+En mode de suppression différée (ARTICLE_DELETE_MODE=deferred), l'article
+est supprimé aussitôt et ses commentaires et likes sont effacés ensuite par
+lots (``app.services.article_purge``). Chaque ligne mémorise les plus grands
+identifiants de commentaire et de like au moment de la suppression : seules
+les lignes antérieures sont purgées, même si l'identifiant de l'article est
+réattribué entre-temps.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, func
+from ..database import Base
+
+
+class ArticlePurge(Base):
+    """Article supprimé dont les commentaires et likes restent à effacer"""
+
+    __tablename__ = "article_purges"
+
+    article_id = Column(Integer, primary_key=True, autoincrement=False)
+    max_comment_id = Column(Integer, nullable=False)
+    max_like_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
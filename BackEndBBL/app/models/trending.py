@@ -0,0 +1,29 @@
+"""
+Modèles du classement des articles tendance
+
+Instantané du classement en mémoire (``app.services.trending``) : scores par
+fenêtre et position atteinte dans chaque journal d'événements. Au démarrage,
+le classement repart de l'instantané et ne relit que les événements suivants.
+"""
+
+from sqlalchemy import Column, Float, Integer, String
+from ..database import Base
+
+
+class TrendingScore(Base):
+    """Score d'un article pour une fenêtre (logarithme, voir DecayedRanking)"""
+
+    __tablename__ = "trending_scores"
+
+    window = Column(String(8), primary_key=True)
+    article_id = Column(Integer, primary_key=True, autoincrement=False)
+    log_score = Column(Float, nullable=False)
+
+
+class TrendingCursor(Base):
+    """Dernier événement pris en compte dans un journal (``likes``, ``comments``)"""
+
+    __tablename__ = "trending_cursors"
+
+    source = Column(String(20), primary_key=True)
+    last_id = Column(Integer, nullable=False)
@@ -2,13 +2,31 @@
 Schemas package initializer
 """
 
-from .article import ArticleCreate, ArticleUpdate, ArticleResponse
-from .comment import CommentCreate, CommentResponse
+from .article import (
+    ArticleCreate,
+    ArticleUpdate,
+    ArticleResponse,
+    ArticlePage,
+    ArticleSearchResult,
+    ArticleSummary,
+    ArticleWithComments,
+    TrendingArticle,
+)
+from .bulk import BulkImportResult, BulkRowError
+from .comment import CommentCreate, CommentPage, CommentResponse
 
 __all__ = [
     "ArticleCreate",
     "ArticleUpdate",
     "ArticleResponse",
+    "ArticlePage",
+    "ArticleSearchResult",
+    "ArticleSummary",
+    "ArticleWithComments",
+    "BulkImportResult",
+    "BulkRowError",
     "CommentCreate",
+    "CommentPage",
     "CommentResponse",
+    "TrendingArticle",
 ]
@@ -4,7 +4,8 @@ Schémas Pydantic pour la validation des articles
 
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Union
+from .comment import CommentResponse
 
 
 class ArticleBase(BaseModel):
@@ -44,8 +45,77 @@ class ArticleResponse(ArticleBase):
 
     id: int
     likes_count: int
+    comments_count: int = 0
     created_at: datetime
     updated_at: Optional[datetime] = None
+    excerpt: Optional[str] = None
+    word_count: int = 0
+    reading_time: int = Field(0, description="Temps de lecture estimé (minutes)")
 
     class Config:
         from_attributes = True
+
+
+class ArticleSummary(BaseModel):
+    """Schéma de réponse allégé d'un article (listes, sans le contenu complet)"""
+
+    title: str
+    author: str
+    excerpt: Optional[str] = Field(None, description="Début du contenu")
+    id: int
+    likes_count: int
+    comments_count: int = 0
+    word_count: int = 0
+    reading_time: int = Field(0, description="Temps de lecture estimé (minutes)")
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    recent_comments: Optional[List[CommentResponse]] = Field(
+        None, description="Présent avec include_comments"
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class TrendingArticle(ArticleSummary):
+    """Schéma de réponse d'un article du classement tendance"""
+
+    score: float = Field(
+        ..., description="Likes et commentaires pondérés par leur ancienneté"
+    )
+
+
+class ArticleWithComments(ArticleResponse):
+    """Schéma de réponse d'un article accompagné de ses derniers commentaires"""
+
+    recent_comments: List[CommentResponse] = Field(
+        default_factory=list, description="Commentaires les plus récents d'abord"
+    )
+
+
+class ArticleSearchResult(ArticleResponse):
+    """Schéma de réponse pour un résultat de recherche plein texte"""
+
+    rank: float = Field(0.0, description="Score BM25 (plus petit = plus pertinent)")
+    snippet: Optional[str] = Field(
+        None,
+        description="Extrait en HTML échappé, termes trouvés entourés de <mark>",
+    )
+
+
+class ArticlePage(BaseModel):
+    """Page d'articles paginée par curseur"""
+
+    items: List[Union[ArticleWithComments, ArticleResponse, ArticleSummary]]
+    next_cursor: Optional[str] = Field(
+        None, description="Curseur de la page suivante (absent sur la dernière page)"
+    )
+
+
+class ArticleBulkDeleteResult(BaseModel):
+    """Résultat d'une suppression d'articles en lot"""
+
+    deleted: List[int] = Field(default_factory=list, description="Articles supprimés")
+    not_found: List[int] = Field(
+        default_factory=list, description="Identifiants sans article"
+    )
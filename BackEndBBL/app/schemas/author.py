@@ -0,0 +1,35 @@
+"""
+Schémas Pydantic des auteurs
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.article import ArticleSummary
+
+
+class AuthorStatsResponse(BaseModel):
+    """Statistiques d'un auteur, tenues à jour à chaque écriture"""
+
+    author: str
+    articles_count: int = Field(..., description="Nombre d'articles publiés")
+    likes_count: int = Field(..., description="Likes cumulés de ses articles")
+    comments_count: int = Field(..., description="Commentaires de ses articles")
+    last_post_at: Optional[datetime] = Field(
+        None, description="Date de son dernier article"
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class AuthorArticlesPage(BaseModel):
+    """Statistiques d'un auteur et page de ses articles, du plus récent"""
+
+    author: AuthorStatsResponse
+    items: List[ArticleSummary]
+    next_cursor: Optional[str] = Field(
+        None, description="Curseur de la page suivante (absent sur la dernière page)"
+    )
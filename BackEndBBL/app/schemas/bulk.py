@@ -0,0 +1,33 @@
+"""
+Schémas Pydantic des imports en masse
+"""
+
+from pydantic import BaseModel, Field
+from typing import List
+
+# Corps NDJSON documenté dans OpenAPI (lu en flux, hors validation FastAPI)
+NDJSON_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+    }
+}
+
+
+class BulkRowError(BaseModel):
+    """Ligne rejetée lors d'un import"""
+
+    line: int = Field(..., description="Numéro de la ligne NDJSON (à partir de 1)")
+    error: str
+
+
+class BulkImportResult(BaseModel):
+    """Bilan d'un import NDJSON"""
+
+    received: int = Field(0, description="Lignes non vides reçues")
+    inserted: int = 0
+    failed: int = 0
+    errors: List[BulkRowError] = Field(
+        default_factory=list,
+        description="Détail des lignes rejetées (limité aux premières erreurs)",
+    )
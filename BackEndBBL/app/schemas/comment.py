@@ -4,7 +4,7 @@ Schémas Pydantic pour la validation des commentaires
 
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class CommentBase(BaseModel):
@@ -32,9 +32,17 @@ class CommentResponse(CommentBase):
 
     id: int
     article_id: int
-    likes_count: int
+    likes_count: int = 0
     created_at: datetime
-    likes_count: Optional[int] = 0
 
     class Config:
         from_attributes = True
+
+
+class CommentPage(BaseModel):
+    """Page of comments returned by cursor pagination"""
+
+    items: List[CommentResponse]
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page (absent on the last page)"
+    )
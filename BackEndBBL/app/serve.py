@@ -0,0 +1,210 @@
+"""
+Point d'entrée de production : plusieurs workers, application préchargée
+
+Usage (depuis BackEndBBL/) :
+    python -m app.serve --workers 4 --host 0.0.0.0 --port 8000
+
+Le processus maître importe l'application une seule fois, vérifie le schéma
+(ou le migre avec MIGRATE_ON_STARTUP), ouvre la socket d'écoute puis crée les
+workers par ``fork`` : ils partagent le code déjà importé (copie à
+l'écriture) et acceptent les connexions sur la même socket. Un worker qui
+s'arrête est relancé.
+
+Arrêt (SIGTERM ou SIGINT au maître) : chaque worker cesse d'accepter des
+connexions, termine les flux d'événements, laisse les requêtes en cours
+finir (au plus SERVE_GRACEFUL_TIMEOUT secondes), puis écrit les likes en
+attente et l'instantané du classement tendance (cycle de vie de
+l'application). Un worker encore actif après ce délai est tué.
+
+Chaque worker garde ses états en mémoire (cache des lectures, tampon des
+likes, abonnés SSE) : au-delà d'un worker, utiliser
+COORDINATION_BACKEND=redis (et REDIS_URL) pour diffuser les invalidations
+et partager les compteurs. Sous SQLite, les écritures restent sérialisées
+par la base : plus de workers accélèrent les lectures, pas les écritures.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional
+
+import uvicorn
+
+from app.core.config import settings
+from app.database import engine
+from app.main import app
+from app.migrations import check_schema, upgrade
+from app.services.events import event_bus
+
+logger = logging.getLogger("app.serve")
+
+# Code de sortie d'un worker dont le démarrage a échoué (comme uvicorn)
+STARTUP_FAILURE = 3
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Socket d'écoute partagée par les workers"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class WorkerServer(uvicorn.Server):
+    """Serveur uvicorn d'un worker : termine les flux SSE avant d'attendre"""
+
+    async def shutdown(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        event_bus.end_streams()
+        await super().shutdown(sockets=sockets)
+
+
+def run_worker(sock: socket.socket, graceful_timeout: float, log_level: str) -> int:
+    """Sert l'application sur la socket partagée ; code de sortie du worker"""
+    # Les connexions ouvertes par le maître ne doivent pas être réutilisées
+    engine.dispose(close=False)
+    config = uvicorn.Config(
+        app,
+        lifespan="on",
+        timeout_graceful_shutdown=graceful_timeout,
+        log_level=log_level,
+    )
+    server = WorkerServer(config)
+    server.run(sockets=[sock])
+    return 0 if server.started else STARTUP_FAILURE
+
+
+class Supervisor:
+    """Processus maître : crée, surveille et arrête les workers"""
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        workers: int,
+        graceful_timeout: float,
+        log_level: str = "info",
+    ):
+        self.sock = sock
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        # pid -> date de lancement
+        self.children: Dict[int, float] = {}
+        self.stopping = False
+        self.exit_code = 0
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGALRM):
+                    signal.signal(sig, signal.SIG_DFL)
+                code = run_worker(self.sock, self.graceful_timeout, self.log_level)
+            finally:
+                # Sans les gestionnaires de sortie hérités du maître
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+
+    def stop(self, signum=None, frame=None) -> None:
+        """Arrêt propre des workers, forcé après le délai de grâce"""
+        if not self.stopping:
+            logger.info("Arrêt de %d worker(s)", len(self.children))
+            self.stopping = True
+            signal.alarm(int(self.graceful_timeout) + 5)
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def kill(self, signum=None, frame=None) -> None:
+        logger.error("Délai de grâce dépassé : workers tués")
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGALRM, self.kill)
+        for _ in range(self.workers):
+            self.spawn()
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = self.children.pop(pid, None)
+            code = os.waitstatus_to_exitcode(status)
+            if self.stopping:
+                continue
+            if code == STARTUP_FAILURE:
+                logger.error("Démarrage du worker %d impossible, arrêt", pid)
+                self.exit_code = STARTUP_FAILURE
+                self.stop()
+                continue
+            logger.warning("Worker %d arrêté (code %d), relancé", pid, code)
+            if started is not None and time.monotonic() - started < 1.0:
+                # Pas de relance en boucle d'un worker qui échoue aussitôt
+                time.sleep(1.0)
+            self.spawn()
+        signal.alarm(0)
+        return self.exit_code
+
+
+def prepare_database() -> None:
+    """Vérification (ou migration) du schéma, une seule fois avant le fork"""
+    if settings.migrate_on_startup:
+        upgrade(engine)
+    else:
+        check_schema(engine)
+    # Aucune connexion ouverte n'est héritée par les workers
+    engine.dispose()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default=settings.serve_host)
+    parser.add_argument("--port", type=int, default=settings.serve_port)
+    parser.add_argument("--workers", type=int, default=settings.serve_workers)
+    parser.add_argument(
+        "--graceful-timeout", type=float, default=settings.serve_graceful_timeout
+    )
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=args.log_level.upper(), format="%(levelname)s:     %(message)s"
+    )
+    if args.workers > 1 and not hasattr(os, "fork"):
+        parser.error("plusieurs workers nécessitent fork (POSIX)")
+    if args.workers > 1 and not (
+        settings.coordination_backend == "redis" and settings.redis_url
+    ):
+        logger.warning(
+            "%d workers sans COORDINATION_BACKEND=redis ni REDIS_URL : les "
+            "invalidations du cache et les événements ne sont pas partagés",
+            args.workers,
+        )
+
+    prepare_database()
+    sock = bind_socket(args.host, args.port)
+    host, port = sock.getsockname()[:2]
+    logger.info("Écoute sur http://%s:%d (%d worker(s))", host, port, args.workers)
+    if args.workers == 1:
+        return run_worker(sock, args.graceful_timeout, args.log_level)
+    return Supervisor(sock, args.workers, args.graceful_timeout, args.log_level).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,12 @@
 Services package initializer
 """
 
-from .article_service import ArticleService
+from .article_service import ArticleService, AsyncArticleService
+from .comment_service import AsyncCommentService, CommentService
 
-__all__ = ["ArticleService"]
+__all__ = [
+    "ArticleService",
+    "AsyncArticleService",
+    "CommentService",
+    "AsyncCommentService",
+]
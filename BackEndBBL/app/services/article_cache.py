@@ -0,0 +1,133 @@
+"""
+Cache des lectures d'articles
+
+Conserve les réponses JSON déjà sérialisées (octets) de ``GET /api/articles/``,
+``GET /api/articles/search`` et ``GET /api/articles/{id}``. Les écritures de
+``ArticleService`` invalident précisément les entrées concernées :
+
+- l'article lui-même (clé ``article:<id>``)
+- les listes qui le contiennent (étiquette ``article:<id>``)
+- toutes les listes si l'ensemble ou l'ordre des articles change (création,
+  suppression), ou les résultats de recherche si son texte change
+
+Avec un cache propre au processus et plusieurs workers, les invalidations
+sont diffusées à tous les workers par le coordinateur (canal ``cache``).
+
+Chaque corps est stocké avec l'ETag calculé avant la lecture des lignes et
+n'est servi que sous ce même ETag. Un corps périmé (lu avant une écriture
+mais stocké après son invalidation, ou invalidation pas encore reçue d'un
+autre worker) reste sous l'ancien ETag : la version suivante ne le sert
+pas, ne le confirme pas par un 304 et ne le compresse pas.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional
+
+from app.core.cache import CacheBackend, create_cache_backend
+from app.core.config import settings
+from app.core.coordination import Coordinator, coordination
+
+ALL_LISTS = "lists"
+SEARCH_LISTS = "lists:search"
+
+# Sépare l'ETag du corps dans la valeur stockée (absent d'un ETag)
+_ETAG_END = b"\n"
+
+
+def _article_tag(article_id: int) -> str:
+    return f"article:{article_id}"
+
+
+def _with_etag(body: bytes, etag: str) -> bytes:
+    return etag.encode() + _ETAG_END + body
+
+
+class ArticleCache:
+    """Cache des réponses de lecture d'articles et règles d'invalidation"""
+
+    def __init__(
+        self, backend: CacheBackend, coordinator: Optional[Coordinator] = None
+    ):
+        self.backend = backend
+        self.coordinator = coordinator
+        if coordinator is not None:
+            coordinator.subscribe("cache", self._apply_invalidation)
+
+    @staticmethod
+    def article_key(article_id: int) -> str:
+        return f"article:{article_id}"
+
+    @staticmethod
+    def list_key(kind: str, params: Dict[str, Any]) -> str:
+        """Clé d'une liste : type de liste et empreinte des paramètres de requête"""
+        canonical = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.sha1(canonical.encode()).hexdigest()
+        return f"list:{kind}:{digest}"
+
+    def get(self, key: str, etag: Optional[str] = None) -> Optional[bytes]:
+        """Corps stocké sous ``key``, s'il l'a été sous ``etag`` (tout ETag si None)"""
+        value = self.backend.get(key)
+        if value is None:
+            return None
+        stored_etag, _, body = value.partition(_ETAG_END)
+        if etag is not None and stored_etag != etag.encode():
+            return None
+        return body
+
+    def set_article(self, article_id: int, body: bytes, etag: str) -> None:
+        self.backend.set(self.article_key(article_id), _with_etag(body, etag))
+
+    def set_list(
+        self,
+        key: str,
+        body: bytes,
+        article_ids: Iterable[int],
+        etag: str,
+        search: bool = False,
+    ) -> None:
+        """Stocke une liste en la rattachant à chacun des articles qu'elle contient"""
+        tags = [ALL_LISTS] + [_article_tag(article_id) for article_id in article_ids]
+        if search:
+            tags.append(SEARCH_LISTS)
+        self.backend.set(key, _with_etag(body, etag), tags=tags)
+
+    def invalidate_article(self, article_id: int, text_changed: bool = False) -> None:
+        """
+        Invalide un article modifié et les listes qui le contiennent
+
+        Si son titre, contenu ou auteur change, les résultats de recherche sont
+        aussi invalidés : il peut désormais apparaître dans d'autres recherches.
+        """
+        self._invalidate({"article_id": article_id, "text_changed": text_changed})
+
+    def invalidate_lists(self) -> None:
+        """Invalide toutes les listes (un article apparaît ou disparaît)"""
+        self._invalidate({"lists": True})
+
+    def _invalidate(self, message: dict) -> None:
+        if self.coordinator is None or self.backend.shared:
+            self._apply_invalidation(message)
+        else:
+            self.coordinator.broadcast("cache", message)
+
+    def _apply_invalidation(self, message: dict) -> None:
+        """Applique une invalidation (de ce worker ou diffusée par un autre)"""
+        if message.get("lists"):
+            self.backend.invalidate_tags(ALL_LISTS)
+            return
+        article_id = message["article_id"]
+        self.backend.delete(self.article_key(article_id))
+        tags = [_article_tag(article_id)]
+        if message.get("text_changed"):
+            tags.append(SEARCH_LISTS)
+        self.backend.invalidate_tags(*tags)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.backend.stats.as_dict(), "entries": self.backend.size()}
+
+
+article_cache = ArticleCache(create_cache_backend(settings), coordination)
@@ -0,0 +1,185 @@
+"""
+Suppression des articles et de leurs dépendances en SQL ensembliste
+
+Un article est supprimé avec ses commentaires et ses likes par quelques
+requêtes ``DELETE ... WHERE article_id IN (...)`` servies par les index,
+sans charger une ligne dans la session (l'ancienne cascade de l'ORM chargeait
+chaque commentaire pour l'effacer individuellement).
+
+Deux modes (ARTICLE_DELETE_MODE) :
+- ``immediate`` : tout est effacé dans la transaction de la requête
+- ``deferred`` : seul l'article est effacé, et une purge est enregistrée
+  (``article_purges``) ; ``ArticlePurger`` efface ensuite commentaires et
+  likes par lots de ``batch_size`` lignes, une transaction par lot, pour ne
+  jamais retenir longtemps le verrou d'écriture. Les purges survivent à un
+  redémarrage et sont reprises par n'importe quel worker.
+"""
+
+import asyncio
+import logging
+from typing import Iterable, List, Optional
+
+from sqlalchemy import Table, delete, func, insert, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.article import Article
+from app.models.comment import Comment
+from app.models.like import Like
+from app.models.purge import ArticlePurge
+from app.services.author_stats import remove_articles
+from app.services.generations import (
+    ARTICLES_DELETED,
+    COMMENTS_DELETED,
+    bump_generation,
+)
+
+logger = logging.getLogger(__name__)
+
+# Tables rattachées à un article par leur colonne ``article_id``
+DEPENDENT_TABLES: List[Table] = [Like.__table__, Comment.__table__]
+
+
+def delete_articles(
+    connection: Connection, article_ids: Iterable[int], deferred: bool = False
+) -> List[int]:
+    """
+    Supprime des articles dans la transaction en cours
+
+    La première instruction est une écriture : sous SQLite, pas de verrou de
+    lecture à promouvoir.
+
+    Returns:
+        Les identifiants des articles effectivement supprimés
+    """
+    ids = sorted(set(article_ids))
+    if not ids:
+        return []
+    if not deferred:
+        for table in DEPENDENT_TABLES:
+            connection.execute(delete(table).where(table.c.article_id.in_(ids)))
+
+    articles = Article.__table__
+    # Ce qui est décompté des statistiques des auteurs
+    removed = (
+        articles.c.id,
+        articles.c.author,
+        articles.c.likes_count,
+        articles.c.comments_count,
+    )
+    statement = delete(articles).where(articles.c.id.in_(ids))
+    if connection.dialect.delete_returning:
+        rows = connection.execute(statement.returning(*removed)).all()
+    else:
+        rows = connection.execute(select(*removed).where(articles.c.id.in_(ids))).all()
+        connection.execute(statement)
+    deleted = sorted(row.id for row in rows)
+    remove_articles(
+        connection, ((row.author, row.likes_count, row.comments_count) for row in rows)
+    )
+    if deleted:
+        bump_generation(connection, ARTICLES_DELETED)
+        if not deferred:
+            bump_generation(connection, COMMENTS_DELETED)
+
+    if deferred and deleted:
+        max_comment_id = connection.execute(select(func.max(Comment.id))).scalar()
+        max_like_id = connection.execute(select(func.max(Like.id))).scalar()
+        connection.execute(
+            insert(ArticlePurge.__table__),
+            [
+                {
+                    "article_id": article_id,
+                    "max_comment_id": max_comment_id or 0,
+                    "max_like_id": max_like_id or 0,
+                }
+                for article_id in deleted
+            ],
+        )
+    return deleted
+
+
+def purge_batch(connection: Connection, purge, batch_size: int) -> int:
+    """
+    Efface au plus ``batch_size`` lignes de chaque table d'une purge
+
+    Returns:
+        Le nombre de lignes effacées ; la purge est terminée (sa ligne est
+        supprimée dans la même transaction) lorsqu'il ne reste rien
+    """
+    removed = 0
+    done = True
+    bounds = {"likes": purge.max_like_id, "comments": purge.max_comment_id}
+    for table in DEPENDENT_TABLES:
+        batch = (
+            select(table.c.id)
+            .where(table.c.article_id == purge.article_id)
+            .where(table.c.id <= bounds[table.name])
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        count = connection.execute(delete(table).where(table.c.id.in_(batch))).rowcount
+        if count and table is Comment.__table__:
+            bump_generation(connection, COMMENTS_DELETED)
+        removed += count
+        # Un lot incomplet : plus rien à effacer dans cette table
+        done = done and count < batch_size
+    if done:
+        connection.execute(
+            delete(ArticlePurge.__table__).where(
+                ArticlePurge.__table__.c.article_id == purge.article_id
+            )
+        )
+    return removed
+
+
+class ArticlePurger:
+    """Exécute les purges en attente, par lots, en tâche de fond"""
+
+    def __init__(
+        self,
+        session_factory: sessionmaker = SessionLocal,
+        batch_size: int = 5000,
+        interval: float = 1.0,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval = interval
+
+    def purge(self, bind: Optional[Engine] = None) -> int:
+        """
+        Termine toutes les purges en attente, un lot par transaction
+
+        Returns:
+            Le nombre de lignes effacées
+        """
+        removed = 0
+        session = Session(bind=bind) if bind is not None else self.session_factory()
+        with session:
+            while True:
+                purges = session.execute(select(ArticlePurge.__table__)).all()
+                session.commit()
+                if not purges:
+                    return removed
+                for purge in purges:
+                    removed += purge_batch(session.connection(), purge, self.batch_size)
+                    session.commit()
+
+    async def run_periodic(self) -> None:
+        """Tâche de fond : purges en attente toutes les ``interval`` secondes"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await run_in_threadpool(self.purge)
+            except Exception:
+                logger.exception("Échec de la purge des articles supprimés")
+
+
+# Purge partagée par l'application
+article_purger = ArticlePurger(
+    batch_size=settings.article_purge_batch_size,
+    interval=settings.article_purge_interval,
+)
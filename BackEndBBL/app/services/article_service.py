@@ -3,11 +3,36 @@ Service métier pour la gestion des articles
 Encapsule la logique métier liée aux articles
 """
 
+from datetime import datetime
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
+from app.core.config import settings
+from app.database import AnySession, run_in_session
 from app.models.article import Article
-from app.schemas.article import ArticleCreate, ArticleUpdate
+from app.schemas.article import ArticleCreate, ArticleUpdate, ArticleResponse
+from app.services.article_cache import article_cache
+from app.services.article_purge import delete_articles
+from app.services.author_stats import add_articles
+from app.services.comment_like_service import comment_like_buffer
+from app.services.events import event_bus
+from app.services.generations import ARTICLES_DELETED, generation_value
+from app.services.jobs import enqueue
+from app.services.like_service import like_buffer
+from app.services.pagination import (
+    decode_cursor,
+    keyset_cursor,
+    keyset_filter,
+    offset_cursor,
+    parse_keyset,
+    parse_offset,
+    raw_created_at,
+)
+from app.services.post_write import REFRESH_AUTHOR, SUMMARIZE_ARTICLE, deferred
+from app.services.projection import ARTICLE_SUMMARY_COLUMNS, rows_to_dicts
+from app.services.search import SearchHit, get_search_backend
+from app.services.summary import content_summary
+from app.services.trending import trending
 
 
 class ArticleService:
@@ -15,81 +40,467 @@ class ArticleService:
 
     @staticmethod
     def get_all_articles(
-        db: Session, search: Optional[str] = None, skip: int = 0, limit: int = 100
+        db: Session,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence] = None,
     ) -> List[Article]:
         """
         Récupère tous les articles avec recherche optionnelle
 
         Args:
             db: Session de base de données
-            search: Terme de recherche optionnel
+            search: Terme de recherche optionnel (résultats classés par pertinence)
             skip: Nombre d'enregistrements à sauter
             limit: Nombre maximum d'enregistrements à retourner
+            columns: Projection (voir ``app.services.projection``) : les
+                articles sont alors retournés sous forme de dictionnaires
         """
-        query = db.query(Article)
+        if search:
+            hits = get_search_backend(db).search(db, search, skip=skip, limit=limit)
+            return [a for a, _ in ArticleService._load_hits(db, hits, columns)]
+
+        query = db.query(*columns) if columns else db.query(Article)
+        rows = (
+            query.order_by(Article.created_at.desc(), Article.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return rows_to_dicts(rows, columns) if columns else rows
+
+    @staticmethod
+    def get_articles_page(
+        db: Session,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        columns: Optional[Sequence] = None,
+        author: Optional[str] = None,
+    ) -> Tuple[List[Article], Optional[str]]:
+        """
+        Récupère une page d'articles par curseur
+
+        Sans recherche, la page est lue par plage d'index sur
+        ``(created_at, id)`` : son coût ne dépend pas de la profondeur.
+        Avec ``author`` (nom exact), la plage est celle de l'auteur dans
+        l'index ``(author, created_at, id)``.
+        Avec recherche, le curseur transporte la position dans le classement.
+        Avec ``columns``, les articles sont des dictionnaires.
+
+        Returns:
+            Les articles de la page et le curseur de la page suivante (None
+            lorsqu'il n'y en a plus)
+
+        Raises:
+            InvalidCursorError: si le curseur fourni est invalide
+        """
+        payload = decode_cursor(cursor) if cursor else {}
 
         if search:
-            search_term = f"%{search}%"
+            skip = parse_offset(payload)
+            hits = get_search_backend(db).search(db, search, skip=skip, limit=limit + 1)
+            loaded = ArticleService._load_hits(db, hits[:limit], columns)
+            next_cursor = offset_cursor(skip + limit) if len(hits) > limit else None
+            return [a for a, _ in loaded], next_cursor
+
+        entities = columns or (Article,)
+        query = db.query(*entities, raw_created_at(Article.created_at))
+        if author is not None:
+            query = query.filter(Article.author == author)
+        key = parse_keyset(payload)
+        if key is not None:
             query = query.filter(
-                or_(
-                    Article.title.ilike(search_term),
-                    Article.content.ilike(search_term),
-                    Article.author.ilike(search_term),
-                )
+                keyset_filter(Article.created_at, Article.id, key, descending=True)
             )
+        rows = (
+            query.order_by(Article.created_at.desc(), Article.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
 
-        return query.order_by(Article.created_at.desc()).offset(skip).limit(limit).all()
+        if columns:
+            articles = rows_to_dicts(rows[:limit], columns)
+        else:
+            articles = [article for article, _ in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            # La clé brute du curseur est la dernière valeur de chaque ligne
+            last_id = articles[-1]["id"] if columns else articles[-1].id
+            next_cursor = keyset_cursor(rows[limit - 1][-1], last_id)
+        return articles, next_cursor
+
+    @staticmethod
+    def search_articles(
+        db: Session,
+        search: str,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence] = None,
+    ) -> List[Tuple[Article, SearchHit]]:
+        """
+        Recherche plein texte classée par pertinence
+
+        Retourne les articles (dictionnaires avec ``columns``) accompagnés de
+        leur score et d'un extrait surligné lorsque le moteur le permet.
+        """
+        hits = get_search_backend(db).search(db, search, skip=skip, limit=limit)
+        return ArticleService._load_hits(db, hits, columns)
+
+    @staticmethod
+    def _load_hits(
+        db: Session, hits: List[SearchHit], columns: Optional[Sequence] = None
+    ) -> List[Tuple[Article, SearchHit]]:
+        """Charge les articles trouvés en une requête, dans l'ordre du classement"""
+        if not hits:
+            return []
+        ids = [hit.article_id for hit in hits]
+        if columns:
+            rows = db.query(*columns).filter(Article.id.in_(ids))
+            articles = {a["id"]: a for a in rows_to_dicts(rows, columns)}
+        else:
+            articles = {a.id: a for a in db.query(Article).filter(Article.id.in_(ids))}
+        return [
+            (articles[hit.article_id], hit)
+            for hit in hits
+            if hit.article_id in articles
+        ]
+
+    @staticmethod
+    def get_trending(
+        db: Session,
+        window: str = "24h",
+        limit: int = 10,
+        columns: Sequence = ARTICLE_SUMMARY_COLUMNS,
+    ) -> List[dict]:
+        """
+        Articles tendance d'une fenêtre, du plus fort score au plus faible
+
+        Le classement est tenu en mémoire (voir ``app.services.trending``) :
+        seuls les ``limit`` articles retenus sont lus, par clé primaire. Les
+        articles supprimés encore classés en sont retirés au passage.
+        """
+        trending.sync(db)
+        while True:
+            ranked = trending.top(window, limit)
+            ids = [article_id for article_id, _ in ranked]
+            rows = db.query(*columns).filter(Article.id.in_(ids)) if ids else []
+            articles = {a["id"]: a for a in rows_to_dicts(rows, columns)}
+            missing = [article_id for article_id in ids if article_id not in articles]
+            if not missing:
+                break
+            for article_id in missing:
+                trending.discard(article_id)
+        return [
+            {**articles[article_id], "score": round(score, 4)}
+            for article_id, score in ranked
+        ]
 
     @staticmethod
     def get_article_by_id(db: Session, article_id: int) -> Optional[Article]:
         """Récupère un article par son ID"""
         return db.query(Article).filter(Article.id == article_id).first()
 
+    @staticmethod
+    def get_article_version(
+        db: Session, article_id: int
+    ) -> Optional[Tuple[Tuple, datetime]]:
+        """
+        Version d'un article, sans charger son contenu
+
+        Returns:
+            Les éléments de l'ETag (id, date de modification, likes en attente
+            inclus) et la date de dernière modification, ou None si l'article
+            n'existe pas
+        """
+        row = (
+            db.query(Article.created_at, Article.updated_at, Article.likes_count)
+            .filter(Article.id == article_id)
+            .first()
+        )
+        if row is None:
+            return None
+        modified_at = row.updated_at or row.created_at
+        likes_count = (row.likes_count or 0) + like_buffer.pending_count(article_id)
+        last_like = like_buffer.last_event_at(article_id)
+        if last_like is not None:
+            if modified_at.tzinfo is None:
+                # SQLite restitue des dates UTC sans fuseau
+                last_like = last_like.replace(tzinfo=None)
+            modified_at = max(modified_at, last_like)
+        return (article_id, modified_at, likes_count), modified_at
+
+    @staticmethod
+    def get_articles_version(db: Session) -> Tuple:
+        """
+        Version de l'ensemble des articles, pour l'ETag des listes
+
+        Lectures servies par les index : id et date de modification maximums,
+        et nombre de suppressions (``write_generations``, une création ou une
+        modification déplace déjà l'un des deux maximums). Sans ``COUNT`` :
+        pas de parcours de la table à chaque lecture. Complétée par les
+        générations des tampons de likes (articles, et commentaires inclus
+        dans les listes).
+        """
+        # Une sous-requête par maximum : SQLite ne lit l'index que pour un
+        # seul MAX par SELECT
+        max_id, max_updated_at, deleted = db.execute(
+            select(
+                select(func.max(Article.id)).scalar_subquery(),
+                select(func.max(Article.updated_at)).scalar_subquery(),
+                generation_value(ARTICLES_DELETED),
+            )
+        ).one()
+        return (
+            max_id,
+            max_updated_at,
+            deleted,
+            like_buffer.generation,
+            comment_like_buffer.generation,
+        )
+
     @staticmethod
     def create_article(db: Session, article_data: ArticleCreate) -> Article:
-        """Crée un nouvel article"""
-        new_article = Article(**article_data.model_dump())
+        """
+        Crée un nouvel article
+
+        En mode POST_WRITE_MODE=deferred, le résumé et les statistiques de
+        l'auteur sont calculés après la réponse (``app.services.post_write``).
+        """
+        data = article_data.model_dump()
+        if deferred():
+            new_article = Article(**data)
+        else:
+            new_article = Article(**data, **content_summary(data["content"]))
         db.add(new_article)
+        db.flush()
+        if deferred():
+            enqueue(db.connection(), SUMMARIZE_ARTICLE, [new_article.id])
+            enqueue(db.connection(), REFRESH_AUTHOR, [new_article.author])
+        else:
+            add_articles(db.connection(), [new_article.author])
         db.commit()
         db.refresh(new_article)
+        article_cache.invalidate_lists()
         return new_article
 
     @staticmethod
     def update_article(
         db: Session, article_id: int, article_data: ArticleUpdate
     ) -> Optional[Article]:
-        """Met à jour un article existant"""
+        """Met à jour un article existant (résumé différé comme à la création)"""
         article = ArticleService.get_article_by_id(db, article_id)
         if not article:
             return None
 
         update_data = article_data.model_dump(exclude_unset=True)
+        if update_data.get("content") is not None:
+            if deferred():
+                enqueue(db.connection(), SUMMARIZE_ARTICLE, [article_id])
+            else:
+                update_data.update(content_summary(update_data["content"]))
         for field, value in update_data.items():
             setattr(article, field, value)
 
         db.commit()
         db.refresh(article)
+        article_cache.invalidate_article(article_id, text_changed=bool(update_data))
         return article
 
     @staticmethod
     def delete_article(db: Session, article_id: int) -> bool:
         """Supprime un article"""
-        article = ArticleService.get_article_by_id(db, article_id)
-        if not article:
-            return False
+        return bool(ArticleService.delete_articles(db, [article_id]))
 
-        db.delete(article)
+    @staticmethod
+    def delete_articles(db: Session, article_ids: Sequence[int]) -> List[int]:
+        """
+        Supprime des articles avec leurs commentaires et likes
+
+        Requêtes ensemblistes, sans charger les commentaires ; en mode
+        ARTICLE_DELETE_MODE=deferred, commentaires et likes sont purgés
+        ensuite par ``article_purger``.
+
+        Returns:
+            Les identifiants des articles supprimés (les autres n'existaient pas)
+        """
+        deferred = settings.article_delete_mode == "deferred"
+        deleted = delete_articles(db.connection(), article_ids, deferred=deferred)
         db.commit()
-        return True
+        for article_id in deleted:
+            like_buffer.discard(article_id)
+            trending.discard(article_id)
+            article_cache.invalidate_article(article_id)
+        if deleted:
+            article_cache.invalidate_lists()
+        return deleted
 
     @staticmethod
     def increment_likes(db: Session, article_id: int) -> Optional[Article]:
-        """Incrémente le nombre de likes d'un article"""
+        """
+        Incrémente le nombre de likes d'un article
+
+        Le like est placé dans le tampon ``like_buffer`` ; il est écrit avec les
+        autres likes en attente lorsque le seuil est atteint ou par la tâche
+        périodique. Utiliser ``to_response`` pour inclure les likes en attente.
+        Le nouveau nombre de likes est publié sur le flux d'événements.
+        """
         article = ArticleService.get_article_by_id(db, article_id)
         if not article:
             return None
 
-        article.likes_count += 1
-        db.commit()
-        db.refresh(article)
+        if like_buffer.add(article_id):
+            # Termine la transaction de lecture avant d'écrire sur une autre connexion
+            db.commit()
+            try:
+                like_buffer.flush(bind=db.get_bind())
+            except Exception:
+                # Les likes restent en attente, la tâche périodique réessaiera
+                pass
+            db.refresh(article)
+        article_cache.invalidate_article(article_id)
+        likes_count = article.likes_count + like_buffer.pending_count(article_id)
+        event_bus.publish(
+            article_id, "likes", {"article_id": article_id, "likes_count": likes_count}
+        )
         return article
+
+    @staticmethod
+    def to_response(article: Article) -> ArticleResponse:
+        """Schéma de réponse d'un article, likes en attente d'écriture inclus"""
+        response = ArticleResponse.model_validate(article)
+        pending = like_buffer.pending_count(article.id)
+        if pending:
+            response.likes_count += pending
+        return response
+
+    @staticmethod
+    def add_pending_likes(article: dict) -> dict:
+        """Équivalent de ``to_response`` pour un article projeté en dictionnaire"""
+        pending = like_buffer.pending_count(article["id"])
+        if pending and "likes_count" in article:
+            article["likes_count"] += pending
+        return article
+
+
+class AsyncArticleService:
+    """
+    Version asynchrone de ArticleService
+
+    Chaque méthode délègue à ArticleService via ``run_in_session`` : la logique
+    métier reste unique, et l'appel n'occupe ni la boucle d'événements (mode
+    async) ni directement le thread de la requête (mode sync).
+    """
+
+    @staticmethod
+    async def get_all_articles(
+        db: AnySession,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence] = None,
+    ) -> List[Article]:
+        """Récupère tous les articles avec recherche optionnelle"""
+        return await run_in_session(
+            db,
+            ArticleService.get_all_articles,
+            search=search,
+            skip=skip,
+            limit=limit,
+            columns=columns,
+        )
+
+    @staticmethod
+    async def get_articles_page(
+        db: AnySession,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        columns: Optional[Sequence] = None,
+    ) -> Tuple[List[Article], Optional[str]]:
+        """Récupère une page d'articles par curseur"""
+        return await run_in_session(
+            db,
+            ArticleService.get_articles_page,
+            search=search,
+            cursor=cursor,
+            limit=limit,
+            columns=columns,
+        )
+
+    @staticmethod
+    async def search_articles(
+        db: AnySession,
+        search: str,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence] = None,
+    ) -> List[Tuple[Article, SearchHit]]:
+        """Recherche plein texte classée par pertinence"""
+        return await run_in_session(
+            db,
+            ArticleService.search_articles,
+            search,
+            skip=skip,
+            limit=limit,
+            columns=columns,
+        )
+
+    @staticmethod
+    async def get_trending(
+        db: AnySession,
+        window: str = "24h",
+        limit: int = 10,
+        columns: Sequence = ARTICLE_SUMMARY_COLUMNS,
+    ) -> List[dict]:
+        """Articles tendance d'une fenêtre, du plus fort score au plus faible"""
+        return await run_in_session(
+            db, ArticleService.get_trending, window=window, limit=limit, columns=columns
+        )
+
+    @staticmethod
+    async def get_article_by_id(db: AnySession, article_id: int) -> Optional[Article]:
+        """Récupère un article par son ID"""
+        return await run_in_session(db, ArticleService.get_article_by_id, article_id)
+
+    @staticmethod
+    async def get_article_version(
+        db: AnySession, article_id: int
+    ) -> Optional[Tuple[Tuple, datetime]]:
+        """Version d'un article, sans charger son contenu"""
+        return await run_in_session(db, ArticleService.get_article_version, article_id)
+
+    @staticmethod
+    async def get_articles_version(db: AnySession) -> Tuple:
+        """Version de l'ensemble des articles, pour l'ETag des listes"""
+        return await run_in_session(db, ArticleService.get_articles_version)
+
+    @staticmethod
+    async def create_article(db: AnySession, article_data: ArticleCreate) -> Article:
+        """Crée un nouvel article"""
+        return await run_in_session(db, ArticleService.create_article, article_data)
+
+    @staticmethod
+    async def update_article(
+        db: AnySession, article_id: int, article_data: ArticleUpdate
+    ) -> Optional[Article]:
+        """Met à jour un article existant"""
+        return await run_in_session(
+            db, ArticleService.update_article, article_id, article_data
+        )
+
+    @staticmethod
+    async def delete_article(db: AnySession, article_id: int) -> bool:
+        """Supprime un article"""
+        return await run_in_session(db, ArticleService.delete_article, article_id)
+
+    @staticmethod
+    async def delete_articles(db: AnySession, article_ids: Sequence[int]) -> List[int]:
+        """Supprime des articles avec leurs commentaires et likes"""
+        return await run_in_session(db, ArticleService.delete_articles, article_ids)
+
+    @staticmethod
+    async def increment_likes(db: AnySession, article_id: int) -> Optional[Article]:
+        """Incrémente le nombre de likes d'un article"""
+        return await run_in_session(db, ArticleService.increment_likes, article_id)
@@ -0,0 +1,92 @@
+"""
+Lecture des auteurs et de leurs articles
+
+Les statistiques viennent de la table ``author_stats`` (voir
+``app.services.author_stats``), lue par clé primaire ; les articles d'un
+auteur sont une plage de l'index ``(author, created_at, id)``. Le coût d'une
+page d'auteur ne dépend pas de la taille du corpus.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.database import AnySession, run_in_session
+from app.models.article import Article
+from app.models.author import AuthorStats
+from app.services.article_service import ArticleService
+
+
+class AuthorService:
+    """Lecture des auteurs et de leurs articles"""
+
+    @staticmethod
+    def get_authors(db: Session, skip: int = 0, limit: int = 100) -> List[AuthorStats]:
+        """Auteurs par ordre alphabétique, avec leurs statistiques"""
+        return (
+            db.query(AuthorStats)
+            .order_by(AuthorStats.author)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def get_author(db: Session, author: str) -> Optional[AuthorStats]:
+        """Statistiques d'un auteur (nom exact), None s'il n'a aucun article"""
+        return db.get(AuthorStats, author)
+
+    @staticmethod
+    def get_author_articles(
+        db: Session,
+        author: str,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        columns: Optional[Sequence] = None,
+    ) -> Tuple[Optional[AuthorStats], List[Article], Optional[str]]:
+        """
+        Statistiques d'un auteur et une page de ses articles, du plus récent
+
+        Returns:
+            Les statistiques (None si l'auteur est inconnu, sans page), les
+            articles et le curseur de la page suivante
+
+        Raises:
+            InvalidCursorError: si le curseur fourni est invalide
+        """
+        stats = AuthorService.get_author(db, author)
+        if stats is None:
+            return None, [], None
+        articles, next_cursor = ArticleService.get_articles_page(
+            db, author=author, cursor=cursor, limit=limit, columns=columns
+        )
+        return stats, articles, next_cursor
+
+
+class AsyncAuthorService:
+    """Version asynchrone de AuthorService (voir AsyncArticleService)"""
+
+    @staticmethod
+    async def get_authors(
+        db: AnySession, skip: int = 0, limit: int = 100
+    ) -> List[AuthorStats]:
+        """Auteurs par ordre alphabétique, avec leurs statistiques"""
+        return await run_in_session(db, AuthorService.get_authors, skip, limit)
+
+    @staticmethod
+    async def get_author_articles(
+        db: AnySession,
+        author: str,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        columns: Optional[Sequence] = None,
+    ) -> Tuple[Optional[AuthorStats], List[Article], Optional[str]]:
+        """Statistiques d'un auteur et une page de ses articles"""
+        return await run_in_session(
+            db,
+            AuthorService.get_author_articles,
+            author,
+            cursor=cursor,
+            limit=limit,
+            columns=columns,
+        )
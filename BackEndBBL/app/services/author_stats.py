@@ -0,0 +1,182 @@
+"""
+Statistiques par auteur, matérialisées et tenues à jour à l'écriture
+
+La table ``author_stats`` est tenue à jour dans la transaction de chaque
+écriture, par des incréments calculés par le SGBD :
+
+- création d'articles (``add_articles``) et suppression (``remove_articles``),
+  qui recalculent aussi la date du dernier article en une lecture de l'index
+  ``(author, created_at, id)`` ;
+- likes écrits par le tampon (``add_likes``) et commentaires créés ou
+  supprimés (``add_comments``), rattachés à l'auteur par l'article.
+
+Chaque écriture paie quelques mises à jour par clé primaire ; la lecture
+n'a plus de ``GROUP BY author`` à faire sur tous les articles. En mode
+POST_WRITE_MODE=deferred, créations d'articles et de commentaires délèguent
+ce travail à la file de travaux, qui recalcule la ligne de l'auteur
+(``refresh_author``).
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import bindparam, delete, func, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+from app.models.article import Article
+from app.models.author import AuthorStats
+
+# Date du dernier article d'un auteur : une lecture de l'index par auteur
+_LAST_POST_AT = (
+    select(func.max(Article.created_at))
+    .where(Article.author == bindparam("b_author"))
+    .scalar_subquery()
+)
+
+
+def add_articles(connection: Connection, authors: Iterable[str]) -> None:
+    """
+    Compte des articles créés (un auteur par article, déjà insérés)
+
+    Upsert atomique (``ON CONFLICT DO UPDATE``) : le premier article d'un
+    auteur crée sa ligne, même avec des écrivains concurrents.
+    """
+    counts = Counter(authors)
+    if not counts:
+        return
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(AuthorStats).values(
+        author=bindparam("b_author"),
+        articles_count=bindparam("articles"),
+        likes_count=0,
+        comments_count=0,
+        last_post_at=_LAST_POST_AT,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[AuthorStats.author],
+        set_={
+            "articles_count": AuthorStats.articles_count
+            + statement.excluded.articles_count,
+            "last_post_at": statement.excluded.last_post_at,
+        },
+    )
+    connection.execute(
+        statement,
+        [{"b_author": author, "articles": n} for author, n in counts.items()],
+    )
+
+
+def remove_articles(
+    connection: Connection, articles: Iterable[Tuple[str, int, int]]
+) -> None:
+    """
+    Décompte des articles supprimés, donnés par ``(author, likes, comments)``
+
+    Les lignes des auteurs qui n'ont plus d'article sont supprimées.
+    """
+    deltas: Dict[str, List[int]] = {}
+    for author, likes_count, comments_count in articles:
+        delta = deltas.setdefault(author, [0, 0, 0])
+        delta[0] += 1
+        delta[1] += likes_count or 0
+        delta[2] += comments_count or 0
+    if not deltas:
+        return
+    connection.execute(
+        update(AuthorStats)
+        .where(AuthorStats.author == bindparam("b_author"))
+        .values(
+            articles_count=AuthorStats.articles_count - bindparam("articles"),
+            likes_count=AuthorStats.likes_count - bindparam("likes"),
+            comments_count=AuthorStats.comments_count - bindparam("comments"),
+            last_post_at=_LAST_POST_AT,
+        ),
+        [
+            {"b_author": author, "articles": n, "likes": likes, "comments": comments}
+            for author, (n, likes, comments) in deltas.items()
+        ],
+    )
+    connection.execute(
+        delete(AuthorStats)
+        .where(AuthorStats.author.in_(list(deltas)))
+        .where(AuthorStats.articles_count <= 0)
+    )
+
+
+def _add_to_articles(connection: Connection, column, deltas: Dict[int, int]) -> None:
+    """Ajoute ``deltas`` (article_id -> n) au compteur de l'auteur de chaque article"""
+    author = (
+        select(Article.author).where(Article.id == bindparam("b_id")).scalar_subquery()
+    )
+    connection.execute(
+        update(AuthorStats)
+        .where(AuthorStats.author == author)
+        .values({column: column + bindparam("delta")}),
+        [{"b_id": article_id, "delta": delta} for article_id, delta in deltas.items()],
+    )
+
+
+def add_likes(connection: Connection, deltas: Dict[int, int]) -> None:
+    """Likes écrits, par article : ajoutés au total de leurs auteurs"""
+    _add_to_articles(connection, AuthorStats.likes_count, deltas)
+
+
+def add_comments(connection: Connection, deltas: Dict[int, int]) -> None:
+    """Commentaires créés (ou supprimés, delta négatif), par article"""
+    _add_to_articles(connection, AuthorStats.comments_count, deltas)
+
+
+def refresh_author(connection: Connection, author: str) -> None:
+    """
+    Recalcule la ligne d'un auteur à partir de ses articles
+
+    Pour les écritures différées (``app.services.post_write``) : le résultat
+    ne dépend pas du nombre de demandes, qui peuvent donc être regroupées.
+    """
+    articles_count, likes_count, comments_count, last_post_at = connection.execute(
+        select(
+            func.count(Article.id),
+            func.coalesce(func.sum(Article.likes_count), 0),
+            func.coalesce(func.sum(Article.comments_count), 0),
+            func.max(Article.created_at),
+        ).where(Article.author == author)
+    ).one()
+    if not articles_count:
+        connection.execute(delete(AuthorStats).where(AuthorStats.author == author))
+        return
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(AuthorStats).values(
+        author=author,
+        articles_count=articles_count,
+        likes_count=likes_count,
+        comments_count=comments_count,
+        last_post_at=last_post_at,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[AuthorStats.author],
+        set_={
+            column: statement.excluded[column]
+            for column in (
+                "articles_count",
+                "likes_count",
+                "comments_count",
+                "last_post_at",
+            )
+        },
+    )
+    connection.execute(statement)
+
+
+def rebuild_author_stats(connection: Connection) -> None:
+    """Recalcule toute la table à partir des articles (maintenance)"""
+    connection.execute(delete(AuthorStats))
+    connection.execute(
+        text(
+            "INSERT INTO author_stats "
+            "(author, articles_count, likes_count, comments_count, last_post_at) "
+            "SELECT author, count(*), sum(coalesce(likes_count, 0)), "
+            "sum(coalesce(comments_count, 0)), max(created_at) "
+            "FROM articles GROUP BY author"
+        )
+    )
@@ -0,0 +1,245 @@
+"""
+Import et export en masse au format NDJSON (un objet JSON par ligne)
+
+L'import lit le corps de la requête au fil de l'eau, valide chaque ligne avec
+le schéma de création habituel et insère les lignes valides par lots
+(``executemany``, une transaction par lot). Les lignes rejetées sont
+signalées avec leur numéro, sans interrompre l'import.
+
+L'export lit les articles sur un curseur côté serveur, par lots : la mémoire
+utilisée ne dépend pas du nombre d'articles.
+"""
+
+from typing import AsyncIterator, Callable, Iterator, List, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool
+
+from app.core.config import settings
+from app.database import AnySession, run_in_session
+from app.models.article import Article
+from app.models.comment import Comment
+from app.schemas.bulk import BulkImportResult, BulkRowError
+from app.services.article_cache import article_cache
+from app.services.article_service import ArticleService
+from app.services.author_stats import add_articles, add_comments
+from app.services.summary import content_summary
+
+# Nombre maximal d'erreurs détaillées dans le bilan (les suivantes sont comptées)
+MAX_REPORTED_ERRORS = 1000
+
+# (numéro de ligne, valeurs à insérer)
+Row = Tuple[int, dict]
+RowError = Tuple[int, str]
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Découpe un flux d'octets en lignes numérotées, lignes vides ignorées"""
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def _describe(exc: ValidationError) -> str:
+    """Première erreur de validation, sous la forme ``champ: message``"""
+    error = exc.errors()[0]
+    location = ".".join(str(part) for part in error["loc"])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+def _insert_rows(
+    db: Session,
+    model,
+    rows: Sequence[Row],
+    after_insert: Callable[[Session, List[dict]], None] = None,
+) -> List[RowError]:
+    """
+    Insère un lot en une transaction
+
+    Si le lot échoue (contrainte violée...), il est annulé puis rejoué ligne
+    par ligne afin d'isoler les lignes fautives.
+    """
+    if not rows:
+        return []
+    try:
+        values = [row for _, row in rows]
+        db.execute(insert(model), values)
+        if after_insert is not None:
+            after_insert(db, values)
+        db.commit()
+        return []
+    except SQLAlchemyError:
+        db.rollback()
+
+    errors = []
+    for line_number, row in rows:
+        try:
+            db.execute(insert(model), [row])
+            if after_insert is not None:
+                after_insert(db, [row])
+            db.commit()
+        except SQLAlchemyError as exc:
+            db.rollback()
+            errors.append((line_number, str(getattr(exc, "orig", None) or exc)))
+    return errors
+
+
+def insert_articles(db: Session, rows: Sequence[Row]) -> List[RowError]:
+    """Insère un lot d'articles validés ; retourne les lignes en échec"""
+    rows = [
+        (line_number, {**row, **content_summary(row["content"])})
+        for line_number, row in rows
+    ]
+    errors = _insert_rows(db, Article, rows, after_insert=_add_author_articles)
+    if len(errors) < len(rows):
+        article_cache.invalidate_lists()
+    return errors
+
+
+def _add_author_articles(db: Session, values: List[dict]) -> None:
+    """Compte les articles insérés dans les statistiques de leurs auteurs"""
+    add_articles(db.connection(), (row["author"] for row in values))
+
+
+def _add_comment_counts(db: Session, values: List[dict]) -> None:
+    """Incrémente comments_count des articles concernés, dans la transaction"""
+    deltas = {}
+    for row in values:
+        deltas[row["article_id"]] = deltas.get(row["article_id"], 0) + 1
+    increments = update(Article).where(Article.id == bindparam("b_id"))
+    increments = increments.values(
+        comments_count=Article.comments_count + bindparam("delta")
+    )
+    db.connection().execute(
+        increments,
+        [{"b_id": article_id, "delta": delta} for article_id, delta in deltas.items()],
+    )
+    add_comments(db.connection(), deltas)
+
+
+def insert_comments(db: Session, rows: Sequence[Row]) -> List[RowError]:
+    """Insère un lot de commentaires validés ; retourne les lignes en échec"""
+    article_ids = {row["article_id"] for _, row in rows}
+    existing = set(db.scalars(select(Article.id).where(Article.id.in_(article_ids))))
+    errors = [
+        (line_number, f"article_id: Article {row['article_id']} non trouvé")
+        for line_number, row in rows
+        if row["article_id"] not in existing
+    ]
+    valid = [
+        (line_number, row) for line_number, row in rows if row["article_id"] in existing
+    ]
+    errors += _insert_rows(db, Comment, valid, after_insert=_add_comment_counts)
+
+    failed = {line_number for line_number, _ in errors}
+    for article_id in {row["article_id"] for line, row in valid if line not in failed}:
+        article_cache.invalidate_article(article_id)
+    return sorted(errors)
+
+
+async def import_ndjson(
+    db: AnySession,
+    chunks: AsyncIterator[bytes],
+    schema: Type[BaseModel],
+    insert_chunk: Callable[[Session, Sequence[Row]], List[RowError]],
+    chunk_size: int = None,
+) -> BulkImportResult:
+    """
+    Importe un flux NDJSON
+
+    Args:
+        db: Session de base de données
+        chunks: Corps de la requête, morceau par morceau
+        schema: Schéma de validation de chaque ligne (ex. ArticleCreate)
+        insert_chunk: Fonction d'insertion d'un lot de lignes validées
+        chunk_size: Lignes par transaction (``BULK_CHUNK_SIZE`` par défaut)
+    """
+    chunk_size = chunk_size or settings.bulk_chunk_size
+    result = BulkImportResult()
+    pending: List[Row] = []
+
+    def reject(line_number: int, error: str) -> None:
+        result.failed += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(BulkRowError(line=line_number, error=error))
+
+    async def flush() -> None:
+        errors = await run_in_session(db, insert_chunk, list(pending))
+        result.inserted += len(pending) - len(errors)
+        for line_number, error in errors:
+            reject(line_number, error)
+        pending.clear()
+
+    async for line_number, line in iter_ndjson(chunks):
+        result.received += 1
+        try:
+            item = schema.model_validate_json(line)
+        except ValidationError as exc:
+            reject(line_number, _describe(exc))
+            continue
+        pending.append((line_number, item.model_dump()))
+        if len(pending) >= chunk_size:
+            await flush()
+    if pending:
+        await flush()
+
+    result.errors.sort(key=lambda error: error.line)
+    return result
+
+
+def _export_statement(batch_size: int):
+    """Articles par id croissant, lus par lots sur un curseur serveur"""
+    return (
+        select(*Article.__table__.columns)
+        .order_by(Article.id)
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+
+
+def _encode_rows(rows) -> bytes:
+    """Lignes NDJSON d'un lot d'articles (likes en attente inclus)"""
+    return b"".join(
+        ArticleService.to_response(row).model_dump_json().encode() + b"\n"
+        for row in rows
+    )
+
+
+def iter_articles_export(bind, batch_size: int) -> Iterator[bytes]:
+    """Export NDJSON des articles, sur une connexion dédiée"""
+    with Session(bind=bind) as session:
+        result = session.execute(_export_statement(batch_size))
+        for rows in result.partitions():
+            yield _encode_rows(rows)
+
+
+async def export_articles(
+    db: AnySession, batch_size: int = None
+) -> AsyncIterator[bytes]:
+    """
+    Export NDJSON des articles, un morceau par lot
+
+    L'export utilise sa propre session : il ne dépend pas de la durée de vie
+    de la session de la requête, qui peut se terminer avant la fin du flux.
+    """
+    batch_size = batch_size or settings.export_batch_size
+    if isinstance(db, AsyncSession):
+        async with AsyncSession(bind=db.bind) as session:
+            result = await session.stream(_export_statement(batch_size))
+            async for rows in result.partitions():
+                yield _encode_rows(rows)
+    else:
+        export = iter_articles_export(db.get_bind(), batch_size)
+        async for chunk in iterate_in_threadpool(export):
+            yield chunk
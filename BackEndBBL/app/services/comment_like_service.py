@@ -0,0 +1,38 @@
+"""
+Buffered comment likes
+
+Likes on comments are counted in memory per comment and written in one
+transaction of atomic increments (``likes_count = likes_count + n``) when the
+buffer reaches its threshold or periodically from a background task, by the
+same ``CounterBuffer`` as article likes (see ``app.services.like_service``).
+Unlike article likes they are not journaled: only the counter is kept.
+"""
+
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.core.coordination import coordination
+from app.models.comment import Comment
+from app.services.counter_buffer import Batch, CounterBuffer, apply_increments
+
+# Shared counter of the comment likes received by every worker
+GENERATION_COUNTER = "comment_likes:generation"
+
+
+def apply_comment_like_batch(connection: Connection, batch: Batch) -> None:
+    """Apply a batch of comment likes as atomic increments of ``likes_count``"""
+    apply_increments(connection, Comment.likes_count, batch)
+
+
+class CommentLikeBuffer(CounterBuffer):
+    """Comment likes waiting to be written, per comment"""
+
+    def __init__(self, **options):
+        super().__init__(apply_comment_like_batch, GENERATION_COUNTER, **options)
+
+
+comment_like_buffer = CommentLikeBuffer(
+    max_pending=settings.like_flush_max_pending,
+    flush_interval=settings.like_flush_interval,
+    coordinator=coordination,
+)
@@ -2,13 +2,39 @@
 This module uses the Pydantic schema in `app.schemas.comment` to validate inputs.
 """
 
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+from typing import Dict, Iterable, List, Literal, Optional, Sequence, Tuple
+from app.database import AnySession, run_in_session
+from app.models.article import Article
 from app.models.comment import Comment
 from app.schemas.comment import CommentCreate  # reuse validation schema from Pydantic
+from app.services.article_cache import article_cache
+from app.services.author_stats import add_comments, rebuild_author_stats
+from app.services.comment_like_service import comment_like_buffer
+from app.services.events import event_bus
+from app.services.generations import (
+    COMMENTS_DELETED,
+    bump_generation,
+    generation_value,
+)
+from app.services.jobs import enqueue
+from app.services.pagination import (
+    decode_cursor,
+    keyset_cursor,
+    keyset_filter,
+    parse_keyset,
+    raw_created_at,
+)
+from app.services.post_write import RECOUNT_COMMENTS, deferred
+from app.services.projection import column_keys, rows_to_dicts
 
 # Single module-level docstring is above; keep code concise below.
 
+# Orders offered by comment listings (oldest first when not given)
+CommentSort = Literal["top", "new"]
+
 
 class CommentService:
     """Service layer for comment-related operations.
@@ -19,22 +45,159 @@ class CommentService:
     """
 
     @staticmethod
-    def get_comments_by_article(db: Session, article_id: int) -> List[Comment]:
+    def get_comments_by_article(
+        db: Session,
+        article_id: int,
+        columns: Optional[Sequence] = None,
+        sort: Optional[CommentSort] = None,
+        limit: Optional[int] = None,
+    ) -> List[Comment]:
         """Return comments for a specific article, ordered by created date.
 
         Args:
             db: SQLAlchemy session
             article_id: id of the article to get comments for
+            columns: optional projection (see ``app.services.projection``);
+                comments are then returned as plain dicts
+            sort: ``"top"`` for the most liked first, ``"new"`` for the newest
+                first; oldest first by default. Each order is an index range
+                (``(article_id, likes_count, id)`` or
+                ``(article_id, created_at, id)``), so the first ``limit``
+                comments are read without sorting the thread.
+            limit: maximum number of comments to return
+        """
+        query = db.query(*columns) if columns else db.query(Comment)
+        query = query.filter(Comment.article_id == article_id)
+        if sort == "top":
+            # Raw column (not coalesced) so the order is the index's
+            query = query.order_by(Comment.likes_count.desc(), Comment.id.desc())
+        elif sort == "new":
+            query = query.order_by(Comment.created_at.desc(), Comment.id.desc())
+        else:
+            query = query.order_by(Comment.created_at, Comment.id)
+        if limit is not None:
+            query = query.limit(limit)
+        rows = query.all()
+        return rows_to_dicts(rows, columns) if columns else rows
+
+    @staticmethod
+    def get_comments_page(
+        db: Session,
+        article_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        columns: Optional[Sequence] = None,
+    ) -> Tuple[List[Comment], Optional[str]]:
+        """Return one page of an article's comments, oldest first.
+
+        Pages are read as an index range on ``(article_id, created_at, id)`` so
+        fetching a deep page costs the same as fetching the first one.
+
+        Returns the comments (dicts when ``columns`` is given) and the cursor
+        of the next page (None on the last page). Raises ``InvalidCursorError``
+        when the cursor cannot be decoded.
+        """
+        entities = columns or (Comment,)
+        query = db.query(*entities, raw_created_at(Comment.created_at)).filter(
+            Comment.article_id == article_id
+        )
+        key = parse_keyset(decode_cursor(cursor)) if cursor else None
+        if key is not None:
+            query = query.filter(
+                keyset_filter(Comment.created_at, Comment.id, key, descending=False)
+            )
+        rows = query.order_by(Comment.created_at, Comment.id).limit(limit + 1).all()
+
+        if columns:
+            comments = rows_to_dicts(rows[:limit], columns)
+        else:
+            comments = [comment for comment, _ in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            # The raw cursor key is the last value of each row
+            last_id = comments[-1]["id"] if columns else comments[-1].id
+            next_cursor = keyset_cursor(rows[limit - 1][-1], last_id)
+        return comments, next_cursor
+
+    @staticmethod
+    def get_recent_comments(
+        db: Session,
+        article_ids: Iterable[int],
+        per_article: int,
+        columns: Optional[Sequence] = None,
+    ) -> Dict[int, List[Comment]]:
+        """Return the latest ``per_article`` comments of each article, newest first.
+
+        All articles are served by a single query: comments are ranked within
+        each article with ``ROW_NUMBER()`` and only the top of each partition
+        is kept, instead of issuing one query per article. With ``columns``
+        (which must include ``article_id``) comments are returned as dicts.
         """
-        query = db.query(Comment).filter(Comment.article_id == article_id)
-        return query.order_by(Comment.created_at).all()
+        article_ids = list(article_ids)
+        recent: Dict[int, List[Comment]] = {
+            article_id: [] for article_id in article_ids
+        }
+        if not article_ids or per_article <= 0:
+            return recent
+
+        position = (
+            func.row_number()
+            .over(
+                partition_by=Comment.article_id,
+                order_by=(Comment.created_at.desc(), Comment.id.desc()),
+            )
+            .label("position")
+        )
+        ranked = (
+            select(*(columns or (Comment,)), position)
+            .where(Comment.article_id.in_(article_ids))
+            .subquery()
+        )
+        if columns:
+            keys = column_keys(columns)
+            query = db.query(*(ranked.c[key] for key in keys))
+        else:
+            query = db.query(aliased(Comment, ranked))
+        query = query.filter(ranked.c.position <= per_article).order_by(
+            ranked.c.article_id, ranked.c.position
+        )
+        if columns:
+            for comment in rows_to_dicts(query, columns):
+                recent[comment["article_id"]].append(comment)
+        else:
+            for comment in query:
+                recent[comment.article_id].append(comment)
+        return recent
 
     @staticmethod
-    def create_comment(db: Session, comment_data: CommentCreate) -> Comment:
-        """Create and return a new comment instance.
+    def get_comments_version(db: Session, article_id: int) -> Tuple[int, int, int, int]:
+        """Return ``(count, max id, deletions, comment likes generation)``.
+
+        Comments are never edited, so these aggregates change whenever the
+        thread does. The deletion generation covers a delete followed by a
+        create that reuses the deleted id (same count and max id); the like
+        buffer's generation covers ``likes_count``. They are used as the ETag
+        of comment listings.
+        """
+        count, max_id, deleted = (
+            db.query(
+                func.count(Comment.id),
+                func.max(Comment.id),
+                generation_value(COMMENTS_DELETED),
+            )
+            .filter(Comment.article_id == article_id)
+            .one()
+        )
+        return count, max_id, deleted, comment_like_buffer.generation
+
+    @staticmethod
+    def create_comment(db: Session, comment_data: CommentCreate) -> Optional[Comment]:
+        """Create and return a new comment, or None if the article does not exist.
 
         Uses the `CommentCreate` Pydantic schema for input validation before
-        persisting to the DB.
+        persisting to the DB. The comment is published to the article's event
+        stream once committed. With POST_WRITE_MODE=deferred the article's
+        comments_count and author stats are recounted by a queued job.
         """
         new_comment = Comment(
             article_id=comment_data.article_id,
@@ -42,13 +205,93 @@ class CommentService:
             content=comment_data.content,
         )
         db.add(new_comment)
+        try:
+            # The insert comes first: once it holds the write lock, the article
+            # cannot be deleted before the commit
+            db.flush()
+        except IntegrityError:
+            # Foreign key enforced by the database
+            db.rollback()
+            return None
+        # SQLite does not enforce the foreign key
+        article = select(Article.id).where(Article.id == comment_data.article_id)
+        if db.scalar(article) is None:
+            db.rollback()
+            return None
+        if deferred():
+            enqueue(db.connection(), RECOUNT_COMMENTS, [comment_data.article_id])
+        else:
+            _adjust_comments_count(db, comment_data.article_id, 1)
         db.commit()
         db.refresh(new_comment)
+        article_cache.invalidate_article(comment_data.article_id)
+        event_bus.publish(
+            new_comment.article_id,
+            "comment_created",
+            CommentService.to_dict(new_comment),
+        )
         return new_comment
 
+    @staticmethod
+    def like_comment(db: Session, comment_id: int) -> Optional[Comment]:
+        """Add a like to a comment; return the comment, or None if it does not exist.
+
+        The like goes to ``comment_like_buffer`` and is written with the other
+        pending likes as one atomic increment per comment, when the buffer is
+        full or by the periodic flush. Use ``to_dict`` to include pending likes.
+        The new count is published to the article's event stream.
+        """
+        comment = db.get(Comment, comment_id)
+        if comment is None:
+            return None
+
+        if comment_like_buffer.add(comment_id):
+            # End the read transaction before writing on another connection
+            db.commit()
+            try:
+                comment_like_buffer.flush(bind=db.get_bind())
+            except Exception:
+                # Likes stay pending, the periodic flush will retry
+                pass
+            db.refresh(comment)
+        # Article listings embed their recent comments
+        article_cache.invalidate_article(comment.article_id)
+        event_bus.publish(
+            comment.article_id,
+            "comment_likes",
+            {
+                "id": comment.id,
+                "article_id": comment.article_id,
+                "likes_count": CommentService.to_dict(comment)["likes_count"],
+            },
+        )
+        return comment
+
+    @staticmethod
+    def to_dict(comment: Comment) -> dict:
+        """Map a Comment to the CommentResponse fields, pending likes included."""
+        return CommentService.add_pending_likes(
+            {
+                "id": comment.id,
+                "article_id": comment.article_id,
+                "author": comment.author,
+                "content": comment.content,
+                "likes_count": comment.likes_count or 0,
+                "created_at": comment.created_at,
+            }
+        )
+
+    @staticmethod
+    def add_pending_likes(comment: dict) -> dict:
+        """Add the likes still in the buffer to a projected comment."""
+        pending = comment_like_buffer.pending_count(comment["id"])
+        if pending and "likes_count" in comment:
+            comment["likes_count"] += pending
+        return comment
+
     @staticmethod
     def delete_comment(db: Session, comment_id: int) -> bool:
-        """Delete a comment by id.
+        """Delete a comment by id and publish the deletion to the article's stream.
 
         Returns True on success, False if the comment does not exist.
         """
@@ -56,6 +299,127 @@ class CommentService:
         existing_comment = query.first()
         if not existing_comment:
             return False
+        article_id = existing_comment.article_id
         query.delete()
+        _adjust_comments_count(db, article_id, -1)
+        bump_generation(db.connection(), COMMENTS_DELETED)
         db.commit()
+        comment_like_buffer.discard(comment_id)
+        article_cache.invalidate_article(article_id)
+        event_bus.publish(
+            article_id, "comment_deleted", {"id": comment_id, "article_id": article_id}
+        )
         return True
+
+
+def _adjust_comments_count(db: Session, article_id: int, delta: int) -> None:
+    """Apply ``delta`` to the article's comments_count in the current transaction.
+
+    The increment is computed by the database so concurrent writers never
+    lose an update. The author's total in ``author_stats`` follows.
+    """
+    db.execute(
+        update(Article)
+        .where(Article.id == article_id)
+        .values(comments_count=Article.comments_count + delta)
+    )
+    add_comments(db.connection(), {article_id: delta})
+
+
+def rebuild_comment_counts(db: Session) -> None:
+    """Recompute ``articles.comments_count`` from the comments table."""
+    count = (
+        select(func.count(Comment.id))
+        .where(Comment.article_id == Article.id)
+        .scalar_subquery()
+    )
+    # updated_at is kept as is: recounting is not an edit of the articles
+    db.execute(
+        update(Article).values(comments_count=count, updated_at=Article.updated_at)
+    )
+    rebuild_author_stats(db.connection())
+    db.commit()
+
+
+class AsyncCommentService:
+    """Async counterpart of CommentService.
+
+    Each coroutine delegates to the matching CommentService method through
+    ``run_in_session`` so both modes share the same queries.
+    """
+
+    @staticmethod
+    async def get_comments_by_article(
+        db: AnySession,
+        article_id: int,
+        columns: Optional[Sequence] = None,
+        sort: Optional[CommentSort] = None,
+        limit: Optional[int] = None,
+    ) -> List[Comment]:
+        """Return comments for a specific article, ordered by created date."""
+        return await run_in_session(
+            db,
+            CommentService.get_comments_by_article,
+            article_id,
+            columns=columns,
+            sort=sort,
+            limit=limit,
+        )
+
+    @staticmethod
+    async def get_comments_page(
+        db: AnySession,
+        article_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        columns: Optional[Sequence] = None,
+    ) -> Tuple[List[Comment], Optional[str]]:
+        """Return one page of an article's comments, oldest first."""
+        return await run_in_session(
+            db,
+            CommentService.get_comments_page,
+            article_id,
+            cursor=cursor,
+            limit=limit,
+            columns=columns,
+        )
+
+    @staticmethod
+    async def get_recent_comments(
+        db: AnySession,
+        article_ids: Iterable[int],
+        per_article: int,
+        columns: Optional[Sequence] = None,
+    ) -> Dict[int, List[Comment]]:
+        """Return the latest ``per_article`` comments of each article."""
+        return await run_in_session(
+            db,
+            CommentService.get_recent_comments,
+            list(article_ids),
+            per_article,
+            columns=columns,
+        )
+
+    @staticmethod
+    async def get_comments_version(
+        db: AnySession, article_id: int
+    ) -> Tuple[int, int, int, int]:
+        """Return ``(count, max id, deletions, comment likes generation)``."""
+        return await run_in_session(db, CommentService.get_comments_version, article_id)
+
+    @staticmethod
+    async def create_comment(
+        db: AnySession, comment_data: CommentCreate
+    ) -> Optional[Comment]:
+        """Create and return a new comment, or None if the article does not exist."""
+        return await run_in_session(db, CommentService.create_comment, comment_data)
+
+    @staticmethod
+    async def like_comment(db: AnySession, comment_id: int) -> Optional[Comment]:
+        """Add a like to a comment."""
+        return await run_in_session(db, CommentService.like_comment, comment_id)
+
+    @staticmethod
+    async def delete_comment(db: AnySession, comment_id: int) -> bool:
+        """Delete a comment by id."""
+        return await run_in_session(db, CommentService.delete_comment, comment_id)
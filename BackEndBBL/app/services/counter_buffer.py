@@ -0,0 +1,195 @@
+"""
+Tampon de compteurs : incréments en mémoire et écritures groupées
+
+Base commune des likes d'articles (``app.services.like_service``) et de
+commentaires (``app.services.comment_like_service``). Chaque incrément est
+ajouté à un tampon par ligne au lieu d'être écrit immédiatement. Le tampon
+est vidé en une seule transaction par la fonction ``apply_batch`` du
+compteur lorsqu'il atteint un seuil, ou périodiquement par une tâche de fond.
+"""
+
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import InstrumentedAttribute, Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.core.coordination import Coordinator
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Lot à écrire : identifiant de ligne -> horodatages des incréments
+Batch = Dict[int, List[datetime]]
+
+
+def apply_increments(
+    connection: Connection, column: InstrumentedAttribute, batch: Batch
+) -> None:
+    """
+    Incrémente ``column`` d'autant que d'événements du lot, par ligne
+
+    Les incréments sont calculés par le SGBD (``column + :delta``) : aucune
+    mise à jour n'est perdue même si plusieurs processus écrivent en parallèle.
+    Les événements d'une ligne supprimée entre-temps ne touchent aucune ligne.
+    """
+    table = column.class_.__table__
+    increments = update(table).where(table.c.id == bindparam("b_id"))
+    increments = increments.values(
+        {column.key: func.coalesce(column, 0) + bindparam("delta")}
+    )
+    connection.execute(
+        increments,
+        [{"b_id": row_id, "delta": len(events)} for row_id, events in batch.items()],
+    )
+
+
+class CounterBuffer:
+    """
+    Incréments en attente d'écriture, partagés par les requêtes
+
+    Thread-safe : les routes synchrones s'exécutent dans le pool de threads.
+    """
+
+    def __init__(
+        self,
+        apply_batch: Callable[[Connection, Batch], None],
+        generation_counter: str,
+        session_factory: sessionmaker = SessionLocal,
+        max_pending: int = 500,
+        flush_interval: float = 1.0,
+        coordinator: Optional[Coordinator] = None,
+    ):
+        self.apply_batch = apply_batch
+        self.generation_counter = generation_counter
+        self.session_factory = session_factory
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        # Identifiant -> horodatages des incréments pas encore écrits
+        self._pending: Batch = {}
+        self._pending_total = 0
+        # Incréments en cours d'écriture : comptés tant que le commit n'est pas fait
+        self._inflight: Dict[int, int] = {}
+        # Horodatage du dernier incrément reçu par ligne (Last-Modified)
+        self._last_event: Dict[int, datetime] = {}
+        # Incrémenté à chaque événement : version des listes pour les ETag,
+        # commune à tous les workers avec un coordinateur
+        self.coordinator = coordinator
+        self._generation = 0
+
+    def add(self, row_id: int) -> bool:
+        """
+        Enregistre un incrément
+
+        Returns:
+            True si le seuil est atteint et que le tampon doit être vidé
+        """
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            self._pending.setdefault(row_id, []).append(now)
+            self._pending_total += 1
+            self._last_event[row_id] = now
+            self._generation += 1
+            full = self._pending_total >= self.max_pending
+        if self.coordinator is not None:
+            self.coordinator.incr(self.generation_counter)
+        return full
+
+    @property
+    def generation(self) -> int:
+        """Nombre d'incréments reçus (par tous les workers avec un coordinateur)"""
+        if self.coordinator is not None:
+            return self.coordinator.counter(self.generation_counter)
+        with self._lock:
+            return self._generation
+
+    def pending_count(self, row_id: int) -> int:
+        """Nombre d'incréments de la ligne pas encore visibles en base"""
+        with self._lock:
+            pending = len(self._pending.get(row_id, ()))
+            return pending + self._inflight.get(row_id, 0)
+
+    def last_event_at(self, row_id: int) -> Optional[datetime]:
+        """Horodatage du dernier incrément reçu par ce processus pour la ligne"""
+        with self._lock:
+            return self._last_event.get(row_id)
+
+    def pending_total(self) -> int:
+        """Nombre total d'incréments en attente d'écriture"""
+        with self._lock:
+            return self._pending_total
+
+    def discard(self, row_id: Optional[int] = None) -> None:
+        """Abandonne les incréments en attente (d'une ligne supprimée, ou tous)"""
+        with self._lock:
+            if row_id is None:
+                self._pending.clear()
+                self._pending_total = 0
+                self._last_event.clear()
+            else:
+                self._pending_total -= len(self._pending.pop(row_id, ()))
+                self._last_event.pop(row_id, None)
+
+    def flush(self, bind: Optional[Engine] = None) -> int:
+        """
+        Écrit les incréments en attente en une transaction
+
+        Utilise une session dédiée (sur ``bind`` si fourni) qui commence
+        directement par les écritures, sans lecture préalable : sous SQLite,
+        cela évite l'erreur « database is locked » due à la promotion d'un
+        verrou de lecture en verrou d'écriture.
+
+        Returns:
+            Le nombre d'incréments écrits
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            self._pending_total = 0
+            for row_id, events in batch.items():
+                self._inflight[row_id] = self._inflight.get(row_id, 0) + len(events)
+
+        written = sum(len(events) for events in batch.values())
+        session = Session(bind=bind) if bind is not None else self.session_factory()
+        try:
+            with session:
+                self.apply_batch(session.connection(), batch)
+                session.commit()
+        except Exception:
+            logger.exception(
+                "Échec de l'écriture de %d incréments (%s), remis en attente",
+                written,
+                self.generation_counter,
+            )
+            with self._lock:
+                for row_id, events in batch.items():
+                    self._pending.setdefault(row_id, [])[:0] = events
+                    self._pending_total += len(events)
+            raise
+        finally:
+            with self._lock:
+                for row_id, events in batch.items():
+                    remaining = self._inflight.get(row_id, 0) - len(events)
+                    if remaining > 0:
+                        self._inflight[row_id] = remaining
+                    else:
+                        self._inflight.pop(row_id, None)
+        return written
+
+    async def run_periodic(self) -> None:
+        """Tâche de fond : vide le tampon toutes les ``flush_interval`` secondes"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self.pending_total():
+                try:
+                    await run_in_threadpool(self.flush)
+                except Exception:
+                    # Déjà journalisé ; les incréments restent en attente
+                    pass
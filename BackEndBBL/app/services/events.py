@@ -0,0 +1,366 @@
+"""
+Bus d'événements du processus pour les flux Server-Sent Events
+
+Les écritures publient un événement sur le sujet de leur article
+(commentaire créé ou supprimé, nouveau nombre de likes) ; chaque connexion
+``GET /api/articles/{id}/events`` est un abonné de ce sujet. L'événement est
+encodé une seule fois, en trame SSE prête à l'envoi, quel que soit le nombre
+d'abonnés.
+
+- Reprise : les derniers événements de chaque article sont conservés dans un
+  tampon circulaire ; un client qui se reconnecte avec ``Last-Event-ID``
+  reçoit ceux qu'il a manqués. S'ils ne sont plus disponibles (tampon
+  dépassé, autre processus, redémarrage), il reçoit un événement ``reset``
+  et recharge la page.
+- Clients lents : un abonné ne garde qu'un nombre borné d'événements en
+  attente (les nombres de likes successifs sont fusionnés). Au-delà, sa file
+  est abandonnée et il reprend depuis le tampon circulaire, comme après une
+  reconnexion : la mémoire par connexion reste bornée.
+
+Avec plusieurs workers, les événements sont diffusés à tous par le
+coordinateur (canal ``events``) ; chaque worker les numérote dans son propre
+historique : une reprise sur un autre worker reçoit un ``reset``.
+"""
+
+import asyncio
+import secrets
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Set
+
+from app.api.responses import dumps
+from app.core.config import settings
+from app.core.coordination import Coordinator, coordination
+
+# Événement envoyé lorsque la reprise est impossible : le client recharge
+RESET = "reset"
+# Événements remplaçables : seul le plus récent compte
+COALESCED = {"likes"}
+
+
+class Event:
+    """Événement numéroté, avec sa trame SSE"""
+
+    __slots__ = ("sequence", "name", "frame")
+
+    def __init__(self, sequence: int, name: str, frame: bytes):
+        self.sequence = sequence
+        self.name = name
+        self.frame = frame
+
+
+class _History:
+    """Derniers événements d'un article"""
+
+    __slots__ = ("events", "truncated")
+
+    def __init__(self, size: int):
+        self.events = deque(maxlen=size)
+        # Numéro du dernier événement sorti du tampon
+        self.truncated = 0
+
+    def append(self, event: Event) -> None:
+        if len(self.events) == self.events.maxlen:
+            self.truncated = self.events[0].sequence
+        self.events.append(event)
+
+
+class Subscriber:
+    """
+    Connexion abonnée aux événements d'un article
+
+    Alimentée depuis la boucle d'événements qui l'a créée ; ``receive``
+    attend les prochains événements.
+    """
+
+    __slots__ = (
+        "bus",
+        "article_id",
+        "loop",
+        "pending",
+        "waiter",
+        "last",
+        "seen",
+        "lagged",
+        "ended",
+    )
+
+    def __init__(self, bus: "EventBus", article_id: int, loop, last: int):
+        self.bus = bus
+        self.article_id = article_id
+        self.loop = loop
+        self.pending: List[Event] = []
+        self.waiter: Optional[asyncio.Future] = None
+        # Numéro du dernier événement transmis au client
+        self.last = last
+        # Événements déjà couverts (rejoués ou antérieurs à l'abonnement)
+        self.seen = last
+        # File abandonnée : reprise depuis l'historique à la prochaine lecture
+        self.lagged = False
+        # Flux terminé par le serveur (arrêt du worker)
+        self.ended = False
+
+    def push(self, event: Event) -> None:
+        """Ajoute un événement à la file (dans la boucle de l'abonné)"""
+        if self.lagged or event.sequence <= self.seen:
+            return
+        pending = self.pending
+        if event.name in COALESCED and pending and pending[-1].name == event.name:
+            pending[-1] = event
+        elif len(pending) >= self.bus.max_pending:
+            self.lagged = True
+            self.pending = []
+        else:
+            pending.append(event)
+        self._wake()
+
+    async def receive(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        Trames des prochains événements
+
+        Returns:
+            Les trames en attente, ``b""`` si rien n'est arrivé pendant
+            ``timeout`` secondes, ou None si le flux est terminé
+        """
+        if not self.pending and not self.lagged and not self.ended:
+            self.waiter = self.loop.create_future()
+            try:
+                await asyncio.wait_for(self.waiter, timeout)
+            except asyncio.TimeoutError:
+                return b""
+            finally:
+                self.waiter = None
+        if self.ended:
+            return None
+        if self.lagged:
+            self.lagged = False
+            self.pending = self.bus._resume(self)
+        events, self.pending = self.pending, []
+        if events:
+            self.last = max(self.last, events[-1].sequence)
+        return b"".join(event.frame for event in events)
+
+    def close(self) -> None:
+        """Désabonne la connexion (idempotent)"""
+        self.bus.unsubscribe(self)
+
+    def end(self) -> None:
+        """Termine le flux (dans la boucle de l'abonné)"""
+        self.ended = True
+        self._wake()
+
+    def _wake(self) -> None:
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+
+class EventBus:
+    """
+    Publication et abonnement par article
+
+    Thread-safe : les routes synchrones publient depuis le pool de threads ;
+    les événements sont remis aux abonnés dans leur boucle d'événements, dans
+    l'ordre de publication.
+    """
+
+    def __init__(
+        self,
+        history_size: int = 100,
+        history_articles: int = 1000,
+        max_pending: int = 64,
+        coordinator: Optional[Coordinator] = None,
+    ):
+        self.history_size = history_size
+        self.history_articles = history_articles
+        self.max_pending = max_pending
+        # Les identifiants d'événements d'une autre instance sont rejetés
+        self.epoch = secrets.token_hex(4)
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._history: "OrderedDict[int, _History]" = OrderedDict()
+        # Plus grand numéro d'événement oublié avec l'historique de son article
+        self._forgotten = 0
+        self._subscribers: Dict[int, Set[Subscriber]] = {}
+        self.coordinator = coordinator
+        if coordinator is not None:
+            coordinator.subscribe("events", self._publish_message)
+
+    def event_id(self, sequence: int) -> str:
+        """Identifiant SSE (``id:``) d'un numéro d'événement"""
+        return f"{self.epoch}-{sequence}"
+
+    def parse_event_id(self, value: Optional[str]) -> Optional[int]:
+        """Numéro d'événement d'un ``Last-Event-ID``, None s'il est inconnu"""
+        epoch, _, sequence = (value or "").strip().rpartition("-")
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        sequence = int(sequence)
+        return sequence if sequence <= self._sequence else None
+
+    def publish(self, article_id: int, name: str, data: dict) -> None:
+        """Publie un événement sur le sujet d'un article (dans tous les workers)"""
+        payload = dumps(data)
+        if self.coordinator is None:
+            self._publish(article_id, name, payload)
+        else:
+            message = {"article_id": article_id, "name": name, "data": payload.decode()}
+            self.coordinator.broadcast("events", message)
+
+    def _publish_message(self, message: dict) -> None:
+        self._publish(message["article_id"], message["name"], message["data"].encode())
+
+    def _publish(self, article_id: int, name: str, payload: bytes) -> None:
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+            event = Event(sequence, name, self._frame(sequence, name, payload))
+            history = self._history.get(article_id)
+            if history is None:
+                history = self._history[article_id] = _History(self.history_size)
+                if len(self._history) > self.history_articles:
+                    _, oldest = self._history.popitem(last=False)
+                    self._forgotten = max(self._forgotten, oldest.events[-1].sequence)
+            else:
+                self._history.move_to_end(article_id)
+            history.append(event)
+            subscribers = self._subscribers.get(article_id)
+            if subscribers:
+                # Sous le verrou : l'ordre de remise suit l'ordre de publication
+                self._dispatch(subscribers, event)
+
+    def subscribe(
+        self, article_id: int, last_event_id: Optional[str] = None
+    ) -> Subscriber:
+        """
+        Abonne la boucle d'événements courante aux événements d'un article
+
+        Avec ``last_event_id``, les événements manqués depuis sont en attente
+        dès l'abonnement (ou un ``reset`` s'ils ne sont plus disponibles).
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            subscriber = Subscriber(self, article_id, loop, self._sequence)
+            if last_event_id is not None:
+                last = self.parse_event_id(last_event_id)
+                subscriber.last = -1 if last is None else last
+                subscriber.pending = self._resume(subscriber, locked=True)
+            self._subscribers.setdefault(article_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.article_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[subscriber.article_id]
+
+    def subscriber_count(self, article_id: Optional[int] = None) -> int:
+        """Nombre d'abonnés (d'un article, ou de tous)"""
+        with self._lock:
+            if article_id is not None:
+                return len(self._subscribers.get(article_id, ()))
+            return sum(len(group) for group in self._subscribers.values())
+
+    def end_streams(self) -> None:
+        """
+        Termine les flux ouverts par la boucle courante
+
+        Appelé à l'arrêt du serveur : les connexions SSE, qui ne finissent
+        jamais d'elles-mêmes, se terminent et l'arrêt n'attend pas le délai
+        de grâce ; les clients se reconnectent à un autre worker.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            subscribers = [
+                subscriber
+                for group in self._subscribers.values()
+                for subscriber in group
+                if subscriber.loop is loop
+            ]
+        for subscriber in subscribers:
+            subscriber.end()
+
+    def reset(self) -> None:
+        """Oublie l'historique (les abonnés restent inscrits)"""
+        with self._lock:
+            self._history.clear()
+            self._forgotten = self._sequence
+
+    def _resume(self, subscriber: Subscriber, locked: bool = False) -> List[Event]:
+        """Événements manqués par un abonné, ou un ``reset`` s'ils sont perdus"""
+        if not locked:
+            with self._lock:
+                return self._resume(subscriber, locked=True)
+        after = subscriber.last
+        history = self._history.get(subscriber.article_id)
+        if history is None:
+            lost = after < self._forgotten
+            events = []
+        else:
+            lost = after < history.truncated
+            events = [event for event in history.events if event.sequence > after]
+        subscriber.seen = self._sequence
+        if after < 0 or lost:
+            return [self._reset_event()]
+        return events
+
+    def _reset_event(self) -> Event:
+        # Porte le numéro courant : le client reprendra à partir d'ici
+        sequence = self._sequence
+        return Event(sequence, RESET, self._frame(sequence, RESET, b"{}"))
+
+    def _frame(self, sequence: int, name: str, payload: bytes) -> bytes:
+        return b"id: %s\nevent: %s\ndata: %s\n\n" % (
+            self.event_id(sequence).encode(),
+            name.encode(),
+            payload,
+        )
+
+    @staticmethod
+    def _dispatch(subscribers: Set[Subscriber], event: Event) -> None:
+        loops: Dict[asyncio.AbstractEventLoop, List[Subscriber]] = {}
+        for subscriber in subscribers:
+            loops.setdefault(subscriber.loop, []).append(subscriber)
+        for loop, group in loops.items():
+            try:
+                loop.call_soon_threadsafe(_deliver, group, event)
+            except RuntimeError:
+                # Boucle fermée : ses connexions sont déjà terminées
+                pass
+
+
+def _deliver(subscribers: List[Subscriber], event: Event) -> None:
+    for subscriber in subscribers:
+        subscriber.push(event)
+
+
+async def event_stream(subscriber: Subscriber, heartbeat: float):
+    """
+    Corps d'une réponse ``text/event-stream``
+
+    Envoie le délai de reconnexion, puis les événements au fil de l'eau et un
+    commentaire ``: ping`` après ``heartbeat`` secondes sans événement (les
+    proxys ne ferment pas la connexion, le client détecte une coupure).
+    Tant que le client ne lit pas, le générateur reste suspendu : les
+    événements s'accumulent dans la file bornée de l'abonné. Le flux se
+    termine avec ``EventBus.end_streams``.
+    """
+    try:
+        yield b"retry: %d\n\n" % settings.events_retry_ms
+        while True:
+            frames = await subscriber.receive(heartbeat)
+            if frames is None:
+                return
+            yield frames or b": ping\n\n"
+    finally:
+        subscriber.close()
+
+
+# Bus du processus, utilisé par les services et la route des événements
+event_bus = EventBus(
+    history_size=settings.events_history_size,
+    history_articles=settings.events_history_articles,
+    max_pending=settings.events_max_pending,
+    coordinator=coordination,
+)
@@ -0,0 +1,41 @@
+"""
+Générations d'écriture partagées par les workers
+
+Un compteur de ``write_generations`` est incrémenté dans la transaction de
+l'écriture qu'il date (``bump_generation``) et lu par clé primaire
+(``generation_value``) : les versions des listes d'articles et des fils de
+commentaires s'en servent pour détecter les suppressions.
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+from app.models.generation import WriteGeneration
+
+# Suppressions d'articles (les créations et modifications déplacent déjà le
+# plus grand identifiant ou la plus récente modification)
+ARTICLES_DELETED = "articles.deleted"
+# Suppressions de commentaires (un par un, ou avec leur article)
+COMMENTS_DELETED = "comments.deleted"
+
+
+def bump_generation(connection: Connection, name: str) -> None:
+    """Incrémente un compteur dans la transaction en cours (créé à 1)"""
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(WriteGeneration).values(name=name, value=1)
+    statement = statement.on_conflict_do_update(
+        index_elements=[WriteGeneration.name],
+        set_={"value": WriteGeneration.value + 1},
+    )
+    connection.execute(statement)
+
+
+def generation_value(name: str):
+    """Valeur d'un compteur (0 s'il n'a jamais été incrémenté), en sous-requête"""
+    return func.coalesce(
+        select(WriteGeneration.value)
+        .where(WriteGeneration.name == name)
+        .scalar_subquery(),
+        0,
+    )
@@ -0,0 +1,301 @@
+"""
+File durable de travaux différés
+
+Les travaux dérivés d'une écriture (résumé d'un article, recomptage de ses
+commentaires, statistiques d'un auteur) peuvent sortir de la requête :
+l'écriture enregistre le travail dans la table ``jobs`` (``enqueue``), dans
+sa propre transaction, puis répond. Le travail est exécuté ensuite :
+
+- juste après la réponse, par une tâche ``BackgroundTasks`` de la requête
+  (``schedule_jobs``, puis ``JobRunner.run_pending``) ;
+- à défaut (exécutions simultanées déjà au maximum, échec, redémarrage), par
+  la tâche de fond ``JobRunner.run_periodic`` ou ``python -m app.jobs drain``.
+
+Au plus ``workers`` exécutions simultanées par processus. Les travaux sont
+réservés par un ``UPDATE ... RETURNING`` atomique pour ``lease`` secondes :
+plusieurs processus se partagent la file sans exécuter deux fois le même
+travail, et celui d'un worker arrêté est repris à l'expiration.
+
+Un travail est identifié par ``(kind, key)`` : redemandé alors qu'il attend,
+il n'est enregistré qu'une fois. Les gestionnaires recalculent donc un état
+à partir de la base au lieu d'appliquer des deltas. Redemandé pendant son
+exécution, il est exécuté à nouveau (colonne ``generation``). En échec, il
+est retenté après un délai exponentiel, puis marqué ``failed`` après
+``max_attempts`` essais.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from fastapi import BackgroundTasks
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.database import AnySession, SessionLocal
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+FAILED = "failed"
+
+
+class JobHandler(NamedTuple):
+    """Exécution d'un type de travail"""
+
+    # Dans la transaction du travail, avec la clé du travail
+    run: Callable[[Connection, str], None]
+    # Après la validation de la transaction (invalidation de caches...)
+    on_commit: Optional[Callable[[str], None]] = None
+
+
+# Type de travail -> gestionnaire
+HANDLERS: Dict[str, JobHandler] = {}
+
+
+def register_job(
+    kind: str,
+    run: Callable[[Connection, str], None],
+    on_commit: Optional[Callable[[str], None]] = None,
+) -> None:
+    """Déclare le gestionnaire d'un type de travail"""
+    HANDLERS[kind] = JobHandler(run, on_commit)
+
+
+def enqueue(connection: Connection, kind: str, keys: Iterable) -> None:
+    """
+    Enregistre un travail par clé dans la transaction en cours
+
+    Upsert sur ``(kind, key)`` : un travail déjà en attente est conservé (et
+    redevient dû tout de suite), un travail abandonné est relancé.
+    """
+    now = time.time()
+    rows = [
+        {
+            "kind": kind,
+            "key": str(key),
+            "status": PENDING,
+            "generation": 1,
+            "attempts": 0,
+            "run_at": now,
+        }
+        for key in dict.fromkeys(keys)
+    ]
+    if not rows:
+        return
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(Job)
+    statement = statement.on_conflict_do_update(
+        index_elements=[Job.kind, Job.key],
+        set_={
+            "status": PENDING,
+            "generation": Job.generation + 1,
+            "attempts": 0,
+            "run_at": statement.excluded.run_at,
+        },
+    )
+    connection.execute(statement, rows)
+
+
+class ClaimedJob(NamedTuple):
+    id: int
+    kind: str
+    key: str
+    generation: int
+    attempts: int
+
+
+class JobRunner:
+    """Exécute les travaux dus, ``workers`` à la fois au plus par processus"""
+
+    def __init__(
+        self,
+        session_factory: sessionmaker = SessionLocal,
+        workers: int = 2,
+        batch_size: int = 50,
+        poll_interval: float = 1.0,
+        max_attempts: int = 5,
+        retry_delay: float = 1.0,
+        retry_max_delay: float = 300.0,
+        lease: float = 60.0,
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.retry_max_delay = retry_max_delay
+        self.lease = lease
+        # Sémaphore de threads : les tâches des requêtes et la tâche de fond
+        # s'exécutent dans le pool de threads
+        self._slots = threading.BoundedSemaphore(workers)
+
+    def backoff(self, attempts: int) -> float:
+        """Délai avant le prochain essai, après ``attempts`` échecs"""
+        return min(self.retry_max_delay, self.retry_delay * 2 ** (attempts - 1))
+
+    def claim(self, connection: Connection, limit: int) -> List[ClaimedJob]:
+        """Réserve jusqu'à ``limit`` travaux dus, les plus anciens d'abord"""
+        now = time.time()
+        due = (
+            select(Job.id)
+            .where(Job.status == PENDING, Job.run_at <= now)
+            .where(or_(Job.locked_until.is_(None), Job.locked_until <= now))
+            .order_by(Job.run_at)
+            .limit(limit)
+        )
+        rows = connection.execute(
+            update(Job)
+            .where(Job.id.in_(due.scalar_subquery()))
+            .values(locked_until=now + self.lease, attempts=Job.attempts + 1)
+            .returning(Job.id, Job.kind, Job.key, Job.generation, Job.attempts)
+        ).all()
+        return [ClaimedJob(*row) for row in rows]
+
+    def execute(self, session: Session, job: ClaimedJob) -> bool:
+        """
+        Exécute un travail réservé dans sa propre transaction
+
+        Returns:
+            True si le travail a réussi
+        """
+        try:
+            handler = HANDLERS.get(job.kind)
+            if handler is None:
+                raise LookupError(f"Type de travail inconnu : {job.kind}")
+            handler.run(session.connection(), job.key)
+            done = session.execute(
+                delete(Job).where(Job.id == job.id, Job.generation == job.generation)
+            ).rowcount
+            if not done:
+                # Redemandé pendant l'exécution : à exécuter à nouveau
+                session.execute(
+                    update(Job).where(Job.id == job.id).values(locked_until=None)
+                )
+            session.commit()
+        except Exception as exc:
+            session.rollback()
+            logger.exception("Échec du travail %s[%s]", job.kind, job.key)
+            abandoned = job.attempts >= self.max_attempts
+            retried = session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.generation == job.generation)
+                .values(
+                    status=FAILED if abandoned else PENDING,
+                    run_at=time.time() + self.backoff(job.attempts),
+                    locked_until=None,
+                    last_error=f"{type(exc).__name__}: {exc}"[:2000],
+                )
+            ).rowcount
+            if not retried:
+                # Redemandé entre-temps : la nouvelle demande repart de zéro
+                session.execute(
+                    update(Job).where(Job.id == job.id).values(locked_until=None)
+                )
+            session.commit()
+            return False
+        if handler.on_commit is not None:
+            handler.on_commit(job.key)
+        return True
+
+    def drain(self, bind: Optional[Engine] = None, limit: Optional[int] = None) -> int:
+        """
+        Exécute les travaux dus jusqu'à ce qu'il n'en reste plus
+
+        Un travail en échec n'est retenté que lorsque son délai est écoulé.
+
+        Returns:
+            Le nombre de travaux exécutés avec succès
+        """
+        succeeded = 0
+        executed = 0
+        session = Session(bind=bind) if bind is not None else self.session_factory()
+        with session:
+            while limit is None or executed < limit:
+                size = self.batch_size
+                if limit is not None:
+                    size = min(size, limit - executed)
+                jobs = self.claim(session.connection(), size)
+                session.commit()
+                if not jobs:
+                    break
+                for job in jobs:
+                    succeeded += self.execute(session, job)
+                executed += len(jobs)
+        return succeeded
+
+    def run_pending(self, bind: Optional[Engine] = None) -> int:
+        """
+        Exécute les travaux dus si une place d'exécution est libre
+
+        Sinon, ne fait rien : les exécutions en cours ou la tâche de fond
+        prendront les travaux.
+        """
+        if not self._slots.acquire(blocking=False):
+            return 0
+        try:
+            return self.drain(bind)
+        finally:
+            self._slots.release()
+
+    async def run_periodic(self) -> None:
+        """Tâche de fond : travaux dus toutes les ``poll_interval`` secondes"""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await run_in_threadpool(self.run_pending)
+            except Exception:
+                logger.exception("Échec de l'exécution des travaux différés")
+
+
+def schedule_jobs(background_tasks: BackgroundTasks, db: AnySession) -> None:
+    """
+    Exécute les travaux en attente après la réponse de la requête
+
+    Sur le moteur de la session de la requête ; une session asynchrone n'a
+    pas de moteur synchrone utilisable : le moteur par défaut est pris.
+    """
+    bind = db.get_bind() if isinstance(db, Session) else None
+    background_tasks.add_task(job_runner.run_pending, bind)
+
+
+def queue_stats(connection: Connection) -> List[dict]:
+    """Nombre de travaux par type et statut, et échéance la plus ancienne"""
+    rows = connection.execute(
+        select(Job.kind, Job.status, func.count(Job.id), func.min(Job.run_at))
+        .group_by(Job.kind, Job.status)
+        .order_by(Job.kind, Job.status)
+    )
+    return [
+        {"kind": kind, "status": status, "count": count, "oldest_run_at": run_at}
+        for kind, status, count, run_at in rows
+    ]
+
+
+def retry_failed(connection: Connection) -> int:
+    """Relance les travaux abandonnés ; renvoie leur nombre"""
+    return connection.execute(
+        update(Job)
+        .where(Job.status == FAILED)
+        .values(status=PENDING, attempts=0, run_at=time.time(), locked_until=None)
+    ).rowcount
+
+
+# Exécution des travaux partagée par l'application
+job_runner = JobRunner(
+    workers=settings.jobs_workers,
+    batch_size=settings.jobs_batch_size,
+    poll_interval=settings.jobs_poll_interval,
+    max_attempts=settings.jobs_max_attempts,
+    retry_delay=settings.jobs_retry_delay,
+    retry_max_delay=settings.jobs_retry_max_delay,
+    lease=settings.jobs_lease,
+)
@@ -0,0 +1,79 @@
+"""
+Pipeline des likes : tampon en mémoire et écritures groupées
+
+Chaque like est ajouté à un tampon par article (``CounterBuffer``) au lieu
+d'être écrit immédiatement. Le tampon est vidé en une seule transaction
+(incréments atomiques ``likes_count = likes_count + n`` et ajout au journal
+``likes``) lorsqu'il atteint un seuil, ou périodiquement par une tâche de
+fond.
+"""
+
+from typing import Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.coordination import coordination
+from app.models.article import Article
+from app.models.like import Like
+from app.services.author_stats import add_likes, rebuild_author_stats
+from app.services.counter_buffer import Batch, CounterBuffer, apply_increments
+
+# Compteur partagé des likes reçus par tous les workers
+GENERATION_COUNTER = "likes:generation"
+
+
+def apply_like_batch(connection: Connection, batch: Batch) -> None:
+    """
+    Applique un lot de likes : incréments atomiques et ajout au journal
+
+    Les totaux des auteurs (``author_stats``) sont incrémentés de même.
+    """
+    apply_increments(connection, Article.likes_count, batch)
+    connection.execute(
+        insert(Like),
+        [
+            {"article_id": article_id, "created_at": created_at}
+            for article_id, events in batch.items()
+            for created_at in events
+        ],
+    )
+    add_likes(
+        connection, {article_id: len(events) for article_id, events in batch.items()}
+    )
+
+
+class LikeBuffer(CounterBuffer):
+    """Tampon des likes d'articles, par article"""
+
+    def __init__(self, **options):
+        super().__init__(apply_like_batch, GENERATION_COUNTER, **options)
+
+
+def rebuild_like_counts(db: Session, article_id: Optional[int] = None) -> None:
+    """
+    Recalcule ``articles.likes_count`` à partir du journal ``likes``
+
+    Attention : les likes antérieurs à l'introduction du journal n'y figurent
+    pas et seraient perdus par un recalcul.
+    """
+    count = (
+        select(func.count(Like.id))
+        .where(Like.article_id == Article.id)
+        .scalar_subquery()
+    )
+    statement = update(Article).values(likes_count=count)
+    if article_id is not None:
+        statement = statement.where(Article.id == article_id)
+    db.execute(statement)
+    rebuild_author_stats(db.connection())
+    db.commit()
+
+
+like_buffer = LikeBuffer(
+    max_pending=settings.like_flush_max_pending,
+    flush_interval=settings.like_flush_interval,
+    coordinator=coordination,
+)
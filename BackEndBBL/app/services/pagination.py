@@ -0,0 +1,130 @@
+"""
+Pagination par curseur (keyset) pour les listes d'articles et de commentaires
+
+Le curseur est opaque pour le client : c'est un JSON encodé en base64 url-safe
+contenant soit la clé ``(created_at, id)`` du dernier élément renvoyé (parcours
+par index, coût constant quelle que soit la profondeur), soit un décalage pour
+les résultats de recherche classés par pertinence.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import DateTime, String, and_, literal, or_, type_coerce
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.types import TypeDecorator
+
+
+class InvalidCursorError(ValueError):
+    """Curseur illisible ou altéré"""
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """Encode un curseur opaque"""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Décode un curseur opaque, lève InvalidCursorError s'il est invalide"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError) as exc:
+        raise InvalidCursorError("Curseur de pagination invalide") from exc
+    if not isinstance(payload, dict):
+        raise InvalidCursorError("Curseur de pagination invalide")
+    return payload
+
+
+def keyset_cursor(created_at: Any, row_id: int) -> str:
+    """Curseur positionné après la ligne de clé ``(created_at, id)``"""
+    if not isinstance(created_at, str):
+        created_at = str(created_at)
+    return encode_cursor({"k": [created_at, row_id]})
+
+
+def offset_cursor(offset: int) -> str:
+    """Curseur par décalage, utilisé pour les résultats de recherche"""
+    return encode_cursor({"o": offset})
+
+
+def parse_keyset(payload: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+    """Extrait la clé ``(created_at, id)`` d'un curseur keyset"""
+    key = payload.get("k")
+    if key is None:
+        return None
+    if (
+        not isinstance(key, list)
+        or len(key) != 2
+        or not isinstance(key[0], str)
+        or not isinstance(key[1], int)
+    ):
+        raise InvalidCursorError("Curseur de pagination invalide")
+    return key[0], key[1]
+
+
+def parse_offset(payload: Dict[str, Any]) -> int:
+    """Extrait le décalage d'un curseur de recherche"""
+    offset = payload.get("o", 0)
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidCursorError("Curseur de pagination invalide")
+    return offset
+
+
+def raw_created_at(column) -> ColumnElement:
+    """
+    Valeur brute stockée de ``created_at``
+
+    SQLite compare les dates comme du texte : le curseur doit transporter la
+    valeur exacte stockée (et non une datetime re-formatée) pour que les
+    comparaisons suivent l'ordre de ``ORDER BY created_at``.
+    """
+    return type_coerce(column, String)
+
+
+class _CursorTimestamp(TypeDecorator):
+    """
+    Paramètre ``created_at`` issu d'un curseur
+
+    Transmis tel quel (texte) à SQLite, converti en datetime pour les autres
+    SGBD dont les colonnes de date sont typées.
+    """
+
+    impl = String
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "sqlite":
+            return value
+        return datetime.fromisoformat(value)
+
+
+def keyset_filter(
+    created_at_column, id_column, key: Tuple[str, int], descending: bool
+) -> ColumnElement:
+    """
+    Condition ``(created_at, id) < key`` (ou ``>`` en ordre croissant)
+
+    La borne redondante sur ``created_at`` seul permet au SGBD de démarrer le
+    parcours de l'index composite directement à la position du curseur.
+    """
+    created_at, row_id = key
+    bound = literal(created_at, _CursorTimestamp())
+    if descending:
+        return and_(
+            created_at_column <= bound,
+            or_(created_at_column < bound, id_column < row_id),
+        )
+    return and_(
+        created_at_column >= bound,
+        or_(created_at_column > bound, id_column > row_id),
+    )
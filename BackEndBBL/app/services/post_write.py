@@ -0,0 +1,80 @@
+"""
+Travaux dérivés des écritures, exécutés hors de la requête
+
+En mode POST_WRITE_MODE=deferred, les écritures ne font dans leur
+transaction que l'insertion (ou la modification) demandée et l'enregistrement
+des travaux qui en découlent dans la file (``app.services.jobs``) :
+
+- ``article.summary`` (par article) : extrait, nombre de mots et temps de
+  lecture, à la création et quand le contenu change ;
+- ``article.comments`` (par article) : ``comments_count`` recompté après la
+  création d'un commentaire, puis statistiques de l'auteur de l'article ;
+- ``author.stats`` (par auteur) : ligne de ``author_stats`` recalculée.
+
+Chaque travail recalcule son résultat à partir de la base : dix commentaires
+reçus avant son exécution ne coûtent qu'un recomptage. En mode ``inline``
+(par défaut), le même travail est fait dans la transaction de la requête.
+"""
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.models.article import Article
+from app.models.comment import Comment
+from app.services.article_cache import article_cache
+from app.services.author_stats import refresh_author
+from app.services.jobs import enqueue, register_job
+from app.services.summary import content_summary
+
+SUMMARIZE_ARTICLE = "article.summary"
+RECOUNT_COMMENTS = "article.comments"
+REFRESH_AUTHOR = "author.stats"
+
+
+def deferred() -> bool:
+    """Les travaux dérivés passent par la file (POST_WRITE_MODE=deferred)"""
+    return settings.post_write_mode == "deferred"
+
+
+def summarize_article(connection: Connection, key: str) -> None:
+    """Calcule le résumé d'un article à partir de son contenu actuel"""
+    article_id = int(key)
+    content = connection.execute(
+        select(Article.content).where(Article.id == article_id)
+    ).scalar()
+    if content is None:
+        # Supprimé entre-temps
+        return
+    connection.execute(
+        update(Article)
+        .where(Article.id == article_id)
+        .values(**content_summary(content))
+    )
+
+
+def recount_comments(connection: Connection, key: str) -> None:
+    """Recompte les commentaires d'un article, puis ceux de son auteur"""
+    article_id = int(key)
+    count = (
+        select(func.count(Comment.id))
+        .where(Comment.article_id == article_id)
+        .scalar_subquery()
+    )
+    author = connection.execute(
+        update(Article)
+        .where(Article.id == article_id)
+        .values(comments_count=count)
+        .returning(Article.author)
+    ).scalar()
+    if author is not None:
+        enqueue(connection, REFRESH_AUTHOR, [author])
+
+
+def _invalidate_article(key: str) -> None:
+    article_cache.invalidate_article(int(key))
+
+
+register_job(SUMMARIZE_ARTICLE, summarize_article, on_commit=_invalidate_article)
+register_job(RECOUNT_COMMENTS, recount_comments, on_commit=_invalidate_article)
+register_job(REFRESH_AUTHOR, refresh_author)
@@ -0,0 +1,93 @@
+"""
+Projections de colonnes pour les réponses en liste
+
+Les listes sont lues comme des tuples de colonnes et converties en
+dictionnaires prêts à encoder en JSON : ni objet ORM ni modèle Pydantic
+n'est construit par ligne. Les colonnes suivent l'ordre des champs des
+schémas de réponse, afin que le JSON produit soit identique.
+"""
+
+from typing import Iterable, List, Sequence, Tuple
+
+from sqlalchemy import func
+
+from app.models.article import Article
+from app.models.comment import Comment
+
+# Champs d'ArticleResponse
+ARTICLE_RESPONSE_COLUMNS = (
+    Article.title,
+    Article.content,
+    Article.author,
+    Article.id,
+    Article.likes_count,
+    Article.comments_count,
+    Article.created_at,
+    Article.updated_at,
+    Article.excerpt,
+    Article.word_count,
+    Article.reading_time,
+)
+
+# Champs d'ArticleSummary : tout sauf le contenu complet
+ARTICLE_SUMMARY_COLUMNS = (
+    Article.title,
+    Article.author,
+    Article.excerpt,
+    Article.id,
+    Article.likes_count,
+    Article.comments_count,
+    Article.word_count,
+    Article.reading_time,
+    Article.created_at,
+    Article.updated_at,
+)
+
+# Champs disponibles pour les listes à champs choisis (``fields=``)
+ARTICLE_FIELDS = {column.key: column for column in ARTICLE_RESPONSE_COLUMNS}
+
+# Champs de CommentResponse (likes_count vaut 0 par défaut dans le schéma)
+COMMENT_RESPONSE_COLUMNS = (
+    Comment.author,
+    Comment.content,
+    Comment.id,
+    Comment.article_id,
+    func.coalesce(Comment.likes_count, 0).label("likes_count"),
+    Comment.created_at,
+)
+
+
+def article_columns(fields: Iterable[str]) -> Tuple:
+    """
+    Projection d'articles réduite aux champs demandés
+
+    ``id`` est toujours inclus (en tête) : il identifie l'article dans la
+    réponse, le cache et le tampon de likes.
+
+    Raises:
+        ValueError: si un champ est inconnu
+    """
+    names = ["id"] + [name for name in fields if name != "id"]
+    unknown = [name for name in names if name not in ARTICLE_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Champs inconnus : {', '.join(unknown)} "
+            f"(disponibles : {', '.join(ARTICLE_FIELDS)})"
+        )
+    return tuple(ARTICLE_FIELDS[name] for name in dict.fromkeys(names))
+
+
+def column_keys(columns: Sequence) -> List[str]:
+    """Noms des clés produites par une projection"""
+    return [column.key for column in columns]
+
+
+def rows_to_dicts(rows: Iterable, columns: Sequence) -> List[dict]:
+    """
+    Convertit des lignes en dictionnaires
+
+    Les valeurs au-delà des colonnes projetées (ex. la clé brute d'un curseur
+    ajoutée en fin de ligne) sont ignorées.
+    """
+    keys = column_keys(columns)
+    return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,248 @@
+"""
+Moteurs de recherche plein texte pour les articles
+
+Le service d'articles délègue la recherche à un ``SearchBackend`` :
+- ``LikeSearchBackend`` : l'ancien chemin ``ILIKE '%x%'`` (portable, sans index)
+- ``FTS5SearchBackend`` : table virtuelle SQLite FTS5 synchronisée par triggers,
+  classement BM25, recherche par préfixe et extraits surlignés
+"""
+
+import html
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy import DDL, event, or_, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.models.article import Article
+
+FTS_TABLE = "articles_fts"
+
+# Poids BM25 par colonne indexée (title, content, author)
+BM25_WEIGHTS = (10.0, 1.0, 5.0)
+
+# Balises utilisées pour surligner les termes trouvés dans les extraits
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+
+# Marqueurs posés par FTS5, remplacés par les balises après échappement du
+# texte : seules les balises <mark> de l'extrait sont du HTML
+_SENTINEL_OPEN = "\x02"
+_SENTINEL_CLOSE = "\x03"
+
+FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, content, author,
+        content='articles', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content, author)
+        VALUES (new.id, new.title, new.content, new.author);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content, author)
+        VALUES ('delete', old.id, old.title, old.content, old.author);
+    END
+    """,
+    # Seules les colonnes indexées déclenchent une réindexation (pas les likes)
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_au
+    AFTER UPDATE OF title, content, author ON articles BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content, author)
+        VALUES ('delete', old.id, old.title, old.content, old.author);
+        INSERT INTO {FTS_TABLE}(rowid, title, content, author)
+        VALUES (new.id, new.title, new.content, new.author);
+    END
+    """,
+]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def render_snippet(snippet: Optional[str]) -> Optional[str]:
+    """
+    Extrait FTS5 en HTML sûr
+
+    Le texte de l'article est échappé (``html.escape``), puis les marqueurs
+    des termes trouvés deviennent des balises ``<mark>`` : le contenu ne peut
+    produire aucune autre balise que celles-ci.
+    """
+    if snippet is None:
+        return None
+    return (
+        html.escape(snippet)
+        .replace(_SENTINEL_OPEN, HIGHLIGHT_OPEN)
+        .replace(_SENTINEL_CLOSE, HIGHLIGHT_CLOSE)
+    )
+
+
+@dataclass
+class SearchHit:
+    """Résultat de recherche : identifiant, score et extrait surligné"""
+
+    article_id: int
+    rank: float = 0.0
+    snippet: Optional[str] = None
+
+
+class SearchBackend(ABC):
+    """Interface commune des moteurs de recherche d'articles"""
+
+    name = "base"
+
+    @abstractmethod
+    def search(
+        self, db: Session, query: str, skip: int = 0, limit: int = 100
+    ) -> List[SearchHit]:
+        """Retourne les résultats classés par pertinence décroissante"""
+
+
+class LikeSearchBackend(SearchBackend):
+    """Recherche par sous-chaîne ILIKE sur titre, contenu et auteur"""
+
+    name = "like"
+
+    def search(
+        self, db: Session, query: str, skip: int = 0, limit: int = 100
+    ) -> List[SearchHit]:
+        search_term = f"%{query}%"
+        rows = (
+            db.query(Article.id)
+            .filter(
+                or_(
+                    Article.title.ilike(search_term),
+                    Article.content.ilike(search_term),
+                    Article.author.ilike(search_term),
+                )
+            )
+            .order_by(Article.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return [SearchHit(article_id=row.id) for row in rows]
+
+
+class FTS5SearchBackend(SearchBackend):
+    """Recherche plein texte SQLite FTS5 classée par BM25"""
+
+    name = "fts5"
+
+    def __init__(self, snippet_tokens: int = 16):
+        self.snippet_tokens = snippet_tokens
+
+    @staticmethod
+    def build_match_query(query: str) -> Optional[str]:
+        """
+        Convertit la saisie utilisateur en requête FTS5
+
+        Chaque mot devient un terme entre guillemets suffixé par ``*`` pour la
+        recherche par préfixe ; les termes sont combinés par un ET implicite.
+        La syntaxe FTS5 de l'utilisateur n'est jamais interprétée.
+        """
+        tokens = _TOKEN_RE.findall(query)
+        if not tokens:
+            return None
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    def search(
+        self, db: Session, query: str, skip: int = 0, limit: int = 100
+    ) -> List[SearchHit]:
+        match = self.build_match_query(query)
+        if match is None:
+            return []
+
+        weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+        statement = text(f"""
+            SELECT rowid AS article_id,
+                   bm25({FTS_TABLE}, {weights}) AS rank,
+                   snippet({FTS_TABLE}, -1, :open, :close, '…', :tokens) AS snippet
+            FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH :match
+            ORDER BY rank
+            LIMIT :limit OFFSET :skip
+            """)
+        rows = db.execute(
+            statement,
+            {
+                "match": match,
+                "open": _SENTINEL_OPEN,
+                "close": _SENTINEL_CLOSE,
+                "tokens": self.snippet_tokens,
+                "limit": limit,
+                "skip": skip,
+            },
+        )
+        return [
+            SearchHit(
+                article_id=row.article_id,
+                rank=row.rank,
+                snippet=render_snippet(row.snippet),
+            )
+            for row in rows
+        ]
+
+
+def create_fts_index(connection: Connection) -> None:
+    """Crée la table FTS5 et ses triggers, puis indexe les articles existants"""
+    for statement in FTS_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql(
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+    )
+
+
+def has_fts_index(connection: Connection) -> bool:
+    """Indique si la table FTS5 existe dans la base"""
+    row = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (FTS_TABLE,),
+    ).first()
+    return row is not None
+
+
+# Création / suppression automatiques avec la table `articles` (SQLite uniquement)
+for _statement in FTS_DDL:
+    event.listen(
+        Article.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+event.listen(
+    Article.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite"),
+)
+
+_like_backend = LikeSearchBackend()
+_fts_backend = FTS5SearchBackend()
+
+# Cache de détection de la table FTS5 par moteur (évite une requête par appel)
+_fts_available: Dict[int, bool] = {}
+
+
+def get_search_backend(db: Session) -> SearchBackend:
+    """
+    Sélectionne le moteur de recherche adapté à la base de la session
+
+    FTS5 est utilisé sur SQLite lorsque l'index existe ; sinon (autre SGBD ou
+    base non migrée) on retombe sur la recherche ILIKE.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "sqlite":
+        return _like_backend
+
+    engine = bind if isinstance(bind, Engine) else bind.engine
+    key = id(engine)
+    if not _fts_available.get(key):
+        _fts_available[key] = has_fts_index(db.connection())
+    return _fts_backend if _fts_available[key] else _like_backend
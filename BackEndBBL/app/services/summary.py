@@ -0,0 +1,40 @@
+"""
+Résumé d'un article pour les listes : extrait, nombre de mots, temps de lecture
+
+Calculé à l'écriture (création, modification, import) et stocké dans les
+colonnes ``excerpt``, ``word_count`` et ``reading_time`` : les listes en mode
+résumé n'ont jamais à lire le contenu complet.
+"""
+
+import math
+import re
+from typing import Dict, Union
+
+# Longueur maximale de l'extrait, points de suspension compris
+EXCERPT_LENGTH = 280
+# Vitesse de lecture moyenne retenue pour le temps de lecture
+WORDS_PER_MINUTE = 200
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def make_excerpt(content: str, length: int = EXCERPT_LENGTH) -> str:
+    """Début du texte, espaces normalisés, coupé entre deux mots"""
+    text = _WHITESPACE_RE.sub(" ", content).strip()
+    if len(text) <= length:
+        return text
+    cut = text[: length - 1]
+    if " " in cut:
+        cut = cut[: cut.rindex(" ")]
+    return cut.rstrip(" ,;:.") + "…"
+
+
+def content_summary(content: str) -> Dict[str, Union[str, int]]:
+    """Valeurs des colonnes de résumé pour un contenu donné"""
+    word_count = len(_WORD_RE.findall(content))
+    return {
+        "excerpt": make_excerpt(content),
+        "word_count": word_count,
+        "reading_time": math.ceil(word_count / WORDS_PER_MINUTE),
+    }
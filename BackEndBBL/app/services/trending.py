@@ -0,0 +1,391 @@
+"""
+Classement des articles tendance
+
+Chaque like et chaque commentaire apporte à son article un poids qui décroît
+exponentiellement avec son ancienneté (constante de temps : la fenêtre, ex.
+24 h). Les scores sont tenus à jour en mémoire, le haut du classement trié,
+à partir des journaux ``likes`` et ``comments`` lus au-delà de la
+dernière position connue : le classement est servi sans requête de tri.
+
+Décroissance « vers l'avant » : le score est stocké sous la forme
+``ln(Σ poids · e^((t - EPOCH) / τ))``. La décroissance commune à tous les
+articles n'y figure pas, si bien que l'ordre ne change qu'à l'arrivée d'un
+événement, et seul l'article concerné est repositionné. Le score courant
+s'obtient en retranchant ``(maintenant - EPOCH) / τ``.
+
+L'instantané (scores et positions dans les journaux) est écrit
+périodiquement en base ; au démarrage, seuls les événements postérieurs
+sont relus.
+"""
+
+import asyncio
+import heapq
+import logging
+import math
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.comment import Comment
+from app.models.like import Like
+from app.models.trending import TrendingCursor, TrendingScore
+
+logger = logging.getLogger(__name__)
+
+# Fenêtres proposées : nom -> constante de temps de la décroissance (s)
+WINDOWS = {"1h": 3600.0, "24h": 86400.0, "7d": 604800.0}
+
+# Origine des temps des scores stockés
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Articles tenus triés par fenêtre (au moins la limite de la route)
+LEADERBOARD_SIZE = 1000
+
+# Événements lus par requête lors de la mise à jour depuis les journaux
+SYNC_BATCH_SIZE = 5000
+# Identifiants par requête DELETE ... IN (limite de variables de SQLite)
+PERSIST_CHUNK_SIZE = 500
+
+
+def _seconds(moment: datetime) -> float:
+    """Secondes écoulées depuis EPOCH (SQLite restitue des dates UTC sans fuseau)"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - EPOCH).total_seconds()
+
+
+def _log_add(a: float, b: float) -> float:
+    """``ln(e^a + e^b)`` sans dépassement de capacité"""
+    if a < b:
+        a, b = b, a
+    return a + math.log1p(math.exp(b - a))
+
+
+class DecayedRanking:
+    """
+    Classement d'une fenêtre : scores à décroissance exponentielle
+
+    Tous les scores sont conservés dans un dictionnaire ; seuls les
+    ``capacity`` meilleurs sont tenus triés. Les scores stockés ne font que
+    croître : un article ne sort du haut du classement que poussé par un
+    autre, et un article hors du classement n'y entre qu'en dépassant le
+    dernier. Un événement ne coûte donc une insertion triée que s'il touche le
+    haut du classement.
+
+    Non thread-safe : protégé par le verrou de ``TrendingRankings``.
+    """
+
+    def __init__(self, time_constant: float, capacity: int = LEADERBOARD_SIZE):
+        self.time_constant = time_constant
+        self.capacity = capacity
+        # article_id -> score stocké (logarithme)
+        self._scores: Dict[int, float] = {}
+        # (-score stocké, article_id) des meilleurs, trié : le plus fort en tête
+        self._board: List[Tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def add(self, article_id: int, weight: float, at: float) -> None:
+        """Ajoute un événement de poids ``weight`` survenu à ``at`` (s depuis EPOCH)"""
+        self.add_many(weight, {article_id: [at]})
+
+    def add_many(self, weight: float, moments: Dict[int, List[float]]) -> None:
+        """Ajoute des événements de même poids, groupés par article"""
+        tau = self.time_constant
+        log_weight = math.log(weight)
+        board = self._board
+        for article_id, ats in moments.items():
+            if len(ats) == 1:
+                value = log_weight + ats[0] / tau
+            else:
+                peak = max(ats) / tau
+                value = (
+                    log_weight
+                    + peak
+                    + math.log(sum(math.exp(at / tau - peak) for at in ats))
+                )
+            previous = self._scores.get(article_id)
+            if previous is not None:
+                value = _log_add(previous, value)
+                if len(board) < self.capacity or (-previous, article_id) <= board[-1]:
+                    self._remove_from_board(article_id, previous)
+            self._scores[article_id] = value
+
+            entry = (-value, article_id)
+            if len(board) < self.capacity:
+                insort(board, entry)
+            elif entry < board[-1]:
+                insort(board, entry)
+                board.pop()
+
+    def _remove_from_board(self, article_id: int, log_score: float) -> None:
+        entry = (-log_score, article_id)
+        index = bisect_left(self._board, entry)
+        if index < len(self._board) and self._board[index] == entry:
+            del self._board[index]
+
+    def _refill(self) -> None:
+        """Recalcule le haut du classement à partir de tous les scores"""
+        self._board = heapq.nsmallest(
+            self.capacity, ((-value, key) for key, value in self._scores.items())
+        )
+
+    def discard(self, article_id: int) -> None:
+        log_score = self._scores.pop(article_id, None)
+        if log_score is not None:
+            self._remove_from_board(article_id, log_score)
+            if len(self._board) < min(self.capacity, len(self._scores)):
+                self._refill()
+
+    def get(self, article_id: int) -> Optional[float]:
+        """Score stocké d'un article, ou None s'il n'est pas classé"""
+        return self._scores.get(article_id)
+
+    def score(self, log_score: float, now: float) -> float:
+        """Score courant correspondant à un score stocké"""
+        return math.exp(log_score - now / self.time_constant)
+
+    def top(self, limit: int, now: float) -> List[Tuple[int, float]]:
+        """Les ``limit`` premiers articles et leur score courant, en O(limit)"""
+        if limit > self.capacity:
+            self.capacity = limit
+            self._refill()
+        return [
+            (article_id, self.score(-negative, now))
+            for negative, article_id in self._board[:limit]
+        ]
+
+    def prune(self, now: float, min_score: float) -> List[int]:
+        """Retire les articles dont le score courant est devenu négligeable"""
+        threshold = math.log(min_score) + now / self.time_constant
+        removed = [key for key, value in self._scores.items() if value < threshold]
+        if removed:
+            for article_id in removed:
+                del self._scores[article_id]
+            self._refill()
+        return removed
+
+    def load(self, scores: Dict[int, float]) -> None:
+        self._scores = dict(scores)
+        self._refill()
+
+
+class TrendingRankings:
+    """
+    Classements de toutes les fenêtres, alimentés par les journaux d'événements
+
+    Les likes n'arrivent dans le journal qu'à l'écriture du tampon
+    ``like_buffer`` : le classement a au plus ``like_flush_interval`` +
+    ``trending_refresh_interval`` de retard. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker = SessionLocal,
+        like_weight: float = 1.0,
+        comment_weight: float = 3.0,
+        refresh_interval: float = 1.0,
+        persist_interval: float = 60.0,
+        min_score: float = 0.01,
+    ):
+        self.session_factory = session_factory
+        self.weights = {"likes": like_weight, "comments": comment_weight}
+        self.refresh_interval = refresh_interval
+        self.persist_interval = persist_interval
+        self.min_score = min_score
+        # Protège les classements ; _sync_lock sérialise les lectures des
+        # journaux (un même événement n'est jamais appliqué deux fois)
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Oublie l'état en mémoire : il sera rechargé depuis la base"""
+        with self._lock:
+            self.rankings = {name: DecayedRanking(tau) for name, tau in WINDOWS.items()}
+            self.cursors = {"likes": 0, "comments": 0}
+            self._dirty: Set[int] = set()
+            self._removed: Set[int] = set()
+            self._loaded = False
+            self._last_sync = float("-inf")
+
+    def load(self, db: Session) -> None:
+        """Charge l'instantané enregistré"""
+        scores: Dict[str, Dict[int, float]] = {name: {} for name in WINDOWS}
+        for window, article_id, log_score in db.execute(
+            select(
+                TrendingScore.window, TrendingScore.article_id, TrendingScore.log_score
+            )
+        ):
+            if window in scores:
+                scores[window][article_id] = log_score
+        cursors = dict(
+            db.execute(select(TrendingCursor.source, TrendingCursor.last_id)).all()
+        )
+        with self._lock:
+            for name, ranking in self.rankings.items():
+                ranking.load(scores[name])
+            for source in self.cursors:
+                self.cursors[source] = cursors.get(source, 0)
+            self._loaded = True
+
+    def sync(self, db: Session, force: bool = False) -> int:
+        """
+        Applique les événements parus depuis la dernière mise à jour
+
+        Sans ``force``, ne fait rien si la dernière mise à jour date de moins
+        de ``refresh_interval`` secondes.
+
+        Returns:
+            Le nombre d'événements appliqués
+        """
+        if not force and time.monotonic() - self._last_sync < self.refresh_interval:
+            return 0
+        with self._sync_lock:
+            if not self._loaded:
+                self.load(db)
+            applied = 0
+            for source, model in (("likes", Like), ("comments", Comment)):
+                while True:
+                    events = db.execute(
+                        select(model.id, model.article_id, model.created_at)
+                        .where(model.id > self.cursors[source])
+                        .order_by(model.id)
+                        .limit(SYNC_BATCH_SIZE)
+                    ).all()
+                    if events:
+                        self._apply(source, events)
+                        applied += len(events)
+                    if len(events) < SYNC_BATCH_SIZE:
+                        break
+            self._last_sync = time.monotonic()
+        return applied
+
+    def _apply(self, source: str, events) -> None:
+        moments: Dict[int, List[float]] = {}
+        for _, article_id, created_at in events:
+            if created_at is not None:
+                moments.setdefault(article_id, []).append(_seconds(created_at))
+        with self._lock:
+            for ranking in self.rankings.values():
+                ranking.add_many(self.weights[source], moments)
+            self._dirty.update(moments)
+            self.cursors[source] = events[-1][0]
+
+    def top(self, window: str, limit: int) -> List[Tuple[int, float]]:
+        """Articles tendance d'une fenêtre et leur score courant"""
+        now = _seconds(datetime.now(timezone.utc))
+        with self._lock:
+            return self.rankings[window].top(limit, now)
+
+    def discard(self, article_id: int) -> None:
+        """Retire un article supprimé de tous les classements"""
+        with self._lock:
+            for ranking in self.rankings.values():
+                ranking.discard(article_id)
+            self._dirty.discard(article_id)
+            self._removed.add(article_id)
+
+    def persist(self, db: Session) -> int:
+        """
+        Écrit l'instantané : scores modifiés depuis la dernière écriture,
+        articles retirés et positions dans les journaux
+
+        Les articles devenus négligeables sont retirés au passage. Si un
+        autre processus a déjà écrit un instantané plus avancé, rien n'est
+        écrit.
+
+        Returns:
+            Le nombre d'articles écrits ou retirés
+        """
+        with self._sync_lock:
+            stored = dict(
+                db.execute(select(TrendingCursor.source, TrendingCursor.last_id)).all()
+            )
+            if any(stored.get(s, 0) > last_id for s, last_id in self.cursors.items()):
+                return 0
+            now = _seconds(datetime.now(timezone.utc))
+            with self._lock:
+                for ranking in self.rankings.values():
+                    self._removed.update(ranking.prune(now, self.min_score))
+                dirty, self._dirty = self._dirty, set()
+                removed, self._removed = self._removed, set()
+                changed = sorted(dirty | removed)
+                # Les lignes d'un article modifié sont remplacées par celles de
+                # toutes les fenêtres où il est encore classé
+                rows = [
+                    {"window": name, "article_id": article_id, "log_score": value}
+                    for article_id in changed
+                    for name, ranking in self.rankings.items()
+                    if (value := ranking.get(article_id)) is not None
+                ]
+                cursors = dict(self.cursors)
+
+            try:
+                for start in range(0, len(changed), PERSIST_CHUNK_SIZE):
+                    chunk = changed[start : start + PERSIST_CHUNK_SIZE]
+                    db.execute(
+                        delete(TrendingScore).where(TrendingScore.article_id.in_(chunk))
+                    )
+                if rows:
+                    db.execute(insert(TrendingScore), rows)
+                db.execute(delete(TrendingCursor))
+                db.execute(
+                    insert(TrendingCursor),
+                    [{"source": s, "last_id": i} for s, i in cursors.items()],
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    self._dirty |= dirty
+                    self._removed |= removed
+                raise
+        return len(changed)
+
+    def refresh(self, persist: bool = False) -> None:
+        """Mise à jour (et écriture de l'instantané) dans une session dédiée"""
+        with self.session_factory() as db:
+            self.sync(db, force=True)
+            if persist:
+                self.persist(db)
+
+    def close(self) -> None:
+        """Arrêt : dernière mise à jour et instantané, si le classement a servi"""
+        if self._loaded:
+            self.refresh(persist=True)
+
+    async def run_periodic(self) -> None:
+        """
+        Tâche de fond : mise à jour toutes les ``refresh_interval`` secondes,
+        instantané toutes les ``persist_interval`` secondes
+        """
+        last_persist = time.monotonic()
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            persist = time.monotonic() - last_persist >= self.persist_interval
+            try:
+                await run_in_threadpool(self.refresh, persist)
+            except Exception:
+                logger.exception("Échec de la mise à jour du classement tendance")
+                continue
+            if persist:
+                last_persist = time.monotonic()
+
+
+trending = TrendingRankings(
+    like_weight=settings.trending_like_weight,
+    comment_weight=settings.trending_comment_weight,
+    refresh_interval=settings.trending_refresh_interval,
+    persist_interval=settings.trending_persist_interval,
+    min_score=settings.trending_min_score,
+)
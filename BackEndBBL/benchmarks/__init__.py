@@ -0,0 +1,3 @@
+"""
+Benchmarks de performance de l'API du blog
+"""
@@ -0,0 +1,181 @@
+"""
+Test de charge : latence des lectures pendant une rafale d'écritures
+
+Le serveur de production (``python -m app.serve``) est lancé sur une base
+générée ; des lecteurs concurrents lisent articles et listes pendant que
+des écrivains envoient likes et commentaires sans pause. Trois phases :
+
+- ``readers`` : lecteurs seuls (référence)
+- ``flood`` : lecteurs et rafale d'écritures, sans protection
+- ``flood+limits`` : même rafale, avec limitation de débit (429) et contrôle
+  d'admission (503) activés ; les écrivains respectent ``Retry-After``
+- ``flood+limits,no-backoff`` : idem, écrivains ignorant ``Retry-After`` (un
+  refus coûte alors encore une requête HTTP au serveur)
+
+Pour chaque phase : latences des lecteurs, débit des écritures acceptées et
+nombre d'écritures refusées.
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_admission --readers 8 --writers 32 --reads 3000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+from sqlalchemy import func, select
+
+from app.models.article import Article
+from benchmarks.bench_serve import start_server, stop_server
+from benchmarks.datagen import open_database, table_sizes
+from benchmarks.load import Scenario
+from benchmarks.report import build_report, print_table, summarize, write_report
+
+READ_MIX = {"get": 70, "list": 30}
+WRITE_MIX = {"like": 70, "comment": 30}
+
+
+async def _reader(http, scenario, remaining, samples):
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        _, method, path, body = scenario.next_request()
+        started = time.perf_counter()
+        response = await http.request(method, path, json=body)
+        samples.append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            raise SystemExit(f"Lecture en échec : {response.status_code} {path}")
+
+
+async def _writer(http, scenario, stop, statuses, backoff):
+    while not stop.is_set():
+        _, method, path, body = scenario.next_request()
+        try:
+            response = await http.request(method, path, json=body)
+        except httpx.HTTPError:
+            statuses["error"] += 1
+            continue
+        statuses[response.status_code] += 1
+        retry_after = response.headers.get("Retry-After")
+        if backoff and retry_after:
+            try:
+                await asyncio.wait_for(stop.wait(), float(retry_after))
+            except asyncio.TimeoutError:
+                pass
+
+
+async def phase(url, min_id, max_id, args, writers: int, backoff: bool):
+    """Latences des lectures et statuts des écritures pendant une phase"""
+    samples = []
+    statuses = Counter()
+    stop = asyncio.Event()
+    remaining = [args.reads]
+    limits = httpx.Limits(max_connections=args.readers + writers)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as http:
+        flood = [
+            asyncio.create_task(
+                _writer(
+                    http,
+                    Scenario(min_id, max_id, WRITE_MIX, i),
+                    stop,
+                    statuses,
+                    backoff,
+                )
+            )
+            for i in range(writers)
+        ]
+        # La rafale s'installe avant la mesure
+        await asyncio.sleep(1.0 if writers else 0)
+        statuses.clear()
+        started = time.perf_counter()
+        scenario = Scenario(min_id, max_id, READ_MIX, args.seed)
+        await asyncio.gather(
+            *(_reader(http, scenario, remaining, samples) for _ in range(args.readers))
+        )
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*flood)
+    return samples, statuses, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", help="base existante (générée par datagen)")
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--comments", type=int, default=20_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--reads", type=int, default=3000)
+    parser.add_argument("--rate", type=float, default=2.0, help="RATE_LIMIT_RATE")
+    parser.add_argument("--burst", type=int, default=20, help="RATE_LIMIT_BURST")
+    parser.add_argument("--max-writes", type=int, default=4)
+    parser.add_argument("--read-p99-ms", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="fichier JSON (sortie standard sinon)")
+    args = parser.parse_args()
+
+    protection = {
+        "RATE_LIMIT_ENABLED": "true",
+        "RATE_LIMIT_RATE": str(args.rate),
+        "RATE_LIMIT_BURST": str(args.burst),
+        "ADMISSION_MAX_WRITES": str(args.max_writes),
+        "ADMISSION_READ_P99_MS": str(args.read_p99_ms),
+    }
+    phases = {
+        "readers": (0, {}, False),
+        "flood": (args.writers, {}, False),
+        "flood+limits": (args.writers, protection, True),
+        "flood+limits,no-backoff": (args.writers, protection, False),
+    }
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = open_database(
+            args.database, tmp, args.articles, args.comments, args.seed
+        )
+        sizes = table_sizes(engine)
+        with engine.connect() as connection:
+            min_id, max_id = connection.execute(
+                select(func.min(Article.id), func.max(Article.id))
+            ).one()
+        database_url = engine.url.render_as_string(hide_password=False)
+        engine.dispose()
+
+        for name, (writers, environment, backoff) in phases.items():
+            log_path = Path(tmp) / f"{name}.log"
+            process, url = start_server(database_url, 1, log_path, environment)
+            try:
+                samples, statuses, elapsed = asyncio.run(
+                    phase(url, min_id, max_id, args, writers, backoff)
+                )
+            finally:
+                stop_server(process)
+            result = summarize(samples, elapsed=elapsed)
+            accepted = sum(n for code, n in statuses.items() if code in (200, 201))
+            result["writes_per_sec"] = round(accepted / elapsed, 1)
+            result["writes_429"] = statuses[429]
+            result["writes_503"] = statuses[503]
+            results[name] = result
+
+    params = {
+        "readers": args.readers,
+        "writers": args.writers,
+        "reads": args.reads,
+        "read_mix": READ_MIX,
+        "write_mix": WRITE_MIX,
+        "limits": protection,
+        "cpu_count": os.cpu_count(),
+        "seed": args.seed,
+        "database": "external" if args.database else "generated",
+        **sizes,
+    }
+    print_table(results)
+    write_report(build_report("admission", params, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
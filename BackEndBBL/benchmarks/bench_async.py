@@ -0,0 +1,117 @@
+"""
+Benchmark de charge : mode base de données synchrone vs asynchrone
+
+Pour chaque mode (DB_MODE=sync / async), l'application est chargée dans un
+processus dédié sur une base SQLite temporaire, puis N clients concurrents
+envoient des requêtes (lecture d'un article, liste, like) via un transport
+ASGI en mémoire. Le débit (requêtes/s) est mesuré pour chaque niveau de
+concurrence.
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_async --concurrency 50 200 1000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ARTICLES = 200
+
+
+async def _client(http, rng, requests, errors):
+    for _ in range(requests):
+        roll = rng.random()
+        if roll < 0.6:
+            response = await http.get(f"/api/articles/{rng.randint(1, ARTICLES)}")
+        elif roll < 0.9:
+            response = await http.get("/api/articles/?limit=20")
+        else:
+            response = await http.post(f"/api/articles/{rng.randint(1, ARTICLES)}/like")
+        if response.status_code >= 500:
+            errors.append(response.status_code)
+
+
+async def _run_level(app, concurrency: int, total: int):
+    """Retourne le débit (requêtes/s) et le nombre de réponses en erreur"""
+    import httpx
+
+    rng = random.Random(concurrency)
+    per_client = max(1, total // concurrency)
+    errors = []
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(_client(http, rng, per_client, errors) for _ in range(concurrency))
+        )
+        elapsed = time.perf_counter() - started
+    return per_client * concurrency / elapsed, len(errors)
+
+
+def child(levels, total: int) -> None:
+    """Exécuté dans le sous-processus : le mode est fixé par l'environnement"""
+    from app.database import SessionLocal, engine
+    from app.main import app
+    from app.migrations import upgrade
+    from app.models.article import Article
+
+    upgrade(engine)
+
+    with SessionLocal() as db:
+        db.add_all(
+            Article(title=f"Article {i}", content="Lorem ipsum " * 200, author="bench")
+            for i in range(ARTICLES)
+        )
+        db.commit()
+
+    async def run_all():
+        results = {}
+        for level in levels:
+            results[level] = await _run_level(app, level, total)
+        return results
+
+    print(json.dumps(asyncio.run(run_all())))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.concurrency, args.requests)
+        return
+
+    results = {}
+    for mode in ("sync", "async"):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ,
+                DB_MODE=mode,
+                DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            )
+            command = [sys.executable, "-m", "benchmarks.bench_async", "--child"]
+            command += ["--requests", str(args.requests), "--concurrency"]
+            command += [str(level) for level in args.concurrency]
+            output = subprocess.run(
+                command, env=env, check=True, capture_output=True, text=True
+            ).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{'clients':>8} {'mode':>6} {'req/s':>8} {'erreurs':>8}")
+    for level in args.concurrency:
+        for mode in ("sync", "async"):
+            rps, errors = results[mode][str(level)]
+            print(f"{level:>8} {mode:>6} {rps:>8.0f} {errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
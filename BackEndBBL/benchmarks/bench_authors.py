@@ -0,0 +1,122 @@
+"""
+Benchmark de la page d'un auteur selon la taille du corpus
+
+Pour chaque taille de base (``--sizes``), une base est générée et la page de
+deux auteurs est lue ``--requests`` fois : l'auteur le plus prolifique et un
+auteur médian. Deux façons de servir la page (statistiques et 20 derniers
+articles) sont comparées :
+
+- ``group_by`` : agrégats ``GROUP BY`` et liste filtrée par ``LIKE`` (ce que
+  permettait la recherche par sous-chaîne), à chaque requête
+- ``author_stats`` : ``AuthorService.get_author_articles`` (ligne de
+  ``author_stats`` par clé primaire, plage de l'index de l'auteur)
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_authors --sizes 10000,100000 --requests 200
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_db_engine
+from app.migrations import upgrade
+from app.models.article import Article
+from app.models.author import AuthorStats
+from app.services.author_service import AuthorService
+from app.services.projection import ARTICLE_SUMMARY_COLUMNS, rows_to_dicts
+from benchmarks.datagen import generate
+from benchmarks.report import build_report, print_table, summarize, write_report
+
+
+def group_by_page(db, author: str, limit: int = 20):
+    """Page d'auteur sans table de statistiques"""
+    pattern = f"%{author}%"
+    stats = (
+        db.query(
+            func.count(Article.id),
+            func.sum(Article.likes_count),
+            func.sum(Article.comments_count),
+            func.max(Article.created_at),
+        )
+        .filter(Article.author.like(pattern))
+        .one()
+    )
+    rows = (
+        db.query(*ARTICLE_SUMMARY_COLUMNS)
+        .filter(Article.author.like(pattern))
+        .order_by(Article.created_at.desc(), Article.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return stats, rows_to_dicts(rows, ARTICLE_SUMMARY_COLUMNS)
+
+
+def stats_page(db, author: str, limit: int = 20):
+    """Page d'auteur servie par author_stats et l'index de l'auteur"""
+    return AuthorService.get_author_articles(
+        db, author, limit=limit, columns=ARTICLE_SUMMARY_COLUMNS
+    )
+
+
+def timed(db, fn, author: str, requests: int):
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        fn(db, author)
+        samples.append((time.perf_counter() - started) * 1000)
+        db.rollback()
+    return summarize(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000", help="articles par base")
+    parser.add_argument("--comments-per-article", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="fichier JSON (sortie standard sinon)")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            engine = create_db_engine(f"sqlite:///{Path(tmp) / f'{size}.db'}")
+            upgrade(engine)
+            generate(engine, size, size * args.comments_per_article, seed=args.seed)
+            session_factory = sessionmaker(bind=engine)
+            with session_factory() as db:
+                authors = [
+                    row.author
+                    for row in db.query(AuthorStats.author).order_by(
+                        AuthorStats.articles_count.desc(), AuthorStats.author
+                    )
+                ]
+                picks = {"top": authors[0], "median": authors[len(authors) // 2]}
+                for label, author in picks.items():
+                    for name, fn in (
+                        ("group_by", group_by_page),
+                        ("author_stats", stats_page),
+                    ):
+                        results[f"{name}[{size},{label}]"] = timed(
+                            db, fn, author, args.requests
+                        )
+            engine.dispose()
+
+    params = {
+        "sizes": sizes,
+        "comments_per_article": args.comments_per_article,
+        "requests": args.requests,
+        "seed": args.seed,
+    }
+    print_table(results)
+    write_report(build_report("authors", params, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
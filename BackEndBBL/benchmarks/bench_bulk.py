@@ -0,0 +1,118 @@
+"""
+Benchmark de l'import/export NDJSON
+
+Compare le débit (lignes/s) de la création article par article
+(``POST /api/articles/``) à celui de l'import en masse
+(``POST /api/articles/bulk``, ``POST /api/comments/bulk``) et de l'export
+(``GET /api/articles/export``), sur une base SQLite temporaire.
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_bulk --rows 100000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+def articles_ndjson(count: int) -> bytes:
+    return b"".join(
+        json.dumps(
+            {"title": f"Article {i}", "content": "Lorem ipsum " * 50, "author": "bench"}
+        ).encode()
+        + b"\n"
+        for i in range(count)
+    )
+
+
+def comments_ndjson(count: int, articles: int) -> bytes:
+    return b"".join(
+        json.dumps(
+            {"article_id": i % articles + 1, "author": "bench", "content": "Merci !"}
+        ).encode()
+        + b"\n"
+        for i in range(count)
+    )
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--single", type=int, default=1000, help="créations unitaires")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            connect_args={"check_same_thread": False},
+        )
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+
+        def override_get_db():
+            with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+        results = []
+
+        def single():
+            for i in range(args.single):
+                client.post(
+                    "/api/articles/",
+                    json={"title": f"Unitaire {i}", "content": "x", "author": "bench"},
+                )
+
+        _, elapsed = timed(single)
+        results.append(("POST /api/articles/ (unitaire)", args.single, elapsed))
+
+        body = articles_ndjson(args.rows)
+        response, elapsed = timed(
+            lambda: client.post("/api/articles/bulk", content=body, headers=NDJSON)
+        )
+        assert response.json()["inserted"] == args.rows, response.text
+        results.append(("POST /api/articles/bulk", args.rows, elapsed))
+
+        body = comments_ndjson(args.rows, args.rows)
+        response, elapsed = timed(
+            lambda: client.post("/api/comments/bulk", content=body, headers=NDJSON)
+        )
+        assert response.json()["inserted"] == args.rows, response.text
+        results.append(("POST /api/comments/bulk", args.rows, elapsed))
+
+        def export():
+            lines = 0
+            with client.stream("GET", "/api/articles/export") as stream:
+                for line in stream.iter_lines():
+                    lines += bool(line)
+            return lines
+
+        lines, elapsed = timed(export)
+        results.append(("GET /api/articles/export", lines, elapsed))
+        app.dependency_overrides.pop(get_db)
+
+    print(f"{'opération':<32} {'lignes':>8} {'durée (s)':>10} {'lignes/s':>10}")
+    for name, rows, elapsed in results:
+        print(f"{name:<32} {rows:>8} {elapsed:>10.2f} {rows / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark de la compression des réponses : octets transmis et coût CPU
+
+Pour des corps réels (article complet, pages d'articles complètes et en mode
+résumé, page de commentaires), mesure la taille compressée et le temps CPU de
+compression par requête, pour chaque encodage disponible (gzip, et br / zstd
+si les paquets sont installés) à plusieurs niveaux. Une réponse servie par le
+cache des réponses compressées ne coûte qu'une lecture du cache.
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_compression --words 1500 3000 --repeat 100
+"""
+
+import argparse
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.api.responses import dumps
+from app.core.cache import LRUCache
+from app.middleware.compression import CODECS, compress
+from app.services.article_service import ArticleService
+from app.services.comment_service import CommentService
+from app.services.projection import (
+    ARTICLE_RESPONSE_COLUMNS,
+    ARTICLE_SUMMARY_COLUMNS,
+    COMMENT_RESPONSE_COLUMNS,
+)
+from benchmarks.datagen import open_database, table_sizes
+from benchmarks.report import build_report, print_table, summarize, write_report
+
+# Niveaux mesurés par encodage (les niveaux par défaut sont gzip 4, br 4, zstd 3)
+LEVELS = {"gzip": (1, 4, 6, 9), "br": (1, 4, 9, 11), "zstd": (1, 3, 9, 19)}
+
+
+def payloads(session_factory, popular_article: int):
+    """Corps JSON mesurés, comme les envoient les routes de lecture"""
+    with session_factory() as db:
+        page = ArticleService.get_all_articles(
+            db, limit=100, columns=ARTICLE_RESPONSE_COLUMNS
+        )
+        summary = ArticleService.get_all_articles(
+            db, limit=20, columns=ARTICLE_SUMMARY_COLUMNS
+        )
+        comments, _ = CommentService.get_comments_page(
+            db, popular_article, limit=100, columns=COMMENT_RESPONSE_COLUMNS
+        )
+    return {
+        "article": dumps(page[len(page) // 2]),
+        "articles[100]": dumps(page),
+        "articles[20].summary": dumps(summary),
+        "comments[100]": dumps(comments),
+    }
+
+
+def measure(body: bytes, coding: str, level: int, repeat: int):
+    """Temps CPU (ms) de chaque compression et taille compressée"""
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        compressed = compress(body, coding, level)
+        samples.append((time.process_time() - started) * 1000)
+    return samples, len(compressed)
+
+
+def measure_cache_hit(body: bytes, repeat: int):
+    """Temps CPU (ms) d'une réponse servie par le cache des corps compressés"""
+    cache = LRUCache()
+    cache.set("gzip:4:etag", compress(body, "gzip", 4))
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        cache.get("gzip:4:etag")
+        samples.append((time.process_time() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", help="base existante (générée par datagen)")
+    parser.add_argument("--articles", type=int, default=2_000)
+    parser.add_argument("--comments", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--words", type=int, nargs=2, default=[40, 120], help="mots par article"
+    )
+    parser.add_argument("--output", help="fichier JSON (sortie standard sinon)")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = open_database(
+            args.database,
+            tmp,
+            args.articles,
+            args.comments,
+            args.seed,
+            article_words=tuple(args.words),
+        )
+        sizes = table_sizes(engine)
+        with engine.connect() as connection:
+            popular_article = connection.exec_driver_sql(
+                "SELECT id FROM articles ORDER BY comments_count DESC LIMIT 1"
+            ).scalar()
+        bodies = payloads(sessionmaker(bind=engine), popular_article)
+        engine.dispose()
+
+    for name, body in bodies.items():
+        for coding in CODECS:
+            for level in LEVELS[coding]:
+                samples, wire_bytes = measure(body, coding, level, args.repeat)
+                results[f"{name}.{coding}-{level}"] = {
+                    **summarize(samples),
+                    "bytes": len(body),
+                    "wire_bytes": wire_bytes,
+                    "ratio": round(len(body) / wire_bytes, 2),
+                }
+        results[f"{name}.cache-hit"] = {
+            **summarize(measure_cache_hit(body, args.repeat)),
+            "bytes": len(body),
+        }
+
+    params = {
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "words": args.words,
+        "codings": list(CODECS),
+        "database": "external" if args.database else "generated",
+        **sizes,
+    }
+    print_table(results)
+    write_report(build_report("compression", params, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
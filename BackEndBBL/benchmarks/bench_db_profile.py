@@ -0,0 +1,139 @@
+"""
+Benchmark du profil SQLite : charge mixte lecture/écriture
+
+Des threads exécutent en parallèle des lectures (article par id, dernière
+page) et des écritures (like, commentaire) pendant une durée fixe, d'abord
+avec la configuration SQLite par défaut (journal DELETE, synchronous=FULL),
+puis avec le profil de ``app.database`` (WAL, synchronous=NORMAL, mmap,
+cache). Le débit et les erreurs « database is locked » sont comptés.
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_db_profile --threads 8 --seconds 5
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, create_db_engine
+from app.models.article import Article
+from app.models.comment import Comment
+
+ARTICLES = 5000
+
+
+def seed(engine) -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Article),
+            [
+                {
+                    "title": f"Article {i}",
+                    "content": "Lorem ipsum " * 100,
+                    "author": "b",
+                }
+                for i in range(ARTICLES)
+            ],
+        )
+
+
+def worker(session_factory, write_ratio, deadline, seed_value, counters, lock):
+    rng = random.Random(seed_value)
+    reads = writes = errors = 0
+    while time.perf_counter() < deadline:
+        try:
+            with session_factory() as db:
+                if rng.random() < write_ratio:
+                    article_id = rng.randint(1, ARTICLES)
+                    if rng.random() < 0.5:
+                        db.execute(
+                            update(Article)
+                            .where(Article.id == article_id)
+                            .values(likes_count=Article.likes_count + 1)
+                        )
+                    else:
+                        db.execute(
+                            insert(Comment).values(
+                                article_id=article_id, author="b", content="Merci"
+                            )
+                        )
+                    db.commit()
+                    writes += 1
+                else:
+                    db.get(Article, rng.randint(1, ARTICLES))
+                    db.scalars(
+                        select(Article).order_by(Article.id.desc()).limit(20)
+                    ).all()
+                    reads += 1
+        except OperationalError:
+            errors += 1
+    with lock:
+        counters["reads"] += reads
+        counters["writes"] += writes
+        counters["errors"] += errors
+
+
+def run(engine, threads: int, seconds: float, write_ratio: float) -> dict:
+    Base.metadata.create_all(bind=engine)
+    seed(engine)
+    session_factory = sessionmaker(bind=engine)
+    counters = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    pool = [
+        threading.Thread(
+            target=worker,
+            args=(session_factory, write_ratio, deadline, i, counters, lock),
+        )
+        for i in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    engine.dispose()
+    return counters
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    profiles = {
+        "défaut": lambda url: create_engine(
+            url, connect_args={"check_same_thread": False}
+        ),
+        "profil": create_db_engine,
+    }
+    print(
+        f"{args.threads} threads, {args.seconds:.0f} s, "
+        f"{args.write_ratio:.0%} d'écritures"
+    )
+    print(
+        f"{'config':>8} {'lectures/s':>11} {'écritures/s':>12} "
+        f"{'total/s':>9} {'erreurs':>8}"
+    )
+    for name, factory in profiles.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = factory(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            counters = run(engine, args.threads, args.seconds, args.write_ratio)
+        reads = counters["reads"] / args.seconds
+        writes = counters["writes"] / args.seconds
+        print(
+            f"{name:>8} {reads:>11.0f} {writes:>12.0f} "
+            f"{reads + writes:>9.0f} {counters['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
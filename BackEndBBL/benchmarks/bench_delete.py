@@ -0,0 +1,148 @@
+"""
+Benchmark de la suppression d'un article très commenté
+
+Un article reçoit ``--comments`` commentaires et ``--likes`` likes (par
+défaut 100 000 et 10 000) dans une base générée, puis il est supprimé selon
+trois stratégies, ``--repeat`` fois chacune :
+
+- ``orm_cascade`` : ancienne suppression, cascade de l'ORM (chargement de
+  chaque commentaire puis un DELETE par ligne ; les likes restaient orphelins)
+- ``immediate`` : ``ArticleService.delete_articles``, DELETE ensemblistes
+- ``deferred`` : seul l'article est supprimé dans la requête ; la purge par
+  lots de ``--batch-size`` lignes est mesurée à part (durée de chaque lot,
+  c'est-à-dire du verrou d'écriture, et durée totale)
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_delete --comments 100000 --repeat 3
+"""
+
+import argparse
+import tempfile
+import time
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models.article import Article
+from app.models.comment import Comment
+from app.models.like import Like
+from app.models.purge import ArticlePurge
+from app.services.article_purge import purge_batch
+from app.services.article_service import ArticleService
+from benchmarks.datagen import open_database, table_sizes
+from benchmarks.report import build_report, print_table, summarize, write_report
+
+
+def seed_article(engine, comments: int, likes: int) -> int:
+    """Article et ses dépendances, insérés par lots ; renvoie son identifiant"""
+    with engine.begin() as connection:
+        article_id = connection.execute(
+            insert(Article.__table__)
+            .values(title="Viral", content="Contenu", author="Auteur")
+            .returning(Article.__table__.c.id)
+        ).scalar_one()
+        for start in range(0, comments, 10_000):
+            connection.execute(
+                insert(Comment.__table__),
+                [
+                    {"article_id": article_id, "author": "Lecteur", "content": str(i)}
+                    for i in range(start, min(comments, start + 10_000))
+                ],
+            )
+        for start in range(0, likes, 10_000):
+            connection.execute(
+                insert(Like.__table__),
+                [{"article_id": article_id}] * min(10_000, likes - start),
+            )
+    return article_id
+
+
+def orm_cascade(db, article_id: int) -> None:
+    """Suppression d'avant : la relation chargée est effacée ligne à ligne"""
+    article = db.get(Article, article_id)
+    # Chargement de la relation, comme sans passive_deletes
+    list(article.comments)
+    db.delete(article)
+    db.commit()
+
+
+def purge_all(db, batch_size: int, batches) -> None:
+    """Purge en attente, un lot par transaction (comme ArticlePurger)"""
+    while True:
+        purges = db.execute(select(ArticlePurge.__table__)).all()
+        db.commit()
+        if not purges:
+            return
+        for purge in purges:
+            started = time.perf_counter()
+            purge_batch(db.connection(), purge, batch_size)
+            db.commit()
+            batches.append((time.perf_counter() - started) * 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", help="base existante (générée par datagen)")
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--comments", type=int, default=100_000)
+    parser.add_argument("--likes", type=int, default=10_000)
+    parser.add_argument("--other-comments", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="fichier JSON (sortie standard sinon)")
+    args = parser.parse_args()
+
+    samples = {"orm_cascade": [], "immediate": [], "deferred": []}
+    batches, purges = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = open_database(
+            args.database, tmp, args.articles, args.other_comments, args.seed
+        )
+        sizes = table_sizes(engine)
+        session_factory = sessionmaker(bind=engine)
+        for _ in range(args.repeat):
+            for strategy, runs in samples.items():
+                article_id = seed_article(engine, args.comments, args.likes)
+                settings.article_delete_mode = (
+                    "deferred" if strategy == "deferred" else "immediate"
+                )
+                with session_factory() as db:
+                    started = time.perf_counter()
+                    if strategy == "orm_cascade":
+                        orm_cascade(db, article_id)
+                    else:
+                        ArticleService.delete_articles(db, [article_id])
+                    runs.append((time.perf_counter() - started) * 1000)
+                    if strategy == "deferred":
+                        started = time.perf_counter()
+                        purge_all(db, args.batch_size, batches)
+                        purges.append((time.perf_counter() - started) * 1000)
+                # Likes laissés par l'ancienne suppression : hors mesure
+                with engine.begin() as connection:
+                    connection.execute(
+                        Like.__table__.delete().where(
+                            Like.__table__.c.article_id == article_id
+                        )
+                    )
+        engine.dispose()
+
+    results = {f"delete.{name}": summarize(runs) for name, runs in samples.items()}
+    results["purge.total"] = summarize(purges)
+    results[f"purge.batch[{args.batch_size}]"] = summarize(batches)
+    params = {
+        "comments": args.comments,
+        "likes": args.likes,
+        "batch_size": args.batch_size,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "database": "external" if args.database else "generated",
+        **sizes,
+    }
+    print_table(results)
+    write_report(build_report("delete", params, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
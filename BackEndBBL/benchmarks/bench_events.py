@@ -0,0 +1,83 @@
+"""
+Benchmark du flux d'événements : connexions inactives et diffusion
+
+Pour chaque nombre d'abonnés, des milliers de flux SSE inactifs attendent sur
+le même article (générateur de la réponse, abonné, minuterie du heartbeat) ;
+on mesure la mémoire par connexion, puis le temps entre la publication d'un
+événement et sa réception par tous les abonnés. La publication sans abonné
+est le coût ajouté à chaque écriture (commentaire, like).
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_events --subscribers 1000 10000 --events 50
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from app.services.events import EventBus, event_stream
+from benchmarks.report import build_report, print_table, summarize, write_report
+
+
+async def fan_out(subscribers: int, events: int):
+    """Mémoire par connexion (octets) et latences de diffusion (ms)"""
+    bus = EventBus()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    streams = [event_stream(bus.subscribe(1), heartbeat=60) for _ in range(subscribers)]
+    for stream in streams:
+        await stream.__anext__()
+    waiting = [asyncio.create_task(stream.__anext__()) for stream in streams]
+    await asyncio.sleep(0)
+    per_connection = (tracemalloc.get_traced_memory()[0] - before) / subscribers
+    tracemalloc.stop()
+
+    samples = []
+    for count in range(events):
+        started = time.perf_counter()
+        bus.publish(1, "comment_created", {"id": count, "content": "Bravo"})
+        await asyncio.gather(*waiting)
+        samples.append((time.perf_counter() - started) * 1000)
+        waiting = [asyncio.create_task(stream.__anext__()) for stream in streams]
+        await asyncio.sleep(0)
+    for task in waiting:
+        task.cancel()
+    await asyncio.gather(*waiting, return_exceptions=True)
+    for stream in streams:
+        await stream.aclose()
+    return per_connection, samples
+
+
+def publish_without_subscribers(events: int):
+    bus = EventBus()
+    samples = []
+    for count in range(events):
+        started = time.perf_counter()
+        bus.publish(count % 1000, "likes", {"article_id": count, "likes_count": 1})
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--events", type=int, default=50, help="événements diffusés")
+    parser.add_argument("--output", help="fichier JSON (sortie standard sinon)")
+    args = parser.parse_args()
+
+    results = {"publish[0 abonné]": summarize(publish_without_subscribers(10_000))}
+    for subscribers in args.subscribers:
+        per_connection, samples = asyncio.run(fan_out(subscribers, args.events))
+        results[f"fan_out[{subscribers}]"] = {
+            **summarize(samples),
+            "bytes_per_connection": round(per_connection),
+        }
+
+    params = {"subscribers": args.subscribers, "events": args.events}
+    print_table(results)
+    write_report(build_report("events", params, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
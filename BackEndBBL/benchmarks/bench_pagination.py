@@ -0,0 +1,93 @@
+"""
+Benchmark de la pagination : décalage (OFFSET) vs curseur (keyset)
+
+Mesure le temps de lecture d'une page de 20 articles à différentes profondeurs.
+Avec OFFSET le coût croît avec la profondeur ; avec le curseur il reste stable.
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_pagination --rows 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.article import Article
+from app.services.article_service import ArticleService
+from app.services.pagination import keyset_cursor
+
+EPOCH = datetime(2020, 1, 1)
+
+
+def seed(session_factory, count: int, chunk: int = 20_000) -> None:
+    """Insère `count` articles courts, une seconde d'écart entre chacun"""
+    with session_factory() as db:
+        for start in range(0, count, chunk):
+            rows = [
+                {
+                    "title": f"Article {i}",
+                    "content": "x",
+                    "author": "bench",
+                    "likes_count": 0,
+                    "created_at": EPOCH + timedelta(seconds=i),
+                }
+                for i in range(start, min(start + chunk, count))
+            ]
+            db.execute(insert(Article.__table__), rows)
+            db.commit()
+
+
+def timed(fn, repeat: int = 20) -> float:
+    """Durée médiane d'un appel, en millisecondes"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        seed(session_factory, args.rows)
+
+        print(f"{args.rows} articles, pages de {args.page_size}")
+        print(f"{'profondeur':>12} {'offset (ms)':>12} {'curseur (ms)':>13}")
+        with session_factory() as db:
+            depths = [10**p for p in range(len(str(args.rows)) - 1)]
+            for depth in depths + [args.rows - args.page_size]:
+                # Curseur équivalent à la position `depth` (ordre décroissant)
+                position = args.rows - depth
+                cursor = keyset_cursor(
+                    f"2020-01-01 00:00:00.{position:06d}", position + 1
+                )
+                offset_ms = timed(
+                    lambda: ArticleService.get_all_articles(
+                        db, skip=depth, limit=args.page_size
+                    )
+                )
+                cursor_ms = timed(
+                    lambda: ArticleService.get_articles_page(
+                        db, cursor=cursor, limit=args.page_size
+                    )
+                )
+                print(f"{depth:>12} {offset_ms:>12.2f} {cursor_ms:>13.2f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
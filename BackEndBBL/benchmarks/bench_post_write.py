@@ -0,0 +1,98 @@
+"""
+Benchmark des écritures selon POST_WRITE_MODE
+
+Dans une base générée, ``--writes`` articles (de ``--words`` mots) puis
+autant de commentaires sont créés par ``ArticleService.create_article`` et
+``CommentService.create_comment``, dans chacun des deux modes :
+
+- ``inline`` : résumé, compteurs et statistiques de l'auteur calculés dans
+  la transaction de l'écriture
+- ``deferred`` : l'écriture n'enregistre que la ligne demandée et ses
+  travaux ; la file est ensuite vidée par ``JobRunner.drain``, mesuré à part
+  (durée totale, rapportée au nombre de travaux exécutés)
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_post_write --writes 500
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.schemas.article import ArticleCreate
+from app.schemas.comment import CommentCreate
+from app.services.article_service import ArticleService
+from app.services.comment_service import CommentService
+from app.services.jobs import JobRunner
+from benchmarks.datagen import open_database, table_sizes
+from benchmarks.report import build_report, print_table, summarize, write_report
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", help="base existante (générée par datagen)")
+    parser.add_argument("--articles", type=int, default=10_000)
+    parser.add_argument("--comments", type=int, default=50_000)
+    parser.add_argument("--writes", type=int, default=500)
+    parser.add_argument("--words", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="fichier JSON (sortie standard sinon)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    content = " ".join(f"mot{rng.randrange(5000)}" for _ in range(args.words))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = open_database(
+            args.database, tmp, args.articles, args.comments, args.seed
+        )
+        sizes = table_sizes(engine)
+        session_factory = sessionmaker(bind=engine)
+        runner = JobRunner(session_factory=session_factory)
+        for mode in ("inline", "deferred"):
+            settings.post_write_mode = mode
+            articles, comments = [], []
+            with session_factory() as db:
+                for i in range(args.writes):
+                    payload = ArticleCreate(
+                        title=f"Article {i}", content=content, author="Auteur 1"
+                    )
+                    article, elapsed = timed(ArticleService.create_article, db, payload)
+                    articles.append(elapsed)
+                for i in range(args.writes):
+                    payload = CommentCreate(
+                        article_id=article.id, author="Lecteur", content=f"Avis {i}"
+                    )
+                    _, elapsed = timed(CommentService.create_comment, db, payload)
+                    comments.append(elapsed)
+            results[f"create_article.{mode}"] = summarize(articles)
+            results[f"create_comment.{mode}"] = summarize(comments)
+            if mode == "deferred":
+                executed, elapsed = timed(runner.drain)
+                results["drain.per_job"] = summarize([elapsed / max(executed, 1)])
+                results["drain.total"] = summarize([elapsed])
+        engine.dispose()
+
+    params = {
+        "writes": args.writes,
+        "words": args.words,
+        "seed": args.seed,
+        "database": "external" if args.database else "generated",
+        **sizes,
+    }
+    print_table(results)
+    write_report(build_report("post_write", params, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
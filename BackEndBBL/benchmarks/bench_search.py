@@ -0,0 +1,108 @@
+"""
+Benchmark de la recherche d'articles : ILIKE vs FTS5
+
+Génère un corpus aléatoire (graine fixe) dans une base SQLite temporaire puis
+mesure la latence p50/p99 de ``get_all_articles(search=...)`` avec chacun des
+moteurs de recherche.
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_search --sizes 10000 100000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.article import Article
+from app.services.search import FTS5SearchBackend, LikeSearchBackend
+from app.services.article_service import ArticleService
+from benchmarks.datagen import build_vocabulary
+from benchmarks.report import percentile
+
+
+def seed(
+    session_factory, count: int, rng: random.Random, vocabulary, chunk: int = 5000
+) -> None:
+    """Insère `count` articles aléatoires par lots"""
+    words, cum_weights = vocabulary
+    with session_factory() as db:
+        for start in range(0, count, chunk):
+            rows = [
+                {
+                    "title": " ".join(rng.choices(words, cum_weights=cum_weights, k=5)),
+                    "content": " ".join(
+                        rng.choices(
+                            words, cum_weights=cum_weights, k=rng.randint(150, 400)
+                        )
+                    ),
+                    "author": f"author{rng.randint(1, 500)}",
+                    "likes_count": 0,
+                }
+                for _ in range(min(chunk, count - start))
+            ]
+            db.execute(insert(Article), rows)
+            db.commit()
+
+
+def measure(session_factory, backend, terms, limit: int):
+    """
+    Exécute les recherches avec un moteur donné et retourne les latences (ms)
+
+    Reproduit le chemin de ``ArticleService.get_all_articles(search=...)`` :
+    recherche des identifiants puis chargement des articles.
+    """
+    samples = []
+    with session_factory() as db:
+        for term in terms:
+            started = time.perf_counter()
+            hits = backend.search(db, term, limit=limit)
+            ArticleService._load_hits(db, hits)
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def run(size: int, queries: int, limit: int, seed_value: int) -> None:
+    rng = random.Random(seed_value)
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+
+        started = time.perf_counter()
+        vocabulary = build_vocabulary(rng)
+        seed(session_factory, size, rng, vocabulary)
+        print(f"\n{size} articles générés en {time.perf_counter() - started:.1f}s")
+
+        # Termes de fréquence moyenne, tronqués pour exercer la recherche par préfixe
+        words = vocabulary[0][100:5000]
+        terms = [rng.choice(words)[: rng.randint(4, 8)] for _ in range(queries)]
+        for backend in (LikeSearchBackend(), FTS5SearchBackend()):
+            samples = measure(session_factory, backend, terms, limit)
+            print(
+                f"  {backend.name:<5} p50={statistics.median(samples):8.2f} ms"
+                f"  p99={percentile(samples, 99):8.2f} ms"
+            )
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.queries, args.limit, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Benchmark de la sérialisation des pages d'articles et de commentaires
+
+Compare, pour une même page, le chemin ORM + Pydantic (objets ORM validés un
+à un par le schéma de réponse puis encodés) et le chemin par projection
+(tuples de colonnes convertis en dictionnaires puis encodés par orjson).
+Le temps de requête et le temps de sérialisation sont mesurés séparément,
+ainsi que la liste en mode résumé (sans le contenu complet).
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_serialization --sizes 20 100 --repeat 200
+"""
+
+import argparse
+import tempfile
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import sessionmaker
+
+from app.api.responses import dumps
+from app.schemas.article import ArticleResponse
+from app.schemas.comment import CommentResponse
+from app.services.article_service import ArticleService
+from app.services.comment_service import CommentService
+from app.services.projection import (
+    ARTICLE_RESPONSE_COLUMNS,
+    ARTICLE_SUMMARY_COLUMNS,
+    COMMENT_RESPONSE_COLUMNS,
+)
+from benchmarks.datagen import open_database, table_sizes
+from benchmarks.report import build_report, print_table, summarize, write_report
+
+_articles_json = TypeAdapter(List[ArticleResponse])
+_comments_json = TypeAdapter(List[CommentResponse])
+
+
+def _pydantic_articles(articles) -> bytes:
+    return _articles_json.dump_json([ArticleService.to_response(a) for a in articles])
+
+
+def _projected_articles(articles) -> bytes:
+    return dumps([ArticleService.add_pending_likes(a) for a in articles])
+
+
+def _pydantic_comments(comments) -> bytes:
+    return _comments_json.dump_json(
+        [CommentResponse.model_validate(c) for c in comments]
+    )
+
+
+def paths(size: int, popular_article: int):
+    """(nom, chargement, sérialisation) de chaque chemin comparé"""
+    return [
+        (
+            f"articles[{size}].orm+pydantic",
+            lambda db: ArticleService.get_all_articles(db, limit=size),
+            _pydantic_articles,
+        ),
+        (
+            f"articles[{size}].columns+orjson",
+            lambda db: ArticleService.get_all_articles(
+                db, limit=size, columns=ARTICLE_RESPONSE_COLUMNS
+            ),
+            _projected_articles,
+        ),
+        (
+            f"articles[{size}].summary+orjson",
+            lambda db: ArticleService.get_all_articles(
+                db, limit=size, columns=ARTICLE_SUMMARY_COLUMNS
+            ),
+            _projected_articles,
+        ),
+        (
+            f"comments[{size}].orm+pydantic",
+            lambda db: CommentService.get_comments_page(
+                db, popular_article, limit=size
+            )[0],
+            _pydantic_comments,
+        ),
+        (
+            f"comments[{size}].columns+orjson",
+            lambda db: CommentService.get_comments_page(
+                db, popular_article, limit=size, columns=COMMENT_RESPONSE_COLUMNS
+            )[0],
+            dumps,
+        ),
+    ]
+
+
+def measure(session_factory, load, serialize, repeat: int):
+    """Latences (ms) de chargement, de sérialisation et totales"""
+    query, encode, total = [], [], []
+    for _ in range(repeat):
+        with session_factory() as db:
+            started = time.perf_counter()
+            items = load(db)
+            loaded = time.perf_counter()
+            serialize(items)
+            done = time.perf_counter()
+        query.append((loaded - started) * 1000)
+        encode.append((done - loaded) * 1000)
+        total.append((done - started) * 1000)
+    return query, encode, total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", help="base existante (générée par datagen)")
+    parser.add_argument("--articles", type=int, default=5_000)
+    parser.add_argument("--comments", type=int, default=50_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--words", type=int, nargs=2, default=[40, 120], help="mots par article"
+    )
+    parser.add_argument("--output", help="fichier JSON (sortie standard sinon)")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = open_database(
+            args.database,
+            tmp,
+            args.articles,
+            args.comments,
+            args.seed,
+            article_words=tuple(args.words),
+        )
+        sizes = table_sizes(engine)
+        session_factory = sessionmaker(bind=engine)
+        with engine.connect() as connection:
+            popular_article = connection.exec_driver_sql(
+                "SELECT id FROM articles ORDER BY comments_count DESC LIMIT 1"
+            ).scalar()
+        for size in args.sizes:
+            for name, load, serialize in paths(size, popular_article):
+                query, encode, total = measure(
+                    session_factory, load, serialize, args.repeat
+                )
+                results[f"{name}.query"] = summarize(query)
+                results[f"{name}.serialize"] = summarize(encode)
+                results[f"{name}.total"] = summarize(total)
+        engine.dispose()
+
+    params = {
+        "sizes": args.sizes,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "words": args.words,
+        "database": "external" if args.database else "generated",
+        **sizes,
+    }
+    print_table(results)
+    write_report(build_report("serialization", params, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark du débit selon le nombre de workers de ``python -m app.serve``
+
+Pour chaque nombre de workers, le serveur de production est lancé sur une
+même base générée, puis le mélange de requêtes de ``benchmarks.load`` lui est
+envoyé par HTTP (clients concurrents d'un processus séparé) ; on mesure le
+débit et les latences. Le passage à l'échelle dépend des cœurs disponibles
+(``cpu_count`` dans les paramètres) : le générateur de charge en occupe une
+partie, et sous SQLite les écritures restent sérialisées.
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_serve --workers 1 2 4 8 --requests 5000
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from sqlalchemy import func, select
+
+from app.models.article import Article
+from benchmarks.datagen import open_database, table_sizes
+from benchmarks.load import DEFAULT_MIX, Scenario, drive, parse_mix
+from benchmarks.report import build_report, print_table, summarize, write_report
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def start_server(
+    database_url: str,
+    workers: int,
+    log_path: Path,
+    environment: Optional[Dict[str, str]] = None,
+):
+    """Lance le serveur (journaux dans `log_path`) ; retourne le processus et son URL"""
+    env = {**os.environ, **(environment or {}), "DATABASE_URL": database_url}
+    command = [sys.executable, "-m", "app.serve", "--port", "0"]
+    with open(log_path, "w") as log:
+        process = subprocess.Popen(
+            command + ["--workers", str(workers)],
+            cwd=BACKEND,
+            env=env,
+            stdout=log,
+            stderr=log,
+        )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline and process.poll() is None:
+        match = re.search(r"Écoute sur (http://\S+)", log_path.read_text())
+        if match:
+            return process, match.group(1)
+        time.sleep(0.05)
+    process.kill()
+    raise SystemExit(f"Échec du démarrage du serveur ({workers} workers)")
+
+
+def stop_server(process) -> None:
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", help="base existante (générée par datagen)")
+    parser.add_argument("--articles", type=int, default=20_000)
+    parser.add_argument("--comments", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument("--mix", nargs="+", type=str, help="ex. get=80 like=20")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="fichier JSON (sortie standard sinon)")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix) if args.mix else dict(DEFAULT_MIX)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = open_database(
+            args.database, tmp, args.articles, args.comments, args.seed
+        )
+        sizes = table_sizes(engine)
+        with engine.connect() as connection:
+            min_id, max_id = connection.execute(
+                select(func.min(Article.id), func.max(Article.id))
+            ).one()
+        database_url = engine.url.render_as_string(hide_password=False)
+        engine.dispose()
+
+        for workers in args.workers:
+            log_path = Path(tmp) / f"serve-{workers}.log"
+            process, url = start_server(database_url, workers, log_path)
+            try:
+                scenario = Scenario(min_id, max_id, mix, args.seed)
+                if args.warmup:
+                    asyncio.run(drive(scenario, args.concurrency, args.warmup, url))
+                samples, errors, elapsed = asyncio.run(
+                    drive(scenario, args.concurrency, args.requests, url)
+                )
+            finally:
+                stop_server(process)
+            every = [sample for name in samples for sample in samples[name]]
+            results[f"workers[{workers}]"] = summarize(
+                every, elapsed=elapsed, errors=sum(errors.values())
+            )
+
+    baseline = results[f"workers[{args.workers[0]}]"]["ops_per_sec"]
+    for result in results.values():
+        result["speedup"] = round(result["ops_per_sec"] / baseline, 2)
+    params = {
+        "workers": args.workers,
+        "cpu_count": os.cpu_count(),
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "mix": mix,
+        "seed": args.seed,
+        "database": "external" if args.database else "generated",
+        **sizes,
+    }
+    print_table(results)
+    write_report(build_report("serve", params, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark du démarrage : délai jusqu'à la première requête servie
+
+Lance N processus « workers » simultanément, comme ``uvicorn --workers N``.
+Chacun importe l'application, exécute le cycle de démarrage (lifespan) puis
+sert une première requête ; on mesure le délai entre le lancement et cette
+première réponse. La base SQLite temporaire est migrée une fois au préalable,
+comme lors d'un déploiement.
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_startup --workers 8 --rounds 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def child(started: float) -> None:
+    """Exécuté dans chaque worker : démarrage puis première requête"""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        status = client.get("/api/articles/").status_code
+    print(json.dumps({"elapsed": time.time() - started, "status": status}))
+
+
+def prepare(env) -> None:
+    """Migration unique de la base, avant le lancement des workers"""
+    subprocess.run(
+        [sys.executable, "-m", "app.migrations", "upgrade"],
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+
+
+def run_round(workers: int, env) -> list:
+    started = time.time()
+    command = [sys.executable, "-m", "benchmarks.bench_startup", "--child"]
+    processes = [
+        subprocess.Popen(
+            command + ["--started", repr(started)],
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(workers)
+    ]
+    results = []
+    for process in processes:
+        stdout, _ = process.communicate()
+        lines = stdout.strip().splitlines()
+        if process.returncode == 0 and lines:
+            results.append(json.loads(lines[-1]))
+        else:
+            results.append({"elapsed": None, "status": None})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--started", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.started)
+        return
+
+    elapsed, failures = [], 0
+    for _ in range(args.rounds):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            )
+            prepare(env)
+            for result in run_round(args.workers, env):
+                if result["status"] == 200:
+                    elapsed.append(result["elapsed"] * 1000)
+                else:
+                    failures += 1
+
+    elapsed.sort()
+    print(f"{args.workers} workers x {args.rounds} démarrages")
+    if elapsed:
+        median = elapsed[len(elapsed) // 2]
+        print(f"première requête : médiane {median:.0f} ms, max {elapsed[-1]:.0f} ms")
+    print(f"workers en échec : {failures}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark du classement des articles tendance sous un flux continu de likes
+
+Un historique de likes répartis sur 7 jours est d'abord écrit dans le
+journal ``likes``, puis des lots de likes arrivent en continu (popularité
+suivant une loi de Zipf). Pour chaque lot, on mesure la mise à jour
+incrémentale du classement et la lecture du top-k, comparées aux requêtes
+SQL qu'il remplace :
+
+- ``ORDER BY likes_count DESC`` (sans index : parcours et tri de la table)
+- likes des dernières 24 h agrégés par article (parcours du journal)
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.bench_trending --history 200000 --batches 200
+"""
+
+import argparse
+import bisect
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.services.article_service import ArticleService
+from app.services.like_service import apply_like_batch
+from app.services.trending import trending
+from benchmarks.datagen import _zipf_weights, open_database, table_sizes
+from benchmarks.report import build_report, print_table, summarize, write_report
+
+BY_LIKES_COUNT = text(
+    "SELECT id, title, likes_count FROM articles ORDER BY likes_count DESC LIMIT :k"
+)
+LAST_DAY = text(
+    "SELECT article_id, COUNT(*) AS n FROM likes WHERE created_at >= :since "
+    "GROUP BY article_id ORDER BY n DESC LIMIT :k"
+)
+
+
+class LikeStream:
+    """Likes tirés selon une loi de Zipf sur les articles (ordre aléatoire)"""
+
+    def __init__(self, ids, seed: int):
+        self.rng = random.Random(seed)
+        self.ids = list(ids)
+        self.rng.shuffle(self.ids)
+        self.weights = _zipf_weights(len(self.ids))
+
+    def batch(self, size: int, start: datetime, span: timedelta):
+        likes = {}
+        for _ in range(size):
+            index = bisect.bisect_left(
+                self.weights, self.rng.random() * self.weights[-1]
+            )
+            moment = start + self.rng.random() * span
+            likes.setdefault(self.ids[index], []).append(moment)
+        return likes
+
+
+def timed(samples, fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    samples.append((time.perf_counter() - started) * 1000)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", help="base existante (générée par datagen)")
+    parser.add_argument("--articles", type=int, default=20_000)
+    parser.add_argument("--comments", type=int, default=50_000)
+    parser.add_argument("--history", type=int, default=200_000, help="likes passés")
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=500, help="likes par lot")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="fichier JSON (sortie standard sinon)")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = open_database(
+            args.database, tmp, args.articles, args.comments, args.seed
+        )
+        session_factory = sessionmaker(bind=engine)
+        with engine.connect() as connection:
+            ids = connection.exec_driver_sql("SELECT id FROM articles").scalars()
+            stream = LikeStream(ids, args.seed)
+
+        now = datetime.now(timezone.utc)
+        for start in range(0, args.history, 10_000):
+            size = min(10_000, args.history - start)
+            with engine.begin() as connection:
+                batch = stream.batch(size, now - timedelta(days=7), timedelta(days=7))
+                apply_like_batch(connection, batch)
+        sizes = table_sizes(engine)
+
+        # Classement du processus, celui que lit ArticleService.get_trending ;
+        # les mises à jour sont déclenchées (et mesurées) explicitement
+        rankings = trending
+        rankings.reset()
+        rankings.refresh_interval = float("inf")
+        sync, top, by_count, last_day = [], [], [], []
+        with session_factory() as db:
+            rebuild = []
+            timed(rebuild, rankings.sync, db, force=True)
+            results["rebuild_from_log"] = summarize(rebuild)
+
+            for _ in range(args.batches):
+                moment = datetime.now(timezone.utc)
+                with engine.begin() as connection:
+                    batch = stream.batch(args.batch_size, moment, timedelta(seconds=1))
+                    apply_like_batch(connection, batch)
+                timed(sync, rankings.sync, db, force=True)
+                timed(top, ArticleService.get_trending, db, limit=args.top)
+                timed(
+                    by_count, lambda: db.execute(BY_LIKES_COUNT, {"k": args.top}).all()
+                )
+                since = moment - timedelta(days=1)
+                timed(
+                    last_day,
+                    lambda: db.execute(
+                        LAST_DAY, {"since": since.replace(tzinfo=None), "k": args.top}
+                    ).all(),
+                )
+            db.rollback()
+            persist = []
+            timed(persist, rankings.persist, db)
+        engine.dispose()
+
+    results[f"sync[{args.batch_size} likes]"] = summarize(sync)
+    results[f"trending.top[{args.top}]"] = summarize(top)
+    results[f"sql.order_by_likes_count[{args.top}]"] = summarize(by_count)
+    results[f"sql.likes_last_24h[{args.top}]"] = summarize(last_day)
+    results["persist_snapshot"] = summarize(persist)
+    params = {
+        "history": args.history,
+        "batches": args.batches,
+        "batch_size": args.batch_size,
+        "top": args.top,
+        "seed": args.seed,
+        "database": "external" if args.database else "generated",
+        **sizes,
+    }
+    print_table(results)
+    write_report(build_report("trending", params, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
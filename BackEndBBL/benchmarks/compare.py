@@ -0,0 +1,87 @@
+"""
+Comparaison de deux rapports de benchmark
+
+Compare un rapport de référence (ex. la branche principale) et un rapport
+candidat sur un percentile donné. Le code de sortie vaut 1 si un benchmark
+ralentit au-delà du seuil, ce qui permet de l'utiliser en intégration
+continue.
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.compare base.json head.json --metric p95_ms --threshold 0.15
+"""
+
+import argparse
+import sys
+from typing import Dict, List, Tuple
+
+from benchmarks.report import load_report
+
+# Écarts absolus ignorés (ms) : le bruit domine sur les opérations très courtes
+DEFAULT_MIN_DELTA_MS = 0.1
+
+Row = Tuple[str, float, float, float]
+
+
+def compare(
+    base: Dict[str, dict],
+    head: Dict[str, dict],
+    metric: str = "p95_ms",
+    threshold: float = 0.15,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> Tuple[List[Row], List[str]]:
+    """
+    Variation relative de `metric` pour les benchmarks présents des deux côtés
+
+    Returns:
+        Les lignes (nom, référence, candidat, variation relative) et les noms
+        des benchmarks en régression
+    """
+    rows = []
+    regressions = []
+    for name in sorted(set(base) & set(head)):
+        before = base[name].get(metric)
+        after = head[name].get(metric)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before if before else 0.0
+        rows.append((name, before, after, change))
+        if change > threshold and after - before > min_delta_ms:
+            regressions.append(name)
+        elif head[name].get("errors", 0) > base[name].get("errors", 0):
+            regressions.append(name)
+    return rows, regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("base", help="rapport de référence")
+    parser.add_argument("head", help="rapport candidat")
+    parser.add_argument("--metric", default="p95_ms")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    args = parser.parse_args()
+
+    base = load_report(args.base)
+    head = load_report(args.head)
+    if base["suite"] != head["suite"]:
+        sys.exit(f"Suites différentes : {base['suite']} / {head['suite']}")
+    if base["params"] != head["params"]:
+        print("Attention : paramètres différents", file=sys.stderr)
+
+    rows, regressions = compare(
+        base["results"], head["results"], args.metric, args.threshold, args.min_delta_ms
+    )
+    print(
+        f"{base['meta'].get('commit')} -> {head['meta'].get('commit')} ({args.metric})"
+    )
+    for name, before, after, change in rows:
+        flag = "  RÉGRESSION" if name in regressions else ""
+        print(f"{name:<36} {before:>10.3f} {after:>10.3f} {change:>+8.1%}{flag}")
+    missing = sorted(set(base["results"]) ^ set(head["results"]))
+    if missing:
+        print(f"Présents d'un seul côté : {', '.join(missing)}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Générateur de données de benchmark reproductible
+
+Remplit une base avec des articles et des commentaires synthétiques : même
+graine, mêmes données. Les mots suivent une distribution de Zipf (comme un
+vrai texte) et les commentaires se concentrent sur les articles populaires.
+Les compteurs dénormalisés (likes_count, comments_count) sont cohérents.
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.datagen --database sqlite:///./bench.db \\
+        --articles 1000000 --comments 10000000 --seed 42
+"""
+
+import argparse
+import itertools
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.engine import Engine
+
+from app.database import create_db_engine
+from app.migrations import upgrade
+from app.models.article import Article
+from app.models.comment import Comment
+from app.services.author_stats import rebuild_author_stats
+from app.services.summary import content_summary
+
+SYLLABLES = "ba be bi bo bu da de di do du ka ke ki ko ku la le li lo lu ma me mi mo mu na ne ni no nu ra re ri ro ru sa se si so su ta te ti to tu".split()
+
+EPOCH = datetime(2020, 1, 1)
+
+
+def build_vocabulary(rng: random.Random, size: int = 20_000):
+    """Vocabulaire synthétique avec une distribution de fréquences de Zipf"""
+    words = sorted(
+        {"".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(size)}
+    )
+    rng.shuffle(words)
+    cum_weights = list(
+        itertools.accumulate(1 / rank for rank in range(1, len(words) + 1))
+    )
+    return words, cum_weights
+
+
+def _zipf_weights(count: int, exponent: float = 1.0):
+    """Poids cumulés d'une loi de Zipf sur `count` éléments"""
+    return list(
+        itertools.accumulate(1 / rank**exponent for rank in range(1, count + 1))
+    )
+
+
+def generate(
+    engine: Engine,
+    articles: int,
+    comments: int,
+    seed: int = 42,
+    chunk_size: int = 10_000,
+    article_words=(40, 120),
+    progress: Optional[Callable[[str, int, int], None]] = None,
+) -> Dict[str, int]:
+    """
+    Insère `articles` articles puis `comments` commentaires dans une base migrée
+
+    Les identifiants d'articles commencent à 1 sur une base vide ; les dates
+    de création sont espacées d'une minute à partir du 1er janvier 2020.
+
+    Returns:
+        Le nombre de lignes insérées par table
+    """
+    rng = random.Random(seed)
+    words, word_weights = build_vocabulary(rng)
+    authors = [f"auteur{i}" for i in range(1, 501)]
+    author_weights = _zipf_weights(len(authors))
+
+    with engine.connect() as connection:
+        first_id = (
+            connection.exec_driver_sql("SELECT max(id) FROM articles").scalar() or 0
+        ) + 1
+
+    for start in range(0, articles, chunk_size):
+        rows = []
+        for i in range(start, min(start + chunk_size, articles)):
+            title = " ".join(rng.choices(words, cum_weights=word_weights, k=6))
+            content = " ".join(
+                rng.choices(
+                    words, cum_weights=word_weights, k=rng.randint(*article_words)
+                )
+            )
+            rows.append(
+                {
+                    "title": title,
+                    "content": content,
+                    **content_summary(content),
+                    "author": rng.choices(authors, cum_weights=author_weights)[0],
+                    "likes_count": int(rng.paretovariate(1.2)) - 1,
+                    "comments_count": 0,
+                    "created_at": EPOCH + timedelta(minutes=i),
+                }
+            )
+        with engine.begin() as connection:
+            connection.execute(insert(Article), rows)
+        if progress:
+            progress("articles", start + len(rows), articles)
+
+    # Les commentaires se concentrent sur une partie des articles (Zipf),
+    # répartis dans le temps après la publication
+    article_ids = list(range(first_id, first_id + articles))
+    popularity = rng.sample(article_ids, len(article_ids))
+    popularity_weights = _zipf_weights(len(popularity), exponent=0.8)
+    counts: Dict[int, int] = {}
+    for start in range(0, comments, chunk_size):
+        rows = []
+        for _ in range(min(chunk_size, comments - start)):
+            article_id = rng.choices(popularity, cum_weights=popularity_weights)[0]
+            counts[article_id] = counts.get(article_id, 0) + 1
+            rows.append(
+                {
+                    "article_id": article_id,
+                    "author": f"lecteur{rng.randint(1, 50_000)}",
+                    "content": " ".join(
+                        rng.choices(
+                            words, cum_weights=word_weights, k=rng.randint(5, 30)
+                        )
+                    ),
+                    "likes_count": 0,
+                    "created_at": EPOCH
+                    + timedelta(
+                        minutes=article_id - first_id, seconds=rng.randint(1, 10**7)
+                    ),
+                }
+            )
+        with engine.begin() as connection:
+            connection.execute(insert(Comment), rows)
+        if progress:
+            progress("comments", start + len(rows), comments)
+
+    # comments_count sans toucher updated_at (ce n'est pas une modification)
+    set_counts = (
+        update(Article)
+        .where(Article.id == bindparam("b_id"))
+        .values(comments_count=bindparam("n"), updated_at=Article.updated_at)
+    )
+    items = list(counts.items())
+    for start in range(0, len(items), chunk_size):
+        with engine.begin() as connection:
+            connection.execute(
+                set_counts,
+                [{"b_id": a, "n": n} for a, n in items[start : start + chunk_size]],
+            )
+    # Insertion en masse : statistiques des auteurs recalculées en une fois
+    with engine.begin() as connection:
+        rebuild_author_stats(connection)
+    return {"articles": articles, "comments": comments}
+
+
+def table_sizes(engine: Engine) -> Dict[str, int]:
+    """Nombre de lignes des tables articles et comments"""
+    with engine.connect() as connection:
+        return {
+            table: connection.exec_driver_sql(f"SELECT count(*) FROM {table}").scalar()
+            for table in ("articles", "comments")
+        }
+
+
+def open_database(
+    database: Optional[str],
+    directory: str,
+    articles: int,
+    comments: int,
+    seed: int,
+    article_words=(40, 120),
+) -> Engine:
+    """
+    Moteur sur la base `database`, ou sur une base générée dans `directory`
+
+    Utilisé par les benchmarks qui acceptent ``--database`` : sans base
+    fournie, une base migrée est générée avec la graine donnée.
+    """
+    if database:
+        return create_db_engine(database)
+    engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+    upgrade(engine)
+    generate(engine, articles, comments, seed=seed, article_words=article_words)
+    return engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", default="sqlite:///./bench.db")
+    parser.add_argument("--articles", type=int, default=10_000)
+    parser.add_argument("--comments", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    engine = create_db_engine(args.database)
+    upgrade(engine)
+    started = time.perf_counter()
+    last_report = [0.0]
+
+    def progress(table: str, done: int, total: int) -> None:
+        now = time.perf_counter()
+        if now - last_report[0] >= 5 or done == total:
+            last_report[0] = now
+            print(f"{table}: {done}/{total} ({now - started:.0f} s)", flush=True)
+
+    generate(
+        engine,
+        args.articles,
+        args.comments,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        progress=progress,
+    )
+    elapsed = time.perf_counter() - started
+    total = args.articles + args.comments
+    print(f"{total} lignes en {elapsed:.1f} s ({total / elapsed:.0f} lignes/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Test de charge en mémoire des principaux points d'accès de l'API
+
+N clients concurrents envoient un mélange de requêtes (liste, recherche,
+lecture, like, commentaire) à l'application via un transport ASGI en mémoire
+(httpx.ASGITransport) : ni réseau ni serveur, seule l'application est mesurée.
+Le mélange, les arguments et l'ordre des requêtes sont fixés par la graine.
+
+Sans --database, une base temporaire est générée avec benchmarks.datagen.
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.load --concurrency 32 --requests 5000 --output load.json
+    python -m benchmarks.load --mix get=80 like=20 --no-cache
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import LRUCache
+from app.database import get_session
+from app.main import app
+from app.models.article import Article
+from app.services.article_cache import article_cache
+from app.services.like_service import like_buffer
+from benchmarks.datagen import build_vocabulary, open_database, table_sizes
+from benchmarks.report import build_report, print_table, summarize, write_report
+
+# Poids par défaut des scénarios (lecture majoritaire)
+DEFAULT_MIX = {"list": 30, "search": 15, "get": 35, "like": 10, "comment": 10}
+
+
+def parse_mix(items: List[str]) -> Dict[str, int]:
+    mix = {}
+    for item in items:
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX or not weight.isdigit():
+            raise argparse.ArgumentTypeError(f"scénario invalide : {item}")
+        mix[name] = int(weight)
+    return mix
+
+
+class Scenario:
+    """Requêtes du mélange, tirées d'un générateur aléatoire à graine fixe"""
+
+    def __init__(self, min_id: int, max_id: int, mix: Dict[str, int], seed: int):
+        self.min_id = min_id
+        self.max_id = max_id
+        self.names = list(mix)
+        self.weights = list(mix.values())
+        self.rng = random.Random(seed)
+        self.terms = build_vocabulary(random.Random(0))[0][100:5000]
+
+    def _article_id(self) -> int:
+        return self.rng.randint(self.min_id, self.max_id)
+
+    def next_request(self):
+        """(nom du scénario, méthode, chemin, corps JSON)"""
+        name = self.rng.choices(self.names, weights=self.weights)[0]
+        if name == "list":
+            return name, "GET", "/api/articles/?limit=20", None
+        if name == "search":
+            term = self.rng.choice(self.terms)[: self.rng.randint(4, 8)]
+            return name, "GET", f"/api/articles/search?q={term}&limit=20", None
+        if name == "get":
+            return name, "GET", f"/api/articles/{self._article_id()}", None
+        if name == "like":
+            return name, "POST", f"/api/articles/{self._article_id()}/like", None
+        body = {
+            "article_id": self._article_id(),
+            "author": "charge",
+            "content": " ".join(self.rng.choices(self.terms, k=12)),
+        }
+        return name, "POST", "/api/comments/", body
+
+
+async def _client(http, scenario, remaining, samples, errors):
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        name, method, path, body = scenario.next_request()
+        started = time.perf_counter()
+        try:
+            response = await http.request(method, path, json=body)
+            failed = response.status_code >= 400
+        except Exception:
+            failed = True
+        samples[name].append((time.perf_counter() - started) * 1000)
+        if failed:
+            errors[name] += 1
+
+
+async def drive(
+    scenario: Scenario, concurrency: int, requests: int, base_url: Optional[str] = None
+):
+    """
+    Envoie `requests` requêtes sur `concurrency` clients ; latences par scénario
+
+    Sans `base_url`, l'application est appelée en mémoire ; sinon, un serveur
+    en cours d'exécution est interrogé par HTTP.
+    """
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    remaining = [requests]
+    if base_url is None:
+        options = {
+            "transport": httpx.ASGITransport(app=app, raise_app_exceptions=False),
+            "base_url": "http://bench",
+        }
+    else:
+        limits = httpx.Limits(max_connections=concurrency)
+        options = {"base_url": base_url, "limits": limits, "timeout": 60}
+    async with httpx.AsyncClient(**options) as http:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _client(http, scenario, remaining, samples, errors)
+                for _ in range(concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+    return samples, errors, elapsed
+
+
+def run(engine, concurrency, requests, warmup, mix, seed, cache=True):
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    def override_get_session():
+        with session_factory() as db:
+            yield db
+
+    with engine.connect() as connection:
+        min_id, max_id = connection.execute(
+            select(func.min(Article.id), func.max(Article.id))
+        ).one()
+    if min_id is None:
+        raise SystemExit("La base ne contient aucun article")
+
+    backend = article_cache.backend
+    if not cache:
+        article_cache.backend = LRUCache(max_entries=0)
+    app.dependency_overrides[get_session] = override_get_session
+    try:
+        scenario = Scenario(min_id, max_id, mix, seed)
+        if warmup:
+            asyncio.run(drive(scenario, concurrency, warmup))
+        samples, errors, elapsed = asyncio.run(drive(scenario, concurrency, requests))
+        like_buffer.flush(bind=engine)
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+        article_cache.backend = backend
+        article_cache.clear()
+        like_buffer.discard()
+
+    # Débit de chaque scénario rapporté à la durée totale (somme = débit global)
+    results = {
+        name: summarize(samples[name], elapsed=elapsed, errors=errors[name])
+        for name in mix
+        if samples[name]
+    }
+    every = [sample for name in samples for sample in samples[name]]
+    results["all"] = summarize(every, elapsed=elapsed, errors=sum(errors.values()))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", help="base existante (générée par datagen)")
+    parser.add_argument("--articles", type=int, default=20_000)
+    parser.add_argument("--comments", type=int, default=200_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--mix", nargs="+", type=str, help="ex. get=80 like=20")
+    parser.add_argument("--no-cache", action="store_true", help="sans cache applicatif")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="fichier JSON (sortie standard sinon)")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix) if args.mix else dict(DEFAULT_MIX)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = open_database(
+            args.database, tmp, args.articles, args.comments, args.seed
+        )
+        sizes = table_sizes(engine)
+        results = run(
+            engine,
+            args.concurrency,
+            args.requests,
+            args.warmup,
+            mix,
+            args.seed,
+            cache=not args.no_cache,
+        )
+        engine.dispose()
+
+    params = {
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "mix": mix,
+        "cache": not args.no_cache,
+        "seed": args.seed,
+        "database": "external" if args.database else "generated",
+        **sizes,
+    }
+    print_table(results)
+    write_report(build_report("load", params, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Microbenchmarks des méthodes de ArticleService et CommentService
+
+Chaque méthode est appelée N fois sur une session neuve (pas de cache
+d'identité d'un appel à l'autre) avec des arguments tirés d'une graine fixe.
+Les écritures portent sur des lignes créées par le benchmark lui-même.
+
+Sans --database, une base temporaire est générée avec benchmarks.datagen.
+
+Usage (depuis BackEndBBL/) :
+    python -m benchmarks.micro --articles 20000 --comments 200000 \\
+        --iterations 300 --output micro.json
+    python -m benchmarks.micro --database sqlite:///./bench.db --only search
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.article import Article
+from app.schemas.article import ArticleCreate, ArticleUpdate
+from app.schemas.comment import CommentCreate
+from app.services.article_cache import article_cache
+from app.services.article_service import ArticleService
+from app.services.comment_service import CommentService
+from app.services.like_service import like_buffer
+from benchmarks.datagen import build_vocabulary, open_database, table_sizes
+from benchmarks.report import build_report, print_table, summarize, write_report
+
+# Un cas : (db, rng) -> None
+Case = Callable[..., None]
+
+
+def build_cases(engine, rng: random.Random) -> Dict[str, Case]:
+    """Cas de mesure, dans l'ordre d'exécution (les suppressions en dernier)"""
+    with engine.connect() as connection:
+        min_id, max_id = connection.execute(
+            select(func.min(Article.id), func.max(Article.id))
+        ).one()
+    if min_id is None:
+        raise SystemExit("La base ne contient aucun article")
+    words = build_vocabulary(random.Random(0))[0][100:5000]
+    created_articles: List[int] = []
+    created_comments: List[int] = []
+
+    def article_id(rng):
+        return rng.randint(min_id, max_id)
+
+    def second_page_cursor(db):
+        return ArticleService.get_articles_page(db, limit=20)[1]
+
+    def create_article(db, rng):
+        article = ArticleService.create_article(
+            db,
+            ArticleCreate(
+                title=" ".join(rng.choices(words, k=6)),
+                content=" ".join(rng.choices(words, k=80)),
+                author="bench",
+            ),
+        )
+        created_articles.append(article.id)
+
+    def create_comment(db, rng):
+        comment = CommentService.create_comment(
+            db,
+            CommentCreate(
+                article_id=article_id(rng),
+                author="bench",
+                content=" ".join(rng.choices(words, k=15)),
+            ),
+        )
+        # None si l'identifiant tiré est celui d'un article supprimé
+        if comment is not None:
+            created_comments.append(comment.id)
+
+    def delete_article(db, rng):
+        if created_articles:
+            ArticleService.delete_article(db, created_articles.pop())
+
+    def delete_comment(db, rng):
+        if created_comments:
+            CommentService.delete_comment(db, created_comments.pop())
+
+    return {
+        "article.get_all_articles": lambda db, rng: ArticleService.get_all_articles(
+            db, limit=20
+        ),
+        "article.get_all_articles[offset]": (
+            lambda db, rng: ArticleService.get_all_articles(
+                db, skip=rng.randint(0, 10_000), limit=20
+            )
+        ),
+        "article.get_articles_page": lambda db, rng: ArticleService.get_articles_page(
+            db, limit=20
+        ),
+        "article.get_articles_page[cursor]": (
+            lambda db, rng: ArticleService.get_articles_page(
+                db, cursor=second_page_cursor(db), limit=20
+            )
+        ),
+        "article.search_articles": lambda db, rng: ArticleService.search_articles(
+            db, rng.choice(words)[: rng.randint(4, 8)], limit=20
+        ),
+        "article.get_article_by_id": lambda db, rng: ArticleService.get_article_by_id(
+            db, article_id(rng)
+        ),
+        "article.get_article_version": (
+            lambda db, rng: ArticleService.get_article_version(db, article_id(rng))
+        ),
+        "article.get_articles_version": (
+            lambda db, rng: ArticleService.get_articles_version(db)
+        ),
+        "article.to_response": lambda db, rng: ArticleService.to_response(
+            ArticleService.get_article_by_id(db, article_id(rng))
+        ),
+        "article.increment_likes": lambda db, rng: ArticleService.increment_likes(
+            db, article_id(rng)
+        ),
+        "article.create_article": create_article,
+        "article.update_article": lambda db, rng: ArticleService.update_article(
+            db,
+            rng.choice(created_articles) if created_articles else article_id(rng),
+            ArticleUpdate(title=" ".join(rng.choices(words, k=6))),
+        ),
+        "comment.get_comments_by_article": (
+            lambda db, rng: CommentService.get_comments_by_article(db, article_id(rng))
+        ),
+        "comment.get_comments_page": lambda db, rng: CommentService.get_comments_page(
+            db, article_id(rng), limit=50
+        ),
+        "comment.get_recent_comments": (
+            lambda db, rng: CommentService.get_recent_comments(
+                db, [article_id(rng) for _ in range(20)], 3
+            )
+        ),
+        "comment.get_comments_version": (
+            lambda db, rng: CommentService.get_comments_version(db, article_id(rng))
+        ),
+        "comment.create_comment": create_comment,
+        "comment.delete_comment": delete_comment,
+        "article.delete_article": delete_article,
+    }
+
+
+def run_case(session_factory, case: Case, rng, iterations: int, warmup: int):
+    """Latences (ms) de `iterations` appels, après `warmup` appels non mesurés"""
+    samples = []
+    errors = 0
+    for i in range(warmup + iterations):
+        with session_factory() as db:
+            started = time.perf_counter()
+            try:
+                case(db, rng)
+            except Exception:
+                errors += 1
+                db.rollback()
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples, errors
+
+
+def run(engine, iterations: int, warmup: int, seed: int, only=None) -> Dict[str, dict]:
+    session_factory = sessionmaker(bind=engine)
+    rng = random.Random(seed)
+    results = {}
+    try:
+        for name, case in build_cases(engine, rng).items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            samples, errors = run_case(session_factory, case, rng, iterations, warmup)
+            results[name] = summarize(samples, errors=errors)
+        like_buffer.flush(bind=engine)
+    finally:
+        like_buffer.discard()
+        article_cache.clear()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", help="base existante (générée par datagen)")
+    parser.add_argument("--articles", type=int, default=20_000)
+    parser.add_argument("--comments", type=int, default=200_000)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="+", help="filtre sur le nom des cas")
+    parser.add_argument("--output", help="fichier JSON (sortie standard sinon)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = open_database(
+            args.database, tmp, args.articles, args.comments, args.seed
+        )
+        sizes = table_sizes(engine)
+        results = run(engine, args.iterations, args.warmup, args.seed, args.only)
+        engine.dispose()
+
+    params = {
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "seed": args.seed,
+        "database": "external" if args.database else "generated",
+        **sizes,
+    }
+    print_table(results)
+    write_report(build_report("micro", params, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
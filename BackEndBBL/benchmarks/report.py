@@ -0,0 +1,137 @@
+"""
+Résultats de benchmark au format JSON
+
+Chaque exécution produit un rapport comparable d'un commit à l'autre :
+métadonnées (commit, versions, paramètres) et, par benchmark, les
+percentiles de latence p50/p95/p99 en millisecondes.
+
+Format :
+    {
+      "suite": "micro",
+      "meta": {"commit": "...", "python": "...", "sqlite": "...", ...},
+      "params": {...},
+      "results": {
+        "<nom>": {"count": 200, "errors": 0, "mean_ms": ..., "p50_ms": ...,
+                  "p95_ms": ..., "p99_ms": ..., "max_ms": ..., "ops_per_sec": ...}
+      }
+    }
+"""
+
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import sqlalchemy
+
+REPORT_VERSION = 1
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(
+    samples_ms: Sequence[float], elapsed: Optional[float] = None, errors: int = 0
+) -> Dict[str, float]:
+    """
+    Statistiques d'une série de latences (ms)
+
+    Args:
+        samples_ms: Latences mesurées, en millisecondes
+        elapsed: Durée totale de la série (s), pour le débit ; à défaut la
+            somme des latences (exécution séquentielle)
+        errors: Nombre d'opérations en échec
+    """
+    count = len(samples_ms)
+    if not count:
+        return {"count": 0, "errors": errors}
+    total_seconds = elapsed if elapsed is not None else sum(samples_ms) / 1000
+    return {
+        "count": count,
+        "errors": errors,
+        "mean_ms": round(sum(samples_ms) / count, 4),
+        "p50_ms": round(percentile(samples_ms, 50), 4),
+        "p95_ms": round(percentile(samples_ms, 95), 4),
+        "p99_ms": round(percentile(samples_ms, 99), 4),
+        "max_ms": round(max(samples_ms), 4),
+        "ops_per_sec": round(count / total_seconds, 1) if total_seconds else None,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def metadata() -> Dict[str, Optional[str]]:
+    """Environnement d'exécution, pour ne comparer que des rapports comparables"""
+    return {
+        "commit": _git_commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "sqlalchemy": sqlalchemy.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def build_report(suite: str, params: dict, results: Dict[str, dict]) -> dict:
+    return {
+        "version": REPORT_VERSION,
+        "suite": suite,
+        "meta": metadata(),
+        "params": params,
+        "results": results,
+    }
+
+
+def write_report(report: dict, path: Optional[str]) -> None:
+    """Écrit le rapport dans `path`, ou sur la sortie standard si absent"""
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if path:
+        Path(path).write_text(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+def load_report(path: str) -> dict:
+    report = json.loads(Path(path).read_text())
+    if report.get("version") != REPORT_VERSION:
+        raise ValueError(f"{path} : version de rapport non prise en charge")
+    return report
+
+
+def print_table(results: Dict[str, dict], file=sys.stderr) -> None:
+    """Résumé lisible des résultats (sur stderr : stdout peut porter le JSON)"""
+    print(
+        f"{'benchmark':<42} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'ops/s':>9} {'err':>4}",
+        file=file,
+    )
+    for name, result in results.items():
+        if not result.get("count"):
+            print(f"{name:<42} {0:>6}", file=file)
+            continue
+        print(
+            f"{name:<42} {result['count']:>6} {result['p50_ms']:>9.3f} "
+            f"{result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f} "
+            f"{result['ops_per_sec'] or 0:>9.1f} {result['errors']:>4}",
+            file=file,
+        )
@@ -0,0 +1,73 @@
+"""
+Shared fixtures for the API tests
+
+These tests use a dedicated SQLite database and override the FastAPI database
+dependency to ensure isolation. Each test recreates the schema so they are
+independent from one another.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db
+from app.middleware.compression import compressed_responses
+from app.middleware.idempotency import idempotency_store
+from app.services.article_cache import article_cache
+from app.services.comment_like_service import comment_like_buffer
+from app.services.events import event_bus
+from app.services.like_service import like_buffer
+from app.services.trending import trending
+
+# Base de données de test
+TEST_DATABASE_URL = "sqlite:///./test.db"
+engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    """Override dependency: yield a transient session bound to the test DB.
+
+    This is used to replace the app's `get_db` dependency so the tests operate
+    on a separate database instance using the same ORM models.
+    """
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db
+
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    """Crée et nettoie la base de données avant chaque test"""
+    Base.metadata.create_all(bind=engine)
+    yield
+    like_buffer.discard()
+    comment_like_buffer.discard()
+    article_cache.clear()
+    compressed_responses.clear()
+    idempotency_store.clear()
+    trending.reset()
+    event_bus.reset()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def client():
+    """Client HTTP de test branché sur l'application"""
+    return TestClient(app)
+
+
+@pytest.fixture
+def db_session():
+    """Session directe sur la base de test, pour préparer ou vérifier des données"""
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,132 @@
+"""
+Tests de la suppression des articles (unitaire, en lot, purge différée)
+"""
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.models.article import Article
+from app.models.comment import Comment
+from app.models.like import Like
+from app.models.purge import ArticlePurge
+from app.services.article_purge import ArticlePurger
+
+
+def _seed(db_session, titles, comments=3, likes=2):
+    """Articles avec leurs commentaires et likes ; renvoie leurs identifiants"""
+    ids = []
+    for title in titles:
+        article = Article(title=title, content="Contenu", author="Auteur")
+        db_session.add(article)
+        db_session.flush()
+        ids.append(article.id)
+        db_session.add_all(
+            Comment(article_id=article.id, author="Lecteur", content=f"n°{i}")
+            for i in range(comments)
+        )
+        db_session.add_all(Like(article_id=article.id) for _ in range(likes))
+    db_session.commit()
+    return ids
+
+
+def _count(db_session, model, article_id):
+    return db_session.scalar(
+        select(func.count()).select_from(model).where(model.article_id == article_id)
+    )
+
+
+def test_delete_removes_comments_and_likes(client, db_session):
+    """Commentaires et likes disparaissent avec l'article"""
+    removed, kept = _seed(db_session, ["Supprimé", "Conservé"])
+
+    assert client.delete(f"/api/articles/{removed}").status_code == 204
+    assert client.delete(f"/api/articles/{removed}").status_code == 404
+
+    for model in (Comment, Like):
+        assert _count(db_session, model, removed) == 0
+        assert _count(db_session, model, kept) > 0
+    assert db_session.scalar(select(func.count()).select_from(ArticlePurge)) == 0
+
+
+def test_bulk_delete(client, db_session):
+    """Suppression en lot : articles supprimés et identifiants inconnus"""
+    first, second, kept = _seed(db_session, ["Un", "Deux", "Trois"])
+
+    response = client.delete(f"/api/articles/?ids={second},{first},999999")
+
+    assert response.status_code == 200
+    assert response.json() == {"deleted": [first, second], "not_found": [999999]}
+    assert [a["id"] for a in client.get("/api/articles/").json()] == [kept]
+    assert _count(db_session, Comment, first) == 0
+
+    assert client.delete("/api/articles/?ids=1,abc").status_code == 400
+    assert client.delete("/api/articles/?ids=,").status_code == 400
+
+
+def test_bulk_delete_is_bounded(client, monkeypatch):
+    """Le nombre d'identifiants par requête est plafonné"""
+    monkeypatch.setattr(settings, "article_bulk_delete_max", 2)
+
+    assert client.delete("/api/articles/?ids=1,2,3").status_code == 400
+
+
+def test_deferred_delete_purges_in_batches(client, db_session, monkeypatch):
+    """En mode différé, la purge efface les dépendances par lots"""
+    monkeypatch.setattr(settings, "article_delete_mode", "deferred")
+    removed, kept = _seed(db_session, ["Supprimé", "Conservé"], comments=7)
+
+    assert client.delete(f"/api/articles/{removed}").status_code == 204
+    assert client.get(f"/api/articles/{removed}").status_code == 404
+    # Seul l'article est effacé dans la requête
+    assert _count(db_session, Comment, removed) == 7
+
+    purger = ArticlePurger(batch_size=3)
+    assert purger.purge(bind=db_session.get_bind()) == 9
+
+    db_session.expire_all()
+    for model in (Comment, Like):
+        assert _count(db_session, model, removed) == 0
+        assert _count(db_session, model, kept) > 0
+    assert db_session.scalar(select(func.count()).select_from(ArticlePurge)) == 0
+
+
+def test_purge_spares_rows_created_after_the_delete(client, db_session, monkeypatch):
+    """Un commentaire inséré après la suppression n'est pas effacé par la purge"""
+    monkeypatch.setattr(settings, "article_delete_mode", "deferred")
+    (removed,) = _seed(db_session, ["Supprimé"])
+    client.delete(f"/api/articles/{removed}")
+
+    late = Comment(article_id=removed, author="Lecteur", content="Plus tard")
+    db_session.add(late)
+    db_session.commit()
+
+    ArticlePurger(batch_size=2).purge(bind=db_session.get_bind())
+
+    db_session.expire_all()
+    assert _count(db_session, Comment, removed) == 1
+    assert _count(db_session, Like, removed) == 0
+
+
+def test_deferred_delete_never_hands_over_the_identifier(
+    client, db_session, monkeypatch
+):
+    """Le dernier article supprimé : ni son identifiant ni ses commentaires repris"""
+    monkeypatch.setattr(settings, "article_delete_mode", "deferred")
+    (removed,) = _seed(db_session, ["Supprimé"])
+    assert client.delete(f"/api/articles/{removed}").status_code == 204
+
+    comment = {"article_id": removed, "author": "Lecteur", "content": "Trop tard"}
+    response = client.post("/api/comments/", json=comment)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Article non trouvé"
+
+    article = {"title": "Nouveau", "content": "Contenu", "author": "Auteur"}
+    created = client.post("/api/articles/", json=article).json()
+    assert created["id"] > removed
+    assert created["comments_count"] == 0
+    # Commentaires en attente de purge : jamais attribués au nouvel article
+    assert client.get(f"/api/comments/?article_id={created['id']}").json() == []
+
+    ArticlePurger().purge(bind=db_session.get_bind())
+    db_session.expire_all()
+    assert _count(db_session, Comment, removed) == 0
@@ -1,50 +1,12 @@
 """
 Unit tests for article endpoints
 
-These tests use an in-memory SQLite database and override the FastAPI
-database dependency to ensure isolation. Each test recreates the schema so
-they are independent from one another.
+The database setup (test engine, dependency override and schema reset between
+tests) lives in ``conftest.py`` so every test module shares it.
 """
 
-import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.main import app
-from app.database import Base, get_db
 
-# Base de données de test en mémoire
-TEST_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-def override_get_db():
-    """Override dependency: yield a transient session bound to the test DB.
-
-    This is used to replace the app's `get_db` dependency so the tests operate
-    on a separate database instance using the same ORM models.
-    """
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
-
-
-app.dependency_overrides[get_db] = override_get_db
-client = TestClient(app)
-
-
-@pytest.fixture(autouse=True)
-def setup_database():
-    """Crée et nettoie la base de données avant chaque test"""
-    Base.metadata.create_all(bind=engine)
-    yield
-    Base.metadata.drop_all(bind=engine)
-
-
-def test_create_article():
+def test_create_article(client):
     """Test de création d'un article"""
     response = client.post(
         "/api/articles/",
@@ -61,7 +23,7 @@ def test_create_article():
     assert "id" in data
 
 
-def test_get_all_articles():
+def test_get_all_articles(client):
     """Test de récupération de tous les articles"""
     # Créer quelques articles
     client.post(
@@ -79,7 +41,7 @@ def test_get_all_articles():
     assert len(data) == 2
 
 
-def test_search_articles():
+def test_search_articles(client):
     """Test de recherche d'articles"""
     client.post(
         "/api/articles/",
@@ -97,7 +59,7 @@ def test_search_articles():
     assert data[0]["title"] == "Python Tutorial"
 
 
-def test_like_article():
+def test_like_article(client):
     """Test d'ajout de like à un article"""
     # Créer un article
     create_response = client.post(
@@ -112,7 +74,7 @@ def test_like_article():
     assert like_response.json()["likes_count"] == 1
 
 
-def test_delete_article():
+def test_delete_article(client):
     """Test de suppression d'un article"""
     # Créer un article
     create_response = client.post(
@@ -0,0 +1,73 @@
+"""
+Tests for the async database mode (AsyncEngine + AsyncSession)
+
+The routes receive an AsyncSession instead of a Session; the service calls go
+through ``run_sync`` on the aiosqlite driver.
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from sqlalchemy.pool import NullPool
+
+from app.core.config import Settings
+from app.database import get_session
+from app.main import app
+
+
+@pytest.fixture
+def async_client(client):
+    """Client dont la dépendance de session fournit une AsyncSession"""
+    # NullPool : chaque requête du TestClient tourne dans sa propre boucle
+    engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    sessions = []
+
+    async def override_get_async_db():
+        async with factory() as db:
+            sessions.append(db)
+            yield db
+
+    previous = app.dependency_overrides.get(get_session)
+    app.dependency_overrides[get_session] = override_get_async_db
+    try:
+        yield client, sessions
+    finally:
+        app.dependency_overrides[get_session] = previous
+
+
+def test_crud_through_async_sessions(async_client):
+    """Les routes fonctionnent de bout en bout avec une AsyncSession"""
+    client, sessions = async_client
+
+    created = client.post(
+        "/api/articles/",
+        json={"title": "Async", "content": "Non blocking", "author": "Loop"},
+    )
+    assert created.status_code == 201
+    article_id = created.json()["id"]
+
+    assert client.post(f"/api/articles/{article_id}/like").json()["likes_count"] == 1
+    assert client.get("/api/articles/?search=async").json()[0]["id"] == article_id
+
+    comment = client.post(
+        "/api/comments/",
+        json={"article_id": article_id, "author": "Reader", "content": "Nice"},
+    )
+    assert comment.status_code == 201
+    assert len(client.get(f"/api/comments/?article_id={article_id}").json()) == 1
+
+    assert client.delete(f"/api/articles/{article_id}").status_code == 204
+    assert all(isinstance(db, AsyncSession) for db in sessions)
+
+
+def test_async_url_is_derived_from_database_url():
+    """Le pilote asynchrone est déduit de DATABASE_URL"""
+    assert (
+        Settings(database_url="sqlite:///./blog.db").get_async_database_url()
+        == "sqlite+aiosqlite:///./blog.db"
+    )
+    assert (
+        Settings(database_url="postgresql://u:p@db/blog").get_async_database_url()
+        == "postgresql+asyncpg://u:p@db/blog"
+    )
@@ -0,0 +1,108 @@
+"""
+Tests des statistiques par auteur et des pages d'auteur
+"""
+
+from sqlalchemy import func, select
+
+from app.models.article import Article
+from app.models.author import AuthorStats
+from app.services.like_service import like_buffer
+
+
+def _create(client, author, title="Titre"):
+    response = client.post(
+        "/api/articles/",
+        json={"title": title, "content": "Contenu", "author": author},
+    )
+    return response.json()["id"]
+
+
+def _stats(client, author):
+    return client.get(f"/api/authors/{author}/articles").json()["author"]
+
+
+def _grouped(db_session):
+    """Statistiques recalculées par GROUP BY, pour comparaison"""
+    rows = db_session.execute(
+        select(
+            Article.author,
+            func.count(Article.id),
+            func.sum(Article.likes_count),
+            func.sum(Article.comments_count),
+        ).group_by(Article.author)
+    )
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+
+def test_writes_update_author_stats(client, db_session):
+    """Créations, likes, commentaires et suppressions mettent à jour les totaux"""
+    first = _create(client, "Alice")
+    second = _create(client, "Alice")
+    _create(client, "Bob")
+    client.post(f"/api/articles/{first}/like")
+    client.post(f"/api/articles/{second}/like")
+    like_buffer.flush(bind=db_session.get_bind())
+    comment = client.post(
+        "/api/comments/", json={"article_id": first, "author": "C", "content": "Oui"}
+    ).json()
+    client.post(
+        "/api/comments/", json={"article_id": second, "author": "C", "content": "Non"}
+    )
+    client.delete(f"/api/comments/{comment['id']}")
+
+    stats = _stats(client, "Alice")
+    assert (stats["articles_count"], stats["likes_count"]) == (2, 2)
+    assert stats["comments_count"] == 1
+    assert stats["last_post_at"] is not None
+
+    client.delete(f"/api/articles/{second}")
+    stats = _stats(client, "Alice")
+    assert (stats["articles_count"], stats["likes_count"]) == (1, 1)
+    assert stats["comments_count"] == 0
+
+    materialized = {
+        s.author: (s.articles_count, s.likes_count, s.comments_count)
+        for s in db_session.scalars(select(AuthorStats))
+    }
+    assert materialized == _grouped(db_session)
+
+    client.delete(f"/api/articles/{first}")
+    assert client.get("/api/authors/Alice/articles").status_code == 404
+    assert [a["author"] for a in client.get("/api/authors/").json()] == ["Bob"]
+
+
+def test_author_articles_are_paginated(client):
+    """Articles d'un auteur (nom exact), du plus récent, par curseur"""
+    ids = [_create(client, "Alice", f"Article {i}") for i in range(5)]
+    _create(client, "Alice Martin")
+
+    page = client.get("/api/authors/Alice/articles?limit=3").json()
+    assert page["author"]["articles_count"] == 5
+    assert [a["id"] for a in page["items"]] == ids[::-1][:3]
+    following = client.get(
+        f"/api/authors/Alice/articles?limit=3&cursor={page['next_cursor']}"
+    ).json()
+    assert [a["id"] for a in following["items"]] == ids[::-1][3:]
+    assert following["next_cursor"] is None
+
+    response = client.get("/api/authors/Alice/articles?cursor=invalide")
+    assert response.status_code == 400
+
+
+def test_bulk_import_counts_authors(client):
+    """L'import en masse alimente aussi les statistiques"""
+    body = b"".join(
+        b'{"title": "T", "content": "C", "author": "%s"}\n' % name
+        for name in (b"Alice", b"Alice", b"Bob")
+    )
+    client.post(
+        "/api/articles/bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    authors = client.get("/api/authors/").json()
+    assert [(a["author"], a["articles_count"]) for a in authors] == [
+        ("Alice", 2),
+        ("Bob", 1),
+    ]
@@ -0,0 +1,58 @@
+"""
+Tests de la suite de benchmarks (données reproductibles, rapports comparables)
+"""
+
+from app.database import create_db_engine
+from app.migrations import upgrade
+from benchmarks.compare import compare
+from benchmarks.datagen import generate
+from benchmarks.report import summarize
+
+
+def _dump(engine):
+    with engine.connect() as connection:
+        articles = connection.exec_driver_sql(
+            "SELECT id, title, likes_count, comments_count FROM articles ORDER BY id"
+        ).all()
+        comments = connection.exec_driver_sql(
+            "SELECT article_id, content FROM comments ORDER BY id"
+        ).all()
+    return articles, comments
+
+
+def test_datagen_is_reproducible(tmp_path):
+    """Même graine, mêmes données ; comments_count reflète les commentaires"""
+    dumps = []
+    for name in ("a.db", "b.db"):
+        engine = create_db_engine(f"sqlite:///{tmp_path / name}")
+        upgrade(engine)
+        generate(engine, articles=50, comments=300, seed=7, chunk_size=64)
+        dumps.append(_dump(engine))
+        engine.dispose()
+
+    assert dumps[0] == dumps[1]
+    articles, comments = dumps[0]
+    assert len(articles) == 50 and len(comments) == 300
+    counts = {}
+    for article_id, _ in comments:
+        counts[article_id] = counts.get(article_id, 0) + 1
+    assert {row.id: row.comments_count for row in articles} == {
+        row.id: counts.get(row.id, 0) for row in articles
+    }
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    base = {
+        "stable": summarize([1.0] * 20),
+        "slower": summarize([1.0] * 20),
+        "tiny": summarize([0.01] * 20),
+    }
+    head = {
+        "stable": summarize([1.05] * 20),
+        "slower": summarize([2.0] * 20),
+        # +100 % mais sous l'écart minimal : bruit de mesure
+        "tiny": summarize([0.02] * 20),
+    }
+    rows, regressions = compare(base, head, metric="p95_ms", threshold=0.10)
+    assert regressions == ["slower"]
+    assert {name for name, *_ in rows} == {"stable", "slower", "tiny"}
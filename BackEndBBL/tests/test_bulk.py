@@ -0,0 +1,82 @@
+"""
+Tests de l'import et de l'export NDJSON
+"""
+
+import json
+
+
+def _ndjson(*rows) -> bytes:
+    return b"".join(
+        (row if isinstance(row, bytes) else json.dumps(row).encode()) + b"\n"
+        for row in rows
+    )
+
+
+def _import(client, url, body):
+    return client.post(
+        url, content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+
+
+def test_bulk_import_articles_reports_row_errors(client):
+    """Les lignes valides sont insérées, les autres signalées par numéro"""
+    body = _ndjson(
+        {"title": "Un", "content": "Premier", "author": "A"},
+        b"{pas du json",
+        {"title": "   ", "content": "Titre vide", "author": "A"},
+        b"",
+        {"title": "Deux", "content": "Second", "author": "B"},
+    )
+    result = _import(client, "/api/articles/bulk", body).json()
+
+    assert result["received"] == 4
+    assert result["inserted"] == 2
+    assert result["failed"] == 2
+    assert [error["line"] for error in result["errors"]] == [2, 3]
+    assert result["errors"][1]["error"].startswith("title")
+    titles = {a["title"] for a in client.get("/api/articles/").json()}
+    assert titles == {"Un", "Deux"}
+
+
+def test_bulk_import_is_chunked(client, monkeypatch):
+    """L'import traverse plusieurs transactions sans perdre de lignes"""
+    monkeypatch.setattr("app.core.config.settings.bulk_chunk_size", 7)
+    rows = [{"title": f"T{i}", "content": "C", "author": "A"} for i in range(50)]
+    result = _import(client, "/api/articles/bulk", _ndjson(*rows)).json()
+    assert result["inserted"] == 50
+    assert len(client.get("/api/articles/?limit=100").json()) == 50
+
+
+def test_bulk_import_comments_updates_counts(client):
+    """Les commentaires importés mettent à jour comments_count"""
+    article_id = client.post(
+        "/api/articles/", json={"title": "T", "content": "C", "author": "A"}
+    ).json()["id"]
+    body = _ndjson(
+        *[
+            {"article_id": article_id, "author": "B", "content": f"n°{i}"}
+            for i in range(3)
+        ],
+        {"article_id": 999, "author": "B", "content": "orphelin"},
+    )
+    result = _import(client, "/api/comments/bulk", body).json()
+
+    assert result["inserted"] == 3
+    assert result["errors"] == [
+        {"line": 4, "error": "article_id: Article 999 non trouvé"}
+    ]
+    assert client.get(f"/api/articles/{article_id}").json()["comments_count"] == 3
+    assert len(client.get(f"/api/comments/?article_id={article_id}").json()) == 3
+
+
+def test_export_round_trips(client, monkeypatch):
+    """L'export NDJSON contient chaque article une fois, par id croissant"""
+    monkeypatch.setattr("app.core.config.settings.export_batch_size", 4)
+    rows = [{"title": f"T{i}", "content": "C", "author": "A"} for i in range(10)]
+    _import(client, "/api/articles/bulk", _ndjson(*rows))
+
+    response = client.get("/api/articles/export")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [a["title"] for a in exported] == [f"T{i}" for i in range(10)]
+    assert [a["id"] for a in exported] == sorted(a["id"] for a in exported)
@@ -0,0 +1,104 @@
+"""
+Tests for the article read cache (LRU/TTL and Redis backends, invalidation)
+"""
+
+import time
+
+from app.core.cache import LRUCache, RedisCache
+from app.core.fake_redis import FakeRedis
+from app.services.article_cache import article_cache
+
+
+def _create(client, title="Cached", content="Content"):
+    response = client.post(
+        "/api/articles/", json={"title": title, "content": content, "author": "A"}
+    )
+    return response.json()["id"]
+
+
+def test_lru_counts_hits_misses_and_evictions():
+    """Le LRU évince l'entrée la moins récemment utilisée et compte les accès"""
+    cache = LRUCache(max_entries=2, ttl=60)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    stats = cache.stats.as_dict()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 1)
+
+
+def test_lru_entries_expire():
+    """Les entrées expirent après leur durée de vie"""
+    cache = LRUCache(ttl=0.01)
+    cache.set("a", b"1")
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.stats.as_dict()["expirations"] == 1
+
+
+def test_tag_invalidation_on_both_backends():
+    """Invalider une étiquette supprime toutes les clés qui y sont rattachées"""
+    for cache in (LRUCache(), RedisCache(FakeRedis())):
+        cache.set("list:1", b"[]", tags=["article:1", "lists"])
+        cache.set("list:2", b"[]", tags=["article:2", "lists"])
+        cache.invalidate_tags("article:1")
+        assert cache.get("list:1") is None
+        assert cache.get("list:2") == b"[]"
+        cache.invalidate_tags("lists")
+        assert cache.get("list:2") is None
+        assert cache.size() == 0
+
+
+def test_article_reads_are_served_from_cache(client):
+    """La deuxième lecture est servie depuis le cache, à l'identique"""
+    article_id = _create(client)
+
+    first = client.get(f"/api/articles/{article_id}")
+    hits = article_cache.stats()["hits"]
+    second = client.get(f"/api/articles/{article_id}")
+
+    assert article_cache.stats()["hits"] == hits + 1
+    assert second.content == first.content
+    assert second.headers["content-type"] == "application/json"
+
+
+def test_writes_invalidate_precisely(client):
+    """Un like n'invalide que l'article concerné et les listes qui le contiennent"""
+    liked = _create(client, "Liked")
+    other = _create(client, "Other")
+    client.get(f"/api/articles/{liked}")
+    client.get(f"/api/articles/{other}")
+    client.get("/api/articles/")
+
+    client.post(f"/api/articles/{liked}/like")
+
+    assert article_cache.get(article_cache.article_key(other)) is not None
+    assert article_cache.get(article_cache.article_key(liked)) is None
+    listing = client.get("/api/articles/").json()
+    assert {a["id"]: a["likes_count"] for a in listing}[liked] == 1
+
+
+def test_create_update_delete_refresh_listings_and_search(client):
+    """Création, modification et suppression sont visibles malgré le cache"""
+    article_id = _create(client, "Original")
+    assert len(client.get("/api/articles/").json()) == 1
+    assert len(client.get("/api/articles/?search=original").json()) == 1
+
+    _create(client, "Second")
+    assert len(client.get("/api/articles/").json()) == 2
+
+    client.put(f"/api/articles/{article_id}", json={"title": "Renamed"})
+    assert client.get("/api/articles/?search=original").json() == []
+    assert client.get(f"/api/articles/{article_id}").json()["title"] == "Renamed"
+
+    client.delete(f"/api/articles/{article_id}")
+    assert len(client.get("/api/articles/").json()) == 1
+    assert client.get(f"/api/articles/{article_id}").status_code == 404
+
+
+def test_cache_stats_endpoint(client):
+    """Les compteurs du cache sont exposés"""
+    data = client.get("/cache/stats").json()
+    assert {"hits", "misses", "evictions", "entries"} <= set(data)
@@ -0,0 +1,104 @@
+"""
+Tests des likes de commentaires et du tri des commentaires
+"""
+
+from sqlalchemy import event
+
+from app.models.article import Article
+from app.models.comment import Comment
+from app.services.comment_like_service import comment_like_buffer
+from app.services.comment_service import CommentService
+
+
+def _seed(db_session, likes):
+    """Un article et un commentaire par nombre de likes ; renvoie leurs ids"""
+    article = Article(title="Fil", content="Contenu", author="A")
+    db_session.add(article)
+    db_session.flush()
+    comments = [
+        Comment(article_id=article.id, author="B", content=f"{n} likes", likes_count=n)
+        for n in likes
+    ]
+    db_session.add_all(comments)
+    db_session.commit()
+    return article.id, [c.id for c in comments]
+
+
+def test_like_comment_is_buffered_then_written(client, db_session):
+    """Les likes en attente sont visibles, puis écrits en un incrément"""
+    article_id, (comment_id,) = _seed(db_session, [0])
+
+    for _ in range(3):
+        response = client.post(f"/api/comments/{comment_id}/like")
+    assert response.status_code == 200
+    assert response.json()["likes_count"] == 3
+    listed = client.get(f"/api/comments/?article_id={article_id}").json()
+    assert listed[0]["likes_count"] == 3
+
+    assert comment_like_buffer.flush(bind=db_session.get_bind()) == 3
+    assert db_session.get(Comment, comment_id).likes_count == 3
+    assert client.post("/api/comments/999999/like").status_code == 404
+
+
+def test_like_changes_the_listing_etag(client, db_session):
+    """Un like rend obsolète l'ETag du fil de commentaires"""
+    article_id, (comment_id,) = _seed(db_session, [0])
+    url = f"/api/comments/?article_id={article_id}"
+    etag = client.get(url).headers["ETag"]
+
+    client.post(f"/api/comments/{comment_id}/like")
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["likes_count"] == 1
+
+
+def test_created_comment_reports_likes_count(client, db_session):
+    """La réponse de création expose likes_count"""
+    article_id, _ = _seed(db_session, [])
+    response = client.post(
+        "/api/comments/",
+        json={"article_id": article_id, "author": "C", "content": "Nouveau"},
+    )
+    assert response.json()["likes_count"] == 0
+
+
+def test_sort_top_and_new(client, db_session):
+    """sort=top : les plus likés d'abord ; sort=new : les plus récents d'abord"""
+    article_id, ids = _seed(db_session, [2, 7, 0, 7, 5])
+    url = f"/api/comments/?article_id={article_id}&limit=3"
+
+    top = client.get(f"{url}&sort=top").json()
+    assert [c["likes_count"] for c in top] == [7, 7, 5]
+    # À égalité, le plus récent d'abord
+    assert [c["id"] for c in top[:2]] == [ids[3], ids[1]]
+    assert len(client.get(f"{url}&sort=new").json()) == 3
+    assert len(client.get(url).json()) == 5
+    assert client.get(f"{url}&sort=top&cursor=").status_code == 400
+
+
+def test_top_comments_are_read_from_the_index(db_session):
+    """Les N premiers commentaires sont lus dans l'index, sans tri du fil"""
+    article_id, _ = _seed(db_session, range(50))
+    engine = db_session.get_bind()
+    captured = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        CommentService.get_comments_by_article(
+            db_session, article_id, sort="top", limit=5
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+
+    statement, parameters = captured[-1]
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_comments_article_id_likes_count_id" in details
+    assert "TEMP B-TREE" not in details
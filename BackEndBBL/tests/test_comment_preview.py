@@ -0,0 +1,90 @@
+"""
+Tests du nombre de commentaires dénormalisé et des aperçus de commentaires
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.models.article import Article
+from app.models.comment import Comment
+
+
+@contextmanager
+def count_statements(engine):
+    """Compte les requêtes SQL exécutées sur le moteur"""
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+
+
+def _seed(db_session, articles, comments_per_article):
+    for i in range(articles):
+        article = Article(title=f"Article {i}", content="Contenu", author="A")
+        article.comments = [
+            Comment(author="B", content=f"Commentaire {j}")
+            for j in range(comments_per_article)
+        ]
+        article.comments_count = comments_per_article
+        db_session.add(article)
+    db_session.commit()
+
+
+def test_comments_count_is_maintained(client):
+    """Créer puis supprimer un commentaire met à jour comments_count"""
+    article_id = client.post(
+        "/api/articles/", json={"title": "T", "content": "C", "author": "A"}
+    ).json()["id"]
+    assert client.get(f"/api/articles/{article_id}").json()["comments_count"] == 0
+
+    comment_ids = [
+        client.post(
+            "/api/comments/",
+            json={"article_id": article_id, "author": "B", "content": f"n°{i}"},
+        ).json()["id"]
+        for i in range(3)
+    ]
+    assert client.get(f"/api/articles/{article_id}").json()["comments_count"] == 3
+
+    client.delete(f"/api/comments/{comment_ids[0]}")
+    listing = client.get("/api/articles/").json()
+    assert listing[0]["comments_count"] == 2
+
+
+def test_listing_embeds_most_recent_comments(client, db_session):
+    """Les N commentaires les plus récents de chaque article sont inclus"""
+    _seed(db_session, articles=3, comments_per_article=5)
+
+    listing = client.get("/api/articles/?include_comments=2").json()
+    assert len(listing) == 3
+    for item in listing:
+        assert item["comments_count"] == 5
+        contents = [c["content"] for c in item["recent_comments"]]
+        assert contents == ["Commentaire 4", "Commentaire 3"]
+
+    assert "recent_comments" not in client.get("/api/articles/").json()[0]
+    page = client.get("/api/articles/?cursor=&include_comments=1").json()
+    assert all(len(item["recent_comments"]) == 1 for item in page["items"])
+
+
+def test_listing_cost_does_not_depend_on_page_size(client, db_session):
+    """Une page de 100 articles coûte autant de requêtes qu'une page de 5"""
+    _seed(db_session, articles=100, comments_per_article=3)
+    engine = db_session.get_bind()
+
+    costs = []
+    for limit in (5, 100):
+        with count_statements(engine) as statements:
+            response = client.get(f"/api/articles/?limit={limit}&include_comments=3")
+        assert len(response.json()) == limit
+        costs.append(len(statements))
+
+    assert costs[0] == costs[1]
+    assert costs[1] <= 3
@@ -0,0 +1,121 @@
+"""
+Tests de la compression négociée des réponses
+"""
+
+import asyncio
+import gzip
+
+from app.api.responses import FastJSONResponse, dumps
+from app.core.config import settings
+from app.middleware.compression import (
+    CompressionMiddleware,
+    compressed_responses,
+    negotiate,
+)
+
+LONG_CONTENT = "Un texte assez long pour être compressé. " * 200
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def _create(client, content=LONG_CONTENT):
+    response = client.post(
+        "/api/articles/",
+        json={"title": "Titre", "content": content, "author": "Auteur"},
+    )
+    return response.json()["id"]
+
+
+def _call(app, headers=()):
+    """Exécute une application ASGI et retourne les messages envoyés"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+    }
+    asyncio.run(app(scope, receive, send))
+    return messages
+
+
+def test_negotiate_follows_weights_and_server_preference():
+    codings = ("br", "gzip")
+    assert negotiate("gzip, deflate, br", codings) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", codings) == "gzip"
+    assert negotiate("br;q=0, *", codings) == "gzip"
+    assert negotiate("identity", codings) is None
+    assert negotiate("*;q=0", codings) is None
+    assert negotiate("", codings) is None
+
+
+def test_large_article_is_gzipped(client):
+    article_id = _create(client)
+
+    response = client.get(f"/api/articles/{article_id}", headers=GZIP)
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(LONG_CONTENT) / 10
+    assert response.json()["content"] == LONG_CONTENT
+
+    # L'ETag devient faible, mais revalide toujours la ressource
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    revalidated = client.get(
+        f"/api/articles/{article_id}", headers={**GZIP, "If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert "content-encoding" not in revalidated.headers
+
+
+def test_small_or_unaccepted_bodies_are_sent_as_is(client):
+    response = client.get("/health", headers=GZIP)
+    assert "content-encoding" not in response.headers
+
+    article_id = _create(client)
+    response = client.get(
+        f"/api/articles/{article_id}", headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"].startswith('"')
+
+
+def test_compressed_article_is_served_from_cache(client):
+    article_id = _create(client)
+    first = client.get(f"/api/articles/{article_id}", headers=GZIP)
+    hits = compressed_responses.stats.hits
+
+    second = client.get(f"/api/articles/{article_id}", headers=GZIP)
+    assert compressed_responses.stats.hits == hits + 1
+    assert second.content == first.content
+
+    # Une modification change l'ETag, donc la clé du cache
+    client.put(f"/api/articles/{article_id}", json={"title": "Nouveau titre"})
+    third = client.get(f"/api/articles/{article_id}", headers=GZIP)
+    assert third.json()["title"] == "Nouveau titre"
+
+
+def test_large_body_is_streamed_in_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "response_chunk_size", 1024)
+    body = dumps([{"content": LONG_CONTENT}])
+
+    messages = _call(FastJSONResponse(content=body))
+    chunks = [m for m in messages if m["type"] == "http.response.body"]
+    assert len(chunks) > 1
+    assert all(m["more_body"] for m in chunks[:-1])
+    assert b"".join(m["body"] for m in chunks) == body
+
+    app = CompressionMiddleware(FastJSONResponse(content=body))
+    messages = _call(app, headers=[("Accept-Encoding", "gzip")])
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    compressed = b"".join(m["body"] for m in messages[1:])
+    assert gzip.decompress(compressed) == body
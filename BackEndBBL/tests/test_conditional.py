@@ -0,0 +1,175 @@
+"""
+Tests des requêtes conditionnelles (ETag, Last-Modified, 304)
+"""
+
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+from app.models.article import Article
+
+
+def _create(client, title="Article", content="Contenu"):
+    response = client.post(
+        "/api/articles/", json={"title": title, "content": content, "author": "A"}
+    )
+    return response.json()["id"]
+
+
+def test_article_revalidation_returns_304(client):
+    """Un article inchangé est revalidé sans corps"""
+    article_id = _create(client)
+    first = client.get(f"/api/articles/{article_id}")
+    etag = first.headers["etag"]
+    assert etag.startswith('"')
+    assert first.headers["cache-control"] == "no-cache"
+    assert "last-modified" in first.headers
+
+    second = client.get(f"/api/articles/{article_id}", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+
+def test_article_etag_changes_on_update_and_like(client):
+    """Modification et like produisent une nouvelle version"""
+    article_id = _create(client)
+    etag = client.get(f"/api/articles/{article_id}").headers["etag"]
+
+    client.put(f"/api/articles/{article_id}", json={"title": "Nouveau"})
+    updated = client.get(f"/api/articles/{article_id}", headers={"If-None-Match": etag})
+    assert updated.status_code == 200
+    assert updated.json()["title"] == "Nouveau"
+
+    etag = updated.headers["etag"]
+    client.post(f"/api/articles/{article_id}/like")
+    liked = client.get(f"/api/articles/{article_id}", headers={"If-None-Match": etag})
+    assert liked.status_code == 200
+    assert liked.json()["likes_count"] == 1
+
+
+def test_successive_updates_within_a_second_change_etag(client):
+    """La version est précise à la microseconde"""
+    article_id = _create(client)
+    etags = set()
+    for i in range(3):
+        client.put(f"/api/articles/{article_id}", json={"content": f"v{i}"})
+        etags.add(client.get(f"/api/articles/{article_id}").headers["etag"])
+    assert len(etags) == 3
+
+
+def test_if_modified_since(client):
+    """If-Modified-Since est pris en compte en l'absence d'If-None-Match"""
+    article_id = _create(client)
+    last_modified = client.get(f"/api/articles/{article_id}").headers["last-modified"]
+
+    fresh = client.get(
+        f"/api/articles/{article_id}", headers={"If-Modified-Since": last_modified}
+    )
+    assert fresh.status_code == 304
+
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(days=1), usegmt=True)
+    stale = client.get(
+        f"/api/articles/{article_id}", headers={"If-Modified-Since": past}
+    )
+    assert stale.status_code == 200
+
+
+def test_list_etag_follows_writes(client):
+    """L'ETag des listes change avec les créations, suppressions et likes"""
+    first_id = _create(client, "Premier")
+    etag = client.get("/api/articles/").headers["etag"]
+    assert (
+        client.get("/api/articles/", headers={"If-None-Match": etag}).status_code == 304
+    )
+    assert (
+        client.get(
+            "/api/articles/?limit=5", headers={"If-None-Match": etag}
+        ).status_code
+        == 200
+    )
+
+    for write in (
+        lambda: _create(client, "Second"),
+        lambda: client.post(f"/api/articles/{first_id}/like"),
+        lambda: client.delete(f"/api/articles/{first_id}"),
+    ):
+        write()
+        response = client.get("/api/articles/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+
+def test_list_etag_survives_identifier_reuse(client):
+    """Supprimer le dernier article puis en créer un change l'ETag"""
+    _create(client, "Premier")
+    last_id = _create(client, "Second")
+    etag = client.get("/api/articles/").headers["etag"]
+
+    client.delete(f"/api/articles/{last_id}")
+    # Identifiants jamais réattribués (AUTOINCREMENT)
+    assert _create(client, "Remplaçant") > last_id
+    response = client.get("/api/articles/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert {a["title"] for a in response.json()} == {"Premier", "Remplaçant"}
+
+
+def test_cached_body_is_only_served_under_its_etag(client, db_session):
+    """Une écriture dont l'invalidation n'est pas reçue ne fige pas l'ancien corps"""
+    article_id = _create(client, "Avant")
+    etag = client.get("/api/articles/").headers["etag"]
+    article_etag = client.get(f"/api/articles/{article_id}").headers["etag"]
+
+    # Écriture d'un autre worker : pas d'invalidation du cache de celui-ci
+    article = db_session.get(Article, article_id)
+    article.title = "Après"
+    db_session.commit()
+
+    listing = client.get("/api/articles/", headers={"If-None-Match": etag})
+    assert listing.status_code == 200
+    assert [a["title"] for a in listing.json()] == ["Après"]
+    single = client.get(
+        f"/api/articles/{article_id}", headers={"If-None-Match": article_etag}
+    )
+    assert single.status_code == 200
+    assert single.json()["title"] == "Après"
+
+
+def test_comment_list_etag_follows_delete_then_create(client):
+    """Supprimer le dernier commentaire puis en poster un autre change l'ETag"""
+    article_id = _create(client)
+    url = f"/api/comments/?article_id={article_id}"
+    ids = [
+        client.post(
+            "/api/comments/",
+            json={"article_id": article_id, "author": "B", "content": f"c{i}"},
+        ).json()["id"]
+        for i in range(3)
+    ]
+    etag = client.get(url).headers["etag"]
+
+    client.delete(f"/api/comments/{ids[-1]}")
+    client.post(
+        "/api/comments/",
+        json={"article_id": article_id, "author": "B", "content": "NEW"},
+    )
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [c["content"] for c in response.json()] == ["c0", "c1", "NEW"]
+
+
+def test_comment_list_revalidation(client):
+    """La liste des commentaires est revalidée sur (nombre, id maximum)"""
+    article_id = _create(client)
+    url = f"/api/comments/?article_id={article_id}"
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    client.post(
+        "/api/comments/",
+        json={"article_id": article_id, "author": "B", "content": "Merci"},
+    )
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 1
@@ -0,0 +1,132 @@
+"""
+Tests de la coordination des workers (messages diffusés, compteurs partagés)
+
+Deux coordinateurs Redis branchés sur le même ``FakeRedis`` tiennent lieu de
+deux workers.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.cache import LRUCache
+from app.core.coordination import Coordinator, LocalCoordinator, RedisCoordinator
+from app.core.fake_redis import FakeRedis
+from app.services.article_cache import ArticleCache
+from app.services.events import EventBus
+from app.services.like_service import LikeBuffer
+
+
+def _workers(redis, *channels):
+    """Deux coordinateurs et les messages reçus par chacun"""
+    received = ([], [])
+    delivered = threading.Event()
+    workers = []
+    for inbox in received:
+        coordinator = RedisCoordinator(redis, poll_interval=0.05)
+        for channel in channels:
+            coordinator.subscribe(channel, inbox.append)
+        workers.append(coordinator)
+    workers[1].subscribe(channels[0], lambda message: delivered.set())
+    for coordinator in workers:
+        coordinator.start()
+    return workers, received, delivered
+
+
+def test_local_coordinator_dispatches_and_counts():
+    coordinator = LocalCoordinator()
+    received = []
+    coordinator.subscribe("cache", received.append)
+    coordinator.broadcast("cache", {"lists": True})
+    assert received == [{"lists": True}]
+    assert coordinator.incr("likes") == 1
+    assert coordinator.incr("likes", 4) == 5
+    assert coordinator.counter("likes") == 5
+    assert coordinator.counter("unknown") == 0
+
+
+def test_incomplete_coordinator_cannot_be_created():
+    class BroadcastOnly(Coordinator):
+        def broadcast(self, channel, message):
+            self._dispatch(channel, message)
+
+    with pytest.raises(TypeError):
+        BroadcastOnly()
+
+
+def test_redis_coordinator_reaches_other_workers_once():
+    redis = FakeRedis()
+    (first, second), received, delivered = _workers(redis, "cache")
+    try:
+        first.broadcast("cache", {"article_id": 1})
+        assert delivered.wait(2)
+        # L'émetteur traite son message à l'envoi, pas une seconde fois
+        assert received == ([{"article_id": 1}], [{"article_id": 1}])
+
+        first.incr("likes:generation")
+        second.incr("likes:generation", 2)
+        assert first.counter("likes:generation") == 3
+        assert second.counter("likes:generation") == 3
+    finally:
+        first.close()
+        second.close()
+
+
+def test_cache_invalidation_is_broadcast_to_other_workers():
+    redis = FakeRedis()
+    workers = [RedisCoordinator(redis, poll_interval=0.05) for _ in range(2)]
+    caches = [ArticleCache(LRUCache(), coordinator) for coordinator in workers]
+    for coordinator in workers:
+        coordinator.start()
+    try:
+        for cache in caches:
+            cache.set_article(7, b"{}", '"v1"')
+            cache.set_list("list:a", b"[]", [7], '"v1"')
+        caches[0].invalidate_article(7)
+        assert caches[0].get("article:7") is None
+
+        for _ in range(40):
+            if caches[1].get("article:7") is None:
+                break
+            threading.Event().wait(0.05)
+        assert caches[1].get("article:7") is None
+        assert caches[1].get("list:a") is None
+    finally:
+        for coordinator in workers:
+            coordinator.close()
+
+
+def test_events_are_relayed_between_workers():
+    redis = FakeRedis()
+    workers = [RedisCoordinator(redis, poll_interval=0.05) for _ in range(2)]
+    buses = [EventBus(coordinator=coordinator) for coordinator in workers]
+    for coordinator in workers:
+        coordinator.start()
+
+    async def scenario():
+        local = buses[0].subscribe(1)
+        remote = buses[1].subscribe(1)
+        buses[0].publish(1, "likes", {"article_id": 1, "likes_count": 3})
+        return await local.receive(2), await remote.receive(2)
+
+    try:
+        local, remote = asyncio.run(scenario())
+    finally:
+        for coordinator in workers:
+            coordinator.close()
+    # Même événement, numéroté par l'historique de chaque worker
+    assert local.split(b"\n", 1)[1] == remote.split(b"\n", 1)[1]
+    assert b'"likes_count":3' in remote
+
+
+def test_like_generation_is_shared():
+    redis = FakeRedis()
+    buffers = [
+        LikeBuffer(coordinator=RedisCoordinator(redis), max_pending=100)
+        for _ in range(2)
+    ]
+    buffers[0].add(1)
+    buffers[1].add(2)
+    assert buffers[0].generation == buffers[1].generation == 2
+    assert buffers[0].pending_count(2) == 0
@@ -0,0 +1,63 @@
+"""
+Tests de la configuration des moteurs (profil PRAGMA SQLite, pool, lecture seule)
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.database import create_db_engine, engine_options
+
+
+def _pragma(engine, name):
+    with engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_sqlite_profile_is_applied_on_connect(tmp_path):
+    """Chaque connexion reçoit le profil WAL / NORMAL / busy_timeout"""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'blog.db'}")
+    assert _pragma(engine, "journal_mode") == "wal"
+    assert _pragma(engine, "synchronous") == 1  # NORMAL
+    assert _pragma(engine, "busy_timeout") == settings.sqlite_busy_timeout_ms
+    assert _pragma(engine, "cache_size") == -settings.sqlite_cache_size_kib
+    engine.dispose()
+
+
+def test_profile_can_be_disabled(tmp_path, monkeypatch):
+    """SQLITE_TUNING=false conserve la configuration par défaut de SQLite"""
+    monkeypatch.setattr(settings, "sqlite_tuning", False)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'blog.db'}")
+    assert _pragma(engine, "journal_mode") == "delete"
+    engine.dispose()
+
+
+def test_read_only_engine_rejects_writes(tmp_path):
+    """Le pool en lecture seule lit la base mais refuse les écritures"""
+    path = tmp_path / "blog.db"
+    writer = create_db_engine(f"sqlite:///{path}")
+    with writer.begin() as connection:
+        connection.execute(text("CREATE TABLE t (x INTEGER)"))
+        connection.execute(text("INSERT INTO t VALUES (1)"))
+
+    reader = create_db_engine(f"sqlite:///file:{path}?mode=ro&uri=true", read_only=True)
+    with reader.connect() as connection:
+        assert connection.execute(text("SELECT x FROM t")).scalar() == 1
+        with pytest.raises(OperationalError):
+            connection.execute(text("INSERT INTO t VALUES (2)"))
+    reader.dispose()
+    writer.dispose()
+
+
+def test_pool_options_follow_settings(monkeypatch):
+    """Les options de pool viennent de la configuration, sauf base en mémoire"""
+    monkeypatch.setattr(settings, "db_pool_size", 12)
+    options = engine_options("postgresql://user@db/blog")
+    assert options["pool_size"] == 12
+    assert "connect_args" not in options
+
+    assert "pool_size" not in engine_options("sqlite://")
+    assert engine_options("sqlite:///./blog.db")["connect_args"] == {
+        "check_same_thread": False
+    }
@@ -0,0 +1,211 @@
+"""
+Tests du flux d'événements des articles (Server-Sent Events)
+"""
+
+import asyncio
+import json
+import tracemalloc
+
+from app.main import app
+from app.services.events import EventBus, event_bus, event_stream
+
+IDLE_SUBSCRIBERS = 5000
+
+
+class _Stream:
+    """Requête ``GET`` en flux sur l'application ASGI, close() simule la déconnexion"""
+
+    def __init__(self, path: str, headers=()):
+        self.messages = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.requested = False
+        self.buffer = b""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"test")]
+            + [(name.lower().encode(), value.encode()) for name, value in headers],
+            "client": ("test", 1234),
+            "server": ("test", 80),
+        }
+        self.task = asyncio.create_task(app(scope, self._receive, self.messages.put))
+
+    async def _receive(self):
+        if not self.requested:
+            self.requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def start(self):
+        message = await asyncio.wait_for(self.messages.get(), 5)
+        assert message["type"] == "http.response.start"
+        return message["status"], dict(message["headers"])
+
+    async def events(self, count: int):
+        """Les ``count`` prochains événements, en (id, nom, données)"""
+        while self.buffer.count(b"event: ") < count:
+            message = await asyncio.wait_for(self.messages.get(), 5)
+            self.buffer += message.get("body", b"")
+        frames = [f for f in self.buffer.split(b"\n\n") if b"event: " in f][:count]
+        events = []
+        for frame in frames:
+            fields = dict(line.split(": ", 1) for line in frame.decode().splitlines())
+            events.append((fields["id"], fields["event"], json.loads(fields["data"])))
+        return events
+
+    async def close(self):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, 5)
+
+
+def _create_article(client) -> int:
+    response = client.post(
+        "/api/articles/",
+        json={"title": "Titre", "content": "Contenu", "author": "Auteur"},
+    )
+    return response.json()["id"]
+
+
+def test_stream_publishes_comments_and_likes(client):
+    article_id = _create_article(client)
+
+    async def scenario():
+        stream = _Stream(f"/api/articles/{article_id}/events")
+        status, headers = await stream.start()
+        assert status == 200
+        assert headers[b"content-type"].startswith(b"text/event-stream")
+        assert headers[b"cache-control"] == b"no-cache"
+        assert b"content-encoding" not in headers
+        assert event_bus.subscriber_count(article_id) == 1
+
+        comment = await asyncio.to_thread(
+            client.post,
+            "/api/comments/",
+            json={"article_id": article_id, "author": "Paul", "content": "Bravo"},
+        )
+        await asyncio.to_thread(client.post, f"/api/articles/{article_id}/like")
+        await asyncio.to_thread(client.delete, f"/api/comments/{comment.json()['id']}")
+        events = await stream.events(3)
+        await stream.close()
+        return comment.json(), events
+
+    comment, events = asyncio.run(scenario())
+    assert [name for _, name, _ in events] == [
+        "comment_created",
+        "likes",
+        "comment_deleted",
+    ]
+    assert events[0][2]["content"] == "Bravo"
+    assert events[0][2]["id"] == comment["id"]
+    assert events[1][2] == {"article_id": article_id, "likes_count": 1}
+    assert events[2][2] == {"id": comment["id"], "article_id": article_id}
+    assert event_bus.subscriber_count() == 0
+
+
+def test_unknown_article_has_no_stream(client):
+    assert client.get("/api/articles/999/events").status_code == 404
+
+
+def test_last_event_id_resumes_from_history():
+    bus = EventBus(history_size=2)
+
+    async def scenario():
+        bus.publish(1, "comment_created", {"id": 1})
+        first = bus.event_id(1)
+        for comment_id in (2, 3):
+            bus.publish(1, "comment_created", {"id": comment_id})
+        bus.publish(2, "comment_created", {"id": 9})
+
+        resumed = bus.subscribe(1, last_event_id=first)
+        replay = await resumed.receive(0)
+        # Un numéro sorti de l'historique, d'une autre instance ou illisible
+        bus.publish(1, "comment_created", {"id": 4})
+        lost = await bus.subscribe(1, last_event_id=first).receive(0)
+        foreign = await bus.subscribe(1, last_event_id="abc-1").receive(0)
+        return replay, lost, foreign
+
+    replay, lost, foreign = asyncio.run(scenario())
+    assert replay.count(b"event: comment_created") == 2
+    assert b'"id":1}' not in replay and b'"id":9' not in replay
+    assert lost.startswith(b"id: %s\nevent: reset\n" % bus.event_id(5).encode())
+    assert foreign.count(b"event: reset") == 1
+
+
+def test_slow_consumer_is_bounded_then_resumed():
+    bus = EventBus(history_size=100, max_pending=4)
+
+    async def scenario():
+        subscriber = bus.subscribe(1)
+        for count in range(1, 6):
+            bus.publish(1, "likes", {"likes_count": count})
+        await asyncio.sleep(0)
+        # Les nombres de likes successifs sont fusionnés
+        assert len(subscriber.pending) == 1
+        for comment_id in range(10):
+            bus.publish(1, "comment_created", {"id": comment_id})
+        await asyncio.sleep(0)
+        assert subscriber.lagged and subscriber.pending == []
+        # La file abandonnée est reprise depuis l'historique, sans doublon
+        frames = await subscriber.receive(0)
+        bus.publish(1, "comment_created", {"id": 10})
+        await asyncio.sleep(0)
+        return frames, await subscriber.receive(0)
+
+    frames, following = asyncio.run(scenario())
+    assert frames.count(b"event: ") == 15
+    assert following.count(b"event: ") == 1 and b'"id":10' in following
+
+
+def test_stream_sends_heartbeats():
+    bus = EventBus()
+
+    async def scenario():
+        stream = event_stream(bus.subscribe(1), heartbeat=0.01)
+        chunks = [await stream.__anext__() for _ in range(2)]
+        await stream.aclose()
+        return chunks
+
+    retry, ping = asyncio.run(scenario())
+    assert retry.startswith(b"retry: ")
+    assert ping == b": ping\n\n"
+    assert bus.subscriber_count() == 0
+
+
+def test_idle_subscribers_memory_per_connection():
+    """Milliers de connexions inactives : mémoire par abonné et diffusion"""
+    bus = EventBus()
+
+    async def scenario():
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        streams = [
+            event_stream(bus.subscribe(1), heartbeat=60)
+            for _ in range(IDLE_SUBSCRIBERS)
+        ]
+        for stream in streams:
+            await stream.__anext__()
+        waiting = [asyncio.create_task(stream.__anext__()) for stream in streams]
+        await asyncio.sleep(0)
+        per_connection = (tracemalloc.get_traced_memory()[0] - before) / len(streams)
+        tracemalloc.stop()
+
+        bus.publish(1, "likes", {"likes_count": 1})
+        received = await asyncio.wait_for(asyncio.gather(*waiting), 5)
+        for stream in streams:
+            await stream.aclose()
+        return per_connection, received
+
+    per_connection, received = asyncio.run(scenario())
+    # Générateur, tâche, abonné et attente du prochain événement (minuterie
+    # du heartbeat comprise), hors tampons du serveur HTTP
+    assert per_connection < 4096, f"{per_connection:.0f} octets par connexion"
+    assert len(set(received)) == 1 and b"event: likes" in received[0]
+    assert bus.subscriber_count() == 0
@@ -0,0 +1,247 @@
+"""
+Tests de l'idempotence des écritures (en-tête Idempotency-Key)
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+from starlette.responses import PlainTextResponse
+
+from app.core.idempotency import (
+    CLAIMED,
+    IN_PROGRESS,
+    MISMATCH,
+    REPLAY,
+    DatabaseIdempotencyStore,
+    MemoryIdempotencyStore,
+    StoredResponse,
+)
+from app.main import app
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.models.article import Article
+from app.services.like_service import like_buffer
+
+ARTICLE = {"title": "Titre", "content": "Contenu", "author": "Auteur"}
+
+
+def _concurrently(target, requests: int, **kwargs):
+    """Envoie la même requête depuis `requests` clients simultanés"""
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=target)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as http:
+            return await asyncio.gather(*(http.post(**kwargs) for _ in range(requests)))
+
+    return asyncio.run(scenario())
+
+
+def test_concurrent_duplicates_create_one_article(db_session):
+    """100 clients, une clé : un seul article, la même réponse pour tous"""
+    responses = _concurrently(
+        app,
+        100,
+        url="/api/articles/",
+        json=ARTICLE,
+        headers={"Idempotency-Key": "creation-1"},
+    )
+
+    assert {r.status_code for r in responses} == {201}
+    assert len({r.json()["id"] for r in responses}) == 1
+    replayed = [r for r in responses if r.headers.get("Idempotent-Replayed")]
+    assert len(replayed) == 99
+    assert db_session.scalar(select(func.count(Article.id))) == 1
+
+
+def test_concurrent_duplicate_likes_count_once(client, db_session):
+    """Un like répété avec la même clé n'est compté qu'une fois"""
+    article_id = client.post("/api/articles/", json=ARTICLE).json()["id"]
+
+    responses = _concurrently(
+        app,
+        100,
+        url=f"/api/articles/{article_id}/like",
+        headers={"Idempotency-Key": "like-1"},
+    )
+
+    assert {r.json()["likes_count"] for r in responses} == {1}
+    like_buffer.flush(bind=db_session.get_bind())
+    assert db_session.get(Article, article_id).likes_count == 1
+    # Une autre clé est une autre requête
+    response = client.post(
+        f"/api/articles/{article_id}/like", headers={"Idempotency-Key": "like-2"}
+    )
+    assert response.json()["likes_count"] == 2
+
+
+def test_key_is_bound_to_its_request(client):
+    """Une clé réutilisée pour une autre requête est refusée (422)"""
+    headers = {"Idempotency-Key": "k"}
+    first = client.post("/api/articles/", json=ARTICLE, headers=headers)
+    assert first.status_code == 201
+    again = client.post("/api/articles/", json=ARTICLE, headers=headers)
+    assert again.json() == first.json()
+    assert again.headers["Idempotent-Replayed"] == "true"
+
+    other = client.post(f"/api/articles/{first.json()['id']}/like", headers=headers)
+    assert other.status_code == 422
+    response = client.post(
+        "/api/articles/", json=ARTICLE, headers={"Idempotency-Key": "x" * 256}
+    )
+    assert response.status_code == 400
+
+
+def _counting_app(statuses):
+    """Application minimale : réponses successives `statuses`, appels comptés"""
+    calls = []
+
+    async def target(scope, receive, send):
+        calls.append(scope["path"])
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        await PlainTextResponse(str(len(calls)), status_code=status)(
+            scope, receive, send
+        )
+
+    return target, calls
+
+
+@pytest.mark.parametrize("status", [500, 503, 429, 409])
+def test_failures_are_not_recorded(status):
+    """Erreurs et refus temporaires libèrent la clé : le nouvel essai est traité"""
+    target, calls = _counting_app([status, 200])
+    middleware = IdempotencyMiddleware(target, store=MemoryIdempotencyStore())
+    headers = {"Idempotency-Key": "k"}
+
+    (failed,) = _concurrently(middleware, 1, url="/", headers=headers)
+    assert failed.status_code == status
+    retried = _concurrently(middleware, 3, url="/", headers=headers)
+    assert [r.status_code for r in retried] == [200] * 3
+    assert len(calls) == 2
+
+
+def test_waits_for_another_worker_then_gives_up():
+    """Clé réservée ailleurs : attente, puis 409 au-delà de wait_timeout"""
+    # La réservation dure bien plus que l'attente : elle ne peut pas expirer
+    store = MemoryIdempotencyStore(lock_timeout=60)
+    target, calls = _counting_app([200])
+    middleware = IdempotencyMiddleware(
+        target, store=store, poll_interval=0.01, wait_timeout=0.2
+    )
+    headers = {"Idempotency-Key": "k"}
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def stalled(scope, receive, send):
+            await release.wait()
+            await PlainTextResponse("ok")(scope, receive, send)
+
+        # Autre worker, même stockage : il traite la requête sans la terminer
+        other = IdempotencyMiddleware(stalled, store=store)
+        worker = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=other), base_url="http://t"
+        )
+        http = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=middleware), base_url="http://t"
+        )
+        async with worker, http:
+            first = asyncio.create_task(worker.post("/", headers=headers))
+            await asyncio.sleep(0.01)
+            started = time.monotonic()
+            busy = await http.post("/", headers=headers)
+            waited = time.monotonic() - started
+            release.set()
+            await first
+        return busy, waited
+
+    busy, waited = asyncio.run(scenario())
+    assert busy.status_code == 409
+    assert busy.headers["Retry-After"] == "1"
+    assert waited >= 0.15
+    assert calls == []
+
+
+def test_key_is_bound_to_the_request_body(client):
+    """Même clé, autre corps : refusée (422), sans effet"""
+    headers = {"Idempotency-Key": "corps"}
+    first = client.post("/api/articles/", json=ARTICLE, headers=headers)
+    assert first.status_code == 201
+
+    other = {**ARTICLE, "title": "Autre titre"}
+    response = client.post("/api/articles/", json=other, headers=headers)
+    assert response.status_code == 422
+    assert client.get("/api/articles/").json()[0]["title"] == "Titre"
+
+
+def test_keys_belong_to_their_client():
+    """Deux clients, même clé : chacun sa requête et sa réponse"""
+    target, calls = _counting_app([200])
+    middleware = IdempotencyMiddleware(target, store=MemoryIdempotencyStore())
+    headers = {"Idempotency-Key": "k"}
+
+    async def scenario():
+        responses = []
+        for address in ("10.0.0.1", "10.0.0.2", "10.0.0.1"):
+            transport = httpx.ASGITransport(app=middleware, client=(address, 1234))
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://t"
+            ) as http:
+                responses.append(await http.post("/", headers=headers))
+        return responses
+
+    first, second, again = asyncio.run(scenario())
+    assert [first.text, second.text, again.text] == ["1", "2", "1"]
+    assert "Idempotent-Replayed" not in second.headers
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert len(calls) == 2
+
+
+def test_body_is_forwarded_and_bounded():
+    """Le corps lu pour l'empreinte parvient à l'application ; trop gros : 413"""
+    received = []
+
+    async def echo(scope, receive, send):
+        message = await receive()
+        received.append(message["body"])
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    middleware = IdempotencyMiddleware(
+        echo, store=MemoryIdempotencyStore(), max_body=10
+    )
+    (ok,) = _concurrently(
+        middleware, 1, url="/", content=b"0123456789", headers={"Idempotency-Key": "a"}
+    )
+    (large,) = _concurrently(
+        middleware, 1, url="/", content=b"01234567890", headers={"Idempotency-Key": "b"}
+    )
+    assert ok.status_code == 200
+    assert received == [b"0123456789"]
+    assert large.status_code == 413
+
+
+def test_database_store(db_session):
+    """Réservation, réponse enregistrée, clé liée à sa requête, expiration"""
+    store = DatabaseIdempotencyStore(db_session.get_bind(), ttl=0.2, lock_timeout=5)
+    response = StoredResponse(201, [("content-type", "application/json")], b"{}")
+
+    assert store.claim("k", "POST /a") == (CLAIMED, None)
+    assert store.claim("k", "POST /a") == (IN_PROGRESS, None)
+    store.release("k")
+    assert store.claim("k", "POST /a") == (CLAIMED, None)
+    store.complete("k", response)
+    assert store.claim("k", "POST /a") == (REPLAY, response)
+    assert store.claim("k", "POST /b") == (MISMATCH, None)
+
+    time.sleep(0.25)
+    assert store.claim("k", "POST /b") == (CLAIMED, None)
+
+
+def test_memory_store_is_bounded():
+    store = MemoryIdempotencyStore(max_keys=2)
+    for key in ("a", "b", "c"):
+        assert store.claim(key, "POST /")[0] == CLAIMED
+    # "a", la plus ancienne, est oubliée
+    assert store.claim("a", "POST /")[0] == CLAIMED
+    assert store.claim("c", "POST /")[0] == IN_PROGRESS
@@ -0,0 +1,145 @@
+"""
+Tests de la file de travaux différés et du mode POST_WRITE_MODE=deferred
+"""
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.jobs import main as jobs_cli
+from app.models.article import Article
+from app.models.author import AuthorStats
+from app.models.job import Job
+from app.schemas.article import ArticleCreate
+from app.services.article_service import ArticleService
+from app.services.jobs import HANDLERS, JobRunner, enqueue, register_job
+
+ARTICLE = {"title": "Titre", "content": "Un contenu de cinq mots", "author": "Alice"}
+
+
+@pytest.fixture
+def deferred(monkeypatch):
+    monkeypatch.setattr(settings, "post_write_mode", "deferred")
+
+
+@pytest.fixture
+def handlers():
+    """Types de travaux déclarés par un test, retirés ensuite"""
+    declared = []
+
+    def declare(kind, run, on_commit=None):
+        declared.append(kind)
+        register_job(kind, run, on_commit)
+
+    yield declare
+    for kind in declared:
+        HANDLERS.pop(kind, None)
+
+
+def _jobs(db_session):
+    db_session.rollback()
+    return db_session.execute(
+        select(Job.kind, Job.key, Job.status, Job.generation).order_by(Job.id)
+    ).all()
+
+
+def test_writes_are_completed_after_the_response(client, db_session, deferred):
+    """La réponse précède le résumé et les compteurs, faits par la file"""
+    created = client.post("/api/articles/", json=ARTICLE).json()
+    assert created["word_count"] == 0
+    article_id = created["id"]
+    for content in ("Oui", "Non"):
+        response = client.post(
+            "/api/comments/",
+            json={"article_id": article_id, "author": "B", "content": content},
+        )
+        assert response.status_code == 201
+
+    # Les tâches de la requête ont vidé la file
+    assert _jobs(db_session) == []
+    article = client.get(f"/api/articles/{article_id}").json()
+    assert (article["word_count"], article["excerpt"]) == (5, ARTICLE["content"])
+    assert article["comments_count"] == 2
+    stats = db_session.get(AuthorStats, "Alice")
+    assert (stats.articles_count, stats.comments_count) == (1, 2)
+
+    client.put(f"/api/articles/{article_id}", json={"content": "Deux mots"})
+    assert client.get(f"/api/articles/{article_id}").json()["word_count"] == 2
+
+
+def test_duplicate_jobs_are_coalesced(db_session, deferred):
+    """Une demande par article et par auteur, quel que soit leur nombre"""
+    for _ in range(3):
+        ArticleService.create_article(db_session, ArticleCreate(**ARTICLE))
+    ids = [a.id for a in db_session.query(Article.id).order_by(Article.id)]
+    with db_session.get_bind().begin() as connection:
+        enqueue(connection, "article.summary", [ids[0], ids[0]])
+
+    jobs = _jobs(db_session)
+    assert [(kind, key) for kind, key, *_ in jobs] == [
+        ("article.summary", str(ids[0])),
+        ("author.stats", "Alice"),
+        ("article.summary", str(ids[1])),
+        ("article.summary", str(ids[2])),
+    ]
+    assert [generation for *_, generation in jobs] == [2, 3, 1, 1]
+
+    runner = JobRunner()
+    assert runner.drain(bind=db_session.get_bind()) == 4
+    assert _jobs(db_session) == []
+    assert db_session.get(AuthorStats, "Alice").articles_count == 3
+
+
+def test_failed_jobs_are_retried_then_abandoned(db_session, handlers):
+    """Délai exponentiel entre les essais, statut failed au dernier"""
+    calls = []
+
+    def flaky(connection, key):
+        calls.append(key)
+        raise RuntimeError("indisponible")
+
+    handlers("test.flaky", flaky)
+    runner = JobRunner(max_attempts=3, retry_delay=0.0)
+    with db_session.get_bind().begin() as connection:
+        enqueue(connection, "test.flaky", ["k"])
+
+    assert runner.drain(bind=db_session.get_bind()) == 0
+    assert calls == ["k"] * 3
+    job = db_session.scalars(select(Job)).one()
+    assert (job.status, job.attempts) == ("failed", 3)
+    assert job.last_error == "RuntimeError: indisponible"
+
+    delays = JobRunner(retry_delay=1.0, retry_max_delay=5.0)
+    assert [delays.backoff(n) for n in range(1, 6)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_job_requested_while_running_runs_again(db_session, handlers):
+    """Redemandé pendant son exécution, un travail est exécuté une fois de plus"""
+    runner = JobRunner(workers=1)
+    calls = []
+
+    def requeue_once(connection, key):
+        calls.append(key)
+        # Une seule place d'exécution : déjà prise par ce travail
+        assert runner.run_pending() == 0
+        if len(calls) == 1:
+            enqueue(connection, "test.requeue", [key])
+
+    handlers("test.requeue", requeue_once)
+    with db_session.get_bind().begin() as connection:
+        enqueue(connection, "test.requeue", ["k"])
+
+    assert runner.run_pending(bind=db_session.get_bind()) == 2
+    assert calls == ["k", "k"]
+    assert _jobs(db_session) == []
+
+
+def test_cli_drains_the_queue(db_session, monkeypatch, deferred, capsys):
+    monkeypatch.setattr("app.jobs.engine", db_session.get_bind())
+    ArticleService.create_article(db_session, ArticleCreate(**ARTICLE))
+
+    assert jobs_cli(["status"]) == 0
+    assert "2 travail(aux) en file" in capsys.readouterr().out
+    assert jobs_cli(["drain"]) == 0
+    assert "2 travail(aux) exécuté(s)" in capsys.readouterr().out
+    assert _jobs(db_session) == []
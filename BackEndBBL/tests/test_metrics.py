@@ -0,0 +1,79 @@
+"""
+Tests de l'instrumentation (métriques par route, temps SQL, /metrics, /health)
+"""
+
+import logging
+
+from app.core.config import settings
+from app.core.metrics import (
+    http_request_db_queries,
+    http_requests_in_flight,
+    http_requests_total,
+)
+
+ARTICLE_ROUTE = "/api/articles/{article_id}"
+
+
+def test_requests_are_recorded_per_route_template(client):
+    """Les requêtes sont regroupées par gabarit de route, avec leurs requêtes SQL"""
+    article_id = client.post(
+        "/api/articles/", json={"title": "T", "content": "C", "author": "A"}
+    ).json()["id"]
+    before = http_requests_total.value("GET", ARTICLE_ROUTE, "200")
+    queries_before, count_before = http_request_db_queries.snapshot(
+        "GET", ARTICLE_ROUTE
+    )
+
+    client.get(f"/api/articles/{article_id}")
+    client.get(f"/api/articles/{article_id}")
+
+    assert http_requests_total.value("GET", ARTICLE_ROUTE, "200") == before + 2
+    queries, count = http_request_db_queries.snapshot("GET", ARTICLE_ROUTE)
+    assert count == count_before + 2
+    assert queries - queries_before >= 2
+    assert http_requests_in_flight.value("GET", ARTICLE_ROUTE) == 0
+
+
+def test_metrics_endpoint_uses_prometheus_format(client):
+    """/metrics expose les séries au format texte de Prometheus"""
+    client.get("/api/articles/")
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    bucket = 'route="/api/articles/",le="+Inf"}'
+    assert f"http_request_duration_seconds_bucket{{method=\"GET\",{bucket}" in body
+    assert "db_query_duration_seconds_count" in body
+    assert 'db_pool_connections{state="checked_out"}' in body
+
+
+def test_unknown_paths_share_one_label(client):
+    """Les chemins inconnus ne créent pas une série par URL"""
+    client.get("/pas/une/route/1")
+    client.get("/pas/une/route/2")
+    assert "/pas/une/route" not in client.get("/metrics").text
+
+
+def test_slow_queries_are_logged(client, monkeypatch, caplog):
+    """Les requêtes au-delà du seuil sont journalisées avec leur texte"""
+    monkeypatch.setattr(settings, "slow_query_ms", 0)
+    with caplog.at_level(logging.WARNING, logger="app.core.metrics"):
+        client.get("/api/articles/")
+    assert any("SELECT" in record.getMessage() for record in caplog.records)
+
+
+def test_health_pings_the_pool(client, monkeypatch):
+    """/health interroge la base et signale une panne par un 503"""
+    data = client.get("/health").json()
+    assert data["database"] == "connected"
+    assert "checked_out" in data["pool"]
+
+    def unreachable():
+        raise ConnectionError("sqlite:////srv/secret/blog.db down")
+
+    monkeypatch.setattr("app.main._ping_database", unreachable)
+    response = client.get("/health")
+    assert response.status_code == 503
+    assert response.json()["status"] == "unhealthy"
+    assert response.json()["database"] == "unreachable"
+    assert "secret" not in response.text
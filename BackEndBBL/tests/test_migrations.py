@@ -0,0 +1,188 @@
+"""
+Tests des migrations du schéma
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+
+from app.database import Base
+from app.migrations import (
+    SchemaVersionError,
+    check_schema,
+    current_version,
+    head_version,
+    upgrade,
+)
+from app.services.search import has_fts_index
+
+
+def _schema(engine) -> dict:
+    """Tables, colonnes et index de la base, sous une forme comparable"""
+    inspector = inspect(engine)
+    schema = {}
+    for table in inspector.get_table_names():
+        if table == "schema_version":
+            continue
+        columns = {
+            c["name"]: (str(c["type"]), c["nullable"])
+            for c in inspector.get_columns(table)
+        }
+        indexes = {
+            i["name"]: tuple(i["column_names"]) for i in inspector.get_indexes(table)
+        }
+        schema[table] = (columns, indexes)
+    return schema
+
+
+@pytest.fixture
+def new_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_migrations_match_models(new_engine, tmp_path):
+    """Le schéma obtenu par migration est celui décrit par les modèles"""
+    applied = upgrade(new_engine)
+    assert [m.version for m in applied][-1] == head_version()
+
+    reference = create_engine(f"sqlite:///{tmp_path / 'models.db'}")
+    Base.metadata.create_all(bind=reference)
+    assert _schema(new_engine) == _schema(reference)
+    reference.dispose()
+
+    assert upgrade(new_engine) == []
+
+
+def test_pre_migration_database_is_adopted(new_engine):
+    """Une base créée avant les migrations est complétée sans perte"""
+    with new_engine.begin() as connection:
+        connection.execute(text("""
+            CREATE TABLE articles (
+                id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL,
+                content TEXT NOT NULL, author VARCHAR(100) NOT NULL,
+                likes_count INTEGER, created_at DATETIME, updated_at DATETIME
+            )"""))
+        connection.execute(text("""
+            CREATE TABLE comments (
+                id INTEGER PRIMARY KEY, article_id INTEGER NOT NULL,
+                author VARCHAR(100) NOT NULL, content TEXT NOT NULL,
+                likes_count INTEGER, created_at DATETIME
+            )"""))
+        connection.execute(
+            text(
+                "INSERT INTO articles VALUES (1, 'Ancien', 'Texte', 'A', 3, NULL, NULL)"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO comments VALUES (1, 1, 'B', 'Bravo', 0, NULL)")
+        )
+
+    upgrade(new_engine)
+
+    with new_engine.connect() as connection:
+        assert current_version(connection) == head_version()
+        assert has_fts_index(connection)
+        row = connection.execute(
+            text("SELECT likes_count, comments_count FROM articles WHERE id = 1")
+        ).one()
+        assert tuple(row) == (3, 1)
+        match = connection.execute(
+            text("SELECT rowid FROM articles_fts WHERE articles_fts MATCH 'ancien'")
+        ).scalar()
+        assert match == 1
+
+
+def test_event_ids_are_never_reused_after_upgrade(new_engine):
+    """0010 : commentaires et likes reconstruits en AUTOINCREMENT, lignes gardées"""
+    upgrade(new_engine, target=9)
+    with new_engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO articles (title, content, author) VALUES ('t', 'c', 'a')")
+        )
+        for content in ("un", "deux"):
+            connection.execute(
+                text(
+                    "INSERT INTO comments (article_id, author, content) "
+                    "VALUES (1, 'b', :content)"
+                ),
+                {"content": content},
+            )
+        connection.execute(text("INSERT INTO trending_cursors VALUES ('likes', 7)"))
+
+    upgrade(new_engine)
+    with new_engine.begin() as connection:
+        connection.execute(text("DELETE FROM comments WHERE id = 2"))
+        connection.execute(
+            text(
+                "INSERT INTO comments (article_id, author, content) "
+                "VALUES (1, 'b', 'trois')"
+            )
+        )
+        connection.execute(text("INSERT INTO likes (article_id) VALUES (1)"))
+        comments = connection.execute(
+            text("SELECT id, content FROM comments ORDER BY id")
+        ).all()
+        assert [tuple(row) for row in comments] == [(1, "un"), (3, "trois")]
+        # Au-delà du curseur du classement tendance
+        assert connection.execute(text("SELECT id FROM likes")).scalar() == 8
+
+
+def test_article_ids_are_never_reused_after_upgrade(new_engine):
+    """0011 : articles reconstruits en AUTOINCREMENT, index plein texte gardé"""
+    upgrade(new_engine, target=10)
+    with new_engine.begin() as connection:
+        for title in ("ancien", "conservé", "supprimé"):
+            connection.execute(
+                text(
+                    "INSERT INTO articles (title, content, author) "
+                    "VALUES (:title, 'c', 'a')"
+                ),
+                {"title": title},
+            )
+        connection.execute(text("DELETE FROM articles WHERE id = 3"))
+        # Purge en attente d'un article supprimé plus récent que tous les autres
+        connection.execute(
+            text(
+                "INSERT INTO article_purges (article_id, max_comment_id, max_like_id) "
+                "VALUES (5, 0, 0)"
+            )
+        )
+
+    upgrade(new_engine)
+    with new_engine.begin() as connection:
+        connection.execute(text("DELETE FROM articles WHERE id = 2"))
+        connection.execute(
+            text(
+                "INSERT INTO articles (title, content, author) VALUES ('neuf', 'c', 'a')"
+            )
+        )
+        articles = connection.execute(
+            text("SELECT id, title FROM articles ORDER BY id")
+        ).all()
+        assert [tuple(row) for row in articles] == [(1, "ancien"), (6, "neuf")]
+        # Triggers recréés : l'index suit les insertions et les suppressions
+        matches = connection.execute(
+            text(
+                "SELECT rowid FROM articles_fts "
+                "WHERE articles_fts MATCH 'ancien OR conservé OR neuf' ORDER BY rowid"
+            )
+        ).scalars()
+        assert list(matches) == [1, 6]
+
+
+def test_startup_only_checks_the_schema(new_engine, monkeypatch):
+    """Le démarrage échoue sur une base non migrée au lieu de la modifier"""
+    monkeypatch.setattr("app.main.engine", new_engine)
+    from app.main import app
+
+    with pytest.raises(SchemaVersionError):
+        with TestClient(app):
+            pass
+    assert inspect(new_engine).get_table_names() == []
+
+    upgrade(new_engine)
+    assert check_schema(new_engine) == head_version()
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
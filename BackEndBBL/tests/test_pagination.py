@@ -0,0 +1,107 @@
+"""
+Tests for cursor (keyset) pagination on article and comment listings
+"""
+
+from sqlalchemy import event
+
+from app.models.article import Article
+from app.models.comment import Comment
+from app.services.article_service import ArticleService
+
+
+def _seed_articles(db_session, count):
+    # Insérés dans la même seconde : l'ordre repose sur le départage par id
+    db_session.add_all(
+        Article(title=f"Article {i}", content="Content", author="Author")
+        for i in range(count)
+    )
+    db_session.commit()
+
+
+def _walk(client, url, limit):
+    items, cursor, pages = [], "", 0
+    while cursor is not None:
+        response = client.get(url, params={"cursor": cursor, "limit": limit})
+        assert response.status_code == 200
+        page = response.json()
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        pages += 1
+    return items, pages
+
+
+def test_article_cursor_pages_cover_listing_without_duplicates(client, db_session):
+    """Le parcours par curseur retourne exactement la liste complète, dans l'ordre"""
+    _seed_articles(db_session, 25)
+
+    items, pages = _walk(client, "/api/articles/", limit=10)
+    legacy = client.get("/api/articles/").json()
+
+    assert pages == 3
+    assert [a["id"] for a in items] == [a["id"] for a in legacy]
+    assert len({a["id"] for a in items}) == 25
+
+
+def test_article_offset_parameters_still_return_a_list(client, db_session):
+    """Sans curseur, la réponse reste une liste (compatibilité skip/limit)"""
+    _seed_articles(db_session, 5)
+
+    response = client.get("/api/articles/?skip=2&limit=2")
+    assert isinstance(response.json(), list)
+    assert len(response.json()) == 2
+
+
+def test_article_search_cursor(client, db_session):
+    """Les résultats de recherche se paginent aussi par curseur"""
+    _seed_articles(db_session, 7)
+
+    items, pages = _walk(client, "/api/articles/?search=article", limit=3)
+    assert len(items) == 7
+    assert pages == 3
+
+
+def test_invalid_cursor_is_rejected(client):
+    """Un curseur altéré renvoie une erreur 400"""
+    response = client.get("/api/articles/?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+def test_comment_cursor_pagination(client, db_session):
+    """Les commentaires d'un article se paginent du plus ancien au plus récent"""
+    _seed_articles(db_session, 1)
+    db_session.add_all(
+        Comment(article_id=1, author="Reader", content=f"Comment {i}")
+        for i in range(12)
+    )
+    db_session.add(Comment(article_id=2, author="Other", content="Elsewhere"))
+    db_session.commit()
+
+    items, pages = _walk(client, "/api/comments/?article_id=1", limit=5)
+    assert pages == 3
+    assert [c["content"] for c in items] == [f"Comment {i}" for i in range(12)]
+
+
+def test_keyset_query_uses_composite_index(db_session):
+    """La page suivante est lue par plage d'index, sans tri en mémoire"""
+    _seed_articles(db_session, 3)
+    _, cursor = ArticleService.get_articles_page(db_session, limit=1)
+
+    statements = []
+
+    def capture(conn, cursor_, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        ArticleService.get_articles_page(db_session, cursor=cursor, limit=1)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    plan = db_session.connection().exec_driver_sql(
+        "EXPLAIN QUERY PLAN " + statement, parameters
+    )
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_articles_summary" in details
+    assert "TEMP B-TREE" not in details
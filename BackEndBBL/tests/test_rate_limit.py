@@ -0,0 +1,124 @@
+"""
+Tests de la limitation de débit (429) et du contrôle d'admission (503)
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from starlette.responses import PlainTextResponse
+
+from app.api.rate_limit import write_rate_limit
+from app.core.fake_redis import FakeRedis
+from app.core.rate_limit import MemoryRateLimitStore, RedisRateLimitStore
+from app.middleware.admission import AdmissionMiddleware
+
+ARTICLE = {"title": "Titre", "content": "Contenu", "author": "Auteur"}
+
+STORES = {
+    "memory": MemoryRateLimitStore,
+    "redis": lambda: RedisRateLimitStore(FakeRedis()),
+}
+
+
+@pytest.mark.parametrize("backend", STORES)
+def test_bucket_allows_a_burst_then_refills(backend):
+    store = STORES[backend]()
+    assert [store.acquire("k", rate=20, burst=3) for _ in range(3)] == [0.0] * 3
+    wait = store.acquire("k", rate=20, burst=3)
+    assert 0 < wait <= 0.05 + 1e-3
+    # Les autres clés ont leur propre seau
+    assert store.acquire("other", rate=20, burst=3) == 0.0
+
+    time.sleep(wait + 0.01)
+    assert store.acquire("k", rate=20, burst=3) == 0.0
+    assert store.acquire("k", rate=20, burst=3) > 0
+
+
+def test_redis_buckets_are_shared_between_workers():
+    redis = FakeRedis()
+    workers = [RedisRateLimitStore(redis), RedisRateLimitStore(redis)]
+    admitted = [workers[i % 2].acquire("k", rate=1, burst=4) == 0 for i in range(8)]
+    assert admitted == [True] * 4 + [False] * 4
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    monkeypatch.setattr(write_rate_limit, "store", MemoryRateLimitStore())
+    monkeypatch.setattr(write_rate_limit, "rate", 0.5)
+    monkeypatch.setattr(write_rate_limit, "burst", 2)
+
+
+def test_write_routes_answer_429_with_retry_after(client, limited):
+    article_id = client.post("/api/articles/", json=ARTICLE).json()["id"]
+    like = f"/api/articles/{article_id}/like"
+    assert client.post(like).status_code == 200
+    assert client.post(like).status_code == 200
+
+    response = client.post(like)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+
+    # Bucket par route ; les lectures ne sont pas limitées
+    assert client.post("/api/articles/", json=ARTICLE).status_code == 201
+    assert client.get(f"/api/articles/{article_id}").status_code == 200
+    comment = {"article_id": article_id, "author": "Paul", "content": "Bravo"}
+    assert client.post("/api/comments/", json=comment).status_code == 201
+
+
+def _admission_app(**options):
+    """Application minimale : les écritures attendent `release`, GET ?slow attend"""
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["method"] == "POST":
+            await release.wait()
+        elif scope["query_string"] == b"slow":
+            await asyncio.sleep(0.05)
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    middleware = AdmissionMiddleware(app, refresh_interval=0, **options)
+    return middleware, release
+
+
+def test_admission_sheds_writes_beyond_max_writes():
+    middleware, release = _admission_app(max_writes=1, retry_after=3)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=middleware)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as http:
+            first = asyncio.create_task(http.post("/"))
+            await asyncio.sleep(0.01)
+            second = await http.post("/")
+            read = await http.get("/")
+            # Requête CORS préalable : ni écriture, ni refusée
+            preflight = await http.options("/")
+            release.set()
+            return await first, second, read, preflight
+
+    first, second, read, preflight = asyncio.run(scenario())
+    assert first.status_code == 200
+    assert second.status_code == 503
+    assert second.headers["Retry-After"] == "3"
+    assert read.status_code == 200
+    assert preflight.status_code == 200
+    assert middleware.writes == 0
+
+
+def test_admission_sheds_writes_while_reads_are_slow():
+    middleware, release = _admission_app(read_p99_ms=20, window=0.2)
+    release.set()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=middleware)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as http:
+            await http.get("/?slow")
+            shed = await http.post("/")
+            # Les lectures lentes sortent de la fenêtre : écritures à nouveau admises
+            await asyncio.sleep(0.25)
+            return shed, await http.post("/")
+
+    shed, admitted = asyncio.run(scenario())
+    assert shed.status_code == 503
+    assert admitted.status_code == 200
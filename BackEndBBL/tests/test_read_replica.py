@@ -0,0 +1,127 @@
+"""
+Tests du routage des sessions entre primaire et réplica
+
+Deux fichiers SQLite : le primaire, et un réplica ouvert en lecture seule que
+``Replicator`` recopie à la demande, comme une réplication en retard.
+"""
+
+import sqlite3
+import time
+
+import pytest
+from fastapi import Request
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, SessionRouter, create_db_engine, get_db
+from app.main import app
+from app.middleware.read_your_writes import COOKIE_NAME
+
+ARTICLE = {"title": "Titre", "content": "Contenu", "author": "Auteur"}
+
+
+class Replicator:
+    """Réplication de substitution : copie complète du primaire vers le réplica"""
+
+    def __init__(self, primary_path, replica_path):
+        self.primary_path = primary_path
+        self.replica_path = replica_path
+
+    def sync(self) -> None:
+        source = sqlite3.connect(self.primary_path)
+        target = sqlite3.connect(self.replica_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+
+def _read_only_url(path) -> str:
+    return f"sqlite:///file:{path}?mode=ro&uri=true"
+
+
+@pytest.fixture
+def replicated(tmp_path):
+    """Application routée sur un primaire et un réplica synchronisé à la demande"""
+    primary_path = tmp_path / "primary.db"
+    replica_path = tmp_path / "replica.db"
+    primary = create_engine(
+        f"sqlite:///{primary_path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=primary)
+    replicator = Replicator(primary_path, replica_path)
+    replicator.sync()
+    replica = create_db_engine(_read_only_url(replica_path), read_only=True)
+    router = SessionRouter(
+        sessionmaker(bind=primary, autoflush=False), sessionmaker(bind=replica)
+    )
+
+    def override_get_db(request: Request):
+        db = router.for_request(request)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    previous = app.dependency_overrides[get_db]
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield router, replicator
+    finally:
+        app.dependency_overrides[get_db] = previous
+        primary.dispose()
+        replica.dispose()
+
+
+def test_reads_use_the_replica_and_writes_the_primary(client, replicated):
+    _, replicator = replicated
+    article = client.post("/api/articles/", json=ARTICLE).json()
+    path = f"/api/articles/{article['id']}"
+
+    # Le réplica n'a pas encore reçu l'article
+    other = type(client)(app)
+    assert other.get(path).status_code == 404
+
+    replicator.sync()
+    assert other.get(path).json()["title"] == "Titre"
+
+
+def test_writer_reads_its_own_writes_during_the_window(client, replicated):
+    article = client.post("/api/articles/", json=ARTICLE).json()
+    assert COOKIE_NAME in client.cookies
+    path = f"/api/articles/{article['id']}"
+    assert client.get(path).status_code == 200
+
+    # Fenêtre expirée : retour au réplica, toujours en retard
+    client.cookies.set(COOKIE_NAME, f"{time.time() - 1:.3f}")
+    assert client.get(path).status_code == 404
+
+
+def test_failed_writes_do_not_open_the_window(client, replicated):
+    assert client.delete("/api/articles/12345").status_code == 404
+    assert COOKIE_NAME not in client.cookies
+
+
+def test_preflight_requests_do_not_open_the_window(client, replicated):
+    response = client.options(
+        "/api/articles/",
+        headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "POST",
+        },
+    )
+    assert response.status_code == 200
+    assert COOKIE_NAME not in client.cookies
+
+
+def test_unreachable_replica_falls_back_to_the_primary(client, replicated, tmp_path):
+    router, _ = replicated
+    missing = create_db_engine(_read_only_url(tmp_path / "missing.db"), read_only=True)
+    router.replica = sessionmaker(bind=missing)
+    article = client.post("/api/articles/", json=ARTICLE).json()
+    client.cookies.clear()
+
+    assert client.get(f"/api/articles/{article['id']}").status_code == 200
+    assert not router.replica_available
+    missing.dispose()
@@ -0,0 +1,95 @@
+"""
+Tests for the full-text search backends (SQLite FTS5 and ILIKE fallback)
+"""
+
+from app.services.search import (
+    FTS5SearchBackend,
+    LikeSearchBackend,
+    get_search_backend,
+)
+
+
+def _create(client, title, content, author="Author"):
+    response = client.post(
+        "/api/articles/",
+        json={"title": title, "content": content, "author": author},
+    )
+    return response.json()["id"]
+
+
+def test_fts_backend_is_selected_on_sqlite(db_session):
+    """La table FTS5 est créée avec le schéma et utilisée par défaut"""
+    assert isinstance(get_search_backend(db_session), FTS5SearchBackend)
+
+
+def test_search_prefix_matching(client):
+    """Un préfixe de mot suffit à trouver l'article"""
+    _create(client, "Python Tutorial", "Learn Python")
+    _create(client, "JavaScript Guide", "Learn JS")
+
+    response = client.get("/api/articles/?search=pyth")
+    assert response.status_code == 200
+    assert [a["title"] for a in response.json()] == ["Python Tutorial"]
+
+
+def test_search_ranks_title_matches_first(client):
+    """BM25 pondère le titre plus fortement que le contenu"""
+    _create(client, "Gardening notes", "A long text that mentions python once")
+    _create(client, "Python in depth", "Everything about the language")
+
+    response = client.get("/api/articles/?search=python")
+    titles = [a["title"] for a in response.json()]
+    assert titles == ["Python in depth", "Gardening notes"]
+
+
+def test_search_index_follows_updates_and_deletes(client):
+    """Les triggers maintiennent l'index synchronisé avec la table articles"""
+    article_id = _create(client, "Old title", "Some content")
+    client.put(f"/api/articles/{article_id}", json={"title": "Fresh title"})
+
+    assert client.get("/api/articles/?search=old").json() == []
+    assert len(client.get("/api/articles/?search=fresh").json()) == 1
+
+    client.delete(f"/api/articles/{article_id}")
+    assert client.get("/api/articles/?search=fresh").json() == []
+
+
+def test_search_endpoint_returns_highlighted_snippet(client):
+    """L'endpoint /search renvoie un extrait surligné et le score"""
+    _create(client, "Cooking", "The best recipe for a chocolate cake")
+
+    response = client.get("/api/articles/search?q=chocol")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert "<mark>chocolate</mark>" in data[0]["snippet"]
+    assert "rank" in data[0]
+
+
+def test_search_snippet_escapes_article_content(client):
+    """Seules les balises <mark> de l'extrait sont du HTML"""
+    _create(client, "Markup", '<script>alert("chocolate")</script> & <mark>x</mark>')
+
+    snippet = client.get("/api/articles/search?q=chocolate").json()[0]["snippet"]
+    assert "<script>" not in snippet
+    assert "&lt;script&gt;" in snippet
+    assert "&lt;mark&gt;x&lt;/mark&gt;" in snippet
+    assert snippet.count("<mark>") == 1
+    assert "<mark>chocolate</mark>" in snippet
+
+
+def test_search_ignores_fts_syntax(client):
+    """Les opérateurs FTS5 saisis par l'utilisateur ne provoquent pas d'erreur"""
+    _create(client, "Quotes", 'He said "hello" AND left')
+
+    response = client.get('/api/articles/?search="hello" AND (')
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+
+def test_like_backend_matches_substrings(client, db_session):
+    """Le moteur ILIKE reste disponible comme repli portable"""
+    _create(client, "Substring", "unbelievable")
+
+    hits = LikeSearchBackend().search(db_session, "liev")
+    assert len(hits) == 1
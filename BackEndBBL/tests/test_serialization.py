@@ -0,0 +1,80 @@
+"""
+Tests de l'encodage direct des listes (projection de colonnes + orjson)
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.api import responses
+from app.models.article import Article
+from app.models.comment import Comment
+from app.schemas.article import ArticleResponse
+from app.schemas.comment import CommentResponse
+
+
+def _seed(db_session):
+    articles = [
+        Article(title=f"Titre {i} é", content="Contenu", author="Auteur")
+        for i in range(3)
+    ]
+    db_session.add_all(articles)
+    db_session.commit()
+    db_session.add_all(
+        Comment(article_id=articles[0].id, author="Lecteur", content=f"Avis {i}")
+        for i in range(3)
+    )
+    db_session.commit()
+    return articles
+
+
+def test_article_list_matches_pydantic_encoding(client, db_session):
+    """Le corps encodé directement est celui que produirait le response_model"""
+    _seed(db_session)
+    db_session.expire_all()
+    expected = TypeAdapter(List[ArticleResponse]).dump_json(
+        [
+            ArticleResponse.model_validate(a)
+            for a in db_session.query(Article).order_by(
+                Article.created_at.desc(), Article.id.desc()
+            )
+        ]
+    )
+
+    response = client.get("/api/articles/")
+    assert response.status_code == 200
+    assert response.content == expected
+
+
+def test_comment_list_matches_pydantic_encoding(client, db_session):
+    articles = _seed(db_session)
+    comments = (
+        db_session.query(Comment).filter(Comment.article_id == articles[0].id).all()
+    )
+    expected = TypeAdapter(List[CommentResponse]).dump_json(
+        [CommentResponse.model_validate(c) for c in comments]
+    )
+
+    response = client.get(f"/api/comments/?article_id={articles[0].id}")
+    assert response.status_code == 200
+    assert response.content == expected
+
+    page = client.get(f"/api/comments/?article_id={articles[0].id}&cursor=&limit=2")
+    assert [c["id"] for c in page.json()["items"]] == [c.id for c in comments[:2]]
+    assert page.json()["next_cursor"]
+
+
+def test_dumps_formats_dates_like_pydantic(monkeypatch):
+    """UTC en ``Z``, dates naïves telles quelles, y compris sans orjson"""
+    value = {
+        "aware": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+        "naive": datetime(2024, 5, 1, 12, 30, 0, 1500),
+    }
+    expected = b'{"aware":"2024-05-01T12:30:00Z","naive":"2024-05-01T12:30:00.001500"}'
+    assert responses.dumps(value) == expected
+    fallback = json.dumps(
+        value, default=responses._default, separators=(",", ":")
+    ).encode()
+    assert fallback == expected
@@ -0,0 +1,89 @@
+"""
+Tests du serveur de production (python -m app.serve) : workers et arrêt propre
+"""
+
+import os
+import re
+import signal
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="fork requis")
+
+
+def _start(tmp_path, workers: int):
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'blog.db'}",
+        "MIGRATE_ON_STARTUP": "true",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--port", "0", "--workers", str(workers)]
+        + ["--graceful-timeout", "30"],
+        cwd=BACKEND,
+        env=env,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        line = process.stderr.readline()
+        match = re.search(r"Écoute sur (http://\S+)", line)
+        if match:
+            return process, match.group(1)
+        if not line and process.poll() is not None:
+            break
+    process.kill()
+    pytest.fail("le serveur n'a pas démarré")
+
+
+def test_workers_serve_and_shutdown_flushes_likes(tmp_path):
+    process, url = _start(tmp_path, workers=2)
+    try:
+        with httpx.Client(base_url=url, timeout=10) as http:
+            article = http.post(
+                "/api/articles/",
+                json={"title": "Titre", "content": "Contenu", "author": "Auteur"},
+            ).json()
+            assert http.post(f"/api/articles/{article['id']}/like").status_code == 200
+
+            # Un flux d'événements ouvert ne retient pas l'arrêt
+            with http.stream("GET", f"/api/articles/{article['id']}/events") as events:
+                assert next(events.iter_bytes()).startswith(b"retry: ")
+                started = time.monotonic()
+                process.send_signal(signal.SIGTERM)
+                assert process.wait(timeout=20) == 0
+        assert time.monotonic() - started < 15
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.stderr.close()
+
+    # Le like encore en tampon a été écrit à l'arrêt du worker qui l'a reçu
+    with sqlite3.connect(tmp_path / "blog.db") as connection:
+        likes = connection.execute("SELECT likes_count FROM articles").fetchone()
+    assert likes == (1,)
+
+
+def test_startup_failure_stops_the_server(tmp_path):
+    """Schéma absent, migration désactivée : échec avant la création des workers"""
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'empty.db'}"}
+    env.pop("MIGRATE_ON_STARTUP", None)
+    result = subprocess.run(
+        [sys.executable, "-m", "app.serve", "--port", "0", "--workers", "2"],
+        cwd=BACKEND,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode != 0
+    assert "Écoute sur" not in result.stderr
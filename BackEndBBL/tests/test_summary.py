@@ -0,0 +1,105 @@
+"""
+Tests des listes en mode résumé (extrait, temps de lecture, champs choisis)
+"""
+
+from sqlalchemy import create_engine, text
+
+from app.migrations import upgrade
+from app.services.summary import EXCERPT_LENGTH, content_summary, make_excerpt
+
+LONG_CONTENT = " ".join(f"mot{i}" for i in range(450))
+
+
+def _create(client, content=LONG_CONTENT):
+    response = client.post(
+        "/api/articles/",
+        json={"title": "Titre", "content": content, "author": "Auteur"},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_excerpt_is_cut_between_words():
+    excerpt = make_excerpt(LONG_CONTENT)
+    assert len(excerpt) <= EXCERPT_LENGTH
+    assert excerpt.endswith("…")
+    assert LONG_CONTENT.startswith(excerpt[:-1])
+    assert make_excerpt("  court\n\ttexte ") == "court texte"
+    assert content_summary(LONG_CONTENT)["reading_time"] == 3
+
+
+def test_summary_is_maintained_on_create_and_update(client):
+    article = _create(client)
+    assert article["word_count"] == 450
+    assert article["reading_time"] == 3
+
+    client.put(f"/api/articles/{article['id']}", json={"content": "Nouveau texte"})
+    updated = client.get(f"/api/articles/{article['id']}").json()
+    assert updated["excerpt"] == "Nouveau texte"
+    assert updated["word_count"] == 2
+    assert updated["reading_time"] == 1
+
+
+def test_summary_view_omits_content(client):
+    _create(client)
+    full = client.get("/api/articles/")
+    summary = client.get("/api/articles/?view=summary")
+    assert summary.status_code == 200
+    item = summary.json()[0]
+    assert "content" not in item
+    assert item["excerpt"] == make_excerpt(LONG_CONTENT)
+    assert len(summary.content) < len(full.content) / 5
+
+    page = client.get("/api/articles/?view=summary&cursor=&limit=1").json()
+    assert "content" not in page["items"][0]
+
+
+def test_sparse_fieldsets(client):
+    article = _create(client)
+    client.post(f"/api/articles/{article['id']}/like")
+
+    response = client.get("/api/articles/?fields=title,likes_count")
+    assert response.json() == [
+        {"id": article["id"], "title": "Titre", "likes_count": 1}
+    ]
+
+    response = client.get("/api/articles/?fields=title,password")
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+def test_summary_list_is_served_by_covering_index(db_session, client):
+    """La liste en mode résumé ne lit pas la table (donc pas le contenu)"""
+    _create(client)
+    columns = (
+        "title, author, excerpt, id, likes_count, comments_count, word_count, "
+        "reading_time, created_at, updated_at"
+    )
+    plan = db_session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN SELECT {columns} FROM articles "
+        "ORDER BY created_at DESC, id DESC LIMIT 20"
+    )
+    details = " ".join(row[-1] for row in plan)
+    assert "COVERING INDEX ix_articles_summary" in details
+
+
+def test_migration_backfills_existing_articles(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'blog.db'}")
+    upgrade(engine, target=1)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO articles (title, content, author, likes_count) "
+                "VALUES ('Ancien', :content, 'A', 0)"
+            ),
+            {"content": LONG_CONTENT},
+        )
+
+    upgrade(engine)
+    with engine.connect() as connection:
+        row = connection.execute(
+            text("SELECT excerpt, word_count, reading_time, updated_at FROM articles")
+        ).one()
+    assert row.excerpt == make_excerpt(LONG_CONTENT)
+    assert (row.word_count, row.reading_time, row.updated_at) == (450, 3, None)
+    engine.dispose()
@@ -0,0 +1,125 @@
+"""
+Tests du classement des articles tendance
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.models.article import Article
+from app.models.comment import Comment
+from app.models.like import Like
+from app.models.trending import TrendingScore
+from app.services.trending import DecayedRanking, TrendingRankings, trending
+
+
+def _seed(db_session, likes):
+    """Articles et likes datés : ``likes`` associe un titre à (nombre, âge)"""
+    now = datetime.now(timezone.utc)
+    ids = {}
+    for title, (count, age) in likes.items():
+        article = Article(title=title, content="Contenu", author="Auteur")
+        db_session.add(article)
+        db_session.flush()
+        ids[title] = article.id
+        db_session.add_all(
+            Like(article_id=article.id, created_at=now - age) for _ in range(count)
+        )
+    db_session.commit()
+    return ids
+
+
+def test_ranking_decays_and_reorders_incrementally():
+    ranking = DecayedRanking(time_constant=100.0, capacity=2)
+    ranking.add(1, 1.0, at=0.0)
+    ranking.add(2, 1.0, at=50.0)
+    assert [a for a, _ in ranking.top(10, now=50.0)] == [2, 1]
+
+    # Deux événements anciens valent plus qu'un récent, à âge suffisant près
+    ranking.add(1, 1.0, at=10.0)
+    top = dict(ranking.top(10, now=100.0))
+    assert top[1] > top[2]
+    assert abs(top[2] - 2.718281828**-0.5) < 1e-9
+
+    # Seuls les deux premiers sont tenus triés : un article hors du haut du
+    # classement y entre en dépassant le dernier
+    ranking.add(3, 1.0, at=90.0)
+    assert [a for a, _ in ranking.top(2, now=100.0)] == [3, 1]
+    for at in (95.0, 96.0, 97.0):
+        ranking.add(2, 1.0, at=at)
+    assert [a for a, _ in ranking.top(2, now=100.0)] == [2, 3]
+    ranking.discard(2)
+    assert [a for a, _ in ranking.top(2, now=100.0)] == [3, 1]
+
+    assert sorted(ranking.prune(now=1000.0, min_score=0.01)) == [1, 3]
+    assert len(ranking) == 0
+
+
+def test_trending_window_weighs_recent_activity(client, db_session):
+    ids = _seed(
+        db_session,
+        {"Ancien": (5, timedelta(days=3)), "Récent": (2, timedelta(minutes=5))},
+    )
+
+    day = client.get("/api/articles/trending?window=24h").json()
+    assert [a["id"] for a in day] == [ids["Récent"], ids["Ancien"]]
+    assert "content" not in day[0]
+    assert abs(day[0]["score"] - 2) < 0.01
+
+    week = client.get("/api/articles/trending?window=7d").json()
+    assert [a["id"] for a in week] == [ids["Ancien"], ids["Récent"]]
+
+    assert client.get("/api/articles/trending?window=2d").status_code == 422
+
+
+def test_new_events_and_deletions_are_applied(client, db_session, monkeypatch):
+    monkeypatch.setattr(trending, "refresh_interval", 0)
+    ids = _seed(
+        db_session,
+        {"A": (3, timedelta(minutes=1)), "B": (2, timedelta(minutes=1))},
+    )
+    assert client.get("/api/articles/trending?limit=1").json()[0]["id"] == ids["A"]
+
+    # Un commentaire pèse trois likes
+    client.post(
+        "/api/comments/",
+        json={"article_id": ids["B"], "author": "Lecteur", "content": "Bravo"},
+    )
+    assert client.get("/api/articles/trending?limit=1").json()[0]["id"] == ids["B"]
+
+    client.delete(f"/api/articles/{ids['B']}")
+    remaining = client.get("/api/articles/trending").json()
+    assert [a["id"] for a in remaining] == [ids["A"]]
+
+
+def test_comment_after_deleting_the_newest_one_is_counted(db_session):
+    """Les identifiants ne sont pas réattribués : aucun événement n'est sauté"""
+    ids = _seed(db_session, {"A": (0, timedelta(0))})
+    rankings = TrendingRankings()
+    newest = Comment(article_id=ids["A"], author="Lecteur", content="Premier")
+    db_session.add(newest)
+    db_session.commit()
+    assert rankings.sync(db_session, force=True) == 1
+
+    db_session.delete(newest)
+    db_session.commit()
+    db_session.add(Comment(article_id=ids["A"], author="Lecteur", content="Second"))
+    db_session.commit()
+    assert rankings.sync(db_session, force=True) == 1
+    assert dict(rankings.top("24h", 10))[ids["A"]] > 5.9
+
+
+def test_snapshot_is_reloaded_then_completed(db_session):
+    ids = _seed(db_session, {"A": (3, timedelta(hours=1)), "B": (1, timedelta(0))})
+    first = TrendingRankings()
+    assert first.sync(db_session) == 4
+    first.persist(db_session)
+    assert db_session.query(TrendingScore).count() == 2 * 3
+
+    db_session.add(Like(article_id=ids["B"], created_at=datetime.now(timezone.utc)))
+    db_session.add(Comment(article_id=ids["B"], author="Lecteur", content="Bravo"))
+    db_session.commit()
+
+    # Seuls les événements postérieurs à l'instantané sont relus
+    second = TrendingRankings()
+    assert second.sync(db_session) == 2
+    assert [a for a, _ in second.top("24h", 10)] == [ids["B"], ids["A"]]
+    assert dict(second.top("24h", 10))[ids["B"]] > 4.9
@@ -30,6 +30,7 @@ export const ArticleDetail: React.FC<ArticleDetailProps> = ({
     const [showDeleteModal, setShowDeleteModal] = useState(false);
     const {
         comments,
+        likesCount: liveLikesCount,
         loading: commentsLoading,
         fetchComments,
         createComment
@@ -39,6 +40,9 @@ export const ArticleDetail: React.FC<ArticleDetailProps> = ({
         fetchComments();
     }, [fetchComments]);
 
+    // Live count from the event stream once a like has been pushed
+    const likesCount = liveLikesCount ?? article.likesCount;
+
     const handleDelete = async (password: string) => {
         await onDelete(article.id, password);
         setShowDeleteModal(false);
@@ -90,7 +94,7 @@ export const ArticleDetail: React.FC<ArticleDetailProps> = ({
                                     <Heart size={20} className="text-red-600" />
                                 </div>
                                 <div>
-                                    <p className="text-2xl font-bold text-gray-900">{article.likesCount}</p>
+                                    <p className="text-2xl font-bold text-gray-900">{likesCount}</p>
                                     <p className="text-sm text-gray-600">J'aime</p>
                                 </div>
                             </div>
@@ -109,7 +113,7 @@ export const ArticleDetail: React.FC<ArticleDetailProps> = ({
                                 </div>
                                 <div>
                                     <p className="text-2xl font-bold text-gray-900">
-                                        {article.likesCount + comments.length}
+                                        {likesCount + comments.length}
                                     </p>
                                     <p className="text-sm text-gray-600">Interactions</p>
                                 </div>
@@ -125,7 +129,7 @@ export const ArticleDetail: React.FC<ArticleDetailProps> = ({
                         >
                             <Heart
                                 size={24}
-                                className={`${article.likesCount > 0
+                                className={`${likesCount > 0
                                     ? 'fill-red-500 text-red-500'
                                     : 'text-gray-400 group-hover:text-red-500'
                                     } group-hover:scale-110 transition-transform`}
@@ -1,5 +1,5 @@
 // src/hooks/useComments.ts
-import { useCallback, useState } from "react";
+import { useCallback, useEffect, useState } from "react";
 // do not use raw axios here; use commentService helper to fetch and map
 // import axios from "axios";
 import commentService from '../services/commentService';
@@ -9,10 +9,14 @@ import { Comment as CommentType } from "../types/comment.types";
  * useComments hook
  * - Fetches comments for an article and supports creating new comments.
  * - Maps API response fields from snake_case to camelCase to match front-end types.
+ * - Follows the article's event stream: new and deleted comments and the live
+ *   likes count are pushed by the server instead of refetching the list.
  */
 export function useComments(articleId: number) {
     const [comments, setComments] = useState<CommentType[]>([]);
     const [loading, setLoading] = useState(false);
+    // Latest likes count pushed by the server (null until the first like event)
+    const [likesCount, setLikesCount] = useState<number | null>(null);
 
     const fetchComments = useCallback(async () => {
         setLoading(true);
@@ -27,17 +31,29 @@ export function useComments(articleId: number) {
         }
     }, [articleId]);
 
+    useEffect(() => {
+        setLikesCount(null);
+        return commentService.subscribeToArticle(articleId, {
+            // The author of a comment also receives it from the POST response
+            onCommentCreated: (comment) =>
+                setComments((prev) => (prev.some((c) => c.id === comment.id) ? prev : [...prev, comment])),
+            onCommentDeleted: (id) => setComments((prev) => prev.filter((c) => c.id !== id)),
+            onLikes: setLikesCount,
+            onReset: fetchComments,
+        });
+    }, [articleId, fetchComments]);
+
     const createComment = async (content: string, author?: string) => {
         try {
             const c = await commentService.createComment({ articleId: articleId, author: author || "Anonymous", content });
             const mapped = c as CommentType;
-            // append the returned comment
-            setComments((prev) => [...prev, mapped]);
+            // append the returned comment (unless the event stream already did)
+            setComments((prev) => (prev.some((c) => c.id === mapped.id) ? prev : [...prev, mapped]));
         } catch (err) {
             console.error("Failed to create comment", err);
             throw err;
         }
     };
 
-    return { comments, loading, fetchComments, createComment };
+    return { comments, likesCount, loading, fetchComments, createComment };
 }
@@ -10,6 +10,8 @@ const api = axios.create({
         'Content-Type': 'application/json',
     },
     timeout: 10000, // 10 secondes
+    // Cookie de l'API : relire ses propres écritures juste après les avoir faites
+    withCredentials: true,
 });
 
 // Intercepteur de requête pour logger les appels
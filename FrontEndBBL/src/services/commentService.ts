@@ -4,6 +4,17 @@
 import api from './api';
 import { Comment, CreateCommentDto } from '../types/comment.types';
 
+/**
+ * Callbacks du flux d'événements d'un article
+ */
+export interface ArticleEventHandlers {
+    onCommentCreated: (comment: Comment) => void;
+    onCommentDeleted: (id: number) => void;
+    onLikes: (likesCount: number) => void;
+    // Des événements ont été manqués : recharger les commentaires
+    onReset: () => void;
+}
+
 class CommentService {
     private readonly BASE_PATH = '/comments';
 
@@ -80,7 +91,36 @@ class CommentService {
     }
 
     /**
-     * Ajoute un like à un commentaire (non implenté côté backend pour l'instant)
+     * S'abonne aux nouveaux commentaires et likes d'un article (Server-Sent Events)
+     * Appelle : GET /api/articles/1/events
+     * EventSource se reconnecte seul et reprend au dernier événement reçu.
+     * Retourne la fonction de désabonnement.
+     */
+    subscribeToArticle(articleId: number, handlers: ArticleEventHandlers): () => void {
+        const source = new EventSource(`${api.defaults.baseURL}/articles/${articleId}/events`);
+        const parse = (event: Event) => JSON.parse((event as MessageEvent).data);
+
+        source.addEventListener('comment_created', (event) => {
+            const c = parse(event);
+            handlers.onCommentCreated({
+                id: c.id,
+                articleId: c.article_id,
+                author: c.author ?? '',
+                content: c.content,
+                likesCount: c.likes_count ?? 0,
+                createdAt: c.created_at,
+            } as Comment);
+        });
+        source.addEventListener('comment_deleted', (event) => handlers.onCommentDeleted(parse(event).id));
+        source.addEventListener('likes', (event) => handlers.onLikes(parse(event).likes_count));
+        source.addEventListener('reset', () => handlers.onReset());
+
+        return () => source.close();
+    }
+
+    /**
+     * Ajoute un like à un commentaire
+     * Appelle : POST /api/comments/1/like
      */
     async likeComment(id: number): Promise<Comment> {
         try {